@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+# /benchmarks/bench_hibernation_memory.py
+#
+# Resident memory of the editor with many large tabs open, with and without tab
+# hibernation. Each mode runs in a fresh process with its own HOME so the user's
+# journals, settings and last-file record are not touched.
+#
+#   QT_QPA_PLATFORM=offscreen python3 benchmarks/bench_hibernation_memory.py --files 20 --segments 400
+
+import os
+import gc
+import sys
+import json
+import time
+import ctypes
+import argparse
+import tempfile
+import subprocess
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from benchmarks.corpus import write_corpus
+
+
+def _trim():
+    """Hand freed heap pages back to the OS (glibc only) so RSS reflects live memory."""
+    try:
+        ctypes.CDLL("libc.so.6").malloc_trim(0)
+    except (OSError, AttributeError):
+        pass
+
+
+def run_mode(mode, paths):
+    from PyQt5.QtCore import QCoreApplication, QEvent
+    from PyQt5.QtWidgets import QApplication
+    app = QApplication.instance() or QApplication(sys.argv)
+    from modules.notepad_window import NotepadWindow
+    from modules.tab_hibernation import process_rss
+
+    def settle():
+        for _ in range(3):
+            app.processEvents()
+            QCoreApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+        gc.collect()
+        _trim()
+
+    window = NotepadWindow()
+    window.show()
+    settle()
+    baseline = process_rss()
+
+    for path in paths:
+        window.openFile(path)
+        settle()
+    # Show every tab once, as a day of switching around would
+    for i in range(window.tabs.count()):
+        window.tabs.setCurrentIndex(i)
+        window.scheduler.flush()
+        settle()
+    window.tabs.setCurrentIndex(0)
+    settle()
+    opened = process_rss()
+
+    result = {"mode": mode, "tabs": window.tabs.count(), "baseline": baseline, "opened": opened}
+    if mode == "hibernate":
+        start = time.perf_counter()
+        result["hibernated"] = window.hibernation.hibernateInactive()
+        result["hibernate_ms"] = (time.perf_counter() - start) * 1000
+    settle()
+    result["settled"] = process_rss()
+
+    if mode == "hibernate":
+        start = time.perf_counter()
+        window.tabs.setCurrentIndex(window.tabs.count() - 1)
+        result["wake_ms"] = (time.perf_counter() - start) * 1000
+        settle()
+        result["after_wake"] = process_rss()
+    window.hibernation.discardAll()
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="RSS with many open tabs, with and without hibernation")
+    parser.add_argument("--files", type=int, default=20)
+    parser.add_argument("--segments", type=int, default=400)
+    parser.add_argument("--child", choices=("awake", "hibernate"), help=argparse.SUPPRESS)
+    parser.add_argument("--corpus", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        paths = sorted(os.path.join(args.corpus, name) for name in os.listdir(args.corpus) if name.endswith(".vhd"))
+        print(json.dumps(run_mode(args.child, paths)))
+        return 0
+
+    with tempfile.TemporaryDirectory(prefix="bench_hibernation_") as tmp:
+        corpus = os.path.join(tmp, "corpus")
+        paths = write_corpus(corpus, args.files, args.segments)
+        size = sum(os.path.getsize(p) for p in paths)
+        print(f"{len(paths)} files, {args.segments} segments each, {size / 1e6:.1f} MB of text")
+
+        results = []
+        for mode in ("awake", "hibernate"):
+            home = os.path.join(tmp, f"home_{mode}")
+            os.makedirs(home)
+            env = dict(os.environ, HOME=home)
+            env.setdefault("QT_QPA_PLATFORM", "offscreen")
+            proc = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), "--child", mode, "--corpus", corpus],
+                env=env, cwd=project_root, capture_output=True, text=True,
+            )
+            lines = [line for line in proc.stdout.splitlines() if line.startswith("{")]
+            if proc.returncode or not lines:
+                print(f"{mode}: failed\n{proc.stderr[-2000:]}")
+                return 1
+            results.append(json.loads(lines[-1]))
+
+    mb = lambda n: f"{n / 1024 / 1024:8.1f} MB"
+    print(f"{'mode':<10} {'tabs':>4} {'empty window':>14} {'tabs open':>12} {'settled':>12}")
+    for r in results:
+        print(f"{r['mode']:<10} {r['tabs']:>4} {mb(r['baseline']):>14} {mb(r['opened']):>12} {mb(r['settled']):>12}")
+    awake, hibernated = results
+    print(f"hibernated {hibernated['hibernated']} tabs in {hibernated['hibernate_ms']:.0f} ms; "
+          f"waking one took {hibernated['wake_ms']:.0f} ms (RSS then {mb(hibernated['after_wake']).strip()})")
+    saved = awake["settled"] - hibernated["settled"]
+    print(f"hibernation saved {mb(saved).strip()} "
+          f"({saved / max(1, awake['settled'] - awake['baseline']) * 100:.0f}% of the memory the open tabs used)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+# /benchmarks/bench_hotpaths.py
+#
+# Micro-benchmarks of the editor's hot paths on synthetic rundowns of several sizes:
+# syntax highlighting, the title pane, the image pane, find-all highlighting, the line
+# cleaners and every parse_segments_with_positions variant in scripts/. Runs offscreen in
+# a child process with its own HOME. Results are written as JSON; --compare checks them
+# against an earlier file and exits with status 1 on a regression.
+#
+#   QT_QPA_PLATFORM=offscreen python3 benchmarks/bench_hotpaths.py --segments 50,400,1600
+#   QT_QPA_PLATFORM=offscreen python3 benchmarks/bench_hotpaths.py --compare benchmarks/results/hotpaths-abc1234.json
+
+import os
+import re
+import ast
+import sys
+import json
+import time
+import hashlib
+import argparse
+import platform
+import tempfile
+import statistics
+import subprocess
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+RESULTS_DIR = os.path.join(project_root, "benchmarks", "results")
+
+# The lazy group around the segment content in a parse_segments_with_positions pattern
+_CONTENT_GROUP = re.compile(r"\((?:\.|\[\\s\\S\])\*\?\)")
+# Regex pieces that stand for literal text in the marker parts of such a pattern
+_MARKER_TOKENS = [(r"\s*", ""), (r"\s+", "\n"), (r"\n", "\n"), ("^", ""), ("$", "")]
+
+
+def time_call(func, setup=None, repeat=5):
+    """{"median_ms", "min_ms"} of func over repeat runs; setup runs untimed before each."""
+    times = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        times.append((time.perf_counter() - start) * 1000)
+    return {"median_ms": statistics.median(times), "min_ms": min(times)}
+
+
+def _literal(fragment):
+    """The text a marker part of a pattern matches, or None if it is not a plain literal."""
+    text = ""
+    while fragment:
+        for token, literal in _MARKER_TOKENS:
+            if fragment.startswith(token):
+                text += literal
+                fragment = fragment[len(token):]
+                break
+        else:
+            if fragment[0] in "\\.[]{}()*+?|":
+                return None
+            text += fragment[0]
+            fragment = fragment[1:]
+    return text
+
+
+def markers_of(node):
+    """(opening, closing) markers a parse function's regex expects around a segment, or None."""
+    for constant in ast.walk(node):
+        if not (isinstance(constant, ast.Constant) and isinstance(constant.value, str)):
+            continue
+        pattern = constant.value
+        group = _CONTENT_GROUP.search(pattern)
+        if group is None:
+            continue
+        # An outer group around the whole match, as in r'(111\s*\n(.*?)\n\s*111)'
+        head, tail = pattern[:group.start()], pattern[group.end():]
+        if head.startswith("(") and tail.endswith(")"):
+            head, tail = head[1:], tail[:-1]
+        opening, closing = _literal(head), _literal(tail)
+        if opening and closing:
+            return opening, closing
+    return None
+
+
+def load_parse_variants(scripts_dir):
+    """
+    ({variant name: (function, markers)}, [skipped variant names]) for the distinct
+    parse_segments_with_positions implementations in scripts_dir. Only the function is
+    compiled, so the scripts' module code (API clients, argument parsing) never runs;
+    scripts sharing an implementation are benchmarked once, named after the first of them.
+    Variants without a marker pattern (those that take the whole text) are skipped.
+    """
+    variants = {}
+    for name in sorted(os.listdir(scripts_dir)):
+        if not name.endswith(".py"):
+            continue
+        path = os.path.join(scripts_dir, name)
+        with open(path, 'r', encoding='utf-8') as f:
+            source = f.read()
+        if "def parse_segments_with_positions" not in source:
+            continue
+        tree = ast.parse(source, filename=path)
+        node = next((n for n in tree.body if isinstance(n, ast.FunctionDef)
+                     and n.name == "parse_segments_with_positions"), None)
+        if node is None:
+            continue
+        if ast.get_docstring(node) is not None:
+            node.body = node.body[1:] or [ast.Pass()]
+        key = hashlib.sha1(ast.dump(node).encode()).hexdigest()
+        if key in variants:
+            variants[key][0].append(os.path.splitext(name)[0])
+            continue
+        markers = markers_of(node)
+        # The variants print a line per call; that is not what is being measured
+        namespace = {"re": re, "logging": __import__("logging"), "print": lambda *a, **k: None}
+        exec(compile(ast.Module(body=[node], type_ignores=[]), path, "exec"), namespace)
+        variants[key] = ([os.path.splitext(name)[0]], namespace[node.name], markers)
+    found, skipped = {}, []
+    for names, func, markers in variants.values():
+        label = names[0] if len(names) == 1 else f"{names[0]} (+{len(names) - 1} alike)"
+        # The markers must make the function find the segment, or the timing measures nothing
+        if markers is None or not func(f"{markers[0]}Title: probe\ntext{markers[1]}"):
+            skipped.append(label)
+        else:
+            found[label] = (func, markers)
+    return found, skipped
+
+
+def marked_text(text, markers):
+    """Every Title: segment of text wrapped in the markers, as a selection would be."""
+    segments = re.split(r"\n(?=Title:)", text)
+    return "\n".join(f"{markers[0]}{segment.strip()}{markers[1]}" for segment in segments)
+
+
+def run_child(sizes, repeat):
+    from PyQt5.QtCore import QCoreApplication
+    from PyQt5.QtGui import QTextCursor
+    from PyQt5.QtWidgets import QApplication
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    from benchmarks.corpus import make_rundown
+    from modules.notepad_window import NotepadWindow
+    from modules.line_pipeline import builtin_presets, get_pipeline
+
+    window = NotepadWindow()
+    window.resize(1600, 1000)
+    window.show()
+    app.processEvents()
+    variants, skipped = load_parse_variants(os.path.join(project_root, "scripts"))
+    presets = builtin_presets()
+    tmp = tempfile.mkdtemp(prefix="bench_hotpaths_")
+    results = {}
+
+    def add(name, size, measured, units=None, unit=None):
+        entry = dict(measured)
+        if units:
+            entry["per_unit_us"] = measured["median_ms"] * 1000 / units
+            entry["unit"] = unit
+        results.setdefault(name, {})[str(size)] = entry
+
+    for size in sizes:
+        text = make_rundown(size)
+        path = os.path.join(tmp, f"rundown_{size}.vhd")
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        window.openFile(path)
+        window.scheduler.flush()
+        app.processEvents()
+        editor = window.currentEditor()
+        blocks = editor.document().blockCount()
+        print(f"{size} segments: {len(text) / 1e6:.2f} MB, {blocks} lines", file=sys.stderr)
+
+        def touch(editor=editor):
+            # One typed character: a new document revision, so cached parses are stale
+            cursor = QTextCursor(editor.document())
+            cursor.movePosition(QTextCursor.End)
+            cursor.insertText("x")
+
+        scroll = editor.verticalScrollBar()
+        positions = iter(range(10 ** 9))
+
+        def scroll_elsewhere(editor=editor, scroll=scroll):
+            # Alternate between two places far apart so the image pane has to rebuild
+            scroll.setValue(scroll.maximum() // 3 if next(positions) % 2 else scroll.maximum() * 2 // 3)
+
+        add("type one character", size, time_call(touch, repeat=repeat))
+        add("highlightBlock (rehighlight)", size,
+            time_call(editor.highlighter.rehighlight, repeat=repeat), blocks, "line")
+        add("updateTitleSegments (after edit)", size,
+            time_call(window.updateTitleSegments, touch, repeat))
+        add("updateTitleSegments (unchanged)", size,
+            time_call(window.updateTitleSegments, repeat=repeat))
+        add("_debounced_update_images (after edit)", size,
+            time_call(window._debounced_update_images, touch, repeat))
+        add("_debounced_update_images (scrolled)", size,
+            time_call(window._debounced_update_images, scroll_elsewhere, repeat))
+        for word in ("the", "ceasefire", "zzqx"):
+            matches = editor.highlightAllMatches(word)
+            add(f"highlightAllMatches '{word}'", size,
+                time_call(lambda w=word: editor.highlightAllMatches(w), repeat=repeat), max(1, matches), "match")
+        editor.clearHighlights()
+        for name in presets:
+            pipeline = get_pipeline(name, presets)
+            add(f"cleaner {name}", size, time_call(lambda p=pipeline: p.run_text(text), repeat=repeat), blocks, "line")
+        for name, (func, markers) in variants.items():
+            marked = marked_text(text, markers)
+            add(f"parse_segments_with_positions {name}", size, time_call(lambda f=func, m=marked: f(m), repeat=repeat))
+
+        window.tabs.removeTab(window.tabs.indexOf(editor))
+        editor.document().setModified(False)
+        editor.deleteLater()
+        QCoreApplication.processEvents()
+    return {"results": results, "skipped": skipped}
+
+
+def git_version():
+    try:
+        return subprocess.run(["git", "describe", "--always", "--dirty"], cwd=project_root,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(old, new, threshold):
+    """Print the change per benchmark and size; returns the number of regressions."""
+    regressions = 0
+    width = max(len(name) for name in new["results"])
+    print(f"\ncompared with {old.get('version', '?')} ({old.get('date', '?')}), fastest run; "
+          f"regression above {threshold:.2f}x")
+    for name, sizes in new["results"].items():
+        for size, entry in sizes.items():
+            before = old.get("results", {}).get(name, {}).get(size)
+            if not before:
+                continue
+            # The fastest run is the steadiest figure; anything under 2 ms is mostly noise
+            ratio = max(entry["min_ms"], 2.0) / max(before["min_ms"], 2.0)
+            flag = ""
+            if ratio > threshold:
+                flag = "  REGRESSION"
+                regressions += 1
+            elif ratio < 1 / threshold:
+                flag = "  faster"
+            print(f"  {name:<{width}} {size:>6}  {before['min_ms']:9.2f} -> {entry['min_ms']:9.2f} ms  {ratio:5.2f}x{flag}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Micro-benchmarks of editor hot paths")
+    parser.add_argument("--segments", default="50,400,1600",
+                        help="document sizes in Title: segments, comma separated (400 is ~1 MB)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="results file (default benchmarks/results/hotpaths-<git version>.json)")
+    parser.add_argument("--compare", help="earlier results file to compare with")
+    parser.add_argument("--threshold", type=float, default=1.25, help="slowdown ratio counted as a regression")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    sizes = [int(n) for n in args.segments.split(",") if n.strip()]
+
+    if args.child:
+        print(json.dumps(run_child(sizes, args.repeat)))
+        return 0
+
+    with tempfile.TemporaryDirectory(prefix="bench_hotpaths_home_") as home:
+        env = dict(os.environ, HOME=home)
+        env.setdefault("QT_QPA_PLATFORM", "offscreen")
+        command = [sys.executable, os.path.abspath(__file__), "--child",
+                   "--segments", args.segments, "--repeat", str(args.repeat)]
+        proc = subprocess.run(command, env=env, cwd=project_root, capture_output=True, text=True)
+    lines = [line for line in proc.stdout.splitlines() if line.startswith("{")]
+    if proc.returncode or not lines:
+        print(f"benchmark run failed\n{proc.stderr[-3000:]}")
+        return 1
+
+    from PyQt5.QtCore import QT_VERSION_STR
+    version = git_version()
+    report = {
+        "version": version,
+        "date": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "python": platform.python_version(),
+        "qt": QT_VERSION_STR,
+        "machine": platform.machine(),
+        "repeat": args.repeat,
+    }
+    child = json.loads(lines[-1])
+    report["results"] = child["results"]
+    report["skipped_parse_variants"] = child["skipped"]
+
+    width = max(len(name) for name in report["results"])
+    print(f"{'benchmark':<{width}} " + " ".join(f"{n:>10}" for n in sizes) + "   (median ms per size in segments)")
+    for name, by_size in report["results"].items():
+        cells = " ".join(f"{by_size[str(n)]['median_ms']:10.2f}" if str(n) in by_size else f"{'-':>10}" for n in sizes)
+        print(f"{name:<{width}} {cells}")
+    if report["skipped_parse_variants"]:
+        print(f"parse_segments_with_positions without marker pattern, not timed: "
+              f"{', '.join(report['skipped_parse_variants'])}")
+
+    output = args.output or os.path.join(RESULTS_DIR, f"hotpaths-{version}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nresults written to {output}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            regressions = compare(json.load(f), report, args.threshold)
+        if regressions:
+            print(f"FAIL: {regressions} regression(s)")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# /benchmarks/bench_startup.py
+#
+# Time from process start until the window is shown and editable, and until the deferred
+# startup work (workspace scan, image file index) is done. Each run is a fresh process
+# with its own HOME, so no last file is reopened and the user's settings are not touched.
+# Exits with status 1 when the median time to the shown window is over --budget-ms.
+#
+#   QT_QPA_PLATFORM=offscreen python3 benchmarks/bench_startup.py --runs 5 --budget-ms 800
+#   QT_QPA_PLATFORM=offscreen python3 benchmarks/bench_startup.py --eager    (the old startup order)
+#   QT_QPA_PLATFORM=offscreen python3 benchmarks/bench_startup.py --session-tabs 20   (restore a saved session)
+
+import os
+import sys
+import json
+import argparse
+import tempfile
+import statistics
+import subprocess
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+
+def write_session(home, tabs, segments):
+    """A session.json in home that reopens tabs corpus files, the middle one current."""
+    from benchmarks.corpus import write_corpus
+    paths = write_corpus(os.path.join(home, "corpus"), tabs, segments)
+    session = {
+        "version": 1,
+        "tabs": [{"filepath": path, "cursor": 0, "anchor": 0, "scroll": 0} for path in paths],
+        "current": len(paths) // 2,
+    }
+    config = os.path.join(home, ".config", "notepadmod")
+    os.makedirs(config, exist_ok=True)
+    with open(os.path.join(config, "session.json"), "w") as f:
+        json.dump(session, f)
+
+
+def run_child(eager):
+    # Imported here so the child's own import time is part of what is measured
+    from modules.startup import elapsed_ms
+    from PyQt5.QtCore import QTimer
+    from PyQt5.QtWidgets import QApplication
+    app = QApplication(sys.argv[:1])
+    from modules.notepad_window import NotepadWindow
+
+    window = NotepadWindow(eager_startup=eager)
+    window.show()
+    result = {}
+
+    def finished():
+        result["phases"] = dict(window.startup.phases)
+        result["tasks"] = dict(window.startup.timings)
+        app.quit()
+
+    window.startup.finished.connect(finished)
+    QTimer.singleShot(60 * 1000, app.quit)
+    app.exec_()
+    result["exit"] = elapsed_ms()
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Startup time to an editable window")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=800,
+                        help="fail when the median time to the shown window is over this")
+    parser.add_argument("--eager", action="store_true", help="finish all initialization before showing the window")
+    parser.add_argument("--session-tabs", type=int, default=0, help="restore a session with this many tabs")
+    parser.add_argument("--segments", type=int, default=400, help="segments per session file (~1 MB per 400)")
+    parser.add_argument("--top", type=int, default=12, help="slowest imports to list (0 = none)")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        print(json.dumps(run_child(args.eager)))
+        return 0
+
+    runs = []
+    with tempfile.TemporaryDirectory(prefix="bench_startup_") as home:
+        if args.session_tabs:
+            write_session(home, args.session_tabs, args.segments)
+        env = dict(os.environ, HOME=home)
+        env.setdefault("QT_QPA_PLATFORM", "offscreen")
+        command = [sys.executable, os.path.abspath(__file__), "--child"] + (["--eager"] if args.eager else [])
+        for _ in range(args.runs):
+            proc = subprocess.run(command, env=env, cwd=project_root, capture_output=True, text=True)
+            lines = [line for line in proc.stdout.splitlines() if line.startswith("{")]
+            if proc.returncode or not lines:
+                print(f"startup run failed\n{proc.stderr[-2000:]}")
+                return 1
+            runs.append(json.loads(lines[-1]))
+
+    def median(key):
+        return statistics.median(run["phases"][key] for run in runs)
+
+    mode = "eager" if args.eager else "deferred"
+    if args.session_tabs:
+        mode += f", restoring {args.session_tabs} session tab(s)"
+    print(f"{args.runs} runs, {mode} startup (median ms since process start)")
+    for phase in runs[0]["phases"]:
+        print(f"  {phase:<22} {median(phase):8.0f}")
+    for task in runs[0]["tasks"]:
+        print(f"  {task + ' (task)':<22} {statistics.median(run['tasks'][task] for run in runs):8.0f}")
+
+    if args.top:
+        from modules.startup import import_report
+        total, rows = import_report("modules.notepad_window", args.top)
+        print(f"import modules.notepad_window: {total:.0f} ms; slowest imports (cumulative):")
+        for cumulative, own, depth, name in rows:
+            print(f"  {cumulative:8.1f} ms  {'  ' * depth}{name}")
+
+    shown = median("window shown")
+    if shown > args.budget_ms:
+        print(f"FAIL: window shown after {shown:.0f} ms, budget is {args.budget_ms:.0f} ms")
+        return 1
+    print(f"OK: window shown after {shown:.0f} ms (budget {args.budget_ms:.0f} ms)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
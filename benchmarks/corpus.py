@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# /benchmarks/corpus.py
+#
+# Synthetic rundown documents for the benchmarks: Title: segments with the line kinds
+# the editor treats specially (media links, word images, URLs, cc-/mm-/jj- lines, GPS
+# coordinates, timestamps) between ordinary paragraphs. Deterministic for a given seed.
+#
+#   python3 benchmarks/corpus.py /tmp/corpus --files 20 --segments 400
+
+import os
+import sys
+import random
+import argparse
+
+WORDS = ("the minister said on tuesday that talks would continue after the ceasefire "
+         "collapsed near the border while officials confirmed new sanctions and markets "
+         "reacted sharply to the report from the regional council about energy prices").split()
+
+
+def _sentence(rnd, low=8, high=24):
+    words = [rnd.choice(WORDS) for _ in range(rnd.randint(low, high))]
+    return " ".join(words).capitalize() + "."
+
+
+def make_segment(rnd, index):
+    """One Title: segment, roughly 25-40 lines."""
+    lines = [f"Title:{rnd.choice(WORDS).capitalize()} {rnd.choice(WORDS)} {index}" + (" news" if index % 7 == 0 else "")]
+    lines.append(f"https://example.com/story/{index}/{rnd.randint(1000, 9999)}")
+    lines.append(f"{rnd.randint(0, 23):02d}:{rnd.randint(0, 59):02d}")
+    for _ in range(rnd.randint(2, 5)):
+        lines.append(f"--/home/j/Pictures/clip_{index}_{rnd.randint(0, 99)}.{rnd.choice(('png', 'jpg', 'mp4', 'webp'))}")
+    if rnd.random() < 0.5:
+        lines.append(f"----{rnd.choice(WORDS)}")
+    if rnd.random() < 0.3:
+        lines.append(f"{rnd.uniform(-60, 60):.5f}, {rnd.uniform(-150, 150):.5f}")
+    lines.append("")
+    for _ in range(rnd.randint(3, 6)):
+        lines.append(" ".join(_sentence(rnd) for _ in range(rnd.randint(2, 5))))
+        lines.append("")
+    for prefix in ("cc-", "mm-", "jj-"):
+        if rnd.random() < 0.4:
+            lines.append(prefix + _sentence(rnd, 3, 8))
+    for _ in range(rnd.randint(2, 6)):
+        lines.append(_sentence(rnd))
+    lines.append("")
+    return "\n".join(lines) + "\n"
+
+
+def make_rundown(segments=400, seed=0):
+    """A rundown document with the given number of Title: segments."""
+    rnd = random.Random(seed)
+    header = "Rundown\n" + _sentence(rnd) + "\n\n"
+    return header + "".join(make_segment(rnd, i) for i in range(segments))
+
+
+def write_corpus(directory, files=20, segments=400, seed=0):
+    """Write files rundown_NN.vhd into directory and return their paths."""
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for n in range(files):
+        path = os.path.join(directory, f"rundown_{n:02d}.vhd")
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(make_rundown(segments, seed + n))
+        paths.append(path)
+    return paths
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write a synthetic rundown corpus")
+    parser.add_argument("directory")
+    parser.add_argument("--files", type=int, default=20)
+    parser.add_argument("--segments", type=int, default=400)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    paths = write_corpus(args.directory, args.files, args.segments, args.seed)
+    total = sum(os.path.getsize(p) for p in paths)
+    print(f"Wrote {len(paths)} files ({total / 1e6:.1f} MB) to {args.directory}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
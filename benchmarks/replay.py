@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+# /benchmarks/replay.py
+#
+# Replays recorded input sessions (View > Profiler > Record Input) into an offscreen window
+# and reports latency per event kind and dropped frames. The documents of the recording are
+# copied to a temporary directory first, so Save in a trace never touches the originals;
+# documents that no longer exist are replaced by a synthetic rundown. Runs in a child process
+# with its own HOME.
+#
+#   QT_QPA_PLATFORM=offscreen python3 benchmarks/replay.py ~/.config/notepadmod/traces/20261019-142301.trace.jsonl
+#   QT_QPA_PLATFORM=offscreen python3 benchmarks/replay.py --synthetic --compare benchmarks/results/replay-synthetic-abc1234.json
+#
+# Script plugins are not replayed (they call APIs); --skip-actions leaves out more actions.
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+import subprocess
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+RESULTS_DIR = os.path.join(project_root, "benchmarks", "results")
+KIND_NAMES = {"k": "key", "w": "wheel", "s": "scroll bar", "c": "cursor", "t": "tab switch", "a": "action"}
+
+
+def synthetic_trace():
+    """(header, events) of a scripted session: typing, deleting, scrolling and switching tabs."""
+    from PyQt5.QtCore import Qt
+    header = {
+        "format": "notepadmod-input", "version": 1, "recorded": "synthetic", "size": [1600, 1000],
+        "tabs": ["synthetic-a.vhd", "synthetic-b.vhd"], "current": 0, "cursor": [0, 0], "scroll": 0,
+    }
+    events = []
+
+    def type_text(text, gap=90):
+        for char in text:
+            events.append([gap, "k", Qt.Key_Return if char == "\n" else ord(char.upper()), 0, char, False])
+
+    events.append([500, "c", 40000, 40000])
+    type_text("\nTitle: Ceasefire talks resume in Doha\ncc- correspondents report heavy shelling overnight\n")
+    events += [[60 if i else 400, "k", Qt.Key_Backspace, 0, "\b", i > 0] for i in range(12)]
+    events += [[30, "w", -120, 0, 0] for _ in range(40)]
+    events += [[30, "w", 120, 0, 0] for _ in range(20)]
+    events += [[16, "s", value] for value in range(200, 4000, 100)]
+    events += [[150, "k", Qt.Key_PageDown, 0, "", False] for _ in range(10)]
+    events.append([300, "k", Qt.Key_End, int(Qt.ControlModifier), "", False])
+    events.append([700, "t", 1])
+    events.append([400, "c", 12000, 12000])
+    type_text("mm- https://example.com/live/feed.mp4\n", gap=70)
+    events.append([700, "t", 0])
+    events += [[200, "k", Qt.Key_Z, int(Qt.ControlModifier), "\x1a", False] for _ in range(5)]
+    return header, events
+
+
+def prepare_documents(header, directory, segments):
+    """Copies of the trace's documents in directory (synthetic rundowns for missing ones)."""
+    from benchmarks.corpus import make_rundown
+    paths = []
+    for i, original in enumerate(header.get("tabs") or []):
+        name = os.path.basename(original or f"untitled-{i}.vhd")
+        path = os.path.join(directory, f"{i}-{name}")
+        if original and os.path.isfile(original):
+            shutil.copyfile(original, path)
+        else:
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(make_rundown(segments, seed=i))
+        paths.append(path)
+    return paths
+
+
+def run_child(trace_path, speed, skip_actions, segments):
+    from PyQt5.QtWidgets import QApplication
+    from PyQt5.QtGui import QTextCursor
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    from modules.notepad_window import NotepadWindow
+    from modules.input_recorder import InputReplayer, read_trace
+
+    header, events = synthetic_trace() if trace_path is None else read_trace(trace_path)
+    window = NotepadWindow()
+    window.resize(*header.get("size", [1600, 1000]))
+    window.show()
+    app.processEvents()
+
+    initial = [window.tabs.widget(i) for i in range(window.tabs.count())]
+    paths = prepare_documents(header, tempfile.mkdtemp(prefix="replay_docs_"), segments)
+    for path in paths:
+        window.openFile(path)
+    if paths:
+        # A new window starts with an empty Untitled tab; close it so tab indices match the trace
+        for widget in initial:
+            window.closeTab(window.tabs.indexOf(widget))
+    opened = [window.tabs.widget(i).property("filepath") for i in range(window.tabs.count())]
+    if paths and opened != paths:
+        raise RuntimeError(f"Tabs do not match the trace: {opened} instead of {paths}")
+    current = header.get("current", -1)
+    if 0 <= current < len(paths):
+        window.tabs.setCurrentIndex(current)
+        if window.tabs.currentWidget().property("filepath") != paths[current]:
+            raise RuntimeError(f"Current tab is not {paths[current]}")
+    editor = window.currentEditor()
+    if editor is not None:
+        anchor, position = header.get("cursor", [0, 0])
+        length = editor.document().characterCount() - 1
+        cursor = editor.textCursor()
+        cursor.setPosition(min(anchor, length))
+        cursor.setPosition(min(position, length), QTextCursor.KeepAnchor)
+        editor.setTextCursor(cursor)
+        editor.verticalScrollBar().setValue(header.get("scroll", 0))
+    window.scheduler.flush()
+    app.processEvents()
+
+    # Script plugins call APIs; the rest of the toolbar is replayed
+    skip = set(skip_actions)
+    for manifest in window.plugins.manifests():
+        skip.update((manifest["name"], manifest["label"]))
+    replayer = InputReplayer(window, events, speed=speed, skip_actions=skip)
+    return replayer.run()
+
+
+def git_version():
+    try:
+        return subprocess.run(["git", "describe", "--always", "--dirty"], cwd=project_root,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def print_report(report):
+    results = report["results"]
+    print(f"{report['trace']}: {results['events']} events replayed, {results['skipped']} skipped, "
+          f"{results['dialogs_closed']} dialogs closed, {results['duration_ms'] / 1000:.1f} s")
+    print(f"{'event':<12} {'count':>6} {'p50 ms':>8} {'p95 ms':>8} {'max ms':>8}")
+    for kind, row in sorted(results["latency"].items(), key=lambda item: -item[1]["p95"]):
+        print(f"{KIND_NAMES.get(kind, kind):<12} {row['count']:>6} {row['p50']:8.2f} {row['p95']:8.2f} {row['max']:8.2f}")
+    print(f"dropped frames: {results['dropped_frames']} of {results['frames']} "
+          f"(longest frame {results['longest_frame_ms']:.0f} ms)")
+    print("slowest events:")
+    for slow in results["slowest"][:5]:
+        print(f"  #{slow['index']:<5} {slow['ms']:8.2f} ms  {slow['event']}")
+
+
+def compare(old, new, threshold):
+    """Print p95 per event kind and dropped frames against an earlier run; returns the number of regressions."""
+    regressions = 0
+    print(f"\ncompared with {old.get('version', '?')} ({old.get('date', '?')}); regression above {threshold:.2f}x")
+    rows = []
+    for kind, row in new["results"]["latency"].items():
+        before = old.get("results", {}).get("latency", {}).get(kind)
+        if before:
+            # p95 under 2 ms is mostly noise
+            rows.append((f"{KIND_NAMES.get(kind, kind)} p95 ms", before["p95"], row["p95"], 2.0))
+    rows.append(("dropped frames", old.get("results", {}).get("dropped_frames", 0), new["results"]["dropped_frames"], 5))
+    for name, before, after, floor in rows:
+        ratio = max(after, floor) / max(before, floor)
+        flag = ""
+        if ratio > threshold:
+            flag = "  REGRESSION"
+            regressions += 1
+        elif ratio < 1 / threshold:
+            flag = "  faster"
+        print(f"  {name:<20} {before:9.2f} -> {after:9.2f}  {ratio:5.2f}x{flag}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay input traces and report input latency")
+    parser.add_argument("trace", nargs="?", help="trace file written by View > Profiler > Record Input")
+    parser.add_argument("--synthetic", action="store_true", help="replay a built-in scripted session instead")
+    parser.add_argument("--speed", type=float, default=1.0,
+                        help="pause scale: 1 keeps the recorded pauses (debounced updates run between events), 0 replays back to back")
+    parser.add_argument("--skip-actions", default="", help="action texts not to replay, comma separated")
+    parser.add_argument("--segments", type=int, default=400, help="size of the rundown standing in for missing documents")
+    parser.add_argument("--output", help="results file (default benchmarks/results/replay-<trace>-<git version>.json)")
+    parser.add_argument("--compare", help="earlier results file to compare with")
+    parser.add_argument("--threshold", type=float, default=1.25, help="slowdown ratio counted as a regression")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    if not args.synthetic and not args.trace:
+        parser.error("give a trace file or --synthetic")
+    trace = None if args.synthetic else os.path.abspath(args.trace)
+    skip_actions = [name.strip() for name in args.skip_actions.split(",") if name.strip()]
+
+    if args.child:
+        print(json.dumps(run_child(trace, args.speed, skip_actions, args.segments)))
+        return 0
+
+    with tempfile.TemporaryDirectory(prefix="replay_home_") as home:
+        env = dict(os.environ, HOME=home)
+        env.setdefault("QT_QPA_PLATFORM", "offscreen")
+        command = [sys.executable, os.path.abspath(__file__), "--child", "--speed", str(args.speed),
+                   "--skip-actions", args.skip_actions, "--segments", str(args.segments)]
+        command += ["--synthetic"] if trace is None else [trace]
+        proc = subprocess.run(command, env=env, cwd=project_root, capture_output=True, text=True)
+    lines = [line for line in proc.stdout.splitlines() if line.startswith("{")]
+    if proc.returncode or not lines:
+        print(f"replay failed\n{proc.stderr[-3000:]}")
+        return 1
+
+    from PyQt5.QtCore import QT_VERSION_STR
+    version = git_version()
+    name = "synthetic" if trace is None else os.path.basename(trace).split(".")[0]
+    report = {
+        "trace": name,
+        "version": version,
+        "date": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "python": platform.python_version(),
+        "qt": QT_VERSION_STR,
+        "speed": args.speed,
+        "results": json.loads(lines[-1]),
+    }
+    print_report(report)
+
+    output = args.output or os.path.join(RESULTS_DIR, f"replay-{name}-{version}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nresults written to {output}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            regressions = compare(json.load(f), report, args.threshold)
+        if regressions:
+            print(f"FAIL: {regressions} regression(s)")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,15 +1,26 @@
 # /modules/backup.py
 
 import os
-import shutil
-import datetime
 import logging
 
 from PyQt5.QtWidgets import QMessageBox
 
+from modules.backup_store import BackupStore
+
+
 class Backup:
     def __init__(self, parent_window):
         self.parent = parent_window
+        self.store = BackupStore()
+
+    def snapshot(self, filepath, label="backup", text=None):
+        """
+        Back up filepath into the shared store (the on-disk content, or text if given).
+        Returns the Snapshot; raises OSError if the store cannot be written.
+        """
+        if text is None:
+            return self.store.snapshot_file(filepath, label)
+        return self.store.snapshot_text(filepath, text, label)
 
     def backupCurrentFile(self):
         editor = self.parent.currentEditor()
@@ -29,21 +40,11 @@ class Backup:
             logging.error(f"File does not exist for backup: {filepath}")
             return
 
-        # Define backup directory
-        backup_dir = os.path.join(os.path.dirname(filepath), 'backups')
-        os.makedirs(backup_dir, exist_ok=True)
-
-        # Define backup file name with timestamp
-        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-        basename = os.path.basename(filepath)
-        backup_filename = f"{basename}.{timestamp}.bak"
-        backup_path = os.path.join(backup_dir, backup_filename)
-
         try:
-            shutil.copy2(filepath, backup_path)
-            self.parent.statusBar().showMessage(f"Backup created: {backup_path}", 5000)
-            logging.info(f"Backup created for {filepath} at {backup_path}")
+            snap = self.snapshot(filepath, "manual")
+            self.parent.statusBar().showMessage(
+                f"Backup created: {os.path.basename(filepath)} ({snap.new_bytes} new bytes stored)", 5000)
+            logging.info(f"Backup created for {filepath} at {snap.manifest_path}")
         except Exception as e:
             QMessageBox.warning(self.parent, "Backup Failed", f"Failed to create backup:\n{e}")
             logging.error(f"Failed to create backup for {filepath}: {e}")
-
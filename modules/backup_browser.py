@@ -0,0 +1,177 @@
+# /modules/backup_browser.py
+
+import os
+import logging
+from PyQt5.QtWidgets import (
+    QDialog, QWidget, QVBoxLayout, QHBoxLayout, QLabel, QListWidget, QListWidgetItem,
+    QPlainTextEdit, QPushButton, QSplitter, QFileDialog, QMessageBox
+)
+from PyQt5.QtCore import Qt
+
+PREVIEW_LIMIT = 200 * 1024  # characters shown in the preview pane
+
+
+class BackupBrowserDialog(QDialog):
+    def __init__(self, store, parent=None):
+        super().__init__(parent)
+        self.store = store
+        self.setWindowTitle("Backups")
+        self.setModal(False)
+        self.resize(1000, 600)
+        self.setupUI()
+        self.setupConnections()
+        self.loadSources()
+        logging.debug("BackupBrowserDialog initialized.")
+
+    def setupUI(self):
+        layout = QVBoxLayout()
+
+        splitter = QSplitter(Qt.Horizontal)
+
+        # Backed up files
+        self.sourceList = QListWidget()
+        splitter.addWidget(self._wrap(QLabel("Files:"), self.sourceList))
+
+        # Snapshots of the selected file
+        self.snapshotList = QListWidget()
+        splitter.addWidget(self._wrap(QLabel("Snapshots:"), self.snapshotList))
+
+        # Preview of the selected snapshot
+        self.preview = QPlainTextEdit()
+        self.preview.setReadOnly(True)
+        self.preview.setLineWrapMode(QPlainTextEdit.NoWrap)
+        splitter.addWidget(self._wrap(QLabel("Preview:"), self.preview))
+        splitter.setSizes([250, 250, 500])
+        layout.addWidget(splitter)
+
+        # Buttons
+        buttonsLayout = QHBoxLayout()
+        self.openBtn = QPushButton("Open in New Tab")
+        self.restoreBtn = QPushButton("Restore to File...")
+        self.pruneBtn = QPushButton("Prune")
+        self.closeBtn = QPushButton("Close")
+        buttonsLayout.addWidget(self.openBtn)
+        buttonsLayout.addWidget(self.restoreBtn)
+        buttonsLayout.addWidget(self.pruneBtn)
+        buttonsLayout.addStretch()
+        buttonsLayout.addWidget(self.closeBtn)
+        layout.addLayout(buttonsLayout)
+
+        self.infoLabel = QLabel("")
+        layout.addWidget(self.infoLabel)
+
+        self.setLayout(layout)
+        logging.debug("BackupBrowserDialog UI setup complete.")
+
+    def _wrap(self, label, widget):
+        container = QWidget()
+        box = QVBoxLayout(container)
+        box.setContentsMargins(0, 0, 0, 0)
+        box.addWidget(label)
+        box.addWidget(widget)
+        return container
+
+    def setupConnections(self):
+        self.sourceList.currentItemChanged.connect(self.loadSnapshots)
+        self.snapshotList.currentItemChanged.connect(self.showPreview)
+        self.snapshotList.itemDoubleClicked.connect(lambda item: self.openInTab())
+        self.openBtn.clicked.connect(self.openInTab)
+        self.restoreBtn.clicked.connect(self.restoreToFile)
+        self.pruneBtn.clicked.connect(self.prune)
+        self.closeBtn.clicked.connect(self.close)
+        logging.debug("BackupBrowserDialog connections established.")
+
+    def loadSources(self):
+        self.sourceList.clear()
+        for source, latest in self.store.sources():
+            item = QListWidgetItem(os.path.basename(source))
+            item.setToolTip(f"{source}\nLast backup: {latest.created:%Y-%m-%d %H:%M:%S}")
+            item.setData(Qt.UserRole, source)
+            self.sourceList.addItem(item)
+        if self.sourceList.count():
+            self.sourceList.setCurrentRow(0)
+        else:
+            self.infoLabel.setText("No backups yet.")
+
+    def loadSnapshots(self, current, previous=None):
+        self.snapshotList.clear()
+        self.preview.clear()
+        if current is None:
+            return
+        snaps = self.store.snapshots(current.data(Qt.UserRole))
+        for snap in snaps:
+            item = QListWidgetItem(
+                f"{snap.created:%Y-%m-%d %H:%M:%S}  {snap.label}  ({snap.size // 1024} KB)")
+            item.setToolTip(f"{snap.new_bytes} new bytes stored\n{snap.manifest_path}")
+            item.setData(Qt.UserRole, snap)
+            self.snapshotList.addItem(item)
+        stored = sum(s.new_bytes for s in snaps)
+        logical = sum(s.size for s in snaps)
+        self.infoLabel.setText(
+            f"{len(snaps)} snapshots, {logical // 1024} KB of content, {stored // 1024} KB of unique chunks written")
+        if snaps:
+            self.snapshotList.setCurrentRow(0)
+
+    def selectedSnapshot(self):
+        item = self.snapshotList.currentItem()
+        return item.data(Qt.UserRole) if item else None
+
+    def showPreview(self, current, previous=None):
+        snap = current.data(Qt.UserRole) if current else None
+        if snap is None:
+            self.preview.clear()
+            return
+        try:
+            text = self.store.read_text(snap)
+        except Exception as e:
+            self.preview.setPlainText(f"Cannot read backup: {e}")
+            logging.error(f"Failed to read backup {snap.manifest_path}: {e}")
+            return
+        if len(text) > PREVIEW_LIMIT:
+            text = text[:PREVIEW_LIMIT] + "\n\n[... preview truncated ...]"
+        self.preview.setPlainText(text)
+
+    def openInTab(self):
+        snap = self.selectedSnapshot()
+        if snap is None:
+            return
+        try:
+            text = self.store.read_text(snap)
+        except Exception as e:
+            QMessageBox.warning(self, "Backup", f"Cannot read backup:\n{e}")
+            return
+        window = self.parent()
+        editor = window.newTab()
+        editor.setPlainText(text)
+        window.tabs.setTabText(
+            window.tabs.indexOf(editor),
+            f"{os.path.basename(snap.source)} @ {snap.created:%m-%d %H:%M}")
+        logging.info(f"Opened backup {snap.manifest_path} in a new tab")
+
+    def restoreToFile(self):
+        snap = self.selectedSnapshot()
+        if snap is None:
+            return
+        dest, _ = QFileDialog.getSaveFileName(self, "Restore Backup To", snap.source)
+        if not dest:
+            return
+        try:
+            if os.path.exists(dest):
+                # The file being replaced is itself backed up first
+                self.store.snapshot_file(dest, "pre-restore")
+            self.store.restore(snap, dest)
+        except Exception as e:
+            QMessageBox.warning(self, "Restore Failed", f"Failed to restore backup:\n{e}")
+            logging.error(f"Failed to restore {snap.manifest_path} to {dest}: {e}")
+            return
+        self.parent().statusBar().showMessage(f"Restored backup to {dest}", 5000)
+
+    def prune(self):
+        expired = 0
+        for source, _ in self.store.sources():
+            expired += self.store.apply_retention(source)
+        removed, freed = self.store.gc()
+        self.infoLabel.setText(
+            f"Pruned {expired} snapshots, removed {removed} chunks ({freed // 1024} KB freed).")
+        current = self.sourceList.currentItem()
+        self.loadSnapshots(current)
@@ -0,0 +1,345 @@
+# /modules/backup_store.py
+#
+# Content-addressed, compressed, deduplicated backup store.
+# Usable from the editor and from standalone scripts (no Qt imports here).
+#
+#   python3 -m modules.backup_store list [file]
+#   python3 -m modules.backup_store restore <manifest.json> <dest>
+#   python3 -m modules.backup_store prune
+
+import os
+import re
+import sys
+import json
+import zlib
+import hashlib
+import logging
+import time
+import datetime
+import tempfile
+
+DEFAULT_STORE_DIR = "/home/j/Desktop/Finals/NotepadApp_backups/store"
+
+# Chunking targets; boundaries fall on line ends so edits only disturb nearby chunks
+MIN_CHUNK = 2 * 1024
+AVG_CHUNK = 8 * 1024
+MAX_CHUNK = 64 * 1024
+
+# Automatic retention after a snapshot runs at most this often per source (seconds)
+RETENTION_INTERVAL = 15 * 60
+
+
+def chunk_data(data, min_size=MIN_CHUNK, avg_size=AVG_CHUNK, max_size=MAX_CHUNK):
+    """
+    Split bytes into content-defined chunks.
+
+    A chunk ends after a line whose CRC matches a mask (chosen so chunks average about
+    avg_size for typical ~64 byte lines) once min_size is reached, or when max_size is
+    hit. Because cut points depend only on line content, inserting or removing text
+    only changes the chunks around the edit and the rest deduplicate.
+    """
+    mask = max(1, avg_size // 64) - 1
+    chunks = []
+    current = []
+    size = 0
+    for line in data.splitlines(keepends=True):
+        while len(line) > max_size:
+            # Pathologically long line: hard split it
+            if current:
+                chunks.append(b"".join(current))
+                current, size = [], 0
+            chunks.append(line[:max_size])
+            line = line[max_size:]
+        current.append(line)
+        size += len(line)
+        if size >= max_size or (size >= min_size and (zlib.crc32(line) & mask) == 0):
+            chunks.append(b"".join(current))
+            current, size = [], 0
+    if current:
+        chunks.append(b"".join(current))
+    return chunks
+
+
+def _write_atomic(path, data):
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(prefix=".tmp-", dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+class RetentionPolicy:
+    """Keep the newest keep_last snapshots, plus the newest one per day for keep_days days."""
+
+    def __init__(self, keep_last=50, keep_days=30):
+        self.keep_last = keep_last
+        self.keep_days = keep_days
+
+    def select_expired(self, snapshots, now=None):
+        """Return the snapshots (newest-first list) that fall outside the policy."""
+        now = now or datetime.datetime.now()
+        keep = set()
+        seen_days = set()
+        for i, snap in enumerate(snapshots):
+            day = snap.created.date()
+            if i < self.keep_last:
+                keep.add(snap.manifest_path)
+                seen_days.add(day)
+                continue
+            if (now - snap.created).days < self.keep_days and day not in seen_days:
+                keep.add(snap.manifest_path)
+            seen_days.add(day)
+        return [s for s in snapshots if s.manifest_path not in keep]
+
+
+class Snapshot:
+    """One backup of one file: a manifest pointing at chunk objects."""
+
+    def __init__(self, manifest_path, manifest):
+        self.manifest_path = manifest_path
+        self.source = manifest["source"]
+        self.label = manifest.get("label", "")
+        self.created = datetime.datetime.fromisoformat(manifest["created"])
+        self.size = manifest["size"]
+        self.digest = manifest["sha256"]
+        self.chunks = manifest["chunks"]
+        self.new_bytes = manifest.get("new_bytes", 0)
+
+    def __repr__(self):
+        return f"<Snapshot {os.path.basename(self.source)} {self.created:%Y-%m-%d %H:%M:%S} {self.label}>"
+
+
+class BackupStore:
+    """
+    Single backup subsystem for the editor and its scripts.
+
+    Layout under root:
+        objects/ab/<sha256>      zlib-compressed chunk, written once
+        manifests/<source key>/<timestamp>_<label>.json
+    """
+
+    def __init__(self, root=DEFAULT_STORE_DIR, policy=None):
+        self.root = root
+        self.objects_dir = os.path.join(root, "objects")
+        self.manifests_dir = os.path.join(root, "manifests")
+        self.policy = policy or RetentionPolicy()
+
+    # Writing
+
+    def source_key(self, source):
+        source = os.path.abspath(source)
+        name = re.sub(r'[^A-Za-z0-9._-]', '_', os.path.basename(source)) or "file"
+        return f"{name}-{hashlib.sha1(source.encode('utf-8')).hexdigest()[:10]}"
+
+    def _object_path(self, digest):
+        return os.path.join(self.objects_dir, digest[:2], digest)
+
+    def _store_chunk(self, chunk):
+        digest = hashlib.sha256(chunk).hexdigest()
+        path = self._object_path(digest)
+        if os.path.exists(path):
+            return digest, 0
+        _write_atomic(path, zlib.compress(chunk, 6))
+        return digest, len(chunk)
+
+    def snapshot_bytes(self, source, data, label="backup"):
+        """Back up data as a snapshot of source; only chunks not already stored are written."""
+        digests = []
+        new_bytes = 0
+        for chunk in chunk_data(data):
+            digest, written = self._store_chunk(chunk)
+            digests.append(digest)
+            new_bytes += written
+
+        now = datetime.datetime.now()
+        manifest = {
+            "source": os.path.abspath(source),
+            "label": label,
+            "created": now.isoformat(timespec="microseconds"),
+            "size": len(data),
+            "sha256": hashlib.sha256(data).hexdigest(),
+            "new_bytes": new_bytes,
+            "chunks": digests,
+        }
+        safe_label = re.sub(r'[^A-Za-z0-9_-]', '_', label)
+        manifest_path = os.path.join(
+            self.manifests_dir, self.source_key(source),
+            f"{now:%Y%m%d_%H%M%S_%f}_{safe_label}.json")
+        _write_atomic(manifest_path, json.dumps(manifest).encode('utf-8'))
+        logging.info(f"Backup of {source} ({label}): {len(digests)} chunks, {new_bytes} new bytes")
+
+        if self._retention_due(source):
+            self.apply_retention(source)
+        return Snapshot(manifest_path, manifest)
+
+    def snapshot_text(self, source, text, label="backup"):
+        return self.snapshot_bytes(source, text.encode('utf-8'), label)
+
+    def snapshot_file(self, path, label="backup"):
+        """Back up the current on-disk content of path (an empty snapshot if it is missing)."""
+        data = b""
+        if os.path.exists(path):
+            with open(path, 'rb') as f:
+                data = f.read()
+        return self.snapshot_bytes(path, data, label)
+
+    # Reading
+
+    def sources(self):
+        """Return (source path, latest Snapshot) pairs, most recently backed up first."""
+        result = []
+        if not os.path.isdir(self.manifests_dir):
+            return result
+        for entry in os.scandir(self.manifests_dir):
+            if not entry.is_dir():
+                continue
+            names = sorted(n for n in os.listdir(entry.path) if n.endswith(".json"))
+            if not names:
+                continue
+            latest = self._load(os.path.join(entry.path, names[-1]))
+            if latest:
+                result.append((latest.source, latest))
+        result.sort(key=lambda item: item[1].created, reverse=True)
+        return result
+
+    def snapshots(self, source):
+        """All snapshots of source, newest first."""
+        directory = os.path.join(self.manifests_dir, self.source_key(source))
+        if not os.path.isdir(directory):
+            return []
+        snaps = []
+        for name in sorted(os.listdir(directory), reverse=True):
+            if name.endswith(".json"):
+                snap = self._load(os.path.join(directory, name))
+                if snap:
+                    snaps.append(snap)
+        return snaps
+
+    def _load(self, manifest_path):
+        try:
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                return Snapshot(manifest_path, json.load(f))
+        except (OSError, ValueError, KeyError) as e:
+            logging.error(f"Unreadable backup manifest {manifest_path}: {e}")
+            return None
+
+    def read_bytes(self, snapshot):
+        parts = []
+        for digest in snapshot.chunks:
+            with open(self._object_path(digest), 'rb') as f:
+                parts.append(zlib.decompress(f.read()))
+        data = b"".join(parts)
+        if hashlib.sha256(data).hexdigest() != snapshot.digest:
+            raise IOError(f"Backup {snapshot.manifest_path} is corrupt (checksum mismatch)")
+        return data
+
+    def read_text(self, snapshot):
+        return self.read_bytes(snapshot).decode('utf-8', errors='replace')
+
+    def restore(self, snapshot, dest_path=None):
+        """Write a snapshot back to dest_path (defaults to its original location)."""
+        dest_path = dest_path or snapshot.source
+        _write_atomic(os.path.abspath(dest_path), self.read_bytes(snapshot))
+        logging.info(f"Restored {snapshot.manifest_path} to {dest_path}")
+        return dest_path
+
+    # Retention
+
+    def _retention_due(self, source):
+        """
+        True at most once per RETENTION_INTERVAL for source. A stamp file next to the
+        manifests keeps the interval across processes (scripts back up from their own).
+        """
+        stamp = os.path.join(self.manifests_dir, self.source_key(source), ".retention")
+        try:
+            if time.time() - os.path.getmtime(stamp) < RETENTION_INTERVAL:
+                return False
+        except OSError:
+            pass
+        try:
+            with open(stamp, 'a'):
+                pass
+            os.utime(stamp)
+        except OSError as e:
+            logging.error(f"Failed to stamp backup retention for {source}: {e}")
+        return True
+
+    def apply_retention(self, source):
+        """Drop snapshots of source outside the retention policy. Chunks are freed by gc()."""
+        expired = self.policy.select_expired(self.snapshots(source))
+        for snap in expired:
+            try:
+                os.remove(snap.manifest_path)
+            except OSError as e:
+                logging.error(f"Failed to expire backup {snap.manifest_path}: {e}")
+        return len(expired)
+
+    def gc(self):
+        """Delete chunk objects no manifest refers to. Returns (objects removed, bytes freed)."""
+        referenced = set()
+        if os.path.isdir(self.manifests_dir):
+            for entry in os.scandir(self.manifests_dir):
+                if not entry.is_dir():
+                    continue
+                for name in os.listdir(entry.path):
+                    if name.endswith(".json"):
+                        snap = self._load(os.path.join(entry.path, name))
+                        if snap is None:
+                            # Never free chunks while a manifest cannot be read
+                            return 0, 0
+                        referenced.update(snap.chunks)
+        removed = freed = 0
+        if not os.path.isdir(self.objects_dir):
+            return removed, freed
+        for bucket in os.scandir(self.objects_dir):
+            if not bucket.is_dir():
+                continue
+            for obj in os.scandir(bucket.path):
+                if obj.name in referenced or obj.name.startswith(".tmp-"):
+                    continue
+                # Fresh objects may belong to a snapshot whose manifest is still being written
+                if time.time() - obj.stat().st_mtime < 3600:
+                    continue
+                freed += obj.stat().st_size
+                os.remove(obj.path)
+                removed += 1
+        logging.info(f"Backup store gc: removed {removed} objects, freed {freed} bytes")
+        return removed, freed
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    store = BackupStore(os.environ.get("NOTEPADMOD_BACKUP_STORE", DEFAULT_STORE_DIR))
+    if not argv or argv[0] not in ("list", "restore", "prune"):
+        print("usage: backup_store.py list [file] | restore <manifest.json> [dest] | prune")
+        return 1
+    if argv[0] == "list":
+        if len(argv) > 1:
+            for snap in store.snapshots(argv[1]):
+                print(f"{snap.created:%Y-%m-%d %H:%M:%S}  {snap.label:<12} {snap.size:>10}  {snap.manifest_path}")
+        else:
+            for source, latest in store.sources():
+                print(f"{latest.created:%Y-%m-%d %H:%M:%S}  {source}")
+    elif argv[0] == "restore":
+        snap = store._load(argv[1])
+        if not snap:
+            return 1
+        print(store.restore(snap, argv[2] if len(argv) > 2 else None))
+    elif argv[0] == "prune":
+        for source, _ in store.sources():
+            store.apply_retention(source)
+        removed, freed = store.gc()
+        print(f"Removed {removed} objects, freed {freed} bytes")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,82 @@
+# /modules/block_info.py
+#
+# What kind of line each block is (Title, media link, URL, cc-, GPS, ...). The highlighter
+# classifies every block it formats and keeps the result on the block as BlockInfo, so the
+# panes, counters and editing actions look the kind up instead of re-matching the text.
+
+import re
+
+from PyQt5.QtGui import QTextBlockUserData
+
+from modules.segment_model import TITLE_RE
+
+# Line kinds, in the order they are tested
+BLANK = "blank"
+TITLE = "title"
+WORD_IMAGE = "word_image"   # ----word
+MEDIA_LINK = "media_link"   # --http...
+MEDIA = "media"             # --path/to/image.png
+URL = "url"
+TIMESTAMP = "timestamp"
+CC = "cc"
+MMM = "mmm"
+MM = "mm"
+JJ = "jj"
+GPS = "gps"
+MEDIA_PATH = "media_path"   # /path/to/image.png without the leading --
+TEXT = "text"
+
+GPS_RE = re.compile(r'^(-?\d+\.\d+)\s*,\s*(-?\d+\.\d+)$')
+MEDIA_PATH_RE = re.compile(r'^[/\\].*\.(png|jpg|jpeg|gif|bmp|webp)$', re.IGNORECASE)
+_TITLE_PREFIX_RE = re.compile(r'^\s*["\']?Title:')
+
+
+def classify_line(line):
+    """(kind, payload) for one line. The payload is the part of the line the kind is about."""
+    s = line.strip()
+    if not s:
+        return BLANK, None
+    if TITLE_RE.match(line):
+        return TITLE, _TITLE_PREFIX_RE.sub('', line).strip().strip('"\'').strip()
+    if s.startswith('----'):
+        return WORD_IMAGE, s[4:].strip()
+    if s.startswith('--http'):
+        return MEDIA_LINK, s[2:]
+    if s.startswith('--'):
+        return MEDIA, s.lstrip('-').strip()
+    if s.startswith('http'):
+        return URL, s
+    if s.startswith('Timestamp'):
+        return TIMESTAMP, None
+    head = s[:4].lower()
+    if head == 'mmm-':
+        return MMM, s[4:].strip()
+    if head[:3] == 'cc-':
+        return CC, s[3:]
+    if head[:3] == 'mm-':
+        return MM, s[3:]
+    if head[:3] == 'jj-':
+        return JJ, s[3:]
+    match = GPS_RE.match(s)
+    if match:
+        return GPS, (float(match.group(1)), float(match.group(2)))
+    if MEDIA_PATH_RE.match(s):
+        return MEDIA_PATH, s
+    return TEXT, None
+
+
+class BlockInfo(QTextBlockUserData):
+    """Kind and payload of one block, attached by the highlighter."""
+
+    def __init__(self, kind, payload=None):
+        super().__init__()
+        self.kind = kind
+        self.payload = payload
+
+
+def block_info(block):
+    """The block's BlockInfo; classified on the spot if the highlighter has not seen it yet."""
+    info = block.userData()
+    if isinstance(info, BlockInfo):
+        return info
+    return BlockInfo(*classify_line(block.text()))
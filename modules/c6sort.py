@@ -0,0 +1,89 @@
+# /modules/c6sort.py
+#
+# Sorts the Title: segments of a document by the order given in the sort order file.
+# The file is compiled once into a rank map and recompiled only when it changes; the
+# sort itself is a stable keyed sort applied to the document as segment moves.
+
+import os
+import re
+import logging
+
+SORT_ORDER_FILE = "/home/j/Desktop/ttag_sort_order.vhd"
+
+_PUNCTUATION = ":;,.-"
+_TITLE_PREFIX_RE = re.compile(r'^\s*[\'"]?Title:\s*', re.IGNORECASE)
+
+
+def normalize_title(line):
+    """Comparison key for a title or sort order entry: no quotes or Title:, case and spacing folded."""
+    text = _TITLE_PREFIX_RE.sub('', line.strip())
+    return " ".join(text.strip('\'"').split()).casefold()
+
+
+def compile_sort_order(text):
+    """
+    Rank map {key: rank} for a sort order file. If the file holds Title: lines only those
+    count, otherwise every non-empty line is an entry. The first occurrence of a key wins.
+    """
+    lines = text.splitlines()
+    titles = [line for line in lines if _TITLE_PREFIX_RE.match(line)]
+    ranks = {}
+    for line in titles or lines:
+        key = normalize_title(line)
+        if key and key not in ranks:
+            ranks[key] = len(ranks)
+    return ranks
+
+
+class SortOrder:
+    """The compiled sort order file, revalidated by mtime and size before each use."""
+
+    def __init__(self, path=SORT_ORDER_FILE):
+        self.path = path
+        self._stamp = None
+        self._ranks = {}
+
+    def ranks(self):
+        """The current rank map; raises OSError if the file cannot be read."""
+        st = os.stat(self.path)
+        stamp = (st.st_mtime_ns, st.st_size)
+        if stamp != self._stamp:
+            with open(self.path, 'r', encoding='utf-8', errors='replace') as f:
+                self._ranks = compile_sort_order(f.read())
+            self._stamp = stamp
+            logging.info(f"Compiled sort order from {self.path}: {len(self._ranks)} entries")
+        return self._ranks
+
+    def rank(self, title, ranks=None):
+        """Rank of a title: its exact entry, else the longest entry it starts with (by words)."""
+        ranks = self.ranks() if ranks is None else ranks
+        key = normalize_title(title)
+        if key in ranks:
+            return ranks[key]
+        words = key.split(" ")
+        for n in range(len(words) - 1, 0, -1):
+            prefix = " ".join(words[:n])
+            # "Ukraine front: day 3" matches "Ukraine front", and "Weather today:" as written
+            rank = ranks.get(prefix)
+            if rank is None:
+                rank = ranks.get(prefix.rstrip(_PUNCTUATION))
+            if rank is not None:
+                return rank
+        return None
+
+
+def sort_segments(model, sort_order):
+    """
+    Reorder the segments of a SegmentModel by sort_order. Ranked segments come first in
+    rank order, unranked ones follow; ties keep their current order. Returns (segments
+    moved, segments without a rank).
+    """
+    ranks = sort_order.ranks()
+    document = model.document
+    unranked_key = len(ranks)
+    keys = []
+    for block_number in model.titles():
+        rank = sort_order.rank(document.findBlockByNumber(block_number).text(), ranks)
+        keys.append(unranked_key if rank is None else rank)
+    order = sorted(range(len(keys)), key=keys.__getitem__)
+    return model.reorder(order), keys.count(unranked_key)
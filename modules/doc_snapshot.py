@@ -0,0 +1,107 @@
+# /modules/doc_snapshot.py
+
+import bisect
+import itertools
+
+from PyQt5.QtCore import QObject
+
+from modules.block_info import block_info
+from modules.utf16 import OffsetMap, has_non_bmp, utf16_len
+
+
+class DocSnapshot:
+    """
+    One revision of a document. The text, its lines (one per block), line start offsets
+    and line kinds are computed on first use and then shared by everyone asking.
+
+    Positions (offsets, line_at, position_of) are Qt document positions, which count UTF-16
+    units; columns index the Python strings in lines.
+    """
+
+    def __init__(self, document):
+        self.document = document
+        self.revision = document.revision()
+        self.length = document.characterCount()
+        self._text = None
+        self._lines = None
+        self._offsets = None
+        self._kinds = None
+
+    @property
+    def text(self):
+        if self._text is None:
+            self._text = self.document.toPlainText()
+        return self._text
+
+    @property
+    def lines(self):
+        """The text split per block (unlike splitlines, a trailing newline gives a last empty line)."""
+        if self._lines is None:
+            self._lines = self.text.split('\n')
+        return self._lines
+
+    @property
+    def offsets(self):
+        """Document position where each line starts (its block's position())."""
+        if self._offsets is None:
+            # Non-BMP characters take two positions; without any, lengths are the same
+            length = utf16_len if has_non_bmp(self.text) else len
+            self._offsets = [0]
+            self._offsets.extend(itertools.accumulate(length(line) + 1 for line in self.lines[:-1]))
+        return self._offsets
+
+    @property
+    def kinds(self):
+        """(kind, payload) per line, as classified by the highlighter (see block_info)."""
+        if self._kinds is None:
+            kinds = []
+            block = self.document.begin()
+            while block.isValid():
+                info = block_info(block)
+                kinds.append((info.kind, info.payload))
+                block = block.next()
+            self._kinds = kinds
+        return self._kinds
+
+    def line_at(self, position):
+        """Line number containing a document position."""
+        return max(0, bisect.bisect_right(self.offsets, position) - 1)
+
+    def column_at(self, position):
+        """Column (index into its line's string) of a document position."""
+        line = self.line_at(position)
+        return max(0, min(OffsetMap(self.lines[line]).from_qt(position - self.offsets[line]), len(self.lines[line])))
+
+    def position_of(self, line, column=0):
+        """Document position of a column in a line (clamped to the line)."""
+        line = max(0, min(line, len(self.lines) - 1))
+        column = max(0, min(column, len(self.lines[line])))
+        return self.offsets[line] + OffsetMap(self.lines[line]).to_qt(column)
+
+    def lines_of_kind(self, *kinds):
+        """Line numbers of every line of one of the given kinds."""
+        return [i for i, (kind, _) in enumerate(self.kinds) if kind in kinds]
+
+
+class SnapshotCache(QObject):
+    """Hands out the DocSnapshot of a document's current revision, building it at most once."""
+
+    def __init__(self, document, parent=None):
+        super().__init__(parent)
+        self.document = document
+        self._snapshot = None
+        self.builds = 0
+        # Undo can bring back an old revision number with different text, so any change
+        # drops the snapshot rather than trusting revision() alone
+        document.contentsChange.connect(self._invalidate)
+
+    def _invalidate(self, *args):
+        self._snapshot = None
+
+    def current(self):
+        snap = self._snapshot
+        doc = self.document
+        if snap is None or snap.revision != doc.revision() or snap.length != doc.characterCount():
+            snap = self._snapshot = DocSnapshot(doc)
+            self.builds += 1
+        return snap
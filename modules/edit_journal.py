@@ -0,0 +1,416 @@
+# /modules/edit_journal.py
+
+import os
+import json
+import time
+import uuid
+import queue
+import logging
+
+from PyQt5.QtCore import QObject, QTimer, QRunnable, QThreadPool, pyqtSignal
+from PyQt5.QtGui import QTextCursor
+from PyQt5.QtWidgets import QMessageBox
+
+from modules.file_saver import atomic_write, content_hash
+from modules.utf16 import to_units, from_units, utf16_len
+
+DEFAULT_JOURNAL_DIR = os.path.expanduser("~/.config/notepadmod/journal")
+
+
+def replay(base_text, ops, chunk_size=65536):
+    """
+    Apply journaled (pos, removed, added) edits to base_text and return the result. pos and
+    removed are Qt positions (UTF-16 units), so the edits are applied to the text split into
+    UTF-16 units.
+    """
+    base_text = to_units(base_text)
+    # Work on fixed-size pieces so each edit only copies the piece(s) it touches
+    pieces = [base_text[i:i + chunk_size] for i in range(0, len(base_text), chunk_size)] or [""]
+    for pos, removed, added in ops:
+        added = to_units(added)
+        i, offset = 0, 0
+        while i < len(pieces) - 1 and offset + len(pieces[i]) < pos:
+            offset += len(pieces[i])
+            i += 1
+        j, span, span_end = i, pieces[i], offset + len(pieces[i])
+        while span_end < pos + removed and j < len(pieces) - 1:
+            j += 1
+            span += pieces[j]
+            span_end += len(pieces[j])
+        local = pos - offset
+        new = span[:local] + added + span[local + removed:]
+        pieces[i:j + 1] = [new[k:k + chunk_size] for k in range(0, len(new), chunk_size)] or [""]
+    return from_units("".join(pieces))
+
+
+def read_journal(path):
+    """Parse a journal file into (header, ops). Raises ValueError on a corrupt header."""
+    with open(path, 'r', encoding='utf-8') as f:
+        header = json.loads(f.readline())
+        if header.get("t") != "base":
+            raise ValueError(f"Journal {path} does not start with a base record")
+        ops = []
+        for line in f:
+            try:
+                pos, removed, added = json.loads(line)
+            except ValueError:
+                # A torn final line from a crash mid-append; everything before it is good
+                break
+            ops.append((pos, removed, added))
+    return header, ops
+
+
+class _BaseSignals(QObject):
+    wake = pyqtSignal()
+
+
+class _BaseJob(QRunnable):
+    """Writes a journal's new base record to a fresh file on a pool thread."""
+
+    def __init__(self, manager, path, data):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.manager = manager
+        self.path = path
+        self.data = data
+
+    def run(self):
+        error = None
+        try:
+            atomic_write(self.path, self.data)
+        except OSError as e:
+            error = e
+        self.data = None
+        self.manager._done.put((self, error))
+        self.manager._signals.wake.emit()
+
+
+class DocumentJournal:
+    """
+    Append-only journal of one editor's contentsChange deltas.
+
+    The file starts with a base record (either the digest of the file on disk or an inline
+    text snapshot) followed by one [pos, removed, added] line per edit, positions in Qt's
+    UTF-16 units. Consecutive typing is coalesced in memory and appended on a short timer.
+
+    A new base (after a save, or compaction) is written to a new file on the manager's
+    pool; edits made meanwhile wait in memory, and the previous file stays in place for
+    recovery until the new one is on disk.
+    """
+
+    FLUSH_DELAY = 500          # ms of quiet before buffered edits are appended
+    COMPACT_OPS = 2000         # compact once this many edits sit on top of the base
+    COMPACT_BYTES = 2 * 1024 * 1024
+
+    def __init__(self, manager, editor, digest=None):
+        self.manager = manager
+        self.editor = editor
+        self.path = None
+        self._base_job = None     # newest base write still running
+        self._closed = False
+        self._pending = []
+        self._op_count = 0
+        self._bytes = 0
+        self._length = self._doc_length()
+
+        self._flush_timer = QTimer()
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.timeout.connect(self.flush)
+
+        self.rebase(digest)
+        editor.document().contentsChange.connect(self._onContentsChange)
+
+    def _doc_length(self):
+        # characterCount() includes the trailing paragraph separator
+        return self.editor.document().characterCount() - 1
+
+    def rebase(self, digest=None):
+        """
+        Start a fresh journal. With a digest the base is the saved file itself and nothing
+        but the header is written; otherwise the current text is stored inline.
+        """
+        self._flush_timer.stop()
+        self._pending = []
+        filepath = self.editor.property("filepath") or None
+        header = {"t": "base", "path": filepath, "created": time.time()}
+        if digest is not None and filepath:
+            header["digest"] = digest
+        else:
+            header["text"] = self.editor.toPlainText()
+        data = json.dumps(header) + "\n"
+        path = os.path.join(self.manager.journal_dir, f"{uuid.uuid4().hex}.jnl")
+        self._base_job = _BaseJob(self.manager, path, data)
+        self.manager._startBaseWrite(self, self._base_job)
+        self._op_count = 0
+        self._bytes = len(data)
+        self._length = self._doc_length()
+
+    def _onBaseWritten(self, job, error):
+        """A base write finished (GUI thread); only the newest one replaces the journal file."""
+        if job is not self._base_job or self._closed:
+            # Superseded by a later rebase, or the tab is gone
+            self.manager._remove(job.path, missing_ok=True)
+            return
+        self._base_job = None
+        if error is not None:
+            logging.error(f"Failed to write journal base {job.path}: {error}")
+            return
+        old, self.path = self.path, job.path
+        if old:
+            self.manager._remove(old, missing_ok=True)
+        self.flush()
+
+    def _onContentsChange(self, pos, removed, added):
+        doc = self.editor.document()
+        length = self._doc_length()
+        # Qt reports the final paragraph separator in the counts for edits touching the end
+        overflow = pos + added - length
+        if overflow > 0:
+            added -= overflow
+            removed -= overflow
+        if removed < 0 or added < 0 or self._length - removed + added != length:
+            logging.debug("Journal out of sync with document; writing a full snapshot.")
+            self.rebase()
+            return
+        self._length = length
+
+        text = ""
+        if added:
+            cursor = QTextCursor(doc)
+            cursor.setPosition(pos)
+            cursor.setPosition(pos + added, QTextCursor.KeepAnchor)
+            text = cursor.selectedText().replace('\u2029', '\n')
+
+        last = self._pending[-1] if self._pending else None
+        if last and removed == 0 and last[1] == 0 and pos == last[0] + utf16_len(last[2]):
+            # Typing: extend the previous insert instead of adding a record
+            last[2] += text
+        else:
+            self._pending.append([pos, removed, text])
+        self._flush_timer.start(self.FLUSH_DELAY)
+
+    def flush(self):
+        """Append buffered edits to the journal file."""
+        self._flush_timer.stop()
+        if not self._pending or self._base_job is not None or self.path is None:
+            # Appended once the new base is on disk
+            return
+        data = "".join(json.dumps(op) + "\n" for op in self._pending)
+        try:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(data)
+        except OSError as e:
+            logging.error(f"Failed to append to journal {self.path}: {e}")
+            return
+        self._op_count += len(self._pending)
+        self._bytes += len(data)
+        self._pending = []
+        if self._op_count >= self.COMPACT_OPS or self._bytes >= self.COMPACT_BYTES:
+            self.compact()
+
+    def compact(self):
+        """Fold all journaled edits into a new inline base snapshot."""
+        self.rebase()
+        logging.debug(f"Compacted journal {self.path}")
+
+    def has_edits(self):
+        return bool(self._pending) or self._op_count > 0
+
+    def close(self, discard=True):
+        self._flush_timer.stop()
+        try:
+            self.editor.document().contentsChange.disconnect(self._onContentsChange)
+        except (TypeError, RuntimeError):
+            pass
+        if not discard and self._base_job is not None:
+            # Keep the edits: let the new base land so they can be appended to it
+            self.manager.waitForDone()
+        self._closed = True
+        if discard:
+            if self.path:
+                self.manager._remove(self.path, missing_ok=True)
+        else:
+            self.flush()
+
+
+class JournalManager(QObject):
+    """Owns the journals of all open tabs and performs crash recovery on startup."""
+
+    COMPACT_INTERVAL = 60 * 1000  # ms between periodic compaction checks
+
+    def __init__(self, parent_window, journal_dir=DEFAULT_JOURNAL_DIR):
+        super().__init__(parent_window)
+        self.parent = parent_window
+        self.journal_dir = journal_dir
+        os.makedirs(self.journal_dir, exist_ok=True)
+        self.journals = {}
+
+        # Base records (the whole text for untitled tabs and compaction) are written off the GUI thread
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(1)
+        self._done = queue.SimpleQueue()   # (job, error) pairs from the pool thread
+        self._signals = _BaseSignals()
+        self._signals.wake.connect(self._drain)
+        self._owners = {}   # base job -> journal
+
+        # Journals left behind by a previous session; collected before any new one exists
+        self._leftovers = sorted(
+            os.path.join(self.journal_dir, name)
+            for name in os.listdir(self.journal_dir) if name.endswith(".jnl")
+        )
+
+        self._compact_timer = QTimer(self)
+        self._compact_timer.timeout.connect(self._periodicCompact)
+        self._compact_timer.start(self.COMPACT_INTERVAL)
+
+    def attach(self, editor, digest=None):
+        """
+        Start journaling an editor; call after its initial text has been set. Pass the
+        digest of the file on disk when the text was just loaded from it, so the base
+        record does not need to repeat the whole text.
+        """
+        self.detach(editor)
+        self.journals[editor] = DocumentJournal(self, editor, digest)
+
+    def _startBaseWrite(self, journal, job):
+        self._owners[job] = journal
+        self.pool.start(job)
+
+    def _drain(self):
+        while True:
+            try:
+                job, error = self._done.get_nowait()
+            except queue.Empty:
+                return
+            journal = self._owners.pop(job, None)
+            if journal is not None:
+                journal._onBaseWritten(job, error)
+
+    def waitForDone(self):
+        """Let running base writes land (before exit, so no half-registered journal is left)."""
+        self.pool.waitForDone()
+        self._drain()
+
+    def detach(self, editor, discard=True):
+        journal = self.journals.pop(editor, None)
+        if journal:
+            journal.close(discard=discard)
+
+    def mark_saved(self, editor, digest):
+        """The editor's text is now on disk; drop everything journaled so far."""
+        journal = self.journals.get(editor)
+        if journal:
+            journal.rebase(digest)
+
+    def rebase(self, editor):
+        """Restart an editor's journal from its current text (its file is no longer the base)."""
+        journal = self.journals.get(editor)
+        if journal:
+            journal.rebase()
+
+    def flush_all(self):
+        for journal in self.journals.values():
+            journal.flush()
+
+    def discard_all(self):
+        """Remove every journal (the user has saved or explicitly discarded all tabs)."""
+        self.waitForDone()
+        for editor in list(self.journals):
+            self.detach(editor, discard=True)
+
+    def _periodicCompact(self):
+        for journal in list(self.journals.values()):
+            journal.flush()
+            if journal._op_count and journal._bytes >= DocumentJournal.COMPACT_BYTES // 4:
+                journal.compact()
+
+    def recover(self):
+        """Replay journals from a crashed session and offer to restore the unsaved edits."""
+        leftovers, self._leftovers = self._leftovers, []
+        for path in leftovers:
+            try:
+                header, ops = read_journal(path)
+            except (OSError, ValueError) as e:
+                logging.error(f"Unreadable journal {path}: {e}")
+                self._retire(path)
+                continue
+
+            filepath = header.get("path")
+            if "text" in header:
+                base_text = header["text"]
+            else:
+                try:
+                    with open(filepath, 'r', encoding='utf-8', errors='replace') as f:
+                        base_text = f.read()
+                except OSError as e:
+                    logging.error(f"Journal base file missing for {path}: {e}")
+                    self._retire(path)
+                    continue
+                if content_hash(base_text) != header.get("digest"):
+                    # The file changed after the journal was started; replaying would corrupt it
+                    logging.warning(f"Journal {path} does not match {filepath} anymore; not replaying.")
+                    self._retire(path)
+                    continue
+
+            if not ops and "text" not in header:
+                self._remove(path)
+                continue
+            recovered = replay(base_text, ops)
+            if filepath and os.path.exists(filepath):
+                with open(filepath, 'r', encoding='utf-8', errors='replace') as f:
+                    if f.read() == recovered:
+                        self._remove(path)
+                        continue
+            elif not filepath and not recovered.strip():
+                self._remove(path)
+                continue
+
+            name = os.path.basename(filepath) if filepath else "Untitled"
+            ret = QMessageBox.question(
+                self.parent, "Recover Unsaved Edits",
+                f"NotepadMod did not shut down cleanly.\n\n"
+                f"Recover {len(ops)} unsaved edit(s) to {name}?",
+                QMessageBox.Yes | QMessageBox.No, QMessageBox.Yes)
+            if ret == QMessageBox.Yes:
+                self._restore(filepath, recovered)
+            self._remove(path)
+
+    def _restore(self, filepath, text):
+        editor = None
+        if filepath and os.path.exists(filepath):
+            for i in range(self.parent.tabs.count()):
+                widget = self.parent.tabs.widget(i)
+                if widget.property("filepath") == filepath:
+                    editor = self.parent.hibernation.wake(widget)
+                    break
+            if editor is None:
+                self.parent.openFile(filepath)
+                editor = self.parent.currentEditor()
+        else:
+            editor = self.parent.newTab()
+            if filepath:
+                editor.setProperty("filepath", filepath)
+        editor.setPlainText(text)
+        editor.document().setModified(True)
+        self.parent.tabs.setCurrentWidget(editor)
+        self.parent.markUnsavedChanges(editor)
+        self.parent.statusBar().showMessage(f"Recovered unsaved edits for {filepath or 'Untitled'}", 5000)
+        logging.info(f"Recovered journaled edits for {filepath or 'Untitled'}")
+
+    def _remove(self, path, missing_ok=False):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            if not missing_ok:
+                logging.error(f"Failed to remove journal {path}: not found")
+        except OSError as e:
+            logging.error(f"Failed to remove journal {path}: {e}")
+
+    def _retire(self, path):
+        """Keep a journal that could not be replayed for manual inspection."""
+        stale_dir = os.path.join(self.journal_dir, "stale")
+        os.makedirs(stale_dir, exist_ok=True)
+        try:
+            os.replace(path, os.path.join(stale_dir, os.path.basename(path)))
+        except OSError as e:
+            logging.error(f"Failed to move stale journal {path}: {e}")
@@ -5,7 +5,6 @@ import os
 import logging
 import time
 import webbrowser
-import requests
 import urllib.parse
 import subprocess
 import tempfile
@@ -17,6 +16,10 @@ from PyQt5.QtWidgets import (
     QPlainTextEdit, QMessageBox, QAction, QMenu, QTextEdit, QInputDialog, QLineEdit, QApplication
 )
 from .syntax_highlighter import VHDLSyntaxHighlighter
+from .backup_store import BackupStore
+from .send_queue import SendQueue
+from .segment_model import SegmentModel, is_title
+from .doc_snapshot import SnapshotCache
 
 class Editor(QPlainTextEdit):
     def __init__(self, parent=None):
@@ -76,6 +79,11 @@ class Editor(QPlainTextEdit):
         # Enable document block visibility
         self.document().documentLayout().setProperty("BlockLayout", True)
 
+        # Title: segment boundaries, kept up to date as the document changes
+        self.segments = SegmentModel(self.document(), self)
+        # Text, lines and line kinds of the current revision, shared by the side panes
+        self.snapshots = SnapshotCache(self.document(), self)
+
         self.zoomFactor = 1.0
 
         # Variables for Find functionality
@@ -91,21 +99,12 @@ class Editor(QPlainTextEdit):
         # Connect cursor position change to parent's image sync
         self.cursorPositionChanged.connect(self.handleCursorMove)
         
-        # Connect scroll bar changes to image sync
+        # Connect scroll bar changes to image sync (debounced by the window's scheduler)
         self.verticalScrollBar().valueChanged.connect(self.handleScroll)
-        
-        # Add debounce timer for scroll events
-        self._scroll_timer = QTimer()
-        self._scroll_timer.setSingleShot(True)
-        self._scroll_timer.setInterval(100)  # 100ms debounce
-        self._scroll_timer.timeout.connect(self.handleScrollTimeout)
 
         # Store the last clicked URL
         self.last_clicked_url = None
 
-        # Add requests for web searching
-        self.requests = requests
-
         self.verticalScrollBar().setStyleSheet(
             "QScrollBar:vertical { width: 50px; background: #2d2d2d; }"
             "QScrollBar::handle:vertical { min-width: 30px; min-height: 200px; background: #4d4d4d; border-radius: 4px; margin: 4px; }"
@@ -142,8 +141,6 @@ class Editor(QPlainTextEdit):
             if moved:
                 return
         super().keyPressEvent(event)
-        # Emit textChanged signal to trigger title segments update
-        self.textChanged.emit()
 
     def wheelEvent(self, event):
         """Enable Ctrl + Scroll to zoom in and out."""
@@ -233,25 +230,9 @@ class Editor(QPlainTextEdit):
 
         # Add Run script actions delegated to ScriptRunner
         try:
-            run_timeSaverAct = QAction("Run timeSaver4445", self)
-            run_timeSaverAct.triggered.connect(self.window().script_runner.run_timeSaverScript)
-            menu.addAction(run_timeSaverAct)
-
-            runTs1Act = QAction("Run ts1", self)
-            runTs1Act.triggered.connect(self.window().script_runner.runTs1Script)
-            menu.addAction(runTs1Act)
-
-            runTs2Act = QAction("Run ts2", self)
-            runTs2Act.triggered.connect(self.window().script_runner.runTs2Script)
-            menu.addAction(runTs2Act)
-
-            runTs3Act = QAction("Run ts3", self)
-            runTs3Act.triggered.connect(self.window().script_runner.runTs3Script)
-            menu.addAction(runTs3Act)
-
-            runTs4Act = QAction("Run ts4", self)
-            runTs4Act.triggered.connect(self.window().script_runner.runTs4Script)
-            menu.addAction(runTs4Act)
+            plugins = self.window().plugins
+            for manifest in plugins.manifests(menu="context"):
+                menu.addAction(plugins.createAction(manifest, self, f"Run {manifest['name']}"))
 
             runIntroAct = QAction("Run intro", self)
             runIntroAct.triggered.connect(self.window().script_runner.runIntroScript)
@@ -334,7 +315,7 @@ class Editor(QPlainTextEdit):
             search_query = " ".join(top_terms)
             
             # Create Twitter search URL
-            encoded_query = requests.utils.quote(search_query)
+            encoded_query = urllib.parse.quote(search_query)
             twitter_search_url = f"https://twitter.com/search?q={encoded_query}&f=live"
             
             # Format the output text
@@ -361,12 +342,10 @@ class Editor(QPlainTextEdit):
         Searches upwards from the current line to find a line that starts with 'Title:'.
         Supports lines that may start with quotes, e.g., '"Title:YourTitle"'.
         """
-        for line in range(current_line - 1, 0, -1):
-            block = self.document().findBlockByNumber(line - 1)
-            text = block.text().strip()
-            if re.match(r'^\s*[\'"]?Title:', text, re.IGNORECASE):
-                return text
-        return None
+        block_number = self.segments.previous_title(current_line - 1)
+        if block_number is None:
+            return None
+        return self.document().findBlockByNumber(block_number).text().strip()
 
     # Find and Highlight Methods
     def highlightAllMatches(self, text, case_sensitive=False, whole_words=False):
@@ -441,17 +420,9 @@ class Editor(QPlainTextEdit):
         return len(self.matches)
 
     def handleScroll(self):
-        """Handle scroll events with debounce."""
-        # Only start the timer if this wasn't triggered by our own sync
-        if not hasattr(self, '_in_sync'):
-            self._scroll_timer.start()
-
-    def handleScrollTimeout(self):
-        """Debounced scroll handler."""
+        """Mark the image pane for an update; the window's scheduler debounces it."""
         if hasattr(self.window(), 'updateImageDisplay'):
-            self._in_sync = True
             self.window().updateImageDisplay()
-            delattr(self, '_in_sync')
 
     def mousePressEvent(self, event):
         if event.button() == Qt.LeftButton:
@@ -530,8 +501,7 @@ class Editor(QPlainTextEdit):
 
     def _is_title_line(self, cursor):
         """Check if the current block's text starts with Title: (with optional quotes)"""
-        line_text = cursor.block().text().strip()
-        return bool(re.match(r'^[\'"]?Title:', line_text))
+        return is_title(cursor.block().text())
 
     def _find_vhd_files(self):
         """Find 4-digit .vhd or .txt files on the desktop"""
@@ -550,271 +520,96 @@ class Editor(QPlainTextEdit):
     def moveToNextTitleLine(self):
         """Move the cursor to the next line that begins with 'Title:'."""
         cursor = self.textCursor()
-        while True:
-            if cursor.atEnd():
-                return False
-            cursor.movePosition(QTextCursor.Down)
-            if cursor.atEnd():
-                return False
-            line_text = cursor.block().text().strip()
-            if re.match(r'^\s*[\'"\"]?Title:', line_text, re.IGNORECASE):
-                cursor.movePosition(QTextCursor.StartOfBlock)
-                self.setTextCursor(cursor)
-                # Scroll so the found Title line is positioned at the top of the
-                # visible editor area. Use layout coordinates so zoom levels are
-                # handled correctly.
-                layout = self.document().documentLayout()
-                block_top = layout.blockBoundingRect(cursor.block()).top()
-                sb = self.verticalScrollBar()
-                sb.setValue(max(0, min(int(block_top), sb.maximum())))
-                self.ensureCursorVisible()
-                return True
-
-    def _send_to_vhd(self, target_file):
-        """Send selected title segment to target file (.vhd or .txt) and remove original"""
+        block_number = self.segments.next_title(cursor.blockNumber())
+        if block_number is None:
+            return False
+        block = self.document().findBlockByNumber(block_number)
+        cursor.setPosition(block.position())
+        self.setTextCursor(cursor)
+        # Scroll so the found Title line is positioned at the top of the
+        # visible editor area. Use layout coordinates so zoom levels are
+        # handled correctly.
+        layout = self.document().documentLayout()
+        block_top = layout.blockBoundingRect(block).top()
+        sb = self.verticalScrollBar()
+        sb.setValue(max(0, min(int(block_top), sb.maximum())))
+        self.ensureCursorVisible()
+        return True
+
+    def _sendQueue(self):
+        """The window's shared send queue (a private one if the editor is used standalone)."""
+        send_queue = getattr(self.window(), "send_queue", None)
+        if send_queue is not None:
+            return send_queue
+        if not hasattr(self, "_own_send_queue"):
+            self._own_send_queue = SendQueue(store=BackupStore())
+        return self._own_send_queue
+
+    def _title_segment_range(self):
+        """(start, end) of the segment from the cursor's line up to the next Title: line."""
+        block = self.textCursor().block()
+        next_title = self.segments.next_title(block.blockNumber())
+        if next_title is None:
+            return block.position(), self.document().characterCount() - 1
+        return block.position(), self.document().findBlockByNumber(next_title).position()
+
+    def _send_segment(self, target_file):
+        """Cut the current title segment and queue it to be prepended to target_file."""
+        start_pos, end_pos = self._title_segment_range()
         cursor = self.textCursor()
-        cursor.movePosition(QTextCursor.StartOfLine)
-        start_pos = cursor.position()
-        end_pos = self.document().end().position()
-        
-        # Search forward for next title line
-        while True:
-            cursor.movePosition(QTextCursor.Down)
-            if cursor.atEnd():
-                break
-            original_pos = cursor.position()
-            cursor.select(QTextCursor.LineUnderCursor)
-            line_text = cursor.selectedText().strip()
-            cursor.setPosition(original_pos)  # Restore position after check
-            if re.match(r'^[\'"]?Title:', line_text, re.IGNORECASE):
-                end_pos = original_pos
-                break
-        
-        # Get the content to move
+        cursor.beginEditBlock()  # Start undoable operation
         cursor.setPosition(start_pos)
         cursor.setPosition(end_pos, QTextCursor.KeepAnchor)
-        content = cursor.selectedText()
-
-        # Create backup copy before sending
-        if re.match(r'^TODAY_ONLY\.(vhd|txt)$', os.path.basename(target_file), re.IGNORECASE):
-            import datetime
-            backup_dir = "/home/j/Desktop/Finals/NotepadApp_backups/TODAY_ONLY"
-            if not os.path.exists(backup_dir):
-                os.makedirs(backup_dir)
-            timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-            ext = os.path.splitext(os.path.basename(target_file))[1]
-            backup_file = os.path.join(backup_dir, f"TODAY_ONLY_{timestamp}{ext}")
-            if os.path.exists(target_file):
-                with open(target_file, 'r', encoding='utf-8', errors='replace') as backup_source:
-                    backup_content = backup_source.read()
-            else:
-                backup_content = ""
-            with open(backup_file, 'w', encoding='utf-8') as backup_dest:
-                backup_dest.write(backup_content)
-        elif re.match(r'^\d{4}\.(vhd|txt)$', os.path.basename(target_file), re.IGNORECASE):
-            import datetime
-            backup_dir = "/home/j/Desktop/Finals/NotepadApp_backups/tomorrows"
-            if not os.path.exists(backup_dir):
-                os.makedirs(backup_dir)
-            timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-            base_name = os.path.basename(target_file)
-            ext = os.path.splitext(base_name)[1]
-            backup_file = os.path.join(backup_dir, f"{base_name[:-len(ext)]}_{timestamp}{ext}")
-            if os.path.exists(target_file):
-                with open(target_file, 'r', encoding='utf-8', errors='replace') as backup_source:
-                    backup_content = backup_source.read()
-            else:
-                backup_content = ""
-            with open(backup_file, 'w', encoding='utf-8') as backup_dest:
-                backup_dest.write(backup_content)
+        content = cursor.selectedText().replace('\u2029', '\n')
+        cursor.removeSelectedText()
+        cursor.endEditBlock()
+        self.setTextCursor(cursor)
 
-        try:
-            # Write to target file
-            if os.path.exists(target_file):
-                with open(target_file, 'r', encoding='utf-8', errors='replace') as f:
-                    existing = f.read()
-            else:
-                existing = ""
-                
-            with open(target_file, 'w', encoding='utf-8') as f:
-                f.write(content + '\n\n' + existing)
-            
-            # Remove original content if write succeeded
-            cursor = self.textCursor()
-            cursor.beginEditBlock()  # Start undoable operation
-            cursor.setPosition(start_pos)
-            cursor.setPosition(end_pos, QTextCursor.KeepAnchor)
-            cursor.removeSelectedText()
-            cursor.endEditBlock()
-            self.setTextCursor(cursor)
-            
-            self.window().statusBar().showMessage(f"Content moved to {os.path.basename(target_file)}", 5000)
-            
-        except Exception as e:
-            self.window().statusBar().showMessage(f"Failed to move content: {str(e)}", 5000)
+        name = os.path.basename(target_file)
+        if self._sendQueue().send(target_file, content):
+            self.window().statusBar().showMessage(f"Content moved to open tab {name}", 5000)
+        else:
+            self.window().statusBar().showMessage(f"Content moved to {name}", 5000)
+
+    def _send_to_vhd(self, target_file):
+        """Send selected title segment to target file (.vhd or .txt) and remove original"""
+        self._send_segment(target_file)
 
     def _move_segment_down(self):
-        """Move the current segment (starting with a Title: line) below the next 3 segments by repositioning it, while preserving the editor's position."""
+        """Move the current segment (starting with a Title: line) below the next 3 segments, keeping the view where it is."""
         cursor = self.textCursor()
         if not self._is_title_line(cursor):
             self.window().statusBar().showMessage("Not on a Title segment.", 5000)
             return
 
-        # Save current editor state
-        old_cursor_pos = cursor.position()
-        old_scroll = self.verticalScrollBar().value()
-        
-        full_text = self.document().toPlainText()
-        pattern = r'^\s*[\'"]?Title:.*$'
-        matches = list(re.finditer(pattern, full_text, flags=re.MULTILINE))
-        if not matches:
-            self.window().statusBar().showMessage("No title segments found.", 5000)
-            return
-
-        current_pos = cursor.block().position()
-        seg_index = None
-        for i, m in enumerate(matches):
-            start = m.start()
-            end = matches[i+1].start() if i+1 < len(matches) else len(full_text)
-            if start <= current_pos < end:
-                seg_index = i
-                break
-        if seg_index is None:
+        seg_index = self.segments.index_for_block(cursor.blockNumber())
+        if seg_index < 0:
             self.window().statusBar().showMessage("Current segment not found.", 5000)
             return
 
         # Check if there are at least 3 segments below this one
-        if seg_index + 3 >= len(matches):
-            self.window().statusBar().showMessage(f"Not enough segments below. Need 3 but found {len(matches) - seg_index - 1}.", 5000)
+        below = self.segments.count() - seg_index - 1
+        if below < 3:
+            self.window().statusBar().showMessage(f"Not enough segments below. Need 3 but found {below}.", 5000)
             return
 
-        # Define boundaries for current segment (S) and the next 3 segments (B, C, D)
-        S_start = matches[seg_index].start()
-        S_end = matches[seg_index+1].start()
-        S_text = full_text[S_start:S_end]
+        old_scroll = self.verticalScrollBar().value()
 
-        # The segment to move below (3 segments down)
-        target_start = matches[seg_index+3].start()
-        target_end = matches[seg_index+4].start() if seg_index + 4 < len(matches) else len(full_text)
+        # Only the moved segment is cut and reinserted, as one undoable step
+        self.segments.move(seg_index, seg_index + 4)
 
-        # Text before current segment
-        A = full_text[:S_start]
-        
-        # Text between current segment and target position (the 3 segments to jump over)
-        B = full_text[S_end:target_end]
-        
-        # Text after target position
-        C = full_text[target_end:]
-
-        # New text: A + B (3 segments) + S (current segment) + C
-        new_text = A + B + S_text + C
+        # The segment that was directly below now starts where the moved one did
+        new_cursor = self.textCursor()
+        new_cursor.setPosition(self.segments.segment(seg_index).start)
+        self.setTextCursor(new_cursor)
+        self.verticalScrollBar().setValue(old_scroll)
+        self.ensureCursorVisible()
 
-        # Update document
-        self.setPlainText(new_text)
-        
-        # Use QTimer to restore positions after content is rendered
-        def restore_positions():
-            # Restore scroll position first
-            self.verticalScrollBar().setValue(old_scroll)
-            
-            # Move cursor to the NEXT segment's title (segment that's now at the previous position)
-            new_cursor = self.textCursor()
-            
-            # Find the Title: line at the position where the current segment used to be
-            # (which now contains the next segment that was directly below the moved segment)
-            next_title_pos = S_start
-            
-            # Get the block at that position
-            block = self.document().findBlock(next_title_pos)
-            if block.isValid():
-                # Make sure we're putting the cursor at a Title: line
-                text = block.text()
-                if not re.match(r'^\s*[\'"]?Title:', text):
-                    # Find the first Title: line in or after this block
-                    while block.isValid() and not re.match(r'^\s*[\'"]?Title:', block.text()):
-                        block = block.next()
-                
-                if block.isValid():
-                    new_cursor.setPosition(block.position())
-                    self.setTextCursor(new_cursor)
-                    self.ensureCursorVisible()
-                else:
-                    # If no Title: line found, use old cursor position as fallback
-                    new_cursor.setPosition(min(old_cursor_pos, self.document().characterCount() - 1))
-                    self.setTextCursor(new_cursor)
-            else:
-                # Fallback to old cursor position if block can't be found
-                new_cursor.setPosition(min(old_cursor_pos, self.document().characterCount() - 1))
-                self.setTextCursor(new_cursor)
-            
-            self.window().statusBar().showMessage("Segment moved down below the 3rd segment.", 5000)
-        
-        # Schedule the position restoration after a short delay
-        QTimer.singleShot(100, restore_positions)
+        self.window().statusBar().showMessage("Segment moved down below the 3rd segment.", 5000)
 
     def _send_to_kny(self):
-        """Send selected title segment to kny.txt and remove original after backup"""
-        target_file = "/home/j/Desktop/IMPORTANT_NOTEPADS/kny.txt"
-        cursor = self.textCursor()
-        cursor.movePosition(QTextCursor.StartOfLine)
-        start_pos = cursor.position()
-        end_pos = self.document().end().position()
-        
-        # Search forward for next title line
-        while True:
-            cursor.movePosition(QTextCursor.Down)
-            if cursor.atEnd():
-                break
-            original_pos = cursor.position()
-            cursor.select(QTextCursor.LineUnderCursor)
-            line_text = cursor.selectedText().strip()
-            cursor.setPosition(original_pos)  # Restore position after check
-            if re.match(r'^[\'\"]?Title:', line_text, re.IGNORECASE):
-                end_pos = original_pos
-                break
-        
-        # Get the content to move
-        cursor.setPosition(start_pos)
-        cursor.setPosition(end_pos, QTextCursor.KeepAnchor)
-        content = cursor.selectedText()
-        
-        # Create backup copy before sending
-        backup_dir = "/home/j/Desktop/Finals/NotepadApp_backups/misc_backups"
-        if not os.path.exists(backup_dir):
-            os.makedirs(backup_dir)
-        import datetime
-        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-        backup_file = os.path.join(backup_dir, f"kny_{timestamp}.txt")
-        if os.path.exists(target_file):
-            with open(target_file, 'r', encoding='utf-8', errors='replace') as backup_source:
-                backup_content = backup_source.read()
-        else:
-            backup_content = ""
-        with open(backup_file, 'w', encoding='utf-8') as backup_dest:
-            backup_dest.write(backup_content)
-        
-        try:
-            # Write to target file by prepending the segment content
-            if os.path.exists(target_file):
-                with open(target_file, 'r', encoding='utf-8', errors='replace') as f:
-                    existing = f.read()
-            else:
-                existing = ""
-                
-            with open(target_file, 'w', encoding='utf-8') as f:
-                f.write(content + '\n\n' + existing)
-            
-            # Remove original content if write succeeded
-            cursor = self.textCursor()
-            cursor.beginEditBlock()
-            cursor.setPosition(start_pos)
-            cursor.setPosition(end_pos, QTextCursor.KeepAnchor)
-            cursor.removeSelectedText()
-            cursor.endEditBlock()
-            self.setTextCursor(cursor)
-            self.window().statusBar().showMessage("Content moved to kny.txt", 5000)
-        except Exception as e:
-            self.window().statusBar().showMessage(f"Failed to move content: {str(e)}", 5000)
+        """Send selected title segment to kny.txt and remove original"""
+        self._send_segment("/home/j/Desktop/IMPORTANT_NOTEPADS/kny.txt")
 
     def contextMenuEvent(self, event):
         """
@@ -899,25 +694,9 @@ class Editor(QPlainTextEdit):
 
         # Add Run script actions delegated to ScriptRunner
         try:
-            run_timeSaverAct = QAction("Run timeSaver4445", self)
-            run_timeSaverAct.triggered.connect(self.window().script_runner.run_timeSaverScript)
-            menu.addAction(run_timeSaverAct)
-
-            runTs1Act = QAction("Run ts1", self)
-            runTs1Act.triggered.connect(self.window().script_runner.runTs1Script)
-            menu.addAction(runTs1Act)
-
-            runTs2Act = QAction("Run ts2", self)
-            runTs2Act.triggered.connect(self.window().script_runner.runTs2Script)
-            menu.addAction(runTs2Act)
-
-            runTs3Act = QAction("Run ts3", self)
-            runTs3Act.triggered.connect(self.window().script_runner.runTs3Script)
-            menu.addAction(runTs3Act)
-
-            runTs4Act = QAction("Run ts4", self)
-            runTs4Act.triggered.connect(self.window().script_runner.runTs4Script)
-            menu.addAction(runTs4Act)
+            plugins = self.window().plugins
+            for manifest in plugins.manifests(menu="context"):
+                menu.addAction(plugins.createAction(manifest, self, f"Run {manifest['name']}"))
 
             runIntroAct = QAction("Run intro", self)
             runIntroAct.triggered.connect(self.window().script_runner.runIntroScript)
@@ -0,0 +1,234 @@
+# /modules/file_saver.py
+
+import os
+import shutil
+import hashlib
+import logging
+import tempfile
+import queue
+
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+from modules import tracing
+
+# Permissions for brand new files follow the process umask, like open(..., 'w') would
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def content_hash(text):
+    """Return a short digest of a text snapshot, used to skip no-op saves."""
+    return hashlib.blake2b(text.encode('utf-8', errors='surrogatepass'), digest_size=16).hexdigest()
+
+
+def _fsync_directory(directory):
+    """Flush a directory entry so a rename survives a crash (no-op where unsupported)."""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def atomic_write(filepath, text, fsync=True):
+    """
+    Write text to a temp file in the target directory, fsync it and rename it over filepath.
+    Readers only ever see the old or the new content, never a half-written file.
+    Returns the mtime of the written file.
+    """
+    directory = os.path.dirname(os.path.abspath(filepath))
+    fd, temp_path = tempfile.mkstemp(prefix=f".{os.path.basename(filepath)}.", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(text)
+            f.flush()
+            if fsync:
+                os.fsync(f.fileno())
+        if os.path.exists(filepath):
+            shutil.copymode(filepath, temp_path)
+        else:
+            os.chmod(temp_path, 0o666 & ~_UMASK)
+        os.replace(temp_path, filepath)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+    if fsync:
+        _fsync_directory(directory)
+    return os.path.getmtime(filepath)
+
+
+class SaveResult:
+    """Outcome of a single save job, handed back to the GUI thread."""
+
+    def __init__(self, filepath, digest, mtime=None, skipped=False, error=None):
+        self.filepath = filepath
+        self.digest = digest
+        self.mtime = mtime
+        self.skipped = skipped
+        self.error = error
+
+    @property
+    def ok(self):
+        return self.error is None
+
+
+class _SaveSignals(QObject):
+    wake = pyqtSignal()
+
+
+class _SaveJob(QRunnable):
+    """Hashes the snapshot and writes it atomically on a pool thread."""
+
+    def __init__(self, saver, filepath, text, revision, callback):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.saver = saver
+        self.filepath = filepath
+        self.text = text
+        self.revision = revision
+        self.callback = callback
+
+    def execute(self):
+        with tracing.span("save write", note=os.path.basename(self.filepath)):
+            digest = content_hash(self.text)
+            tracing.mark("hash")
+            try:
+                # The file can be removed or renamed after is_unchanged() looked at it
+                if self.saver.is_unchanged(self.filepath, digest):
+                    return SaveResult(self.filepath, digest, mtime=os.path.getmtime(self.filepath), skipped=True)
+                mtime = atomic_write(self.filepath, self.text, fsync=self.saver.fsync)
+            except Exception as e:
+                return SaveResult(self.filepath, digest, error=e)
+            tracing.mark("write")
+            return SaveResult(self.filepath, digest, mtime=mtime)
+
+    def run(self):
+        result = self.execute()
+        # Drop the snapshot as soon as it is on disk; large rundowns are several MB
+        self.text = None
+        self.saver._done.put((self, result))
+        self.saver._signals.wake.emit()
+
+
+class FileSaver(QObject):
+    """
+    Save pipeline for editor tabs.
+
+    The document text is snapshotted on the GUI thread, then hashed, written to a temp
+    file, fsynced and renamed into place on a worker thread. Saves to the same path are
+    serialized; if a newer snapshot arrives while one is being written, only the newest
+    is written afterwards.
+    """
+
+    def __init__(self, parent=None, fsync=True):
+        super().__init__(parent)
+        self.fsync = fsync
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(2)
+        self._done = queue.SimpleQueue()  # (job, SaveResult) pairs from worker threads
+        self._signals = _SaveSignals()
+        self._signals.wake.connect(self._drain)
+        self._saved = {}      # filepath -> (digest, mtime) of what is known to be on disk
+        self._running = {}    # filepath -> job currently being written
+        self._queued = {}     # filepath -> newest job waiting for the running one
+
+    def remember(self, filepath, text):
+        """Record text that is known to match the file on disk (e.g. right after opening it)."""
+        try:
+            self._saved[filepath] = (content_hash(text), os.path.getmtime(filepath))
+        except OSError:
+            self._saved.pop(filepath, None)
+
+    def forget(self, filepath):
+        self._saved.pop(filepath, None)
+
+    def is_unchanged(self, filepath, digest):
+        """True if the file still holds exactly the content last saved or loaded."""
+        known = self._saved.get(filepath)
+        if not known or known[0] != digest:
+            return False
+        try:
+            return os.path.getmtime(filepath) == known[1]
+        except OSError:
+            return False
+
+    def saved_digest(self, filepath):
+        known = self._saved.get(filepath)
+        return known[0] if known else None
+
+    def isSaving(self, filepath):
+        return filepath in self._running or filepath in self._queued
+
+    def save(self, filepath, text, revision=None, callback=None, blocking=False):
+        """
+        Save a text snapshot to filepath. callback(result, revision) runs on the GUI thread
+        once the write has landed (or was skipped/failed). With blocking=True the write
+        happens inline and the SaveResult is returned.
+        """
+        job = _SaveJob(self, filepath, text, revision, callback)
+        if blocking:
+            self.waitForPath(filepath)
+            result = job.execute()
+            job.text = None
+            self._finish(job, result)
+            return result
+        if filepath in self._running:
+            # Any snapshot still waiting is older than this one and is simply dropped
+            self._queued[filepath] = job
+        else:
+            self._running[filepath] = job
+            self.pool.start(job)
+        return None
+
+    def waitForPath(self, filepath):
+        """Block until no save for filepath is pending."""
+        while filepath in self._running:
+            self.pool.waitForDone(50)
+            self._drain()
+
+    def waitForDone(self, msecs=-1):
+        """Block until every pending save has been written (used on shutdown)."""
+        while self._running:
+            self.pool.waitForDone(msecs)
+            self._drain()
+            if msecs >= 0:
+                break
+
+    def _drain(self):
+        """Hand finished jobs back to the GUI thread; also called directly while blocking."""
+        while True:
+            try:
+                job, result = self._done.get_nowait()
+            except queue.Empty:
+                return
+            self._onJobFinished(job, result)
+
+    def _onJobFinished(self, job, result):
+        if self._running.get(job.filepath) is job:
+            del self._running[job.filepath]
+            nxt = self._queued.pop(job.filepath, None)
+            if nxt is not None:
+                self._running[job.filepath] = nxt
+                self.pool.start(nxt)
+        self._finish(job, result)
+
+    def _finish(self, job, result):
+        if result.ok and result.mtime is not None:
+            self._saved[result.filepath] = (result.digest, result.mtime)
+        if result.ok:
+            if result.skipped:
+                logging.debug(f"Save skipped, content unchanged: {result.filepath}")
+            else:
+                logging.info(f"File saved atomically: {result.filepath}")
+        else:
+            logging.error(f"Failed to save file {result.filepath}: {result.error}")
+        if job.callback:
+            job.callback(result, job.revision)
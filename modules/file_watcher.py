@@ -0,0 +1,286 @@
+# /modules/file_watcher.py
+
+import os
+import zlib
+import logging
+
+from PyQt5.QtCore import QObject, QTimer, QFileSystemWatcher
+from PyQt5.QtWidgets import QMessageBox
+
+from modules.file_saver import content_hash
+from modules.text_patch import line_hunks, apply_text
+
+
+def merge3(base, mine, theirs):
+    """
+    Three-way line merge of two edited versions of base.
+
+    Changes made on only one side are combined; where both sides changed the same lines
+    differently, mine is kept. Returns (merged text, number of conflicting regions).
+    """
+    b = base.splitlines(keepends=True)
+    m = mine.splitlines(keepends=True)
+    t = theirs.splitlines(keepends=True)
+    hunks = sorted([(h, 0) for h in line_hunks(b, m)] + [(h, 1) for h in line_hunks(b, t)],
+                   key=lambda item: (item[0][0], item[0][1]))
+
+    # Group hunks whose base ranges overlap or touch into clusters
+    clusters = []
+    for hunk, side in hunks:
+        if clusters and hunk[0] <= clusters[-1][1]:
+            cluster = clusters[-1]
+            cluster[1] = max(cluster[1], hunk[1])
+            cluster[2].append((hunk, side))
+        else:
+            clusters.append([hunk[0], hunk[1], [(hunk, side)]])
+
+    def side_text(lines, start, end, side_hunks):
+        out, x = [], start
+        for i1, i2, j1, j2 in side_hunks:
+            out.extend(b[x:i1])
+            out.extend(lines[j1:j2])
+            x = i2
+        out.extend(b[x:end])
+        return out
+
+    result, pos, conflicts = [], 0, 0
+    for start, end, members in clusters:
+        result.extend(b[pos:start])
+        mine_hunks = [h for h, side in members if side == 0]
+        theirs_hunks = [h for h, side in members if side == 1]
+        mine_part = side_text(m, start, end, mine_hunks)
+        if not theirs_hunks:
+            result.extend(mine_part)
+        elif not mine_hunks:
+            result.extend(side_text(t, start, end, theirs_hunks))
+        else:
+            if mine_part != side_text(t, start, end, theirs_hunks):
+                conflicts += 1
+            result.extend(mine_part)
+        pos = end
+    result.extend(b[pos:])
+    return "".join(result), conflicts
+
+
+class ExternalChangeMonitor(QObject):
+    """
+    Watches every open file with QFileSystemWatcher and reacts when one changes on disk.
+
+    Events are debounced, our own saves are recognised by mtime/digest and ignored. For a
+    tab without unsaved edits the new disk content is patched in place; for a tab with
+    unsaved edits the user can merge the external change into the buffer, reload, or keep
+    the buffer. Tabs in the background are handled when they are next activated.
+    """
+
+    DEBOUNCE = 300  # ms
+
+    def __init__(self, parent_window):
+        super().__init__(parent_window)
+        self.parent = parent_window
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.fileChanged.connect(self._onPathChanged)
+        self.watcher.directoryChanged.connect(self._onDirectoryChanged)
+        self._paths = {}      # editor -> watched path
+        self._bases = {}      # editor -> (digest, compressed text) last known to be on disk
+        self._dirty = set()   # paths with unprocessed change events
+        self._deferred = set()  # background editors with an unhandled external change
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._processChanges)
+        parent_window.tabs.currentChanged.connect(self._onTabActivated)
+
+    # Registration
+
+    def watch(self, editor, text=None):
+        """Start watching the editor's file; text is its content as just loaded from disk."""
+        path = editor.property("filepath")
+        if not path:
+            return
+        old = self._paths.get(editor)
+        self._paths[editor] = path
+        if old and old != path:
+            self._release(old)
+        if text is not None:
+            self._setBase(editor, text)
+        self._addPath(path)
+
+    def unwatch(self, editor):
+        path = self._paths.pop(editor, None)
+        self._bases.pop(editor, None)
+        self._deferred.discard(editor)
+        if path:
+            self._release(path)
+
+    def saved(self, editor, text=None):
+        """The editor was just saved; text is what was written (read back from disk if None)."""
+        self.watch(editor)
+        if text is None:
+            text = self._readDisk(editor.property("filepath"))
+        if text is not None:
+            self._setBase(editor, text)
+        self._deferred.discard(editor)
+
+    def _setBase(self, editor, text):
+        self._bases[editor] = (content_hash(text), zlib.compress(text.encode('utf-8'), 1))
+
+    def _base(self, editor):
+        base = self._bases.get(editor)
+        return zlib.decompress(base[1]).decode('utf-8') if base else None
+
+    def _addPath(self, path):
+        if os.path.exists(path) and path not in self.watcher.files():
+            self.watcher.addPath(path)
+        directory = os.path.dirname(path)
+        if os.path.isdir(directory) and directory not in self.watcher.directories():
+            # Needed to see the file again after an atomic rename replaces it
+            self.watcher.addPath(directory)
+
+    def _release(self, path):
+        if path in self._paths.values():
+            return
+        if path in self.watcher.files():
+            self.watcher.removePath(path)
+        directory = os.path.dirname(path)
+        if not any(os.path.dirname(p) == directory for p in self._paths.values()):
+            if directory in self.watcher.directories():
+                self.watcher.removePath(directory)
+
+    # Events
+
+    def _onPathChanged(self, path):
+        self._dirty.add(path)
+        self._timer.start(self.DEBOUNCE)
+
+    def _onDirectoryChanged(self, directory):
+        for path in self._paths.values():
+            if os.path.dirname(path) == directory and path not in self.watcher.files():
+                # Replaced or (re)created; the old watch died with the old inode
+                self._dirty.add(path)
+        if self._dirty:
+            self._timer.start(self.DEBOUNCE)
+
+    def _processChanges(self):
+        dirty, self._dirty = self._dirty, set()
+        for path in dirty:
+            self._addPath(path)
+            for editor, watched in list(self._paths.items()):
+                if watched != path:
+                    continue
+                if editor.property("save_in_progress"):
+                    # Our own write is landing; look again once it has
+                    self._dirty.add(path)
+                    continue
+                self._checkEditor(editor)
+        if self._dirty:
+            self._timer.start(self.DEBOUNCE)
+
+    def _onTabActivated(self, index):
+        editor = self.parent.tabs.widget(index)
+        if editor in self._deferred:
+            self._deferred.discard(editor)
+            self._checkEditor(editor)
+
+    # Reacting to a change
+
+    def _readDisk(self, path):
+        try:
+            with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def _checkEditor(self, editor):
+        path = editor.property("filepath")
+        if not os.path.exists(path):
+            self.parent.statusBar().showMessage(f"WARNING: {os.path.basename(path)} was deleted or moved on disk", 0)
+            editor.document().setModified(True)
+            self.parent.markUnsavedChanges(editor)
+            return
+        mtime = os.path.getmtime(path)
+        if mtime == editor.property("last_modified_time"):
+            return
+        disk_text = self._readDisk(path)
+        if disk_text is None:
+            return
+        base = self._bases.get(editor)
+        if base and content_hash(disk_text) == base[0]:
+            # Touched or rewritten with identical content
+            editor.setProperty("last_modified_time", mtime)
+            return
+
+        if not editor.document().isModified():
+            self._reload(editor, disk_text, mtime)
+            self.parent.statusBar().showMessage(f"Reloaded {os.path.basename(path)} (changed on disk)", 5000)
+            logging.info(f"Reloaded externally changed file in place: {path}")
+            return
+
+        if editor is not self.parent.currentEditor():
+            self._deferred.add(editor)
+            self.parent.statusBar().showMessage(
+                f"WARNING: {os.path.basename(path)} changed externally (unsaved edits in its tab)", 0)
+            return
+        self._offerMerge(editor, disk_text, mtime)
+
+    def _reload(self, editor, disk_text, mtime):
+        path = editor.property("filepath")
+        apply_text(editor, disk_text)
+        editor.document().setModified(False)
+        self.parent.updateTabTitle(editor, saved=True)
+        self._accept(editor, disk_text, mtime)
+        self.parent.journals.mark_saved(editor, self.parent.file_saver.saved_digest(path))
+
+    def _accept(self, editor, disk_text, mtime):
+        """Record disk_text as the current on-disk content of the editor's file."""
+        path = editor.property("filepath")
+        editor.setProperty("last_modified_time", mtime)
+        self._setBase(editor, disk_text)
+        self.parent.file_saver.remember(path, disk_text)
+        self.parent.statusBar().setStyleSheet("")
+
+    def _offerMerge(self, editor, disk_text, mtime):
+        path = editor.property("filepath")
+        mine = editor.toPlainText()
+        base = self._base(editor)
+        if base is None:
+            merged, conflicts = None, 0
+        else:
+            merged, conflicts = merge3(base, mine, disk_text)
+        their_hunks = line_hunks(mine.splitlines(), disk_text.splitlines())
+        added = sum(j2 - j1 for i1, i2, j1, j2 in their_hunks)
+        removed = sum(i2 - i1 for i1, i2, j1, j2 in their_hunks)
+
+        box = QMessageBox(self.parent)
+        box.setIcon(QMessageBox.Warning)
+        box.setWindowTitle("File Changed on Disk")
+        text = (f"{os.path.basename(path)} was changed by another program and this tab has unsaved edits.\n\n"
+                f"Disk vs. buffer: +{added} / -{removed} lines in {len(their_hunks)} place(s).")
+        if merged is not None:
+            if conflicts:
+                text += f"\n{conflicts} region(s) were changed on both sides; Merge keeps your version there."
+            else:
+                text += "\nThe changes do not overlap with yours and can be merged cleanly."
+        box.setText(text)
+        merge_btn = box.addButton("Merge", QMessageBox.AcceptRole) if merged is not None else None
+        reload_btn = box.addButton("Reload (Discard Mine)", QMessageBox.DestructiveRole)
+        box.addButton("Keep Mine", QMessageBox.RejectRole)
+        box.exec_()
+        clicked = box.clickedButton()
+
+        if merge_btn is not None and clicked is merge_btn:
+            apply_text(editor, merged)
+            self._accept(editor, disk_text, mtime)
+            # The journal base no longer matches the file; start it over from the merged text
+            self.parent.journals.rebase(editor)
+            self.parent.statusBar().showMessage(
+                f"Merged external changes into {os.path.basename(path)}"
+                + (f" ({conflicts} conflict(s) kept as yours)" if conflicts else ""), 5000)
+            logging.info(f"Merged external changes into {path} ({conflicts} conflicts)")
+        elif clicked is reload_btn:
+            self._reload(editor, disk_text, mtime)
+            self.parent.statusBar().showMessage(f"Reloaded {os.path.basename(path)} from disk", 5000)
+        else:
+            # Saving the tab will overwrite the external change, as before
+            self._accept(editor, disk_text, mtime)
+            self.parent.journals.rebase(editor)
+            self.parent.statusBar().showMessage(f"Kept your version of {os.path.basename(path)}", 5000)
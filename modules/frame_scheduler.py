@@ -0,0 +1,113 @@
+# /modules/frame_scheduler.py
+
+import time
+import logging
+
+from PyQt5.QtCore import QObject, QTimer
+
+from modules import tracing
+
+
+class _Task:
+    def __init__(self, name, callback, priority, delay, max_wait):
+        self.name = name
+        self.callback = callback
+        self.priority = priority
+        self.delay = delay / 1000.0
+        self.max_wait = None if max_wait is None else max_wait / 1000.0
+        self.dirty = False
+        self.first_marked = 0.0
+        self.last_marked = 0.0
+        self.runs = 0
+        self.marks = 0
+
+    def due_at(self):
+        due = self.last_marked + self.delay
+        if self.max_wait is not None:
+            due = min(due, self.first_marked + self.max_wait)
+        return due
+
+
+class FrameScheduler(QObject):
+    """
+    Coalesces the work editor signals trigger in the side panes.
+
+    Subsystems register a named task once and mark it dirty from their signal handlers;
+    marking is cheap and can happen any number of times. Dirty tasks run at most once per
+    frame, lowest priority number first, until the frame's time budget is used up; the rest
+    wait for the next frame. A task with a delay only runs once it has not been marked for
+    that long (debounce), or max_wait after it was first marked if that comes sooner.
+    """
+
+    FRAME = 16   # ms between passes
+    BUDGET = 8   # ms of work per pass before the remaining tasks wait a frame
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._tasks = {}
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._runFrame)
+        self.frames = 0
+
+    def register(self, name, callback, priority=0, delay=0, max_wait=None):
+        """Add a task; delay and max_wait are in ms."""
+        self._tasks[name] = _Task(name, callback, priority, delay, max_wait)
+
+    def mark(self, name):
+        """Ask for the task to run in an upcoming frame."""
+        task = self._tasks[name]
+        now = time.monotonic()
+        if not task.dirty:
+            task.dirty = True
+            task.first_marked = now
+        task.last_marked = now
+        task.marks += 1
+        self._schedule(now)
+
+    def cancel(self, name):
+        self._tasks[name].dirty = False
+
+    def isPending(self, name):
+        return self._tasks[name].dirty
+
+    def flush(self):
+        """Run every dirty task now, ignoring delays and the budget."""
+        self._timer.stop()
+        for task in sorted(self._dirty(), key=lambda t: t.priority):
+            self._run(task)
+
+    def stats(self):
+        """{name: (times marked, times run)}; the gap is the work saved by coalescing."""
+        return {name: (task.marks, task.runs) for name, task in self._tasks.items()}
+
+    def _dirty(self):
+        return [task for task in self._tasks.values() if task.dirty]
+
+    def _schedule(self, now):
+        dirty = self._dirty()
+        if not dirty:
+            return
+        wait = max(0.0, min(task.due_at() for task in dirty) - now)
+        msec = max(self.FRAME, int(wait * 1000) + 1)
+        if not self._timer.isActive() or self._timer.remainingTime() > msec:
+            self._timer.start(msec)
+
+    def _run(self, task):
+        task.dirty = False
+        task.runs += 1
+        try:
+            with tracing.span(f"pane: {task.name}", background=True):
+                task.callback()
+        except Exception as e:
+            logging.error(f"Scheduled update '{task.name}' failed: {e}", exc_info=True)
+
+    def _runFrame(self):
+        self.frames += 1
+        start = time.monotonic()
+        due = sorted((t for t in self._dirty() if t.due_at() <= start), key=lambda t: t.priority)
+        for i, task in enumerate(due):
+            if i and (time.monotonic() - start) * 1000 > self.BUDGET:
+                break
+            self._run(task)
+        self._schedule(time.monotonic())
@@ -0,0 +1,155 @@
+# /modules/fuzzy.py
+#
+# Subsequence fuzzy matching for file names. "tdyonl" matches "TODAY_ONLY.vhd": every query
+# character must appear in order; matches at word starts and runs of adjacent characters
+# score higher, gaps score lower, and a match in the file name beats one spread over the
+# directories.
+
+import os
+import heapq
+
+SEPARATORS = frozenset(" _-./\\")
+
+MATCH = 16          # per matched character
+BOUNDARY = 10       # match at the start of the key or right after a separator
+CAMEL = 6           # match on an upper-case letter after a lower-case one
+CONSECUTIVE = 12    # match right after the previous match
+GAP_START = -3      # first skipped character between two matches
+GAP_EXTEND = -1     # every further skipped character
+NAME_BONUS = 40     # the whole query matched in the file name
+
+
+def _positions(query, key):
+    """Positions of a short match of query in key (None if query is not a subsequence of key)."""
+    pos = -1
+    for ch in query:
+        pos = key.find(ch, pos + 1)
+        if pos < 0:
+            return None
+    # Walk back from the end of the leftmost match to the latest start, which makes the
+    # match more compact ("ab" in "a_xa_b" is taken from "a_b", not "a_xa_b")
+    end = pos
+    for ch in reversed(query[:-1]):
+        pos = key.rfind(ch, 0, pos)
+    positions = []
+    pos -= 1
+    for ch in query:
+        pos = key.find(ch, pos + 1, end + 1)
+        positions.append(pos)
+    return positions
+
+
+def fuzzy_score(query, key, original=None):
+    """
+    Score of query against key, both lower-case (None if it does not match). original is
+    key before lower-casing, used to find camelCase word starts.
+    """
+    if not query:
+        return 0
+    positions = _positions(query, key)
+    if positions is None:
+        return None
+    score = 0
+    previous = -2
+    for pos in positions:
+        score += MATCH
+        if pos == 0 or key[pos - 1] in SEPARATORS:
+            score += BOUNDARY
+        elif original is not None and original[pos].isupper() and original[pos - 1].islower():
+            score += CAMEL
+        if pos == previous + 1:
+            score += CONSECUTIVE
+        elif previous >= 0:
+            score += GAP_START + GAP_EXTEND * (pos - previous - 2)
+        previous = pos
+    return score
+
+
+def char_mask(text):
+    """Bit set of the characters in text (folded to 64 bits); a cheap superset test before matching."""
+    mask = 0
+    for ch in set(text):
+        mask |= 1 << (ord(ch) & 63)
+    return mask
+
+
+class FuzzyIndex:
+    """
+    Paths with their lower-case search keys and character masks computed once. search()
+    rejects most paths with one integer test, scores the file name first and falls back to
+    the whole path; file name matches rank above matches that need the directories. A query
+    that extends the previous one (typing) only rescans the previous matches.
+    """
+
+    def __init__(self, paths=()):
+        self._entries = {}   # path -> (name or None, name lower-case, path lower-case, char mask)
+        self._generation = 0
+        self._last = None    # (query, generation, paths whose path key matched)
+        self.set(paths)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, path):
+        return path in self._entries
+
+    def set(self, paths):
+        """Replace the indexed paths; keys of paths that were already indexed are reused."""
+        old, self._entries = self._entries, {}
+        for path in paths:
+            entry = old.get(path)
+            if entry is None:
+                self._add(path)
+            else:
+                self._entries[path] = entry
+        self._generation += 1
+
+    def add(self, path):
+        if path not in self._entries:
+            self._add(path)
+            self._generation += 1
+
+    def remove(self, path):
+        if self._entries.pop(path, None) is not None:
+            self._generation += 1
+
+    def _add(self, path):
+        name = os.path.basename(path)
+        name_key = name.lower()
+        path_key = path.lower()
+        # A few characters change length when lower-cased; camelCase positions are then unusable
+        original = name if len(name_key) == len(name) else None
+        self._entries[path] = (original, name_key, path_key, char_mask(path_key))
+
+    def search(self, query, limit=50):
+        """[(score, path)] best first; an empty query lists everything in index order."""
+        query = query.strip().lower().replace(" ", "")
+        if not query:
+            return [(0, path) for path in list(self._entries)[:limit]]
+        entries = self._entries
+        last = self._last
+        if last and last[1] == self._generation and query.startswith(last[0]):
+            candidates = last[2]
+        else:
+            wanted = char_mask(query)
+            candidates = [path for path, entry in entries.items() if entry[3] & wanted == wanted]
+
+        matched, by_name, by_path = [], [], []
+        for path in candidates:
+            original, name_key, path_key, _ = entries[path]
+            score = fuzzy_score(query, name_key, original)
+            if score is not None:
+                # Shorter paths first among equal scores
+                by_name.append((score + NAME_BONUS, -len(path), path))
+            elif _positions(query, path_key) is None:
+                continue
+            else:
+                by_path.append(path)
+            matched.append(path)
+        self._last = (query, self._generation, matched)
+
+        results = heapq.nlargest(limit, by_name)
+        if len(results) < limit:
+            scored = ((fuzzy_score(query, entries[path][2]), -len(path), path) for path in by_path)
+            results += heapq.nlargest(limit - len(results), scored)
+        return [(score, path) for score, _, path in results]
@@ -0,0 +1,331 @@
+# /modules/input_recorder.py
+#
+# Recording of input sessions (View > Record Input) and their replay against a window, for
+# input-latency benchmarks on real editing sessions (benchmarks/replay.py).
+#
+# A trace is a JSON-lines file. The first line describes the window at the start of the
+# recording; every further line is one event, [ms since the previous event, kind, ...]:
+#
+#   {"format": "notepadmod-input", "version": 1, "size": [1600, 1000],
+#    "tabs": ["/home/j/Desktop/rundown.vhd"], "current": 0, "cursor": [120, 120], "scroll": 40}
+#   [140, "k", 65, 0, "a", false]      key press in the editor: key, modifiers, text, autorepeat
+#   [300, "w", -120, 0, 0]             wheel over the editor: angle delta y, x, modifiers
+#   [90, "s", 812]                     scroll bar dragged to a value
+#   [500, "c", 4410, 4410]             cursor set with the mouse: anchor, position
+#   [700, "t", 1]                      tab switch
+#   [250, "a", "Save"]                 menu or toolbar action, by its text
+#
+# Keys that are shortcuts of an action never reach the editor; they are recorded as the action.
+
+import os
+import json
+import time
+import logging
+import statistics
+
+from PyQt5.QtCore import Qt, QObject, QEvent, QEventLoop, QPoint, QPointF, QTimer, pyqtSignal
+from PyQt5.QtGui import QKeyEvent, QTextCursor, QWheelEvent
+from PyQt5.QtWidgets import QAction, QApplication
+
+from modules.editor import Editor
+from modules import tracing
+
+TRACES_DIR = os.path.expanduser("~/.config/notepadmod/traces")
+TRACE_FORMAT = "notepadmod-input"
+TRACE_VERSION = 1
+FRAME_MS = 1000 / 60
+MAX_GAP_MS = 2000     # longer pauses in a recording are shortened to this on replay
+SETTLE_MS = 500       # event loop time after the last event, for debounced pane updates
+
+
+def write_trace(path, header, events):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(json.dumps(header) + "\n")
+        for event in events:
+            f.write(json.dumps(event, separators=(",", ":")) + "\n")
+
+
+def read_trace(path):
+    """(header, events) of a trace file; ValueError if it is not one."""
+    with open(path, 'r', encoding='utf-8') as f:
+        lines = [line for line in f if line.strip()]
+    if not lines:
+        raise ValueError(f"Empty trace: {path}")
+    header = json.loads(lines[0])
+    if not isinstance(header, dict) or header.get("format") != TRACE_FORMAT:
+        raise ValueError(f"Not an input trace: {path}")
+    if header.get("version", 0) > TRACE_VERSION:
+        raise ValueError(f"Trace version {header['version']} is newer than this editor ({TRACE_VERSION})")
+    return header, [json.loads(line) for line in lines[1:]]
+
+
+class InputRecorder(QObject):
+    """Records the editor input of a window (application event filter plus action signals)."""
+
+    stopped = pyqtSignal(str)   # path of the written trace ("" if nothing was written)
+
+    def __init__(self, parent_window, directory=TRACES_DIR):
+        super().__init__(parent_window)
+        self.parent = parent_window
+        self.directory = directory
+        self.header = None
+        self.events = []
+        self._last = None
+        self._actions = []
+        self._scroll_bars = set()
+
+    def isRecording(self):
+        return self.header is not None
+
+    def start(self, exclude=()):
+        """Start recording; actions in exclude (e.g. the one that toggles recording) are left out."""
+        if self.isRecording():
+            return
+        window = self.parent
+        editor = window.currentEditor()
+        cursor = editor.textCursor() if editor else None
+        self.header = {
+            "format": TRACE_FORMAT,
+            "version": TRACE_VERSION,
+            "recorded": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "size": [window.width(), window.height()],
+            "tabs": [window.tabs.widget(i).property("filepath") for i in range(window.tabs.count())],
+            "current": window.tabs.currentIndex(),
+            "cursor": [cursor.anchor(), cursor.position()] if cursor else [0, 0],
+            "scroll": editor.verticalScrollBar().value() if editor else 0,
+        }
+        self.events = []
+        self._last = time.perf_counter()
+
+        self._actions = []
+        for action in window.findChildren(QAction):
+            if action in exclude or action.menu() is not None or not action.text():
+                continue
+            action.triggered.connect(self._onAction)
+            self._actions.append(action)
+        window.tabs.currentChanged.connect(self._onTabChanged)
+        self._watchScrollBar(editor)
+        QApplication.instance().installEventFilter(self)
+        window.statusBar().showMessage("Recording input...", 3000)
+        logging.info(f"Input recording started ({len(self._actions)} actions watched)")
+
+    def stop(self):
+        """Stop recording and write the trace; returns its path (None if there was nothing to write)."""
+        if not self.isRecording():
+            return None
+        QApplication.instance().removeEventFilter(self)
+        self.parent.tabs.currentChanged.disconnect(self._onTabChanged)
+        watched = [(action, "triggered", self._onAction) for action in self._actions]
+        watched += [(bar, "sliderMoved", self._onSliderMoved) for bar in self._scroll_bars]
+        for obj, signal, slot in watched:
+            try:
+                getattr(obj, signal).disconnect(slot)
+            except (TypeError, RuntimeError):
+                pass   # its editor or plugin action was deleted while recording
+        self._actions = []
+        self._scroll_bars = set()
+        header, events, self.header, self.events = self.header, self.events, None, []
+
+        if not events:
+            self.parent.statusBar().showMessage("Input recording stopped; nothing was recorded", 5000)
+            self.stopped.emit("")
+            return None
+        path = os.path.join(self.directory, f"{time.strftime('%Y%m%d-%H%M%S')}.trace.jsonl")
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            write_trace(path, header, events)
+        except OSError as e:
+            logging.error(f"Failed to write input trace: {e}")
+            self.parent.statusBar().showMessage(f"Failed to write input trace: {e}", 5000)
+            self.stopped.emit("")
+            return None
+        logging.info(f"Input trace written ({len(events)} events): {path}")
+        self.parent.statusBar().showMessage(f"Input trace written ({len(events)} events): {path}", 10000)
+        self.stopped.emit(path)
+        return path
+
+    def _add(self, kind, *values):
+        now = time.perf_counter()
+        self.events.append([round((now - self._last) * 1000), kind, *values])
+        self._last = now
+
+    def _watchScrollBar(self, editor):
+        if editor is None:
+            return
+        bar = editor.verticalScrollBar()
+        if bar not in self._scroll_bars:
+            # sliderMoved fires only for drags, not for scrolling caused by keys or the wheel
+            bar.sliderMoved.connect(self._onSliderMoved)
+            self._scroll_bars.add(bar)
+
+    def eventFilter(self, obj, event):
+        kind = event.type()
+        if kind == QEvent.KeyPress and isinstance(obj, Editor):
+            self._add("k", event.key(), int(event.modifiers()), event.text(), event.isAutoRepeat())
+        elif kind == QEvent.Wheel and isinstance(obj.parent(), Editor) and obj is obj.parent().viewport():
+            delta = event.angleDelta()
+            self._add("w", delta.y(), delta.x(), int(event.modifiers()))
+        elif kind == QEvent.MouseButtonRelease and isinstance(obj.parent(), Editor) and obj is obj.parent().viewport():
+            # Where the click or drag left the cursor, which replays at any window size
+            cursor = obj.parent().textCursor()
+            self._add("c", cursor.anchor(), cursor.position())
+        return False
+
+    def _onAction(self, checked=False):
+        self._add("a", self.sender().text())
+
+    def _onTabChanged(self, index):
+        self._add("t", index)
+        self._watchScrollBar(self.parent.currentEditor())
+
+    def _onSliderMoved(self, value):
+        self._add("s", value)
+
+
+class InputReplayer:
+    """
+    Plays a trace back into a window and measures it. Each event's latency is the time to
+    handle it plus the work it posts to the event loop; a 60 Hz frame clock runs alongside,
+    and ticks that come late count as dropped frames (this includes debounced pane updates
+    and highlighting that run between events).
+    """
+
+    def __init__(self, window, events, speed=1.0, skip_actions=()):
+        self.window = window
+        self.events = events
+        self.speed = speed                    # 1.0 keeps the recorded pauses, 0 replays back to back
+        self.skip_actions = set(skip_actions)
+        self.latencies = {}                   # kind -> [ms]
+        self.slowest = []                     # [(ms, event index, event)]
+        self.skipped = 0
+        self.dialogs_closed = 0
+        self._ticks = []
+
+    def run(self):
+        """Replay every event and return the measurements (see results())."""
+        app = QApplication.instance()
+        tracing.tracer.clear()
+        clock = QTimer()
+        clock.setTimerType(Qt.PreciseTimer)
+        clock.timeout.connect(lambda: self._ticks.append(time.perf_counter()))
+        # Actions that open a dialog would wait for a user; close it as soon as it shows
+        guard = QTimer()
+        guard.timeout.connect(self._closeDialogs)
+        guard.start(50)
+        self._ticks = [time.perf_counter()]
+        clock.start(round(FRAME_MS))
+        start = time.perf_counter()
+
+        for index, event in enumerate(self.events):
+            self._wait(min(event[0] * self.speed, MAX_GAP_MS))
+            began = time.perf_counter()
+            if not self._dispatch(event):
+                self.skipped += 1
+                continue
+            app.processEvents()
+            ms = (time.perf_counter() - began) * 1000
+            self.latencies.setdefault(event[1], []).append(ms)
+            self.slowest.append((ms, index, event))
+
+        self._wait(SETTLE_MS)
+        clock.stop()
+        guard.stop()
+        self._ticks.append(time.perf_counter())
+        return self.results((time.perf_counter() - start) * 1000)
+
+    def _wait(self, ms):
+        if ms <= 0:
+            QApplication.instance().processEvents()
+            return
+        loop = QEventLoop()
+        QTimer.singleShot(round(ms), loop.quit)
+        loop.exec_()
+
+    def _closeDialogs(self):
+        dialog = QApplication.activeModalWidget()
+        if dialog is not None:
+            logging.info(f"Replay closed dialog: {dialog.windowTitle()}")
+            self.dialogs_closed += 1
+            if hasattr(dialog, "reject"):
+                dialog.reject()
+            else:
+                dialog.close()
+
+    def _dispatch(self, event):
+        """Deliver one recorded event; False if it cannot be replayed here."""
+        window = self.window
+        kind, values = event[1], event[2:]
+        if kind == "t":
+            if values[0] >= window.tabs.count():
+                return False
+            window.tabs.setCurrentIndex(values[0])
+            return True
+        if kind == "a":
+            if values[0] in self.skip_actions:
+                return False
+            action = self._findAction(values[0])
+            if action is None:
+                return False
+            action.trigger()
+            return True
+
+        editor = window.currentEditor()
+        if editor is None:
+            return False
+        if kind == "k":
+            key, modifiers, text, autorepeat = values
+            modifiers = Qt.KeyboardModifiers(modifiers)
+            QApplication.sendEvent(editor, QKeyEvent(QEvent.KeyPress, key, modifiers, text, autorepeat))
+            QApplication.sendEvent(editor, QKeyEvent(QEvent.KeyRelease, key, modifiers, text, autorepeat))
+        elif kind == "w":
+            dy, dx, modifiers = values
+            viewport = editor.viewport()
+            center = QPointF(viewport.rect().center())
+            wheel = QWheelEvent(center, QPointF(viewport.mapToGlobal(center.toPoint())), QPoint(), QPoint(dx, dy),
+                                Qt.NoButton, Qt.KeyboardModifiers(modifiers), Qt.NoScrollPhase, False)
+            QApplication.sendEvent(viewport, wheel)
+        elif kind == "s":
+            editor.verticalScrollBar().setValue(values[0])
+        elif kind == "c":
+            length = editor.document().characterCount() - 1
+            cursor = editor.textCursor()
+            cursor.setPosition(min(values[0], length))
+            cursor.setPosition(min(values[1], length), QTextCursor.KeepAnchor)
+            editor.setTextCursor(cursor)
+        else:
+            return False
+        return True
+
+    def _findAction(self, text):
+        for action in self.window.findChildren(QAction):
+            if action.text() == text and action.isEnabled():
+                return action
+        return None
+
+    def results(self, total_ms):
+        """Latency per event kind (ms), dropped frames and the slowest events."""
+        kinds = {}
+        for kind, values in self.latencies.items():
+            values = sorted(values)
+            kinds[kind] = {
+                "count": len(values),
+                "p50": tracing.percentile(values, 0.50),
+                "p95": tracing.percentile(values, 0.95),
+                "max": values[-1],
+                "mean": statistics.fmean(values),
+            }
+        gaps = [(b - a) * 1000 for a, b in zip(self._ticks, self._ticks[1:])]
+        dropped = sum(round(gap / FRAME_MS) - 1 for gap in gaps if gap > FRAME_MS * 1.5)
+        self.slowest.sort(key=lambda item: -item[0])
+        return {
+            "events": sum(len(values) for values in self.latencies.values()),
+            "skipped": self.skipped,
+            "dialogs_closed": self.dialogs_closed,
+            "duration_ms": total_ms,
+            "frames": round(total_ms / FRAME_MS),
+            "dropped_frames": dropped,
+            "longest_frame_ms": max(gaps, default=0.0),
+            "latency": kinds,
+            "slowest": [{"ms": ms, "index": index, "event": event} for ms, index, event in self.slowest[:10]],
+            "spans": tracing.tracer.stats(),
+        }
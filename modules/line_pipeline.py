@@ -0,0 +1,362 @@
+# /modules/line_pipeline.py
+#
+# Composable line transforms for the cleanup actions. Stages are chained generators, so
+# any number of them run as one streaming pass over the lines. No Qt imports: usable from
+# the editor, from scripts and from the command line:
+#
+#   python3 -m modules.line_pipeline --list
+#   python3 -m modules.line_pipeline cleaner,spacermvr file.vhd --in-place
+#   cat file.vhd | python3 -m modules.line_pipeline tempmax > out.vhd
+
+import os
+import re
+import sys
+import json
+import logging
+import argparse
+import tempfile
+
+PRESETS_FILE = os.path.expanduser("~/.config/notepadmod/pipelines.json")
+
+# Exact "cc-" reaction lines removed by the Cleaner
+CC_REACTIONS = [
+    "cc-!!",
+    "cc-Wow",
+    "cc-Great news",
+    "cc-Yes",
+    "cc-Slava Ukraini",
+    "cc-#SlavaUkraini",
+    "cc-Yeah baby!",
+    "cc-",
+    "cc-Lol",
+    "cc-Good",
+    "cc-Sure",
+    "cc-!",
+    "cc-Super",
+    "cc-Nice",
+    "cc-Thank you, Heroiam Slava",
+    "cc-Well done",
+    "cc-YES",
+    "cc-we love this",
+    "cc-Absolutely",
+    "cc-Burn baby burn",
+    "cc-Fuck yea",
+    "cc-MORE",
+    "cc-Tragic",
+    "cc-Thoughts and prayers.",
+    "cc-Hahahahha",
+    "cc-Hoorah!",
+    "cc-Repeat",
+]
+
+TEMPMAX_PREFIXES = ["Timestamp:", "cc-", "--", "http"]
+
+
+class Stage:
+    """One line transform. Subclasses implement process(lines) as a generator."""
+
+    name = ""
+
+    def __init__(self):
+        self.changed = 0  # lines removed, added or rewritten in the last run
+
+    def __call__(self, lines):
+        self.changed = 0
+        return self.process(lines)
+
+    def process(self, lines):
+        raise NotImplementedError
+
+    def spec(self):
+        return {"stage": self.name}
+
+
+class DropExact(Stage):
+    """Drop lines whose stripped text is one of patterns (a hashed set lookup per line)."""
+
+    name = "drop_exact"
+
+    def __init__(self, patterns):
+        super().__init__()
+        self.patterns = frozenset(patterns)
+
+    def process(self, lines):
+        patterns = self.patterns
+        for line in lines:
+            if line.strip() in patterns:
+                self.changed += 1
+                continue
+            yield line
+
+    def spec(self):
+        return {"stage": self.name, "patterns": sorted(self.patterns)}
+
+
+class DropPrefix(Stage):
+    """
+    Drop lines whose stripped text starts with any of prefixes. Prefixes are grouped by
+    length, so each line costs one slice and set lookup per distinct prefix length.
+    """
+
+    name = "drop_prefix"
+
+    def __init__(self, prefixes):
+        super().__init__()
+        self.prefixes = list(prefixes)
+        by_length = {}
+        for prefix in self.prefixes:
+            by_length.setdefault(len(prefix), set()).add(prefix)
+        self._lookup = sorted((length, frozenset(group)) for length, group in by_length.items() if length)
+
+    def process(self, lines):
+        lookup = self._lookup
+        for line in lines:
+            stripped = line.lstrip()
+            if any(stripped[:length] in group for length, group in lookup):
+                self.changed += 1
+                continue
+            yield line
+
+    def spec(self):
+        return {"stage": self.name, "prefixes": self.prefixes}
+
+
+class CollapseBlank(Stage):
+    """
+    Shorten runs of blank (whitespace-only) lines. mode "max" keeps at most count blank
+    lines per run (SpaceRmvr); mode "mod" keeps run length % count (Cleaner's removal of
+    groups of four).
+    """
+
+    name = "collapse_blank"
+
+    def __init__(self, mode="max", count=3):
+        super().__init__()
+        if mode not in ("max", "mod"):
+            raise ValueError(f"Unknown collapse_blank mode: {mode}")
+        self.mode = mode
+        self.count = count
+
+    def _keep(self, run):
+        return min(run, self.count) if self.mode == "max" else run % self.count
+
+    def process(self, lines):
+        run = 0
+        for line in lines:
+            if not line.strip():
+                run += 1
+                continue
+            if run:
+                keep = self._keep(run)
+                self.changed += run - keep
+                yield from [""] * keep
+                run = 0
+            yield line
+        if run:
+            keep = self._keep(run)
+            self.changed += run - keep
+            yield from [""] * keep
+
+    def spec(self):
+        return {"stage": self.name, "mode": self.mode, "count": self.count}
+
+
+class DeepStateLinks(Stage):
+    """Replace lines holding only "lat, lon" with a DeepStateMap link."""
+
+    name = "deepstate_links"
+    GPS_RE = re.compile(r'^(-?\d+\.\d+)\s*,\s*(-?\d+\.\d+)\s*$')
+
+    def process(self, lines):
+        match_gps = self.GPS_RE.match
+        for line in lines:
+            match = match_gps(line.strip())
+            if match:
+                self.changed += 1
+                lat, lon = match.groups()
+                yield f"https://deepstatemap.live/en#13/{lat}/{lon}"
+            else:
+                yield line
+
+
+class CcSpacing(Stage):
+    """
+    Space out cc- lines: four blank lines before the first cc- line of a quoted "Title:
+    segment, and a blank line around every other cc- line.
+    """
+
+    name = "cc_spacing"
+
+    def process(self, lines):
+        in_segment = False
+        found_first_cc = False
+        previous = None  # last line emitted
+        iterator = iter(lines)
+        current = next(iterator, None)
+        while current is not None:
+            following = next(iterator, None)  # one line of lookahead
+            line = current.strip()
+            if line.startswith('"Title:') or line.startswith("'Title:"):
+                in_segment = True
+                found_first_cc = False
+            elif in_segment and line.startswith('cc-') and not found_first_cc:
+                self.changed += 4
+                yield from [""] * 4
+                found_first_cc = True
+            elif line.startswith('cc-'):
+                if previous is not None and previous.strip():
+                    self.changed += 1
+                    yield ""
+                yield current
+                previous = current
+                if following is not None and following.strip():
+                    self.changed += 1
+                    yield ""
+                    previous = ""
+                current = following
+                continue
+            yield current
+            previous = current
+            current = following
+
+
+STAGE_TYPES = {cls.name: cls for cls in (DropExact, DropPrefix, CollapseBlank, DeepStateLinks, CcSpacing)}
+
+
+def stage_from_spec(spec):
+    """Build a stage from its JSON form, e.g. {"stage": "collapse_blank", "mode": "max", "count": 3}."""
+    spec = dict(spec)
+    kind = spec.pop("stage", None)
+    if kind not in STAGE_TYPES:
+        raise ValueError(f"Unknown pipeline stage: {kind}")
+    return STAGE_TYPES[kind](**spec)
+
+
+class Pipeline:
+    """A sequence of stages fused into a single pass over the lines."""
+
+    def __init__(self, stages, name=""):
+        self.stages = list(stages)
+        self.name = name
+
+    def __add__(self, other):
+        return Pipeline(self.stages + other.stages, f"{self.name}+{other.name}")
+
+    def run_lines(self, lines):
+        for stage in self.stages:
+            lines = stage(lines)
+        return lines
+
+    def run_text(self, text):
+        result = "\n".join(self.run_lines(text.splitlines()))
+        # Keep the file's final newline
+        return result + "\n" if text.endswith("\n") and result else result
+
+    @property
+    def changed(self):
+        return sum(stage.changed for stage in self.stages)
+
+    def spec(self):
+        return [stage.spec() for stage in self.stages]
+
+
+def builtin_presets():
+    return {
+        "cleaner": [DropExact(CC_REACTIONS), CollapseBlank("mod", 4)],
+        "spacermvr": [CollapseBlank("max", 3)],
+        "tempmax": [DropPrefix(TEMPMAX_PREFIXES)],
+        "deepstate": [DeepStateLinks()],
+        "cc-spacing": [CcSpacing()],
+        "tidy": [DropExact(CC_REACTIONS), CollapseBlank("mod", 4), CollapseBlank("max", 3), DeepStateLinks()],
+    }
+
+
+def load_presets(path=PRESETS_FILE):
+    """Built-in presets plus user presets from pipelines.json ({"name": [stage specs]})."""
+    presets = builtin_presets()
+    if os.path.exists(path):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                for name, specs in json.load(f).items():
+                    presets[name] = [stage_from_spec(spec) for spec in specs]
+        except (OSError, ValueError, TypeError) as e:
+            logging.error(f"Failed to load pipeline presets from {path}: {e}")
+    return presets
+
+
+def get_pipeline(names, presets=None):
+    """Pipeline for one preset name or several joined with commas (run as one pass)."""
+    presets = presets if presets is not None else load_presets()
+    stages = []
+    for name in names.split(","):
+        name = name.strip()
+        if name not in presets:
+            raise KeyError(f"Unknown pipeline preset: {name}")
+        stages.extend(presets[name])
+    return Pipeline(stages, names)
+
+
+def save_preset(name, pipeline, path=PRESETS_FILE):
+    """Store a pipeline as a user preset."""
+    data = {}
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    data[name] = pipeline.spec()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2)
+
+
+def _write_in_place(path, text):
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(prefix=f".{os.path.basename(path)}.", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(text)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+        raise
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run line transform presets over text files.")
+    parser.add_argument('preset', nargs='?', help="preset name, or several joined with commas")
+    parser.add_argument('files', nargs='*', help="input files (stdin if omitted)")
+    parser.add_argument('--in-place', action='store_true', help="rewrite the files (backed up first)")
+    parser.add_argument('--list', action='store_true', help="list available presets")
+    args = parser.parse_args(argv)
+
+    presets = load_presets()
+    if args.list or not args.preset:
+        for name, stages in presets.items():
+            print(f"{name:<12} {' -> '.join(stage.name for stage in stages)}")
+        return 0
+    try:
+        pipeline = get_pipeline(args.preset, presets)
+    except KeyError as e:
+        print(e, file=sys.stderr)
+        return 1
+
+    if not args.files:
+        sys.stdout.write(pipeline.run_text(sys.stdin.read()))
+        return 0
+    for path in args.files:
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            text = f.read()
+        result = pipeline.run_text(text)
+        if args.in_place:
+            if result != text:
+                from modules.backup_store import BackupStore
+                BackupStore().snapshot_text(path, text, f"pipeline-{args.preset}")
+                _write_in_place(path, result)
+            print(f"{path}: {pipeline.changed} line(s) changed", file=sys.stderr)
+        else:
+            sys.stdout.write(result)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,11 +4,9 @@ import sys
 import os
 import logging
 import re
-import requests  # Ensure requests is installed: pip install requests
 import urllib.parse
 import subprocess
 import tempfile
-import time
 import shutil
 import base64
 import json # For Ollama API interaction
@@ -23,24 +21,48 @@ from PyQt5.QtWidgets import (
     QMainWindow, QTabWidget, QToolBar, QAction, QFileDialog, QMessageBox,
     QMenu, QWidgetAction, QDialog, QVBoxLayout, QLabel,
     QScrollArea, QWidget, QHBoxLayout, QPushButton, QToolButton, QPlainTextEdit,
-    QSplitter, QGridLayout, QApplication, QSizePolicy
+    QSplitter, QGridLayout, QApplication, QSizePolicy, QInputDialog
 )
-from PyQt5.QtGui import QIcon, QFont, QPixmap, QTextCursor
-from PyQt5.QtGui import QPixmap
+from PyQt5.QtGui import QIcon, QFont, QTextCursor
 
 from modules.editor import Editor
 from modules.backup import Backup
+from modules.backup_browser import BackupBrowserDialog
 from modules.find_dialog import FindDialog
 from modules.script_runner import ScriptRunner
+from modules.plugin_registry import PluginRegistry
 from modules.recent_files import RecentFiles
+from modules.file_saver import FileSaver
+from modules.edit_journal import JournalManager
+from modules.send_queue import SendQueue, prepend_block
+from modules.file_watcher import ExternalChangeMonitor
+from modules.text_patch import apply_text
+from modules.line_pipeline import get_pipeline, load_presets
+from modules.frame_scheduler import FrameScheduler
+from modules.title_navigator import TitleListModel, TitleNavigator
+from modules.pane_cache import PixmapCache, TabPaneState
+from modules.tab_hibernation import TabHibernation
+from modules.startup import DeferredStartup
+from modules.session import Session
+from modules.quick_open import QuickOpenDialog
+from modules.trace_hud import TraceHud, TraceStatsDialog
+from modules.profiler import Profiler, PROFILES_DIR, PROFILE_SECONDS
+from modules.input_recorder import InputRecorder, TRACES_DIR
+from modules import tracing
+from modules.block_info import (
+    block_info, TITLE, WORD_IMAGE, MEDIA, MEDIA_LINK, MEDIA_PATH, URL, TIMESTAMP, CC, MM, JJ, MMM
+)
 
 import qdarkstyle
-from scripts.text2png_ALL_v3 import create_image
 
 class NotepadWindow(QMainWindow):
-    def __init__(self):
+    def __init__(self, eager_startup=False):
         super().__init__()
         self.setWindowTitle("Custom Notepad")
+
+        # Slow setup the first window does not need runs after it is shown (unless eager_startup)
+        self.startup = DeferredStartup(self, eager=eager_startup)
+        self.startup.mark("window created")
         
         # Set window size to half of QHD width and full height
         self.resize(1280, 1400)  # Half of 2560 for width, slightly less than 1440 for height to account for taskbar
@@ -84,24 +106,24 @@ class NotepadWindow(QMainWindow):
         self.word_images_dir = "/home/j/Desktop/YTs/aa UNTV Today/notepad_word_images"
         os.makedirs(self.word_images_dir, exist_ok=True)
         
-        # Build file index for faster searches
+        # Filled by build_file_index(); lookups fall back to search_dirs until then
         self.file_index = {}
-        self.build_file_index()
 
-        # Dictionary to store line numbers for images
-        self.image_line_numbers = {}
+        # Side pane state per open tab (title model, parsed image segments, built image pane)
+        self.pane_states = {}
+        self._shown_titles = None  # TabPaneState whose titles are in the navigator
+        self._shown_images = None  # TabPaneState whose images are in the image pane
+        self.pixmap_cache = PixmapCache()
+        self._word_images = {}     # word text -> rendered word image path
         
-        # Add debounce timer for image updates
-        self._image_update_timer = QTimer()
-        self._image_update_timer.setSingleShot(True)
-        self._image_update_timer.timeout.connect(self._debounced_update_images)
+        # Side pane updates are marked dirty by editor signals and run once per frame
         self._image_update_delay = 500  # 500ms delay
-
-        # Add debounce timer for scroll sync
-        self._scroll_sync_timer = QTimer()
-        self._scroll_sync_timer.setSingleShot(True)
-        self._scroll_sync_timer.timeout.connect(self._debounced_sync_scroll)
         self._scroll_sync_delay = 100  # 100ms delay
+        self.scheduler = FrameScheduler(self)
+        self.scheduler.register("titles", self.updateTitleSegments, priority=0, delay=50, max_wait=250)
+        self.scheduler.register("image_scroll", self._debounced_sync_scroll, priority=1, delay=self._scroll_sync_delay)
+        self.scheduler.register("images", self._debounced_update_images, priority=2, delay=self._image_update_delay)
+        self.scheduler.register("mmm", self.check_for_mmm_lines, priority=3, delay=100)
 
         # Create a splitter to hold the image viewer and editor/tabs
         self.splitter = QSplitter(self)
@@ -116,7 +138,7 @@ class NotepadWindow(QMainWindow):
         self.tabs.setTabsClosable(True)
         self.tabs.setMovable(True)  # Enable tab movement
         self.tabs.tabCloseRequested.connect(self.closeTab)
-        self.tabs.currentChanged.connect(self.updateImageDisplay)
+        self.tabs.currentChanged.connect(self.onTabChanged)
         
         # Make tabs 50% bigger with custom styling
         self.tabs.setStyleSheet("""
@@ -147,60 +169,23 @@ class NotepadWindow(QMainWindow):
         # Add the tabs to the editor splitter
         self.editor_splitter.addWidget(self.tabs)
         
-        # Create a scroll area for the title segments
-        self.title_segments_scroll = QScrollArea()
-        self.title_segments_scroll.setWidgetResizable(True)
-        self.title_segments_scroll.setMinimumWidth(150)
-        self.title_segments_scroll.setMaximumWidth(200)
-        self.title_segments_scroll.setStyleSheet("""
-            QScrollArea {
-                border: none;
-                background-color: #1e1e1e;
-            }
-            QScrollArea > QWidget > QWidget {
-                background-color: #1e1e1e;
-            }
-        """)
-        
-        # Create container widget for title segments
-        self.title_segments_container = QWidget()
-        self.title_segments_container.setStyleSheet("""
-            QWidget {
-                background-color: #1e1e1e;
-            }
-            QPushButton {
-                text-align: left;
-                padding: 8px;
-                border: none;
-                background-color: #1e1e1e;
-                color: #d4d4d4;
-                font-size: 14px;  /* Increased from 12px to 14px */
-                width: 100%;
-                margin: 0;
-            }
-            QPushButton:hover {
-                background-color: #2d2d2d;
-            }
-            QPushButton:pressed {
-                background-color: #3d3d3d;
-            }
-        """)
-        
-        # Create layout for title segments
-        self.title_segments_layout_inner = QVBoxLayout(self.title_segments_container)
-        self.title_segments_layout_inner.setContentsMargins(0, 0, 0, 0)
-        self.title_segments_layout_inner.setSpacing(0)
-        self.title_segments_layout_inner.addStretch()
-        
-        self.title_segments_scroll.setWidget(self.title_segments_container)
-        
+        # Title segment navigator: a virtualized list of the current editor's titles.
+        # Each tab has its own model; this empty one is shown when there is no editor
+        self._no_titles = TitleListModel(parent=self)
+        self.title_model = self._no_titles
+        self.title_navigator = TitleNavigator()
+        self.title_navigator.setMinimumWidth(150)
+        self.title_navigator.setMaximumWidth(200)
+        self.title_navigator.setModel(self.title_model)
+        self.title_navigator.titleActivated.connect(self.scrollToLine)
+
         # Create a container widget for the title segments scroll area
         self.title_segments_widget = QWidget()
         self.title_segments_widget.setStyleSheet("background-color: #1e1e1e;")
         self.title_segments_layout = QVBoxLayout(self.title_segments_widget)
         self.title_segments_layout.setContentsMargins(0, 0, 0, 0)
         self.title_segments_layout.setSpacing(0)
-        self.title_segments_layout.addWidget(self.title_segments_scroll)
+        self.title_segments_layout.addWidget(self.title_navigator)
         
         # Add the title segments widget directly after the tabs widget
         self.editor_splitter.insertWidget(1, self.title_segments_widget)
@@ -227,12 +212,8 @@ class NotepadWindow(QMainWindow):
         self.image_scroll.setWidgetResizable(True)
         self.image_scroll.setMinimumWidth(300)  # Set minimum width for image pane
         
-        # Create a widget to hold multiple images
-        self.image_container = QWidget()
-        self.image_layout = QGridLayout(self.image_container)
-        self.image_layout.setAlignment(Qt.AlignHCenter | Qt.AlignTop)  # Center horizontally, align top vertically
-        self.image_layout.setContentsMargins(20, 20, 20, 20)  # Add some padding around the edges
-        self.image_layout.setSpacing(20)  # Add space between images
+        # Each tab builds its own image widget; this empty one is shown when there is none
+        self.image_container, _ = self._newImageWidget()
         self.image_scroll.setWidget(self.image_container)
         
         # Add the image scroll area to the right of the splitter
@@ -248,7 +229,12 @@ class NotepadWindow(QMainWindow):
         self.image_pane_visible = True
 
         self.backup = Backup(self)
+        self.file_saver = FileSaver(self)
+        self.journals = JournalManager(self)
+        self.send_queue = SendQueue(self, self.backup.store)
+        self.send_queue.finished.connect(self._onSendFinished)
         self.script_runner = ScriptRunner(self)
+        self.plugins = PluginRegistry(self.script_runner)
         self.search_widget = None
 
         self.createActions()
@@ -266,20 +252,37 @@ class NotepadWindow(QMainWindow):
         self.statusBar().showMessage("Ready")
         self.statusBar().setStyleSheet("QStatusBar { min-height: 40px; font-size: 20px; }")
 
+        self.last_modified_time = None
+        self.current_file = None
+
+        # Watch every open file for changes made by other programs (before the last file is reopened)
+        self.file_monitor = ExternalChangeMonitor(self)
+
+        # Opt-in: frees the documents of background tabs (View > Hibernate Inactive Tabs)
+        self.hibernation = TabHibernation(self)
+        self.hibernateTabsAct.setChecked(self.hibernation.enabled)
+
+        # Per-action timings (View > Latency HUD / Latency Stats)
+        self.trace_hud = TraceHud(self)
+        self.statusBar().addPermanentWidget(self.trace_hud)
+        self.profiler = Profiler(self)
+        self.profiler.stopped.connect(self._onProfilerStopped)
+        self.input_recorder = InputRecorder(self)
+        self.input_recorder.stopped.connect(lambda path: self.recordInputAct.setChecked(False))
+
+        # Tabs and pane layout of the previous run (~/.config/notepadmod/session.json)
+        self.session = Session(self)
+
+        # Build file index for faster searches (in the background once the window is shown)
+        self.build_file_index()
+
         self.initializeRecentFiles()
 
+        self.startup.mark("window initialized")
         logging.debug("NotepadWindow initialized.")
 
-        # Connect text change signal to update title segments
-        self.tabs.currentChanged.connect(self.updateTitleSegments)
-
-        self.last_modified_time = None
-        self.current_file = None
-        
-        # Set up timer to check for external changes every 2 seconds
-        self.check_timer = QTimer(self)
-        self.check_timer.timeout.connect(self.check_external_changes)
-        self.check_timer.start(2000)
+        # Offer to replay edit journals left behind by a crash once the window is up
+        QTimer.singleShot(0, self.journals.recover)
 
     def initializeRecentFiles(self):
         menubar = self.menuBar()
@@ -308,6 +311,10 @@ class NotepadWindow(QMainWindow):
             recent_files_path="/home/j/Desktop/notepadmod/recentfiles.txt"
         )
 
+        # Reopen the tabs of the last session; only the current one is read now
+        if self.session.restore():
+            return
+
         # Try to open the last file that was open
         last_file, cursor_pos, scroll_pos = self.load_last_file()
         if last_file and os.path.exists(last_file):
@@ -320,6 +327,7 @@ class NotepadWindow(QMainWindow):
         # File actions
         self.newAct = QAction("New", self, shortcut="Ctrl+N", triggered=self.newTab)
         self.openAct = QAction("Open", self, shortcut="Ctrl+O", triggered=self.openDialog)
+        self.quickOpenAct = QAction("Quick Open...", self, shortcut="Ctrl+P", triggered=self.openQuickOpen)
         self.saveAct = QAction("Save", self, shortcut="Ctrl+S", triggered=self.saveFile)
         self.saveAsAct = QAction("Save As", self)
         self.saveAsAct.setShortcut("Ctrl+Shift+S")
@@ -327,6 +335,7 @@ class NotepadWindow(QMainWindow):
         self.saveAsAct.triggered.connect(self.saveFileAs)
         self.addAction(self.saveAsAct)  # Add to window to enable the shortcut
         self.backupAct = QAction("Backup", self, triggered=self.backup.backupCurrentFile)
+        self.browseBackupsAct = QAction("Browse Backups...", self, triggered=self.openBackupBrowser)
         self.closeTabAct = QAction("Close Tab", self, shortcut="Ctrl+W", triggered=self.closeCurrentTab)
         
         # Edit actions
@@ -334,6 +343,7 @@ class NotepadWindow(QMainWindow):
         self.copyAct = QAction("Copy", self, shortcut="Ctrl+C", triggered=self.copyText)
         self.pasteAct = QAction("Paste", self, shortcut="Ctrl+V", triggered=self.pasteText)
         self.findAct = QAction("Find", self, shortcut="Ctrl+F", triggered=self.openFindDialog)
+        self.runPipelineAct = QAction("Run Cleanup Pipeline...", self, triggered=self.runPipeline)
         
         # Add intro toolbar action
         self.runIntroToolbarAct = QAction("intro", self)
@@ -350,10 +360,6 @@ class NotepadWindow(QMainWindow):
         self.runContextToolbarAct.setToolTip("Context - Add explanation for highlighted text")
         self.runContextToolbarAct.triggered.connect(self.script_runner.runContextScript)
         
-        # Add STB button to toolbar actions
-        self.runSTBToolbarAct = QAction("STB-", self, triggered=self.runSTBScript)
-        self.runSTBToolbarAct.setToolTip("STB- - Rewrite and improve text")
-        
         # Add STBC button to toolbar actions
         self.runSTBCToolbarAct = QAction("STBC", self)
         self.runSTBCToolbarAct.setToolTip("STBC - Rewrite with context awareness")
@@ -386,40 +392,30 @@ class NotepadWindow(QMainWindow):
         self.runSegmentSorterToolbarAct.setToolTip("segmentmover - Sort and format text segments - Parent Folder Name: gui71")
 
         # Script runner actions (menu)
-        self.runTimeSaverMenuAct = QAction("Run timeSaver4445", self, triggered=self.runTimeSaverScript)
         self.runIntroMenuAct = QAction("Run intro", self, triggered=self.runIntroScript)
         self.runOutroMenuAct = QAction("Run outro", self, triggered=self.runOutroScript)
-        self.runTs1MenuAct = QAction("Run ts1", self, triggered=self.runTs1Script)
         self.runQqMenuAct = QAction("Run qq", self, triggered=self.runQqScript)
-        self.runShrtnMenuAct = QAction("Run shrtn", self, triggered=self.runShrtnScript)
         self.runSynMenuAct = QAction("Run syn", self, triggered=self.runSynScript)
         self.runTestModelMenuAct = QAction("Run test_model", self, triggered=self.runTestModelScript)
         self.runTestModelExperimentalMenuAct = QAction("Run test_model_experimental", self, triggered=self.runTestModelExperimentalScript)
         self.runTestModel3MenuAct = QAction("Run test_model_3", self, triggered=self.runTestModel3Script)
         self.runTestModel4MenuAct = QAction("Run test_model_4", self, triggered=self.runTestModel4Script)
+        self.pluginMenuActs = [self.plugins.createAction(manifest, self, f"Run {manifest['name']}")
+                               for manifest in self.plugins.manifests(menu="edit")]
 
         # Script runner actions (toolbar)
-        self.runTimeSaverToolbarAct = QAction("timeSaver4445", self, triggered=self.runTimeSaverScript)
-        self.runTimeSaverToolbarAct.setToolTip("timeSaver4445 - Process and format text")
-
         self.runIntroToolbarAct = QAction("intro", self, triggered=self.runIntroScript)
         self.runIntroToolbarAct.setToolTip("intro - Generate introduction text")
 
         self.runOutroToolbarAct = QAction("outro", self, triggered=self.runOutroScript)
         self.runOutroToolbarAct.setToolTip("outro - Generate conclusion text")
 
-        self.runTs1ToolbarAct = QAction("ts1", self, triggered=self.runTs1Script)
-        self.runTs1ToolbarAct.setToolTip("ts1 - Text processing script 1")
-
         self.runDeepStateAct = QAction("DeepState", self, triggered=self.convertToDeepStateLink)
         self.runDeepStateAct.setToolTip("Convert GPS coordinates to DeepState map links")
 
         self.runQqToolbarAct = QAction("qq", self, triggered=self.runQqScript)
         self.runQqToolbarAct.setToolTip("qq - Quick query processing")
 
-        self.runShrtnToolbarAct = QAction("shrtn", self, triggered=self.runShrtnScript)
-        self.runShrtnToolbarAct.setToolTip("shrtn - Text shortening tool")
-
         self.runSynToolbarAct = QAction("syn", self, triggered=self.runSynScript)
         self.runSynToolbarAct.setToolTip("syn - Syntax processing tool")
 
@@ -440,6 +436,25 @@ class NotepadWindow(QMainWindow):
         self.toggleImagePaneAct.setShortcut("Ctrl+I")
         self.toggleImagePaneAct.triggered.connect(self.toggleImagePane)
 
+        self.hibernateTabsAct = QAction("Hibernate Inactive Tabs", self, checkable=True)
+        self.hibernateTabsAct.setToolTip("Write idle background tabs to disk and free their memory; they are restored when selected")
+        self.hibernateTabsAct.triggered.connect(lambda on: self.hibernation.setEnabled(on))
+
+        self.latencyHudAct = QAction("Latency HUD", self, checkable=True, shortcut="Ctrl+Shift+L")
+        self.latencyHudAct.setToolTip("Show the time of the last action and its phases in the status bar")
+        self.latencyHudAct.triggered.connect(lambda on: self.trace_hud.setActive(on))
+        self.latencyStatsAct = QAction("Latency Stats...", self, triggered=self.openLatencyStats)
+
+        self.profileSamplingAct = QAction("Sampling Profile (all threads)", self, checkable=True)
+        self.profileSamplingAct.triggered.connect(lambda on: self.toggleProfiler(Profiler.SAMPLING, on))
+        self.profileCProfileAct = QAction("cProfile (GUI thread)", self, checkable=True)
+        self.profileCProfileAct.triggered.connect(lambda on: self.toggleProfiler(Profiler.CPROFILE, on))
+
+        self.recordInputAct = QAction("Record Input", self, checkable=True, shortcut="Ctrl+Shift+R")
+        self.recordInputAct.setToolTip(f"Record keys, scrolling, tab switches and actions until unchecked; "
+                                       f"written to {TRACES_DIR} for benchmarks/replay.py")
+        self.recordInputAct.triggered.connect(self.toggleInputRecording)
+
         # Add translate action
         self.translateAct = QAction("Translate", self)
         self.translateAct.setToolTip("Translate selected text")
@@ -450,12 +465,6 @@ class NotepadWindow(QMainWindow):
         self.runModel2iToolbarAct.setToolTip("model2i - Test model2i functionality")
 
         # Add STB button to toolbar actions
-        self.runSTBToolbarAct = QAction("STB-", self, triggered=self.runSTBScript)
-        self.runSTBToolbarAct.setToolTip("STB- - Rewrite and improve text")
-
-        # Add STB menu action (optional, but consistent with other scripts)
-        self.runSTBMenuAct = QAction("Run STB", self, triggered=self.runSTBScript)
-
         # Add Grammar toolbar action
         self.runGrammarToolbarAct = QAction("Grammar", self)
         self.runGrammarToolbarAct.setToolTip("Grammar processing tool")
@@ -480,10 +489,12 @@ class NotepadWindow(QMainWindow):
         fileMenu = menubar.addMenu("&File")
         fileMenu.addAction(self.newAct)
         fileMenu.addAction(self.openAct)
+        fileMenu.addAction(self.quickOpenAct)
         fileMenu.addAction(self.saveAct)
         fileMenu.addAction(self.saveAsAct)
         fileMenu.addSeparator()
         fileMenu.addAction(self.backupAct)
+        fileMenu.addAction(self.browseBackupsAct)
         fileMenu.addAction(self.closeTabAct)
 
         editMenu = menubar.addMenu("&Edit")
@@ -492,25 +503,36 @@ class NotepadWindow(QMainWindow):
         editMenu.addAction(self.pasteAct)
         editMenu.addSeparator()
         editMenu.addAction(self.findAct)
+        editMenu.addAction(self.runPipelineAct)
         editMenu.addSeparator()
 
         # Existing scripts
-        editMenu.addAction(self.runTimeSaverMenuAct)
         editMenu.addAction(self.runIntroMenuAct)
         editMenu.addAction(self.runOutroMenuAct)
-        editMenu.addAction(self.runTs1MenuAct)
         editMenu.addAction(self.runQqMenuAct)
-        editMenu.addAction(self.runShrtnMenuAct)
         editMenu.addAction(self.runSynMenuAct)
         editMenu.addAction(self.runTestModelMenuAct)
         editMenu.addAction(self.runTestModelExperimentalMenuAct)
         editMenu.addAction(self.runTestModel3MenuAct)
         editMenu.addAction(self.runTestModel4MenuAct)
-        editMenu.addAction(self.runSTBMenuAct)
+
+        # Script plugins (scripts/ modules with a PLUGIN manifest)
+        for action in self.pluginMenuActs:
+            editMenu.addAction(action)
 
         # Add View menu
         self.viewMenu = self.menuBar().addMenu("View")
         self.viewMenu.addAction(self.toggleImagePaneAct)
+        self.viewMenu.addAction(self.hibernateTabsAct)
+        self.viewMenu.addAction(self.latencyHudAct)
+        self.viewMenu.addAction(self.latencyStatsAct)
+        profilerMenu = self.viewMenu.addMenu("Profiler")
+        profilerMenu.setToolTipsVisible(True)
+        for action in (self.profileSamplingAct, self.profileCProfileAct):
+            action.setToolTip(f"Profile until unchecked or for {PROFILE_SECONDS} s; written to {PROFILES_DIR}")
+            profilerMenu.addAction(action)
+        profilerMenu.addSeparator()
+        profilerMenu.addAction(self.recordInputAct)
         self.viewMenu.addSeparator()
         self.draftViewCountAct = QAction("Draft View Count", self, triggered=self.draftViewCount)
         self.viewMenu.addAction(self.draftViewCountAct)
@@ -543,18 +565,18 @@ class NotepadWindow(QMainWindow):
         self.setToolButtonStyle(Qt.ToolButtonTextOnly)
         self.addToolBarBreak()
 
-        # First row: test models and timeSaver
+        # First row: test models
         toolbar1.addAction(self.newAct)
         toolbar1.addAction(self.runTestModelToolbarAct)
         toolbar1.addAction(self.runTestModelExperimentalToolbarAct)
         toolbar1.addAction(self.runTestModel3ToolbarAct)
         toolbar1.addAction(self.runTestModel4ToolbarAct)
-        toolbar1.addAction(self.runTimeSaverToolbarAct)
         toolbar1.addAction(self.runIntroToolbarAct)
         toolbar1.addAction(self.runOutroToolbarAct)
         toolbar1.addAction(self.runGpsToolbarAct)  # Add GPS button
         toolbar1.addAction(self.runDeepStateAct)  # Add DeepState button
         toolbar1.addAction(self.runContextToolbarAct)  # Add Context button
+        self.addPluginActions(toolbar1, 1)
 
         # Add first toolbar and force a break
         self.addToolBar(Qt.TopToolBarArea, toolbar1)
@@ -563,18 +585,10 @@ class NotepadWindow(QMainWindow):
         # Second row: remaining tools
         toolbar2.addAction(self.runSegmentSorterToolbarAct)  # Moved to start of toolbar2
         toolbar2.addAction(self.runQqToolbarAct)
-        toolbar2.addAction(self.runShrtnToolbarAct)
         toolbar2.addAction(self.runSynToolbarAct)
-        toolbar2.addAction(self.runSTBToolbarAct)
-        toolbar2.addAction(self.runSTBCToolbarAct)  # Add STBC button right after STB
+        toolbar2.addAction(self.runSTBCToolbarAct)  # Add STBC button
         toolbar2.addAction(self.runGrammarToolbarAct)  # Add Grammar button
-        
-        # Add CmntSntmnt button to toolbar2
-        self.runCmntSntmntToolbarAct = QAction("CmntSntmnt", self)
-        self.runCmntSntmntToolbarAct.setToolTip("CmntSntmnt - Analyze sentiment of highlighted comments")
-        self.runCmntSntmntToolbarAct.triggered.connect(self.script_runner.runCmntSntmntScript)
-        toolbar2.addAction(self.runCmntSntmntToolbarAct)
-        logging.critical("Added CmntSntmnt button to toolbar2")
+        self.addPluginActions(toolbar2, 2)  # shrtn, STB-, CmntSntmnt
 
         # Add second toolbar
         self.addToolBar(Qt.TopToolBarArea, toolbar2)
@@ -833,11 +847,6 @@ class NotepadWindow(QMainWindow):
             QMessageBox.warning(self, "Warning", "Please save the file first.")
             return
 
-        # Save the current cursor and scroll positions
-        cursor = editor.textCursor()
-        cursor_position = cursor.position()
-        scroll_value = editor.verticalScrollBar().value()
-
         script_path = "/home/j/Desktop/code/gui71/segmentMoversAllv6.py"
         if not os.path.exists(script_path):
             QMessageBox.critical(self, "Error", f"Script not found at {script_path}")
@@ -852,58 +861,16 @@ class NotepadWindow(QMainWindow):
                 with open(current_file, 'r', encoding='utf-8') as f:
                     content = f.read()
                     
-                # Split into lines and process
-                lines = content.splitlines()
-                new_lines = []
-                
-                in_segment = False
-                found_first_cc = False
-                
-                i = 0
-                while i < len(lines):
-                    line = lines[i].strip()
-                    
-                    # Check for new segment
-                    if line.startswith('"Title:') or line.startswith("'Title:"):
-                        # Add current line
-                        new_lines.append(lines[i])
-                        in_segment = True
-                        found_first_cc = False
-                    # Check for first cc- in segment
-                    elif in_segment and line.startswith('cc-') and not found_first_cc:
-                        # Add 4 empty lines before the first cc- line
-                        new_lines.extend([''] * 4)
-                        new_lines.append(lines[i])
-                        found_first_cc = True
-                    # Regular cc- line (not first in segment)
-                    elif line.startswith('cc-'):
-                        # Add empty line before if there isn't one already
-                        if new_lines and new_lines[-1].strip():
-                            new_lines.append('')
-                        # Add the cc- line
-                        new_lines.append(lines[i])
-                        # Add empty line after if next line isn't empty
-                        if i + 1 < len(lines) and lines[i + 1].strip():
-                            new_lines.append('')
-                    else:
-                        new_lines.append(lines[i])
-                    i += 1
-                
+                # Space out the cc- lines
+                new_text = get_pipeline("cc-spacing").run_text(content)
+
                 # Write back to file
                 with open(current_file, 'w', encoding='utf-8') as f:
-                    f.write('\n'.join(new_lines))
+                    f.write(new_text)
                 
-                # Update editor content
-                editor.setPlainText('\n'.join(new_lines))
-                
-                # Restore cursor position, making sure it's within the valid range
-                new_cursor = editor.textCursor()
-                new_position = min(cursor_position, len('\n'.join(new_lines)))
-                new_cursor.setPosition(new_position)
-                editor.setTextCursor(new_cursor)
-                
-                # Restore scroll position
-                editor.verticalScrollBar().setValue(scroll_value)
+                # Update editor content in place; the tab now matches the file again
+                apply_text(editor, new_text)
+                self.markInSyncWithDisk(editor, new_text)
                 
                 self.statusBar().showMessage("Segment sorter completed successfully.", 5000)
                 
@@ -953,17 +920,17 @@ class NotepadWindow(QMainWindow):
             current_index = cursor.blockNumber()
             block = editor.document().findBlockByNumber(current_index)
             block_text = block.text()
-            import re
-            media_regex = re.compile(r'^\s*[/\\].*\.(png|jpg|jpeg|gif|bmp|webp)$', re.IGNORECASE)
 
-            if media_regex.match(block_text.strip()):
+            if block_info(block).kind == MEDIA_PATH:
                 # Determine contiguous media file blocks
-                start_line = current_index
-                end_line = current_index
-                while start_line > 0 and media_regex.match(editor.document().findBlockByNumber(start_line - 1).text().strip()):
-                    start_line -= 1
-                while end_line < editor.document().blockCount() - 1 and media_regex.match(editor.document().findBlockByNumber(end_line + 1).text().strip()):
-                    end_line += 1
+                start_block = block
+                while start_block.previous().isValid() and block_info(start_block.previous()).kind == MEDIA_PATH:
+                    start_block = start_block.previous()
+                end_block = block
+                while end_block.next().isValid() and block_info(end_block.next()).kind == MEDIA_PATH:
+                    end_block = end_block.next()
+                start_line = start_block.blockNumber()
+                end_line = end_block.blockNumber()
                 # Select the blocks from start_line to end_line
                 block_start = editor.document().findBlockByNumber(start_line)
                 block_end = editor.document().findBlockByNumber(end_line)
@@ -995,7 +962,7 @@ class NotepadWindow(QMainWindow):
                 logging.info("Double dash operation completed on media file path group.")
             else:
                 # Update only the current block
-                if not block_text.lstrip().startswith("--"):
+                if block_info(block).kind not in (MEDIA, MEDIA_LINK, WORD_IMAGE):
                     old_position = cursor.position()
                     selection_cursor = editor.textCursor()
                     selection_cursor.select(QTextCursor.BlockUnderCursor)
@@ -1015,8 +982,10 @@ class NotepadWindow(QMainWindow):
         return
 
     # Script Runner Hooks
-    def runTimeSaverScript(self):
-        self.script_runner.run_timeSaverScript()
+    def addPluginActions(self, toolbar, row):
+        """Add a button for every script plugin whose manifest puts it in this toolbar row."""
+        for manifest in self.plugins.manifests(toolbar=row):
+            toolbar.addAction(self.plugins.createAction(manifest, self))
 
     def runIntroScript(self):
         import os, subprocess
@@ -1067,15 +1036,9 @@ class NotepadWindow(QMainWindow):
     def runOutroScript(self):
         self.script_runner.runOutroScript()
 
-    def runTs1Script(self):
-        self.script_runner.runTs1Script()
-
     def runQqScript(self):
         self.script_runner.runQqScript()
 
-    def runShrtnScript(self):
-        self.script_runner.runShrtnScript()
-
     # NEW: syn
     def runSynScript(self):
         self.script_runner.runSynScript()
@@ -1091,15 +1054,6 @@ class NotepadWindow(QMainWindow):
 
     def runC6SortV2Script(self):
         self.script_runner.run_c6sortv2_script_on_tab()
-        editor = self.currentEditor()
-        if editor:
-            filepath = editor.property("filepath")
-            if filepath and os.path.exists(filepath):
-                new_mtime = os.path.getmtime(filepath)
-                editor.setProperty("last_modified_time", new_mtime)
-        # Clear any external change warning if it was set
-        self.statusBar().setStyleSheet("")
-        self.statusBar().clearMessage()
 
     # Tab management
     def newTab(self):
@@ -1107,16 +1061,22 @@ class NotepadWindow(QMainWindow):
         index = self.tabs.addTab(editor, "Untitled")
         self.tabs.setCurrentIndex(index)
         editor.setFocus()
-        # Connect text change signal to update title segments
-        editor.textChanged.connect(self.updateTitleSegments)
+        self._connectEditor(editor)
+        self.journals.attach(editor)
+
+        # Update title segments in the next frame
+        self.scheduleTitleUpdate()
+        return editor
+
+    def _connectEditor(self, editor):
+        """Wire a new editor to the unsaved-changes marker and the side panes"""
         editor.document().contentsChanged.connect(lambda: self.markUnsavedChanges(editor))
+        # Connect text change signal to update title segments
+        editor.textChanged.connect(self.scheduleTitleUpdate)
         editor.verticalScrollBar().valueChanged.connect(self.syncImageScroll)
         # Add scroll event connection for title highlighting
-        editor.verticalScrollBar().valueChanged.connect(self.updateTitleSegments)
-        
-        # Update title segments immediately
-        self.updateTitleSegments()
-        return editor
+        editor.verticalScrollBar().valueChanged.connect(self.scheduleTitleUpdate)
+        editor.cursorPositionChanged.connect(self.scheduleTitleUpdate)
 
     def dragEnterEvent(self, event):
         # Accept drag event if it contains URLs with supported file extensions
@@ -1150,10 +1110,12 @@ class NotepadWindow(QMainWindow):
                 logging.info(f"Cancelled closing tab at index {index} due to unsaved changes.")
                 return
         
-            # Remove any title segment buttons for this tab
-            self.updateTitleSegments()
-        
+            self.journals.detach(widget)
+            self.file_monitor.unwatch(widget)
+            self.hibernation.discard(widget)
+            # Switches the side panes to the next tab if this one was current
             self.tabs.removeTab(index)
+            self.dropPaneState(widget)
             widget.deleteLater()
             logging.info(f"Closed tab at index {index}.")
         if self.tabs.count() == 0:
@@ -1171,7 +1133,9 @@ class NotepadWindow(QMainWindow):
         """
         Returns the currently active Editor instance.
         """
-        return self.tabs.currentWidget()
+        widget = self.tabs.currentWidget()
+        # A hibernated tab is restored when it becomes current; None if that failed
+        return None if self.hibernation.isHibernated(widget) else widget
 
     # File Operations
     def openDialog(self):
@@ -1179,6 +1143,55 @@ class NotepadWindow(QMainWindow):
         if fname:
             self.openFile(fname)
 
+    def toggleProfiler(self, mode, on):
+        if on:
+            self.profiler.start(mode)
+            running = self.profileSamplingAct if mode == Profiler.SAMPLING else self.profileCProfileAct
+            for action in (self.profileSamplingAct, self.profileCProfileAct):
+                action.setEnabled(action is running)
+        else:
+            self.profiler.stop()
+
+    def _onProfilerStopped(self, path):
+        for action in (self.profileSamplingAct, self.profileCProfileAct):
+            action.setChecked(False)
+            action.setEnabled(True)
+
+    def toggleInputRecording(self, on):
+        if on:
+            self.input_recorder.start(exclude=[self.recordInputAct])
+        else:
+            self.input_recorder.stop()
+
+    def openLatencyStats(self):
+        if getattr(self, 'latency_stats', None) is None:
+            self.latency_stats = TraceStatsDialog(self)
+        self.latency_stats.show()
+        self.latency_stats.raise_()
+
+    def openQuickOpen(self):
+        if not hasattr(self, 'recent_files'):
+            return
+        if getattr(self, 'quick_open', None) is None:
+            self.quick_open = QuickOpenDialog(self.recent_files.files, self)
+        self.quick_open.popup()
+
+    def openFiles(self, paths):
+        """Open files passed by another launch (see single_instance) and bring the window forward."""
+        for path in paths:
+            # A file that is already open just gets its tab selected
+            for i in range(self.tabs.count()):
+                if self.tabs.widget(i).property("filepath") == path:
+                    self.tabs.setCurrentIndex(i)
+                    break
+            else:
+                self.openFile(path)
+        if self.isMinimized():
+            self.showNormal()
+        self.raise_()
+        self.activateWindow()
+
+    @tracing.traced("open file")
     def openFile(self, fname, cursor_pos=0, scroll_pos=0):
         if not os.path.exists(fname):
             QMessageBox.warning(self, "Error", f"File does not exist: {fname}")
@@ -1191,17 +1204,18 @@ class NotepadWindow(QMainWindow):
             QMessageBox.information(self, "Unsupported", f"Failed to open file: {e}")
             logging.error(f"Failed to open file {fname}: {e}")
             return
+        tracing.mark("read")
 
         editor = Editor(parent=self)
         editor.setPlainText(text)
+        tracing.mark("setText")
         editor.setProperty("filepath", fname)
         editor.setProperty("last_modified_time", os.path.getmtime(fname))
-        editor.document().contentsChanged.connect(lambda: self.markUnsavedChanges(editor))
-        editor.textChanged.connect(self.updateTitleSegments)
-        editor.verticalScrollBar().valueChanged.connect(self.syncImageScroll)
-        # Add scroll event connection for title highlighting
-        editor.verticalScrollBar().valueChanged.connect(self.updateTitleSegments)
-        
+        self.file_saver.remember(fname, text)
+        self.journals.attach(editor, self.file_saver.saved_digest(fname))
+        self._connectEditor(editor)
+        tracing.mark("journal")
+
         # Set cursor and scroll position
         cursor = editor.textCursor()
         cursor.setPosition(cursor_pos)
@@ -1210,14 +1224,16 @@ class NotepadWindow(QMainWindow):
         
         self.tabs.addTab(editor, os.path.basename(fname))
         self.tabs.setCurrentWidget(editor)
+        tracing.mark("tab")
+        self.file_monitor.watch(editor, text)
         self.statusBar().showMessage(f"Opened file: {fname}", 5000)
         logging.info(f"Opened file: {fname} at position {cursor_pos}")
 
         if hasattr(self, 'recent_files'):
             self.recent_files.add_file(fname)
             
-        # Update title segments immediately after opening
-        self.updateTitleSegments()
+        # Update title segments right after opening
+        self.scheduleTitleUpdate()
 
         if fname:
             self.current_file = fname
@@ -1228,30 +1244,7 @@ class NotepadWindow(QMainWindow):
         if not editor:
             logging.warning("Save action triggered with no open editor.")
             return False
-        filepath = editor.property("filepath")
-        if filepath:
-            # Check if the save operation succeeded
-            if self.doSave(editor, filepath):
-                # Update properties after successful save
-                try:
-                    editor.setProperty("last_modified_time", os.path.getmtime(filepath))
-                except OSError as e:
-                    logging.error(f"Could not get mtime for {filepath}: {e}")
-                    editor.setProperty("last_modified_time", None) # Reset if error
-                editor.document().setModified(False) # Mark as saved
-                self.updateTabTitle(editor, saved=True) # Update title to remove asterisk
-                # Add to recent files (doSave doesn't handle this)
-                if hasattr(self, 'recent_files'):
-                    self.recent_files.add_file(filepath)
-                # Clear external change warning from status bar is handled in doSave
-                return True
-            else:
-                # doSave failed (error message shown in doSave)
-                return False
-        else:
-            # If no filepath exists, call saveFileAs (which handles untitled files)
-            # Corrected call: saveFileAs() doesn't take arguments anymore.
-            return self.saveFileAs()
+        return self._saveEditor(editor)
 
     def saveFileAs(self):
         logging.debug('saveFileAs triggered via shortcut or menu')
@@ -1261,7 +1254,18 @@ class NotepadWindow(QMainWindow):
             logging.warning('No editor is active for Save As.')
             QMessageBox.warning(self, "Save As", "No file is active. Please open a file or create a new tab first.")
             return False
+        return self._saveEditorAs(editor)
+
+    def _saveEditor(self, editor, blocking=False):
+        """Save an editor to its own file, or ask for a name if it is untitled."""
+        filepath = editor.property("filepath")
+        if filepath:
+            # Properties are updated in _onSaveFinished once the write has landed
+            return self.doSave(editor, filepath, blocking=blocking)
+        # If no filepath exists, fall back to Save As (which handles untitled files)
+        return self._saveEditorAs(editor, blocking=blocking)
 
+    def _saveEditorAs(self, editor, blocking=False):
         # Suggest a filename based on the current file if it exists
         current_filepath = editor.property("filepath")
         initial_dir = os.path.dirname(current_filepath) if current_filepath else ""
@@ -1273,57 +1277,94 @@ class NotepadWindow(QMainWindow):
                                              os.path.join(initial_dir, initial_name), # Suggest current path/name
                                              "Text Files (*.txt);;All Files (*)")
 
-        if fname:
-            # Call doSave with the obtained editor and new filename
-            if self.doSave(editor, fname): # Check if doSave succeeded
-                # Update the tab title and properties for the saved file
-                index = self.tabs.indexOf(editor)
-                if index != -1:
-                    self.tabs.setTabText(index, os.path.basename(fname))
-                editor.setProperty("filepath", fname)
-                # Update last modified time *after* successful save
-                try:
-                    editor.setProperty("last_modified_time", os.path.getmtime(fname))
-                except OSError as e:
-                    logging.error(f"Could not get mtime for {fname}: {e}")
-                    editor.setProperty("last_modified_time", None) # Reset if error
-
-                editor.document().setModified(False) # Mark as saved
-                # self.updateTabTitle(editor, saved=True) # Already done by setTabText and setModified above
-                if hasattr(self, 'recent_files'):
-                    self.recent_files.add_file(fname) # Add to recent files
-                return True
-            else:
-                # doSave failed (e.g., permissions error shown in doSave)
-                return False
-        else:
+        if not fname:
             # User cancelled the dialog
             logging.debug("Save As cancelled by user.")
             return False
 
-    def doSave(self, editor, filepath):
+        # The tab moves to the new file in _onSaveFinished, once the write has landed
+        return self.doSave(editor, fname, blocking=blocking, save_as=True)
+
+    @tracing.traced("save")
+    def doSave(self, editor, filepath, blocking=False, save_as=False):
+        """
+        Snapshot the editor text and hand it to the FileSaver. The write (temp file, fsync,
+        rename) happens on a worker thread unless blocking is set; returns False only if the
+        save is already known to have failed. With save_as the tab switches to filepath
+        only if the write succeeds.
+        """
+        snapshot = editor.toPlainText()
+        revision = editor.document().revision()
+        editor.setProperty("save_in_progress", True)
+        tracing.mark("snapshot")
+
+        def on_done(result, rev, editor=editor):
+            self._onSaveFinished(editor, result, rev, save_as)
+
+        result = self.file_saver.save(filepath, snapshot, revision, on_done, blocking=blocking)
+        if blocking:
+            return result.ok
+        self.statusBar().showMessage(f"Saving: {filepath}", 2000)
+        return True
+
+    def _onSaveFinished(self, editor, result, revision, save_as=False):
+        """Runs on the GUI thread after a save job finished, skipped or failed."""
         try:
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(editor.toPlainText())
-            # Properties (filepath, modified status, etc.) are updated by the caller (saveFile/saveFileAs)
-            self.statusBar().showMessage(f"File saved: {filepath}", 5000)
-            logging.info(f"File saved: {filepath}")
-            # Clear potential external change warning after successful save
-            self.statusBar().setStyleSheet("")
-            return True # Indicate success
-        except Exception as e:
-            QMessageBox.warning(self, "Error", f"Failed to save file: {e}")
-            logging.error(f"Failed to save file {filepath}: {e}")
-            return False # Indicate failure
+            editor.setProperty("save_in_progress", self.file_saver.isSaving(result.filepath))
+        except RuntimeError:
+            # The tab was closed while the save was in flight
+            return
+        if not result.ok:
+            # A failed Save As leaves the tab on its previous file (or untitled)
+            QMessageBox.warning(self, "Error", f"Failed to save file: {result.error}")
+            return
+        if save_as:
+            editor.setProperty("filepath", result.filepath)
+            self.updateTabTitle(editor, saved=not editor.document().isModified())
+        if editor.property("filepath") != result.filepath:
+            return
+        # Only now does the on-disk mtime belong to us
+        editor.setProperty("last_modified_time", result.mtime)
+        # Edits made while the write was in flight keep the tab marked as modified
+        if editor.document().revision() == revision:
+            editor.document().setModified(False) # Mark as saved
+            self.updateTabTitle(editor, saved=True) # Update title to remove asterisk
+            # Everything journaled so far is now on disk
+            self.journals.mark_saved(editor, result.digest)
+            self.file_monitor.saved(editor, editor.toPlainText())
+        else:
+            self.file_monitor.saved(editor)
+        if result.skipped:
+            self.statusBar().showMessage(f"No changes to save: {result.filepath}", 5000)
+        else:
+            self.statusBar().showMessage(f"File saved: {result.filepath}", 5000)
+        # Clear potential external change warning after successful save
+        self.statusBar().setStyleSheet("")
+        if hasattr(self, 'recent_files'):
+            self.recent_files.add_file(result.filepath)
+
+    def markInSyncWithDisk(self, editor, text):
+        """Record that text was just written to the editor's file by something other than a save."""
+        filepath = editor.property("filepath")
+        editor.setProperty("last_modified_time", os.path.getmtime(filepath))
+        self.file_saver.remember(filepath, text)
+        if editor.toPlainText() == text:
+            editor.document().setModified(False)
+            self.updateTabTitle(editor, saved=True)
+            self.journals.mark_saved(editor, self.file_saver.saved_digest(filepath))
+        self.file_monitor.saved(editor, text)
 
     def maybeSave(self, editor):
+        # Only tabs without unsaved changes are hibernated
+        if self.hibernation.isHibernated(editor):
+            return True
         if editor.document().isModified():
             ret = QMessageBox.warning(self, "Application",
                 "The document has been modified.\n"
                 "Do you want to save your changes?",
                 QMessageBox.Yes | QMessageBox.No | QMessageBox.Cancel)
             if ret == QMessageBox.Yes:
-                return self.saveFileAs(editor)
+                return self._saveEditor(editor, blocking=True)
             elif ret == QMessageBox.No:
                 return True
             elif ret == QMessageBox.Cancel:
@@ -1385,14 +1426,63 @@ class NotepadWindow(QMainWindow):
         self.find_dialog.show()
         logging.info("Opened Find Dialog.")
 
+    def _onSendFinished(self, target, count, error):
+        name = os.path.basename(target)
+        if error:
+            self.statusBar().showMessage(f"Failed to send {count} segment(s) to {name}: {error} (will retry)", 8000)
+        else:
+            self.statusBar().showMessage(f"Sent {count} segment(s) to {name}", 3000)
+
+    def _reopenUnsentSegments(self):
+        """Put segments that could not be written into new tabs so they are not lost on exit."""
+        failed = self.send_queue.takeFailed()
+        for target, segments in failed.items():
+            editor = self.newTab()
+            editor.setPlainText(prepend_block(segments))
+            editor.document().setModified(True)
+            self.tabs.setTabText(self.tabs.indexOf(editor), f"Unsent: {os.path.basename(target)} *")
+        QMessageBox.warning(
+            self, "Send Failed",
+            "Some segments could not be written to:\n" + "\n".join(failed) +
+            "\n\nThey have been opened in new tabs.")
+
+    def openBackupBrowser(self):
+        self.backup_browser = BackupBrowserDialog(self.backup.store, self)
+        self.backup_browser.show()
+        logging.info("Opened Backup Browser.")
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        # Deferred startup work begins after the first frame has been painted
+        QTimer.singleShot(0, self.startup.start)
+
     def closeEvent(self, event):
+        # Write out queued Send To segments before anything else
+        self.send_queue.flush(blocking=True)
+        if self.send_queue.hasPending():
+            self._reopenUnsentSegments()
+            event.ignore()
+            return
+
         for i in range(self.tabs.count()):
             editor = self.tabs.widget(i)
             if not self.maybeSave(editor):
                 event.ignore()
                 logging.info("Application close canceled by user.")
                 return
+
+        # Let any in-flight background saves land before the process exits
+        self.file_saver.waitForDone()
+        self.startup.waitForDone()
+        # A profile that is still running is written as far as it got
+        self.profiler.stop()
+        self.input_recorder.stop()
+        # Every tab was saved or explicitly discarded, so nothing is left to recover
+        self.journals.discard_all()
+        self.hibernation.discardAll()
         
+        self.session.save()
+
         # Save the current file path before closing
         current_editor = self.currentEditor()
         if current_editor:
@@ -1472,6 +1562,7 @@ class NotepadWindow(QMainWindow):
         """
         Sends the provided text to the external API and returns the response.
         """
+        import requests  # imported on first use; it is slow to import at startup
         api_url = "https://api.example.com/your-endpoint"  # Replace with your API endpoint
         headers = {
             "Content-Type": "application/json",
@@ -1500,13 +1591,25 @@ class NotepadWindow(QMainWindow):
 
     def build_file_index(self):
         """Build an index of all files in search directories for faster lookup"""
-        self.file_index = {}
+        self.startup.background("file index", self._scanFileIndex, self._setFileIndex)
+
+    def _scanFileIndex(self):
+        # Runs on a pool thread: only reads search_dirs and the file system
+        file_index = {}
         for dir_path in self.search_dirs:
             if os.path.exists(dir_path):
                 for root, _, files in os.walk(dir_path):
                     for name in files:
-                        self.file_index[name] = os.path.join(root, name)
-        logging.info("File index built for image searching")
+                        file_index[name] = os.path.join(root, name)
+        return file_index
+
+    def _setFileIndex(self, file_index):
+        self.file_index = file_index
+        logging.info(f"File index built for image searching ({len(file_index)} files)")
+        # Media lines in subdirectories could not be resolved without the index; parse again
+        for state in self.pane_states.values():
+            state.segments_snapshot = None
+        self.updateImageDisplay()
 
     def find_image_path(self, path_or_filename):
         """Find the full path of an image using the same logic as cpyimagesv4.py"""
@@ -1553,60 +1656,81 @@ class NotepadWindow(QMainWindow):
         """Schedule a debounced update of the image display"""
         if not self.image_pane_visible:
             return
-        self._image_update_timer.start(self._image_update_delay)
+        self.scheduler.mark("images")
 
     def _debounced_update_images(self):
-        """Actually perform the image update after the debounce delay"""
+        """Show the images of the segment at the top of the viewport and of the one after it"""
         if not self.image_pane_visible:
             return
-            
-        # Clear existing images and line number mapping
-        while self.image_layout.count():
-            item = self.image_layout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
-        self.image_line_numbers.clear()
-        
-        # Get text from current editor
+
         current_editor = self.currentEditor()
         if not current_editor:
+            self._showImageWidget(None)
             return
-            
-        text = current_editor.toPlainText()
-        lines = text.split('\n')
-        
-        # Get the visible lines range
-        first_block = current_editor.firstVisibleBlock()
-        first_line = first_block.blockNumber()
-        
-        viewport_height = current_editor.viewport().height()
-        last_block = current_editor.cursorForPosition(QPoint(0, viewport_height)).block()
-        last_line = last_block.blockNumber()
+        state = self.paneState(current_editor)
 
-        # Structure to hold segments and their images
+        # Parsed once per revision of this tab's text
+        segments = state.imageSegments(self._parseImageSegments)
+
+        # Get the first visible line
+        first_line = current_editor.firstVisibleBlock().blockNumber()
+
+        # Determine the segment that contains the top of the viewport
+        current_index = None
+        for i, (title, start_line, end_line, images) in enumerate(segments):
+            if start_line <= first_line <= end_line:
+                current_index = i
+                break
+
+        # If no segment contains the first visible line, select the last
+        # segment whose start line is above the viewport
+        if current_index is None:
+            for i in reversed(range(len(segments))):
+                if first_line >= segments[i][1]:
+                    current_index = i
+                    break
+
+        # Build the list of segments to display: the current one and
+        # optionally the next one for context
+        visible_segments = []
+        if current_index is not None:
+            visible_segments.append(segments[current_index])
+            if current_index + 1 < len(segments):
+                visible_segments.append(segments[current_index + 1])
+
+        # Rebuild the pane only if it would show something different
+        key = tuple(visible_segments)
+        if state.image_widget is None or key != state.image_key:
+            widget, line_numbers = self._buildImageWidget(visible_segments)
+            if self._shown_images is state:
+                self._showImageWidget(None)
+            state.dropImages()
+            state.image_widget, state.image_key, state.image_line_numbers = widget, key, line_numbers
+        self._showImageWidget(state)
+
+    def _parseImageSegments(self, snapshot):
+        """(title, start_line, end_line, images) per Title: segment of a document snapshot"""
         segments = []  # List of (title, start_line, end_line, images) tuples
         current_segment = None
         current_images = []
-        
+
         # Import the word image module for creating word images
         sys.path.insert(0, os.path.join(project_root, 'scripts'))
         from word_image import create_word_image
-        
-        # Process lines to identify segments and their images
-        for line_num, line in enumerate(lines):
-            line = line.strip()
-            
-            # Skip empty lines
-            if not line:
-                continue
 
+        kinds = snapshot.kinds
+        # Process lines to identify segments and their images (kinds come from the highlighter)
+        for line_num, (kind, payload) in enumerate(kinds):
             # Check for word image lines (starting with ----)
-            if line.startswith('----'):
-                word_text = line[4:].strip()  # Extract text after the dashes
+            if kind == WORD_IMAGE:
+                word_text = payload  # Text after the dashes
                 if word_text and current_segment:  # Only process if there's text and we're in a segment
                     try:
-                        # Create word image
-                        image_path = create_word_image(word_text, self.word_images_dir)
+                        # Render each word once; later parses reuse the file
+                        image_path = self._word_images.get(word_text)
+                        if not image_path or not os.path.isfile(image_path):
+                            image_path = create_word_image(word_text, self.word_images_dir)
+                            self._word_images[word_text] = image_path
                         # Add to current segment's images
                         current_images.append((image_path, line_num, True))
                     except Exception as e:
@@ -1614,87 +1738,88 @@ class NotepadWindow(QMainWindow):
                 continue
 
             # Check for new segment
-            if line.startswith('"Title:'):
+            if kind == TITLE:
                 # If we have a previous segment, save it
                 if current_segment:
-                    segments.append((current_segment[0], current_segment[1], line_num - 1, current_images))
-                
+                    segments.append((current_segment[0], current_segment[1], line_num - 1, tuple(current_images)))
+
                 # Start new segment
-                title = line.strip('"').split(':', 1)[-1].strip()
+                title = payload
                 current_segment = (title, line_num)
                 current_images = []
-                
+
                 # Add BSQ image if exists
                 specific_image = os.path.join(self.bsqs_dir, f"{title}.png")
                 if os.path.isfile(specific_image):
                     current_images.append((specific_image, line_num, True))
                 elif not current_images:  # Only add generic if no specific BSQ
                     current_images.append((self.generic_bsq, line_num, False))
-                
-            # Check for image lines
-            elif line.startswith('--'):
-                if line.strip().startswith('--http'):
-                    continue
-                    
-                file_path = line.lstrip('-').strip()
+
+            # Check for image lines (--http links are not images)
+            elif kind == MEDIA:
+                file_path = payload
                 full_path = self.find_image_path(file_path)
-                
+
                 if full_path and os.path.isfile(full_path):
                     current_images.append((full_path, line_num, True))
-                    
+
         # Add the last segment if exists
         if current_segment:
-            segments.append((current_segment[0], current_segment[1], len(lines) - 1, current_images))
-
-        # Determine the segment that contains the top of the viewport
-        current_index = None
-        for i, (title, start_line, end_line, images) in enumerate(segments):
-            if start_line <= first_line <= end_line:
-                current_index = i
-                break
-
-        # If no segment contains the first visible line, select the last
-        # segment whose start line is above the viewport
-        if current_index is None:
-            for i in reversed(range(len(segments))):
-                if first_line >= segments[i][1]:
-                    current_index = i
-                    break
-
-        # Build the list of segments to display: the current one and
-        # optionally the next one for context
-        visible_segments = []
-        if current_index is not None:
-            visible_segments.append(segments[current_index])
-            if current_index + 1 < len(segments):
-                visible_segments.append(segments[current_index + 1])
-
-        # Display images for visible segments
+            segments.append((current_segment[0], current_segment[1], len(kinds) - 1, tuple(current_images)))
+        return segments
+
+    def _newImageWidget(self):
+        """An empty image pane widget and its grid layout"""
+        widget = QWidget()
+        layout = QGridLayout(widget)
+        layout.setAlignment(Qt.AlignHCenter | Qt.AlignTop)  # Center horizontally, align top vertically
+        layout.setContentsMargins(20, 20, 20, 20)  # Add some padding around the edges
+        layout.setSpacing(20)  # Add space between images
+        return widget, layout
+
+    def _buildImageWidget(self, visible_segments):
+        """Lay out the images of the given segments; returns the widget and {line number: image widget}"""
+        widget, image_layout = self._newImageWidget()
+        line_numbers = {}
         current_row = 0
-        
+
         # Display regular segment images with word images integrated
-        if visible_segments:
-            for title, start_line, end_line, images in visible_segments:
-                # Add segment title
-                title_label = QLabel(f"Section: {title}")
-                title_label.setStyleSheet("color: white; font-size: 12px; font-weight: bold; background-color: rgba(60, 60, 60, 100); padding: 5px;")
-                title_label.setAlignment(Qt.AlignCenter)
-                self.image_layout.addWidget(title_label, current_row, 0, 1, 2)  # Span both columns
-                current_row += 1
-
-                # Add images for this segment in 2 columns
-                for i, (image_path, line_num, is_specific) in enumerate(images):
-                    container = self.add_image_to_display(image_path, line_num)
-                    if container:
-                        row = current_row + (i // 2)  # Integer division to determine row
-                        col = i % 2   # Modulo to determine column (0 or 1)
-                        self.image_layout.addWidget(container, row, col)
-                        self.image_line_numbers[line_num] = container
-                        
-                current_row += ((len(images) + 1) // 2) + 1  # Move to next row after segment's images
-            
+        for title, start_line, end_line, images in visible_segments:
+            # Add segment title
+            title_label = QLabel(f"Section: {title}")
+            title_label.setStyleSheet("color: white; font-size: 12px; font-weight: bold; background-color: rgba(60, 60, 60, 100); padding: 5px;")
+            title_label.setAlignment(Qt.AlignCenter)
+            image_layout.addWidget(title_label, current_row, 0, 1, 2)  # Span both columns
+            current_row += 1
+
+            # Add images for this segment in 2 columns
+            for i, (image_path, line_num, is_specific) in enumerate(images):
+                container = self.add_image_to_display(image_path, line_num)
+                if container:
+                    row = current_row + (i // 2)  # Integer division to determine row
+                    col = i % 2   # Modulo to determine column (0 or 1)
+                    image_layout.addWidget(container, row, col)
+                    line_numbers[line_num] = container
+
+            current_row += ((len(images) + 1) // 2) + 1  # Move to next row after segment's images
+
         # Add a spacer item at the bottom to keep images at the top
-        self.image_layout.setRowStretch(current_row, 1)
+        image_layout.setRowStretch(current_row, 1)
+        return widget, line_numbers
+
+    def _showImageWidget(self, state):
+        """Put a tab's image widget (None: the empty one) in the image pane, keeping each tab's scroll position"""
+        widget = state.image_widget if state is not None else self.image_container
+        bar = self.image_scroll.verticalScrollBar()
+        if self._shown_images is not None and self._shown_images is not state:
+            self._shown_images.image_scroll = bar.value()
+        if self.image_scroll.widget() is not widget:
+            # takeWidget hands the old widget back instead of deleting it like setWidget would
+            self.image_scroll.takeWidget()
+            self.image_scroll.setWidget(widget)
+            if state is not None:
+                bar.setValue(state.image_scroll)
+        self._shown_images = state
 
     def add_image_to_display(self, file_path, line_num):
         """Create a display widget for an image or media file"""
@@ -1747,10 +1872,9 @@ class NotepadWindow(QMainWindow):
             # Try to generate video thumbnail
             thumbnail_path = self.generate_video_thumbnail(file_path)
             if thumbnail_path:
-                # Load and scale the thumbnail
-                pixmap = QPixmap(thumbnail_path)
-                if not pixmap.isNull():
-                    scaled_pixmap = pixmap.scaledToWidth(108, Qt.SmoothTransformation)
+                # Load and scale the thumbnail (decoded once per file version)
+                scaled_pixmap = self.pixmap_cache.scaled(thumbnail_path, 108)
+                if not scaled_pixmap.isNull():
                     thumbnail.setIcon(QIcon(scaled_pixmap))
                     thumbnail.setIconSize(scaled_pixmap.size())
                 else:
@@ -1846,11 +1970,9 @@ class NotepadWindow(QMainWindow):
         image_button = QPushButton()
         image_button.setCursor(Qt.PointingHandCursor)
         
-        # Load and scale the image
-        pixmap = QPixmap(image_path)
-        if not pixmap.isNull():
-            # Scale the image to fit the width while maintaining aspect ratio
-            scaled_pixmap = pixmap.scaledToWidth(108, Qt.SmoothTransformation)
+        # Load and scale the image to fit the width (decoded once per file version)
+        scaled_pixmap = self.pixmap_cache.scaled(image_path, 108)
+        if not scaled_pixmap.isNull():
             image_button.setIcon(QIcon(scaled_pixmap))
             image_button.setIconSize(scaled_pixmap.size())
             
@@ -1924,7 +2046,7 @@ class NotepadWindow(QMainWindow):
         """Schedule a debounced sync of the image scroll position"""
         if not self.image_pane_visible:
             return
-        self._scroll_sync_timer.start(self._scroll_sync_delay)
+        self.scheduler.mark("image_scroll")
 
     def _debounced_sync_scroll(self):
         """Actually perform the scroll sync after the debounce delay"""
@@ -1945,7 +2067,9 @@ class NotepadWindow(QMainWindow):
 
         # Find the first image that corresponds to a line in the visible range
         target_pos = None
-        for line_num, widget in list(self.image_line_numbers.items()):
+        state = self._shown_images
+        image_line_numbers = state.image_line_numbers if state is not None else {}
+        for line_num, widget in list(image_line_numbers.items()):
             if not widget or not widget.isVisible():
                 continue
             try:
@@ -1953,7 +2077,7 @@ class NotepadWindow(QMainWindow):
                     target_pos = widget.pos().y()
                     break
             except RuntimeError:
-                self.image_line_numbers.pop(line_num, None)
+                image_line_numbers.pop(line_num, None)
                 continue
 
         # If we found a matching image, scroll to it
@@ -1968,12 +2092,10 @@ class NotepadWindow(QMainWindow):
             # Hide image pane
             self.image_scroll.hide()
             self.image_pane_visible = False
-            # Clear the image container to free resources
-            for i in reversed(range(self.image_layout.count())): 
-                widget = self.image_layout.itemAt(i).widget()
-                if widget is not None:
-                    widget.setParent(None)
-                    widget.deleteLater()
+            # Drop the built image panes of every tab to free resources
+            self._showImageWidget(None)
+            for state in self.pane_states.values():
+                state.dropImages()
         else:
             # Show image pane
             self.image_scroll.show()
@@ -1981,173 +2103,99 @@ class NotepadWindow(QMainWindow):
             # Update images if needed
             self.updateImageDisplay()
 
+    def scheduleTitleUpdate(self, *args):
+        """Refresh the title pane in an upcoming frame; bursts of edits and scrolling coalesce."""
+        self.scheduler.mark("titles")
+
+    def paneState(self, editor):
+        """The side pane state of a tab, created on first use"""
+        state = self.pane_states.get(editor)
+        if state is None:
+            state = self.pane_states[editor] = TabPaneState(editor)
+        return state
+
+    def dropPaneState(self, editor):
+        state = self.pane_states.pop(editor, None)
+        if state is None:
+            return
+        if self._shown_titles is state:
+            self._showTitleModel(None)
+        if self._shown_images is state:
+            self._showImageWidget(None)
+        state.discard()
+
+    def onTabChanged(self, index):
+        """Swap in the new tab's navigator and image pane; only what its own edits invalidated is rebuilt"""
+        widget = self.tabs.widget(index)
+        if self.hibernation.isHibernated(widget):
+            self.hibernation.wake(widget)
+        self.hibernation.tabActivated(self.tabs.currentWidget())
+        self.scheduler.cancel("titles")
+        self.updateTitleSegments()
+        if self.image_pane_visible:
+            self.scheduler.cancel("images")
+            self._debounced_update_images()
+
+    def _showTitleModel(self, state):
+        """Put a tab's title model (None: the empty one) in the navigator, keeping each tab's scroll position"""
+        if self._shown_titles is not None and self._shown_titles is not state:
+            self._shown_titles.title_scroll, self._shown_titles.title_first_visible = self.title_navigator.viewState()
+        self.title_model = state.title_model if state is not None else self._no_titles
+        self.title_navigator.setModel(self.title_model)
+        if state is not None:
+            self.title_navigator.restoreViewState(state.title_scroll, state.title_first_visible)
+        self._shown_titles = state
+
     def updateTitleSegments(self):
         """Update the title segments pane with current document's title segments"""
-        # Clear existing buttons
-        while self.title_segments_layout_inner.count() > 0:  # Clear all widgets
-            item = self.title_segments_layout_inner.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
-        
         editor = self.currentEditor()
+        state = self.paneState(editor) if editor else None
+        if state is not self._shown_titles or self.title_navigator.model() is not self.title_model:
+            self._showTitleModel(state)
         if not editor:
             return
-            
-        # Get document text and find title segments
-        text = editor.toPlainText()
-        lines = text.splitlines()
-        segments = []  # List of (title, start_line, end_line)
-        current_segment = None
-        
+
+        # Re-reads the titles only if the document changed
+        self.title_model.refresh()
+
         # Get the visible lines range
-        first_block = editor.firstVisibleBlock()
-        first_line = first_block.blockNumber()
+        first_line = editor.firstVisibleBlock().blockNumber()
         viewport_height = editor.viewport().height()
-        last_block = editor.cursorForPosition(QPoint(0, viewport_height)).block()
-        last_line = last_block.blockNumber()
-        
-        # First pass: collect all segments and their ranges
-        for i, line in enumerate(lines):
-            if re.match(r'^["\']?Title:', line.strip()):
-                if current_segment:
-                    segments.append((current_segment[0], current_segment[1], i - 1))
-                title = re.sub(r'^["\']?Title:', '', line.strip()).strip('"\'').strip()
-                current_segment = (title, i)
-        
-        # Add the last segment
-        if current_segment:
-            segments.append((current_segment[0], current_segment[1], len(lines) - 1))
-        
-        # Track visible buttons and the first visible segment index
-        visible_buttons = []
-        first_visible_segment_index = -1
-        
-        # Create buttons for each segment
-        for index, (title, start_line, end_line) in enumerate(segments):
-            btn = QPushButton(f"Title:{title}")
-            
-            # A segment is visible if:
-            # 1. Its title line is visible, OR
-            # 2. Any significant portion of its content is visible
-            title_visible = first_line <= start_line <= last_line
-            content_visible = (
-                (start_line <= first_line <= end_line) or  # Content starts before viewport
-                (start_line <= last_line <= end_line) or   # Content ends after viewport
-                (first_line <= start_line <= last_line)    # Title is in viewport
-            )
-            
-            is_visible = title_visible or content_visible
-            
-            # Track the first visible segment
-            if is_visible and first_visible_segment_index == -1:
-                first_visible_segment_index = index
-                
-            # Check if title contains the word "news" (case insensitive)
-            has_news = "news" in title.lower()
-            
-            # Determine text color: 
-            # - Orange if visible (overrides green)
-            # - Green if it contains "news" but is not visible
-            # - Grey if not visible and doesn't contain "news"
-            text_color = '#ff9933' if is_visible else ('#27a344' if has_news else '#d4d4d4')
-            
-            btn.setStyleSheet(f"""
-                QPushButton {{
-                    text-align: left;
-                    padding: 8px;
-                    border: none;
-                    background-color: #1e1e1e;
-                    color: {text_color};
-                    font-size: 14px;
-                    font-weight: bold;
-                }}
-                QPushButton:hover {{
-                    background-color: #2d2d2d;
-                }}
-                QPushButton:pressed {{
-                    background-color: #3d3d3d;
-                }}
-            """)
-            
-            # Create a closure to capture the correct line_num
-            def make_click_handler(ln=start_line):
-                return lambda: self.scrollToLine(ln)
-            btn.clicked.connect(make_click_handler())
-            
-            # Add button to layout
-            self.title_segments_layout_inner.addWidget(btn)
-            
-            # Track visible buttons
-            if is_visible:
-                visible_buttons.append(btn)
-            
-        # Add stretch at the end
-        self.title_segments_layout_inner.addStretch()
-        
-        # Ensure the title segments are visible
-        self.title_segments_widget.show()
-        self.title_segments_scroll.show()
-        
-        # Scroll the title segments pane to show the visible titles
-        if first_visible_segment_index >= 0 and visible_buttons:
-            scroll_area = self.title_segments_scroll
-            first_visible_btn = visible_buttons[0]
-            
-            # Use QTimer to ensure the scroll happens after layout is complete
-            def center_visible_title():
-                try:
-                    btn_rect = first_visible_btn.geometry()
-                    viewport_height = scroll_area.viewport().height()
-                    global_btn_pos = first_visible_btn.mapTo(self.title_segments_container, QPoint(0, 0))
-                    target_pos = global_btn_pos.y() + (btn_rect.height() // 2) - (viewport_height // 2)
-                    target_pos = max(0, target_pos)
-                    scroll_area.verticalScrollBar().setValue(target_pos)
-                except RuntimeError:
-                    logging.warning("CenterVisibleTitle: QPushButton has been deleted; skipping centering.")
-            # Use a timer to ensure layout is complete before scrolling
-            QTimer.singleShot(50, center_visible_title)
+        last_line = editor.cursorForPosition(QPoint(0, viewport_height)).block().blockNumber()
+
+        # Color the segments on screen and the one holding the cursor
+        first_visible = self.title_model.setViewport(first_line, last_line)
+        self.title_model.setCurrentLine(editor.textCursor().blockNumber())
+
+        # Keep the first visible title in view in the navigator
+        self.title_navigator.followViewport(first_visible)
 
     def scrollToLine(self, line_num):
         """Find the exact title line and position cursor at its end"""
         editor = self.currentEditor()
         if not editor:
             return
-            
-        # Get the document text
-        text = editor.toPlainText()
-        lines = text.splitlines()
-        
-        # Find the exact title line by searching from the approximate position
-        title_line = None
-        search_range = range(max(0, line_num - 5), min(len(lines), line_num + 5))
-        for i in search_range:
-            if re.match(r'^["\']?Title:', lines[i].strip()):
-                # Add current line
-                title_line = i
-                break
-        
+
+        # The title nearest the approximate line
+        title_line = editor.segments.nearest_title(line_num, 5)
         if title_line is not None:
-            # Calculate the position at the end of the title line
-            pos = 0
-            for i in range(title_line):
-                pos += len(lines[i]) + 1  # +1 for newline
-            pos += len(lines[title_line])  # Add length of the target line
-            
+            block = editor.document().findBlockByNumber(title_line)
+
             # Move cursor to the end of the title line
             cursor = editor.textCursor()
-            cursor.setPosition(pos)
+            cursor.setPosition(block.position() + block.length() - 1)
             editor.setTextCursor(cursor)
             editor.setFocus()
-            
+
             # Ensure the cursor is visible
             editor.ensureCursorVisible()
 
     def check_for_mmm_lines(self):
         editor = self.currentEditor()
         if editor:
-            text = editor.toPlainText()
-            lines = text.splitlines()
-            for line in lines:
+            snapshot = editor.snapshots.current()
+            for line_num in snapshot.lines_of_kind(MMM):
+                line = snapshot.lines[line_num]
                 if line.startswith('mmm-'):
                     # Extract text after 'mmm-'
                     text_to_convert = line[4:].strip()
@@ -2158,14 +2206,14 @@ class NotepadWindow(QMainWindow):
                     if os.path.exists(image_path):
                         logging.debug(f"Found image at: {image_path}")
                         # Display image
-                        self.add_image_to_display(image_path, lines.index(line))
+                        self.add_image_to_display(image_path, line_num)
                     else:
                         logging.warning(f"Image not found for: {text_to_convert}")
 
     def keyPressEvent(self, event):
         super(NotepadWindow, self).keyPressEvent(event)
         # Check for 'mmm-' lines on key press
-        self.check_for_mmm_lines()
+        self.scheduler.mark("mmm")
 
     def runTestModelScript(self):
         """Run the test_model script on the selected text."""
@@ -2191,27 +2239,16 @@ class NotepadWindow(QMainWindow):
         # ... existing code for runModel2iScript ...
         pass
 
-    def runSTBScript(self):
-        """Run the STB script on the current tab's text."""
-        self.script_runner.runSTBScript()
-
     def runSTBCScript(self):
         """Run the STBC script on the current tab's text."""
         self.script_runner.runSTBCScript()
 
     def runCleaner(self):
-        import os, time, shutil
         # Perform backup of the current file
         file_path = self.getCurrentFilePath()
         if file_path:
-            backup_dir = '/home/j/Desktop/Finals/NotepadApp_backups/cleaner/'
-            os.makedirs(backup_dir, exist_ok=True)
-            base = os.path.basename(file_path)
-            name, ext = os.path.splitext(base)
-            timestamp = time.strftime("%Y%m%d_%H%M%S")
-            backup_file = os.path.join(backup_dir, f"{name}_cleaner_{timestamp}{ext}")
             try:
-                shutil.copy(file_path, backup_file)
+                self.backup.snapshot(file_path, "cleaner")
             except Exception as e:
                 from PyQt5.QtWidgets import QMessageBox
                 QMessageBox.warning(self, "Backup Error", f"Error creating backup: {e}")
@@ -2227,86 +2264,12 @@ class NotepadWindow(QMainWindow):
             from PyQt5.QtWidgets import QMessageBox
             QMessageBox.warning(self, "Error", "No editor available.")
             return
-            
-        # Save the current cursor and scroll positions
-        cursor = editor.textCursor()
-        cursor_position = cursor.position()
-        scroll_value = editor.verticalScrollBar().value()
-        
-        text = editor.toPlainText()
-
-        # Define specific patterns to remove - only when they appear exactly as listed
-        patterns_to_remove = [
-            "cc-!!",
-            "cc-Wow",
-            "cc-Great news",
-            "cc-Yes",
-            "cc-Slava Ukraini",
-            "cc-#SlavaUkraini",
-            "cc-Yeah baby!",
-            "cc-",
-            "cc-Lol",
-            "cc-Good",
-            "cc-Sure",
-            "cc-!",
-            "cc-Super",
-            "cc-Nice",
-            "cc-Thank you, Heroiam Slava",
-            "cc-Well done",
-            "cc-YES",  # Added this line
-            "cc-we love this",
-            "cc-Absolutely",
-            "cc-Burn baby burn",
-            "cc-Fuck yea",
-            "cc-MORE",
-            "cc-Tragic",
-            "cc-Thoughts and prayers.",
-            "cc-Hahahahha",
-            "cc-Hoorah!",
-            "cc-Repeat"
-            
-            
-        ]
-        
-        # Remove only the exact lines
-        cleaned_lines = []
-        for line in text.splitlines():
-            line_stripped = line.strip()
-            
-            # Check if the line exactly matches one of the patterns to remove
-            if line_stripped in patterns_to_remove:
-                continue
-            cleaned_lines.append(line)
-
-        # Remove groups of exactly 4 consecutive empty lines
-        result_lines = []
-        empty_count = 0
-        for line in cleaned_lines:
-            if line.strip() == "":
-                empty_count += 1
-            else:
-                if empty_count:
-                    remainder = empty_count % 4
-                    result_lines.extend([""] * remainder)
-                    empty_count = 0
-                result_lines.append(line)
-        if empty_count:
-            remainder = empty_count % 4
-            result_lines.extend([""] * remainder)
 
-        new_text = "\n".join(result_lines)
-        
-        # Update the text while preserving cursor position
-        editor.setPlainText(new_text)
+        # Drop the exact cc- reaction lines and groups of 4 consecutive empty lines in one pass
+        new_text = get_pipeline("cleaner").run_text(editor.toPlainText())
         
-        # Restore cursor position, making sure it's within the valid range
-        new_cursor = editor.textCursor()
-        new_position = min(cursor_position, len(new_text))
-        new_cursor.setPosition(new_position)
-        editor.setTextCursor(new_cursor)
-        
-        # Restore scroll position
-        editor.verticalScrollBar().setValue(scroll_value)
+        # Patch only the removed lines; cursor, scroll and undo history are preserved
+        apply_text(editor, new_text)
         
         from PyQt5.QtWidgets import QMessageBox
         QMessageBox.information(self, "Cleaner", "Cleaning complete and backup saved.")
@@ -2380,38 +2343,8 @@ class NotepadWindow(QMainWindow):
         if not editor:
             return
 
-        cursor = editor.textCursor()
-        # Store the current cursor position and scroll position
-        current_position = cursor.position()
-        scroll_bar = editor.verticalScrollBar()
-        scroll_position = scroll_bar.value()
-        
-        text = editor.toPlainText()
-        lines = text.splitlines()
-        
-        # Regular expression to match GPS coordinates
-        gps_pattern = re.compile(r'^(-?\d+\.\d+)\s*,\s*(-?\d+\.\d+)\s*$')
-        
-        # Process each line
-        new_lines = []
-        for line in lines:
-            match = gps_pattern.match(line.strip())
-            if match:
-                lat, lon = match.groups()
-                deepstate_link = f"https://deepstatemap.live/en#13/{lat}/{lon}"
-                new_lines.append(deepstate_link)
-            else:
-                new_lines.append(line)
-        
-        # Replace the text
-        new_text = '\n'.join(new_lines)
-        editor.setPlainText(new_text)
-        
-        # Restore cursor position and scroll position
-        new_cursor = editor.textCursor()
-        new_cursor.setPosition(current_position)
-        editor.setTextCursor(new_cursor)
-        scroll_bar.setValue(scroll_position)
+        # Replace only the converted lines
+        apply_text(editor, get_pipeline("deepstate").run_text(editor.toPlainText()))
         
         self.statusBar().showMessage("Converted GPS coordinates to DeepState links", 5000)
 
@@ -2431,7 +2364,7 @@ class NotepadWindow(QMainWindow):
             return
 
         # Get the full text of the editor
-        full_text = editor.toPlainText()
+        full_text = editor.snapshots.current().text
 
         try:
             # Create a temporary file with the highlighted word on first line and full text on second line
@@ -2576,7 +2509,7 @@ class NotepadWindow(QMainWindow):
             return
 
         # Get the full text of the editor
-        full_text = editor.toPlainText()
+        full_text = editor.snapshots.current().text
 
         try:
             # Create a temporary file with the highlighted word on first line and full text on second line
@@ -2713,13 +2646,16 @@ class NotepadWindow(QMainWindow):
             return
 
         # Get the full text of the editor
-        full_text = editor.toPlainText()
+        snapshot = editor.snapshots.current()
+        full_text = snapshot.text
 
-        # Prefixes to exclude from word count
-        prefixes = ("http", "cc-", "mm-", "jj-", "--", "Timestamp", "CC-", "MM-", "JJ-")
-        
-        # Filter out lines starting with excluded prefixes
-        valid_lines = [line for line in full_text.splitlines() if not line.strip().startswith(prefixes)]
+        # Line kinds excluded from the word count (http, cc-, mm-, jj-, --, Timestamp lines)
+        excluded = {URL, CC, MM, JJ, MEDIA, MEDIA_LINK, WORD_IMAGE, TIMESTAMP}
+        lines = snapshot.lines
+        counted = [kind not in excluded for kind, _ in snapshot.kinds]
+
+        # Filter out lines of excluded kinds
+        valid_lines = [line for line, keep in zip(lines, counted) if keep]
         valid_text = " ".join(valid_lines)
         special_word_count = len(valid_text.split())
 
@@ -2731,13 +2667,12 @@ class NotepadWindow(QMainWindow):
 
         # Calculate special word count up to cursor position
         cursor = editor.textCursor()
-        text_up_to_cursor = full_text[:cursor.position()]
-        
-        # Filter lines up to cursor, excluding specified prefixes
-        valid_lines_up_to_cursor = [
-            line for line in text_up_to_cursor.splitlines() 
-            if not line.strip().startswith(prefixes)
-        ]
+        cursor_line = snapshot.line_at(cursor.position())
+
+        # Lines above the cursor line, plus the cursor line up to the cursor
+        valid_lines_up_to_cursor = [line for line, keep in zip(lines[:cursor_line], counted) if keep]
+        if counted[cursor_line]:
+            valid_lines_up_to_cursor.append(lines[cursor_line][:snapshot.column_at(cursor.position())])
         valid_text_up_to_cursor = " ".join(valid_lines_up_to_cursor)
         special_word_count_up_to_cursor = len(valid_text_up_to_cursor.split())
 
@@ -2777,13 +2712,12 @@ class NotepadWindow(QMainWindow):
         if not file_path: # Try finding the path via line number if not stored directly
             editor = self.currentEditor()
             if editor:
-                text = editor.toPlainText()
-                lines = text.splitlines()
-                if 0 <= media_line < len(lines):
-                    line_text = lines[media_line].strip()
-                    if line_text.startswith('--'):
+                kinds = editor.snapshots.current().kinds
+                if 0 <= media_line < len(kinds):
+                    kind, payload = kinds[media_line]
+                    if kind == MEDIA:
                         # Try to resolve the path from the line text
-                        possible_path = line_text.lstrip('-').strip()
+                        possible_path = payload
                         resolved_path = self.find_image_path(possible_path)
                         if resolved_path:
                             file_path = resolved_path
@@ -2839,6 +2773,7 @@ class NotepadWindow(QMainWindow):
         model_name = "granite3.2-vision" # Common Ollama vision model.
         # Use the /api/chat endpoint, which is common for multimodal requests
         ollama_url = "http://localhost:11434/api/chat"
+        import requests
 
         try:
             # Read and encode the image in Base64
@@ -2887,26 +2822,18 @@ class NotepadWindow(QMainWindow):
             return
 
         document = editor.document()
-        content = document.toPlainText()
-        lines = content.splitlines()
+        snapshot = editor.snapshots.current()
 
         # Find the 'Title:' line for the segment containing the image_line_num
-        segment_title_line_num = -1
-        for i in range(image_line_num, -1, -1):
-             if re.match(r'^["\']?Title:', lines[i].strip()):
-                 segment_title_line_num = i
-                 break
-
-        if segment_title_line_num == -1:
+        segment_title_line_num = editor.segments.previous_title(image_line_num + 1)
+        if segment_title_line_num is None:
             logging.warning(f"Could not find Title segment for image at line {image_line_num}")
             QMessageBox.warning(self, "Error", "Could not find the corresponding 'Title:' segment for this image.")
             return
 
         # Calculate the insertion position (end of the Title line + newline)
-        insertion_pos = 0
-        for i in range(segment_title_line_num + 1):
-            insertion_pos += len(lines[i]) + 1 # +1 for the newline character
-
+        title_line = snapshot.lines[segment_title_line_num]
+        insertion_pos = snapshot.position_of(segment_title_line_num, len(title_line)) + 1
         # Ensure the insertion position is valid
         insertion_pos = min(insertion_pos, document.characterCount() -1) # -1 to avoid potential off-by-one at very end
 
@@ -2953,21 +2880,6 @@ class NotepadWindow(QMainWindow):
         self.statusBar().showMessage("Media link deleted.", 5000)
         self.updateImageDisplay()
 
-    def check_external_changes(self):
-        editor = self.currentEditor()
-        if editor:
-            filepath = editor.property("filepath")
-            if filepath and os.path.exists(filepath):
-                current_mtime = os.path.getmtime(filepath)
-                last_mtime = editor.property("last_modified_time")
-                logging.debug(f"check_external_changes: filepath={filepath}, last_modified_time={last_mtime}, current_mtime={current_mtime}")
-                if last_mtime is None:
-                    editor.setProperty("last_modified_time", current_mtime)
-                elif current_mtime != last_mtime:
-                    self.statusBar().setStyleSheet("color: red; font-weight: bold;")
-                    self.statusBar().showMessage("<span style='color:red; font-weight:bold;'>WARNING: File changed externally!</span>", 0)
-                    editor.setProperty("last_modified_time", current_mtime)
-
     def save_file(self):
         # ... existing save code ...
         if success:
@@ -3251,38 +3163,38 @@ class NotepadWindow(QMainWindow):
         """
         Takes the word on the current line at cursor position and transforms it to "Title:{word}" format.
         """
-        # Check if we have an active editor
-        if self.tabs.count() > 0:
-            editor = self.tabs.currentWidget()
+        # Check if we have an active editor (None if a hibernated tab failed to wake)
+        editor = self.currentEditor()
+        if editor is None:
+            self.statusBar().showMessage("No active editor", 2000)
+            return
+        
+        # Get the current cursor
+        cursor = editor.textCursor()
+        
+        # Get the current line
+        cursor.select(QTextCursor.LineUnderCursor)
+        line = cursor.selectedText().strip()
+        
+        # If there's text on the line
+        if line:
+            # Avoid double transformation
+            if line.startswith('"Title:') and line.endswith('"'):
+                self.statusBar().showMessage("Line already in Title format", 2000)
+                return
             
-            # Get the current cursor
-            cursor = editor.textCursor()
+            # Format as "Title:{word}"
+            transformed_line = f'"Title:{line}"'
             
-            # Get the current line
-            cursor.select(QTextCursor.LineUnderCursor)
-            line = cursor.selectedText().strip()
+            # Replace the line with the transformed text
+            cursor.beginEditBlock()
+            cursor.removeSelectedText()
+            cursor.insertText(transformed_line)
+            cursor.endEditBlock()
             
-            # If there's text on the line
-            if line:
-                # Avoid double transformation
-                if line.startswith('"Title:') and line.endswith('"'):
-                    self.statusBar().showMessage("Line already in Title format", 2000)
-                    return
-                
-                # Format as "Title:{word}"
-                transformed_line = f'"Title:{line}"'
-                
-                # Replace the line with the transformed text
-                cursor.beginEditBlock()
-                cursor.removeSelectedText()
-                cursor.insertText(transformed_line)
-                cursor.endEditBlock()
-                
-                self.statusBar().showMessage(f"Transformed to {transformed_line}", 2000)
-            else:
-                self.statusBar().showMessage("No text on the current line", 2000)
+            self.statusBar().showMessage(f"Transformed to {transformed_line}", 2000)
         else:
-            self.statusBar().showMessage("No active editor", 2000)
+            self.statusBar().showMessage("No text on the current line", 2000)
 
     def showDraftCount(self):
         """Show document-wide statistics including word, character, and line counts."""
@@ -3292,7 +3204,7 @@ class NotepadWindow(QMainWindow):
             return
 
         # Get the full text of the editor
-        full_text = editor.toPlainText()
+        full_text = editor.snapshots.current().text
 
         # Calculate document-wide statistics
         all_words = full_text.split()
@@ -3350,7 +3262,7 @@ class NotepadWindow(QMainWindow):
             return
 
         # Get the full text of the editor
-        full_text = editor.toPlainText()
+        full_text = editor.snapshots.current().text
         logging.critical(f"ReFlow - Full text length: {len(full_text)}")
 
         try:
@@ -3404,8 +3316,8 @@ class NotepadWindow(QMainWindow):
                 if reflowed_text:
                     # Only update if there was a change
                     if reflowed_text != full_text:
-                        # Update the editor with the new text
-                        editor.setPlainText(reflowed_text)
+                        # Update the editor with the new text, editing only what changed
+                        apply_text(editor, reflowed_text)
                         self.statusBar().showMessage("Text reflowed successfully", 5000)
                         logging.critical("ReFlow - Editor text updated")
                     else:
@@ -3506,7 +3418,7 @@ class NotepadWindow(QMainWindow):
     def runTempMaxCleaner(self):
         """
         Creates a backup of the current file and removes lines starting with specific prefixes.
-        Backup is saved to /home/j/Desktop/Finals/NotepadApp_backups/misc_backups/ with filename pattern {filename}_{HHMM}{am/pm}.vhd
+        The backup goes into the shared backup store with the label "tempmax".
         Removes lines starting with: Timestamp:, cc-, --, http
         Retains lines starting with "Title: (no longer replaces with +)
         """
@@ -3525,61 +3437,21 @@ class NotepadWindow(QMainWindow):
                 self.statusBar().showMessage("Please save the file before cleaning.", 3000)
                 return
                 
-            # Create backup directory if it doesn't exist
-            backup_dir = '/home/j/Desktop/Finals/NotepadApp_backups/misc_backups/'
-            os.makedirs(backup_dir, exist_ok=True)
-            
-            # Get current time in HHMM am/pm format
-            current_time = time.strftime("%I%M%p").lower()  # e.g., "0345pm"
-            
-            # Create backup filename
-            base_filename = os.path.basename(file_path)
-            backup_filename = f"{os.path.splitext(base_filename)[0]}_{current_time}.vhd"
-            backup_path = os.path.join(backup_dir, backup_filename)
-            
             # Save backup
             with open(file_path, 'r', encoding='utf-8') as source_file:
                 content = source_file.read()
-                
-            with open(backup_path, 'w', encoding='utf-8') as backup_file:
-                backup_file.write(content)
-                
-            logging.info(f"TempMaxCleaner: Created backup at {backup_path}")
-            
-            # Save current cursor position and scroll value
-            cursor = editor.textCursor()
-            cursor_position = cursor.position()
-            scroll_value = editor.verticalScrollBar().value()
-            
-            # Process the text
-            lines = content.split('\n')
-            prefixes_to_remove = ["Timestamp:", "cc-", "--", "http"]
-            
-            # Process each line
-            cleaned_lines = []
-            removed_count = 0
-            
-            for line in lines:
-                stripped_line = line.strip()
-                
-                # Check for lines to remove completely
-                if any(stripped_line.startswith(prefix) for prefix in prefixes_to_remove):
-                    removed_count += 1
-                # Keep all other lines unchanged (including "Title: lines)
-                else:
-                    cleaned_lines.append(line)
-                    
-            cleaned_content = '\n'.join(cleaned_lines)
+
+            snap = self.backup.snapshot(file_path, "tempmax", text=content)
+            logging.info(f"TempMaxCleaner: Created backup at {snap.manifest_path}")
             
-            # Update editor with cleaned content
-            editor.setPlainText(cleaned_content)
             
-            # Restore cursor position and scroll value as closely as possible
-            new_cursor = editor.textCursor()
-            new_position = min(cursor_position, len(cleaned_content))
-            new_cursor.setPosition(new_position)
-            editor.setTextCursor(new_cursor)
-            editor.verticalScrollBar().setValue(scroll_value)
+            # Remove Timestamp:/cc-/--/http lines (title lines are kept)
+            pipeline = get_pipeline("tempmax")
+            cleaned_content = pipeline.run_text(content)
+            removed_count = pipeline.changed
+
+            # Update editor with cleaned content, editing only the removed lines
+            apply_text(editor, cleaned_content)
             
             # Update status
             self.statusBar().showMessage(
@@ -3605,38 +3477,47 @@ class NotepadWindow(QMainWindow):
         # Call the script runner method to process the text
         self.script_runner.runGpsCScript()
 
-    def runSpaceRmvr(self):
-        """Limit consecutive empty lines to a maximum of three."""
+    def runPipeline(self):
+        """Run one or more cleanup presets (comma separated) over the current tab in a single pass."""
         editor = self.currentEditor()
         if not editor:
             QMessageBox.warning(self, "No Editor", "No active editor found.")
             return
 
-        cursor = editor.textCursor()
-        cursor_pos = cursor.position()
-        scroll_value = editor.verticalScrollBar().value()
-
-        text = editor.toPlainText()
-
-        result_lines = []
-        empty_count = 0
-        for line in text.splitlines():
-            if line.strip() == "":
-                empty_count += 1
-                if empty_count <= 3:
-                    result_lines.append("")
-            else:
-                empty_count = 0
-                result_lines.append(line)
+        presets = load_presets()
+        name, ok = QInputDialog.getItem(
+            self, "Run Cleanup Pipeline",
+            "Preset (join several with commas, e.g. cleaner,spacermvr):",
+            list(presets), 0, True)
+        if not ok or not name.strip():
+            return
+        try:
+            pipeline = get_pipeline(name, presets)
+        except KeyError as e:
+            QMessageBox.warning(self, "Cleanup Pipeline", str(e))
+            return
 
-        new_text = "\n".join(result_lines)
+        filepath = editor.property("filepath")
+        if filepath and os.path.exists(filepath):
+            try:
+                self.backup.snapshot(filepath, "pipeline", text=editor.toPlainText())
+            except Exception as e:
+                QMessageBox.warning(self, "Backup Error", f"Error creating backup: {e}")
+                return
+
+        apply_text(editor, pipeline.run_text(editor.toPlainText()))
+        self.statusBar().showMessage(f"Pipeline {name}: {pipeline.changed} line(s) changed", 5000)
+        logging.info(f"Ran cleanup pipeline {name} on {filepath or 'Untitled'}")
+
+    def runSpaceRmvr(self):
+        """Limit consecutive empty lines to a maximum of three."""
+        editor = self.currentEditor()
+        if not editor:
+            QMessageBox.warning(self, "No Editor", "No active editor found.")
+            return
 
-        editor.setPlainText(new_text)
+        new_text = get_pipeline("spacermvr").run_text(editor.toPlainText())
 
-        new_cursor = editor.textCursor()
-        new_position = min(cursor_pos, len(new_text))
-        new_cursor.setPosition(new_position)
-        editor.setTextCursor(new_cursor)
-        editor.verticalScrollBar().setValue(scroll_value)
+        apply_text(editor, new_text)
 
         self.statusBar().showMessage("Removed excessive empty lines", 5000)
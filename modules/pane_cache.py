@@ -0,0 +1,94 @@
+# /modules/pane_cache.py
+
+import os
+import logging
+from collections import OrderedDict
+
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QPixmap
+
+from modules.title_navigator import TitleListModel
+
+
+class PixmapCache:
+    """
+    Decoded and scaled thumbnails keyed by (path, width). An entry is reused as long as the
+    file's mtime and size are unchanged; the least recently used ones are dropped past limit.
+    """
+
+    def __init__(self, limit=512):
+        self.limit = limit
+        self._entries = OrderedDict()  # (path, width) -> (stamp, pixmap)
+        self.hits = 0
+        self.misses = 0
+
+    def scaled(self, path, width):
+        """The image at path scaled to width (a null QPixmap if it cannot be loaded)."""
+        try:
+            st = os.stat(path)
+            stamp = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            return QPixmap()
+        key = (path, width)
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == stamp:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+        self.misses += 1
+        pixmap = QPixmap(path)
+        if not pixmap.isNull():
+            pixmap = pixmap.scaledToWidth(width, Qt.SmoothTransformation)
+        self._entries[key] = (stamp, pixmap)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.limit:
+            self._entries.popitem(last=False)
+        return pixmap
+
+    def clear(self):
+        self._entries.clear()
+
+
+class TabPaneState:
+    """
+    What the side panes show for one tab, kept while the tab is in the background so that
+    switching back only swaps the views in. Everything derived from the text is tied to the
+    document snapshot it was computed from and is recomputed only after edits to this tab.
+    """
+
+    def __init__(self, editor):
+        self.editor = editor
+        # Lives as long as the editor; tracks edits to it even while the tab is hidden
+        self.title_model = TitleListModel(editor, parent=editor)
+        self.title_scroll = 0
+        self.title_first_visible = -1
+        self.segments = None           # image segments parsed from segments_snapshot
+        self.segments_snapshot = None
+        self.image_widget = None       # image pane contents last built for this tab
+        self.image_key = None          # the visible segments image_widget shows
+        self.image_line_numbers = {}   # line number -> image widget in image_widget
+        self.image_scroll = 0
+
+    def imageSegments(self, parse):
+        """The tab's image segments, re-parsed by parse(snapshot) only when the text changed."""
+        snapshot = self.editor.snapshots.current()
+        if snapshot is not self.segments_snapshot:
+            self.segments = parse(snapshot)
+            self.segments_snapshot = snapshot
+        return self.segments
+
+    def dropImages(self):
+        """Forget the built image pane (the widget is deleted unless it is on screen elsewhere)."""
+        if self.image_widget is not None:
+            try:
+                self.image_widget.deleteLater()
+            except RuntimeError:
+                pass
+        self.image_widget = None
+        self.image_key = None
+        self.image_line_numbers = {}
+
+    def discard(self):
+        self.dropImages()
+        self.segments = self.segments_snapshot = None
+        logging.debug("Dropped side pane state of a closed tab")
@@ -0,0 +1,244 @@
+# /modules/plugin_registry.py
+#
+# Scripts in scripts/ describe themselves with a module-level PLUGIN dict: name, how the text
+# is handed over (selection markers or the command line), the model they call and how many
+# segments may be sent at once. The dict is read from the source with ast, so building the
+# toolbar and menus imports nothing; a script module is imported the first time it runs.
+#
+#   PLUGIN = {
+#       "name": "ts1",
+#       "tooltip": "ts1 - Text processing script 1",
+#       "mode": "module",                    # module: clean_segment() in-process; subprocess: argv -> stdout
+#       "input": "selection",                # or "selection_or_document"
+#       "markers": ["111\n", "\n111"],       # module mode: wrapped around the selection ...
+#       "pattern": r"^111\s*\n([\s\S]*?)\n111$",   # ... and matched by parse_segments_with_positions
+#       "model": "gpt-4o-mini",
+#       "concurrency": 4,                    # opt-in: segments sent in parallel; only for a
+#                                            # clean_segment without window= (no status reporting)
+#       "toolbar": 2, "order": 10,           # toolbar row and position among the plugins in it
+#       "menus": ["edit", "context"],        # Edit menu and editor context menu entries
+#   }
+
+import os
+import re
+import ast
+import logging
+import subprocess
+
+from PyQt5.QtWidgets import QAction
+from PyQt5.QtGui import QTextCursor
+
+from modules import tracing
+
+PLUGIN_DEFAULTS = {
+    "tooltip": "",
+    "label": None,          # toolbar text; the name when not given
+    "mode": "module",
+    "input": "selection",
+    "markers": None,
+    "pattern": None,
+    "model": None,
+    "concurrency": 1,
+    "toolbar": None,
+    "order": 100,
+    "menus": [],
+}
+MODES = ("module", "subprocess")
+INPUTS = ("selection", "selection_or_document")
+
+_PLUGIN_ASSIGNMENT = re.compile(r"^PLUGIN\s*=", re.M)
+_TOP_LEVEL_LINE = re.compile(r"\n(?=\S)")
+
+
+def _statement_ends(source, start):
+    for match in _TOP_LEVEL_LINE.finditer(source, start):
+        yield match.start()
+    yield len(source)
+
+
+def read_manifest(path):
+    """The PLUGIN dict declared in the script at path (None if it has none or it is invalid)."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            source = f.read()
+    except OSError as e:
+        logging.error(f"Failed to read plugin {path}: {e}")
+        return None
+    match = _PLUGIN_ASSIGNMENT.search(source)
+    if match is None:
+        return None
+
+    # Parse only the assignment: from PLUGIN = up to the next line that starts a top-level
+    # statement. Parsing the whole script costs more than all of this together.
+    declared = None
+    for end in _statement_ends(source, match.end()):
+        try:
+            tree = ast.parse(source[match.start():end], filename=path)
+        except SyntaxError:
+            continue
+        try:
+            declared = ast.literal_eval(tree.body[0].value)
+        except ValueError:
+            logging.error(f"PLUGIN in {path} must be a literal dict")
+            return None
+        break
+    if not isinstance(declared, dict) or not declared.get("name"):
+        logging.error(f"PLUGIN in {path} needs at least a name")
+        return None
+    manifest = dict(PLUGIN_DEFAULTS, **declared)
+    if manifest["mode"] not in MODES or manifest["input"] not in INPUTS:
+        logging.error(f"PLUGIN in {path} has an unknown mode or input: {manifest['mode']}, {manifest['input']}")
+        return None
+    if manifest["mode"] == "module" and not (manifest["markers"] and manifest["pattern"]):
+        logging.error(f"PLUGIN in {path} runs as a module but declares no markers and pattern")
+        return None
+    manifest["path"] = path
+    manifest["label"] = manifest["label"] or manifest["name"]
+    return manifest
+
+
+class PluginRegistry:
+    """Manifests of the scripts in scripts_dir, with the actions that run them."""
+
+    def __init__(self, script_runner, scripts_dir=None):
+        self.script_runner = script_runner
+        self.parent_window = script_runner.parent_window
+        self.scripts_dir = scripts_dir or script_runner.scripts_dir
+        self.plugins = {}   # name -> manifest
+        self.discover()
+
+    def discover(self):
+        """Re-read the manifests of all scripts (no script is imported)."""
+        plugins = {}
+        try:
+            names = sorted(os.listdir(self.scripts_dir))
+        except OSError as e:
+            logging.error(f"Cannot list plugin directory {self.scripts_dir}: {e}")
+            names = []
+        for name in names:
+            if not name.endswith(".py"):
+                continue
+            manifest = self._readManifest(os.path.join(self.scripts_dir, name))
+            if manifest is None:
+                continue
+            if manifest["name"] in plugins:
+                logging.warning(f"Plugin {manifest['name']} in {name} is declared twice; keeping "
+                                f"{os.path.basename(plugins[manifest['name']]['path'])}")
+                continue
+            plugins[manifest["name"]] = manifest
+        self.plugins = plugins
+        logging.debug(f"Found {len(plugins)} script plugins in {self.scripts_dir}")
+
+    def _readManifest(self, path):
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+        manifest = read_manifest(path)
+        if manifest is not None:
+            manifest["mtime"] = mtime
+        return manifest
+
+    def _current(self, manifest):
+        """The manifest re-read if its script was edited since (the old one if the new one is invalid)."""
+        try:
+            if os.stat(manifest["path"]).st_mtime_ns == manifest["mtime"]:
+                return manifest
+        except OSError:
+            return manifest
+        updated = self._readManifest(manifest["path"])
+        if updated is None or updated["name"] != manifest["name"]:
+            logging.warning(f"Manifest of {manifest['path']} is no longer valid; using the previous one")
+            manifest["mtime"] = None   # checked again on the next run
+            return manifest
+        self.plugins[manifest["name"]] = updated
+        return updated
+
+    def manifests(self, menu=None, toolbar=None):
+        """Manifests in toolbar order, optionally only those in a menu or a toolbar row."""
+        found = [m for m in self.plugins.values()
+                 if (menu is None or menu in m["menus"]) and (toolbar is None or m["toolbar"] == toolbar)]
+        return sorted(found, key=lambda m: (m["order"], m["name"]))
+
+    def createAction(self, manifest, parent, text=None):
+        action = QAction(text or manifest["label"], parent)
+        tooltip = manifest["tooltip"] or manifest["name"]
+        if manifest["model"]:
+            tooltip += f" ({manifest['model']})"
+        action.setToolTip(tooltip)
+        name = manifest["name"]
+        action.triggered.connect(lambda checked=False: self.run(name))
+        return action
+
+    def run(self, name):
+        with tracing.span(name):
+            self._run(name)
+
+    def _run(self, name):
+        manifest = self.plugins.get(name)
+        window = self.parent_window
+        if manifest is None:
+            window.statusBar().showMessage(f"Unknown script: {name}", 5000)
+            return
+        # An edited script runs with its new markers and hints; its module is reloaded by the script runner
+        manifest = self._current(manifest)
+        editor = window.currentEditor()
+        if not editor:
+            window.statusBar().showMessage(f"No open editor for {name}.", 5000)
+            logging.warning(f"Attempted to run {name} with no open editor.")
+            return
+
+        cursor = editor.textCursor()
+        text = cursor.selectedText()
+        whole_document = False
+        if not text.strip() and manifest["input"] == "selection_or_document":
+            text = editor.toPlainText()
+            whole_document = True
+        if not text.strip():
+            window.statusBar().showMessage(f"No text selected for {name}.", 5000)
+            logging.warning(f"No text selected for {name}.")
+            return
+        tracing.mark("selection")
+
+        if manifest["mode"] == "module":
+            self.script_runner.run_generic_script(
+                script=manifest["path"],
+                markers=tuple(manifest["markers"]),
+                pattern=manifest["pattern"],
+                selected_text=text,
+                concurrency=manifest["concurrency"],
+            )
+        else:
+            self._runSubprocess(manifest, editor, text, whole_document)
+
+    def _runSubprocess(self, manifest, editor, text, whole_document):
+        """Run the script with the text as its argument and put its stdout in place of the text."""
+        window = self.parent_window
+        name = manifest["name"]
+        try:
+            result = subprocess.run(
+                [self.script_runner.python_executable, manifest["path"], text],
+                capture_output=True,
+                text=True,
+                check=False
+            )
+            # Interpreter start, imports and the API call of the script
+            tracing.mark("subprocess")
+            if result.returncode != 0:
+                error_msg = f"{name} script failed (return code {result.returncode}): {result.stderr}"
+                window.statusBar().showMessage(error_msg, 5000)
+                logging.error(error_msg)
+                return
+            cursor = editor.textCursor()
+            cursor.beginEditBlock()
+            if whole_document:
+                cursor.select(QTextCursor.Document)
+            cursor.removeSelectedText()
+            cursor.insertText(result.stdout)
+            cursor.endEditBlock()
+            tracing.mark("insert")
+            window.statusBar().showMessage(f"{name} script completed successfully.", 5000)
+        except Exception as e:
+            error_msg = f"Error running {name}: {str(e)}"
+            window.statusBar().showMessage(error_msg, 5000)
+            logging.error(error_msg, exc_info=True)
@@ -0,0 +1,194 @@
+# /modules/profiler.py
+#
+# On-demand profiling of the running editor (View > Profiler). Two modes, each stopped by
+# unchecking the menu entry or after PROFILE_SECONDS:
+#
+#   sampling  A thread reads the Python stack of every other thread each SAMPLE_INTERVAL
+#             (sys._current_frames); the GUI thread runs at full speed. Written as a
+#             speedscope file (https://www.speedscope.app), one profile per thread.
+#   cProfile  Deterministic profile of the GUI thread, written as a .pstats file
+#             (python3 -m pstats FILE, or snakeviz).
+#
+# Files go to PROFILES_DIR named after the time, the current document and its revision.
+
+import os
+import re
+import sys
+import json
+import time
+import logging
+import cProfile
+import threading
+
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+
+PROFILES_DIR = os.path.expanduser("~/.config/notepadmod/profiles")
+PROFILE_SECONDS = 10
+SAMPLE_INTERVAL = 0.005   # seconds between stack samples
+
+
+class SamplingProfiler:
+    """Samples the Python stacks of all threads from a daemon thread."""
+
+    def __init__(self, interval=SAMPLE_INTERVAL):
+        self.interval = interval
+        self.frames = []        # speedscope frames: {"name", "file", "line"}
+        self._frame_ids = {}    # code object -> index into frames
+        self.samples = {}       # thread id -> [[stack (frame indices, root first), weight ms], ...]
+        self.sample_count = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="profiler-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        own = threading.get_ident()
+        last = time.perf_counter()
+        while not self._stop.wait(self.interval):
+            now = time.perf_counter()
+            # The real gap: a thread holding the GIL can delay the sampler
+            weight = (now - last) * 1000
+            last = now
+            for ident, frame in sys._current_frames().items():
+                if ident != own:
+                    self._addSample(ident, frame, weight)
+            self.sample_count += 1
+
+    def _addSample(self, ident, frame, weight):
+        stack = []
+        while frame is not None:
+            stack.append(self._frameId(frame.f_code))
+            frame = frame.f_back
+        stack.reverse()
+        samples = self.samples.setdefault(ident, [])
+        # Consecutive identical stacks are merged (an idle thread costs one entry)
+        if samples and samples[-1][0] == stack:
+            samples[-1][1] += weight
+        else:
+            samples.append([stack, weight])
+
+    def _frameId(self, code):
+        index = self._frame_ids.get(code)
+        if index is None:
+            index = len(self.frames)
+            self._frame_ids[code] = index
+            self.frames.append({"name": code.co_name, "file": code.co_filename, "line": code.co_firstlineno})
+        return index
+
+    def speedscope(self, name):
+        """The samples as a speedscope file (dict), busiest thread first."""
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        profiles = []
+        for ident, samples in self.samples.items():
+            total = sum(weight for _, weight in samples)
+            profiles.append({
+                "type": "sampled",
+                "name": names.get(ident, f"thread {ident}"),
+                "unit": "milliseconds",
+                "startValue": 0,
+                "endValue": total,
+                "samples": [stack for stack, _ in samples],
+                "weights": [weight for _, weight in samples],
+            })
+        main = threading.main_thread().name
+        profiles.sort(key=lambda p: (p["name"] != main, -len(p["samples"])))
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": name,
+            "exporter": "notepadmod",
+            "activeProfileIndex": 0,
+            "shared": {"frames": self.frames},
+            "profiles": profiles,
+        }
+
+
+def profile_path(document, revision, suffix, directory=PROFILES_DIR):
+    """PROFILES_DIR/20261019-142301-rundown.vhd-r5123.<suffix>"""
+    name = re.sub(r"[^\w.-]+", "_", document) or "untitled"
+    return os.path.join(directory, f"{time.strftime('%Y%m%d-%H%M%S')}-{name}-r{revision}.{suffix}")
+
+
+class Profiler(QObject):
+    """Starts and stops a bounded profiling run for the window and writes the result."""
+
+    stopped = pyqtSignal(str)   # path of the written profile ("" if nothing was written)
+
+    SAMPLING = "sampling"
+    CPROFILE = "cprofile"
+
+    def __init__(self, parent_window, directory=PROFILES_DIR, seconds=PROFILE_SECONDS):
+        super().__init__(parent_window)
+        self.parent = parent_window
+        self.directory = directory
+        self.seconds = seconds
+        self.mode = None
+        self._profiler = None
+        self._document = ("untitled", 0)
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self.stop)
+
+    def isRunning(self):
+        return self.mode is not None
+
+    def start(self, mode):
+        if self.isRunning():
+            return
+        editor = self.parent.currentEditor()
+        if editor is not None:
+            filepath = editor.property("filepath")
+            self._document = (os.path.basename(filepath) if filepath else "untitled", editor.document().revision())
+        else:
+            self._document = ("untitled", 0)
+
+        if mode == self.SAMPLING:
+            self._profiler = SamplingProfiler()
+            self._profiler.start()
+        else:
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        self.mode = mode
+        self._timer.start(self.seconds * 1000)
+        self.parent.statusBar().showMessage(f"Profiling ({mode}) for {self.seconds} s...", 3000)
+        logging.info(f"Profiler started: {mode}, document {self._document[0]} r{self._document[1]}")
+
+    def stop(self):
+        """Stop the running profile and write it; returns the file path (None on failure)."""
+        if not self.isRunning():
+            return None
+        self._timer.stop()
+        mode, profiler, self.mode, self._profiler = self.mode, self._profiler, None, None
+        document, revision = self._document
+        if mode == self.SAMPLING:
+            profiler.stop()
+        else:
+            profiler.disable()
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            if mode == self.SAMPLING:
+                path = profile_path(document, revision, "speedscope.json", self.directory)
+                with open(path, 'w', encoding='utf-8') as f:
+                    json.dump(profiler.speedscope(f"{document} r{revision}"), f)
+                detail = f"{profiler.sample_count} samples"
+            else:
+                path = profile_path(document, revision, "pstats", self.directory)
+                profiler.dump_stats(path)
+                detail = "GUI thread"
+        except OSError as e:
+            logging.error(f"Failed to write profile: {e}")
+            self.parent.statusBar().showMessage(f"Failed to write profile: {e}", 5000)
+            self.stopped.emit("")
+            return None
+        logging.info(f"Profile written ({detail}): {path}")
+        self.parent.statusBar().showMessage(f"Profile written ({detail}): {path}", 10000)
+        self.stopped.emit(path)
+        return path
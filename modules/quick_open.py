@@ -0,0 +1,97 @@
+# /modules/quick_open.py
+
+import os
+import time
+import logging
+
+from PyQt5.QtCore import Qt, QEvent
+from PyQt5.QtWidgets import QDialog, QVBoxLayout, QLineEdit, QListWidget, QListWidgetItem, QLabel
+
+
+class QuickOpenDialog(QDialog):
+    """
+    Keyboard file palette (Ctrl+P): type part of a file name, Up/Down to pick, Enter to
+    open. Matches come from the window's in-memory WorkspaceFiles index; an empty query
+    lists the recent files.
+    """
+
+    LIMIT = 50
+
+    def __init__(self, files, parent=None):
+        super().__init__(parent, Qt.Popup)
+        self.files = files
+        self.parent = parent
+        self.setMinimumWidth(700)
+        self.setStyleSheet("""
+            QLineEdit { font-size: 18px; padding: 8px; }
+            QListWidget { font-size: 16px; }
+            QListWidget::item { padding: 6px; }
+            QListWidget::item:selected { background-color: #2d2d2d; }
+            QLabel { color: gray; font-size: 12px; }
+        """)
+
+        layout = QVBoxLayout(self)
+        self.input = QLineEdit()
+        self.input.setPlaceholderText("Open file by name...")
+        self.input.textChanged.connect(self.updateResults)
+        self.input.installEventFilter(self)
+        layout.addWidget(self.input)
+        self.results = QListWidget()
+        self.results.itemActivated.connect(self.openItem)
+        layout.addWidget(self.results)
+        self.status = QLabel()
+        layout.addWidget(self.status)
+
+    def popup(self):
+        """Show centered over the top of the window with an empty query."""
+        self.input.clear()
+        self.updateResults("")
+        parent = self.parentWidget()
+        if parent is not None:
+            width = max(self.minimumWidth(), parent.width() // 2)
+            self.resize(width, 500)
+            top_left = parent.mapToGlobal(parent.rect().topLeft())
+            self.move(top_left.x() + (parent.width() - width) // 2, top_left.y() + 80)
+        self.show()
+        self.input.setFocus()
+
+    def updateResults(self, text):
+        start = time.perf_counter()
+        if text.strip():
+            matches = [path for _, path in self.files.index.search(text, self.LIMIT)]
+        else:
+            matches = self.files.existingRecent()[:self.LIMIT]
+        elapsed = (time.perf_counter() - start) * 1000
+
+        self.results.clear()
+        for path in matches:
+            item = QListWidgetItem(f"{os.path.basename(path)}    {os.path.dirname(path)}")
+            item.setData(Qt.UserRole, path)
+            item.setToolTip(path)
+            self.results.addItem(item)
+        if matches:
+            self.results.setCurrentRow(0)
+        self.status.setText(f"{len(matches)} shown of {len(self.files.index)} files ({elapsed:.1f} ms)")
+
+    def eventFilter(self, obj, event):
+        # Keys for the list while typing in the search box
+        if obj is self.input and event.type() == QEvent.KeyPress:
+            key = event.key()
+            if key in (Qt.Key_Down, Qt.Key_Up, Qt.Key_PageDown, Qt.Key_PageUp):
+                self.results.keyPressEvent(event)
+                return True
+            if key in (Qt.Key_Return, Qt.Key_Enter):
+                self.openItem(self.results.currentItem())
+                return True
+        return super().eventFilter(obj, event)
+
+    def openItem(self, item):
+        if item is None:
+            return
+        path = item.data(Qt.UserRole)
+        self.hide()
+        if not os.path.exists(path):
+            self.parent.statusBar().showMessage(f"File no longer exists: {path}", 5000)
+            return
+        logging.info(f"Quick Open: {path}")
+        self.parent.openFiles([path])
@@ -6,14 +6,20 @@ from PyQt5.QtGui import QColor
 import os
 import logging
 
+from modules.fuzzy import fuzzy_score
+from modules.workspace_files import WorkspaceFiles
+
 class RecentFiles:
     def __init__(self, parent, menu, max_files=20, recent_files_path="/home/j/Desktop/notepadmod/recentfiles.txt"):
         self.parent = parent
         self.menu = menu
         self.max_files = max_files
         self.recent_files_path = recent_files_path
-        self.recent_files = self.load_recent_files()
+        # Kept current by a directory watcher; the menu is only rebuilt after it changed
+        self.files = WorkspaceFiles(parent, recent_files_path, max_files)
         self.file_actions = []
+        self._action_keys = []   # lower-case action text per file action, for filtering
+        self._built_revision = None
 
         # Set menu style to increase text size
         self.menu.setStyleSheet("""
@@ -35,21 +41,15 @@ class RecentFiles:
         self.create_search_box()
         self.menu.aboutToShow.connect(self.update_menu)
 
+    @property
+    def recent_files(self):
+        return self.files.recent
+
     def load_recent_files(self):
-        if os.path.exists(self.recent_files_path):
-            with open(self.recent_files_path, 'r', encoding='utf-8', errors='replace') as file:
-                files = file.read().splitlines()
-                return files[:self.max_files]
-        return []
+        return list(self.files.recent)
 
     def save_recent_files(self):
-        try:
-            os.makedirs(os.path.dirname(self.recent_files_path), exist_ok=True)
-            with open(self.recent_files_path, 'w', encoding='utf-8') as file:
-                for file_path in self.recent_files:
-                    file.write(f"{file_path}\n")
-        except Exception as e:
-            print(f"Error saving recent files: {e}")
+        self.files.saveRecent()
 
     def create_search_box(self):
         """Creates a search box at the top of the Recent menu."""
@@ -67,61 +67,45 @@ class RecentFiles:
         search_action.setDefaultWidget(search_box)
         self.menu.addAction(search_action)
         self.menu.addSeparator()
+        self.search_box = search_box
 
     def update_menu(self):
         """Updates the Recent Files menu with the latest files and applies filtering."""
-        self.recent_files = self.load_recent_files()
+        if self._built_revision == self.files.revision:
+            return
+        self._built_revision = self.files.revision
         # Remove all existing file actions except the search box and separator
         for action in self.file_actions:
             self.menu.removeAction(action)
+            action.deleteLater()
         self.file_actions.clear()
 
-        # Create a list of tuples (display_name, file_path) for sorting
-        file_entries = []
-        
-        # Add recent files
-        for file_path in self.recent_files:
-            if os.path.exists(file_path):
-                display_name = os.path.basename(file_path)
-                file_entries.append((display_name, file_path, False))  # False indicates not a desktop number file
-
-        # Add files from desktop that start with 4 numbers
-        desktop_path = os.path.expanduser("~/Desktop")
-        if os.path.exists(desktop_path):
-            for filename in os.listdir(desktop_path):
-                if len(filename) >= 4 and filename[:4].isdigit():
-                    file_path = os.path.join(desktop_path, filename)
-                    if os.path.isfile(file_path):
-                        file_entries.append((filename, file_path, True))  # True indicates a desktop number file
+        # file path -> is a desktop number file (preferred when a file is both)
+        file_entries = dict.fromkeys(self.files.existingRecent(), False)
+        for file_path in self.files.desktop_numbered:
+            file_entries[file_path] = True
 
         # Sort by display name (case-insensitive)
-        file_entries.sort(key=lambda x: x[0].lower())
-
-        # Add file actions based on sorted entries
-        for display_name, file_path, is_desktop_number in file_entries:
-            # Skip duplicates (prefer desktop number files)
-            if any(a.data() == file_path for a in self.file_actions):
-                continue
-                
+        for file_path, is_desktop_number in sorted(file_entries.items(), key=lambda x: os.path.basename(x[0]).lower()):
+            display_name = os.path.basename(file_path)
             action = QAction(display_name, self.parent)
             action.setData(file_path)
-            
+
             # Set yellow text for special files and desktop number files
             if display_name in ['TODAY_ONLY.vhd', 'ttag_sort_order.vhd'] or is_desktop_number:
                 action.setProperty("yellowText", True)
-                
+
             action.triggered.connect(self.open_recent_file)
             self.menu.addAction(action)
             self.file_actions.append(action)
+        self._action_keys = [action.text().lower() for action in self.file_actions]
+        self.filter_recent_files(self.search_box.text())
 
     def filter_recent_files(self, text):
-        """Filters the visible recent files based on the search text."""
-        for action in self.file_actions:
-            file_name = action.text()
-            if text.lower() in file_name.lower():
-                action.setVisible(True)
-            else:
-                action.setVisible(False)
+        """Shows the recent files whose names fuzzy-match the search text."""
+        query = text.strip().lower().replace(" ", "")
+        for action, key in zip(self.file_actions, self._action_keys):
+            action.setVisible(not query or fuzzy_score(query, key) is not None)
 
     def open_recent_file(self):
         """Opens the selected recent file."""
@@ -132,17 +116,8 @@ class RecentFiles:
                 self.parent.openFile(file_path)
                 self.add_file(file_path)  # Move to top of recent files
             else:
-                if file_path in self.recent_files:
-                    self.recent_files.remove(file_path)
-                    self.save_recent_files()
+                self.files.removeRecent(file_path)
 
     def add_file(self, file_path):
         """Adds a file to the recent files list."""
-        if file_path in self.recent_files:
-            self.recent_files.remove(file_path)
-        self.recent_files.insert(0, file_path)
-        if len(self.recent_files) > self.max_files:
-            self.recent_files = self.recent_files[:self.max_files]
-        self.save_recent_files()
-        self.update_menu()
-
+        self.files.addRecent(file_path)
@@ -8,20 +8,24 @@ import subprocess
 import tempfile
 import logging
 import sys
-import requests
+import threading
 import importlib.util
-from PyQt5.QtCore import QObject, QTimer, QUrl
+from concurrent.futures import ThreadPoolExecutor
+from PyQt5.QtCore import QObject, QUrl
 from PyQt5.QtWidgets import QMessageBox, QApplication
 from PyQt5.QtGui import QTextCursor
 
 from PyQt5.QtWidgets import QMessageBox
 
+from modules import tracing
+
 # Get the base directory path
 base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, base_dir)  # Add the base directory to Python path
 
-from scripts.c6sortv2 import read_file, parse_input, get_sort_order, sort_blocks
 
+# Every run* action is timed; see View > Latency HUD
+@tracing.trace_methods("run")
 class ScriptRunner:
     def __init__(self, parent_window):
         """Initialize ScriptRunner with a reference to the parent window"""
@@ -29,26 +33,24 @@ class ScriptRunner:
         logging.debug("ScriptRunner initialized with parent window reference")
         self.scripts_dir = os.path.join(base_dir, 'scripts')
 
-        # Cache for imported modules
+        # Cache for imported modules; script plugins are imported on first use and
+        # re-imported when their file changes
         self._module_cache = {}
+        self._module_versions = {}   # script path -> (mtime_ns, size) of the cached module
+        self._accepts_window = {}    # script path -> whether clean_segment takes window=
+        self._import_lock = threading.RLock()
+
+        # Compiled c6sort order, created on first sort
+        self._sort_order = None
 
-        # Existing scripts
-        self.TIME_SAVER_SCRIPT_4445 = os.path.join(self.scripts_dir, 'timeSaver4445.py')
+        # Scripts with hand-written runners; the others declare a PLUGIN manifest (see plugin_registry)
         self.INTRO_SCRIPT = os.path.join(self.scripts_dir, 'intro.py')
-        self.TS1_SCRIPT = os.path.join(self.scripts_dir, 'ts1.py')
-        self.TS2_SCRIPT = os.path.join(self.scripts_dir, 'ts2.py')
-        self.TS3_SCRIPT = os.path.join(self.scripts_dir, 'ts3.py')
-        self.TS3334_SCRIPT = os.path.join(self.scripts_dir, 'ts3334.py')
-        self.TS4_SCRIPT = os.path.join(self.scripts_dir, 'ts4.py')
         self.CPYIMAGES_SCRIPT = os.path.join(self.scripts_dir, 'cpyimagesv4.py')
         self.C6SORTV2_SCRIPT = os.path.join(self.scripts_dir, 'c6sortv2.py')
         self.QQ_SCRIPT = os.path.join(self.scripts_dir, 'qq.py')
-        self.SHRTN_SCRIPT = os.path.join(self.scripts_dir, 'shrtn.py')
         self.SYN_SCRIPT = os.path.join(self.scripts_dir, 'syn.py')
         self.GPS_SCRIPT = os.path.join(self.scripts_dir, 'gps.py')
         self.CONTEXT_SCRIPT = os.path.join(self.scripts_dir, 'context.py')
-        self.CMNT_SNTMNT_SCRIPT = os.path.join(self.scripts_dir, 'CmntSntmnt.py')
-        self.STB_SCRIPT = os.path.join(self.scripts_dir, 'STB.py')
         self.STBC_SCRIPT = os.path.join(self.scripts_dir, 'STBC.py')
         self.LASTWORDS_SCRIPT = os.path.join(self.scripts_dir, 'lastwords.py')
         self.STBC_MIDDLE_SCRIPT = os.path.join(self.scripts_dir, 'STBC-Middle.py')
@@ -58,55 +60,59 @@ class ScriptRunner:
 
         self.python_executable = sys.executable
 
-        # Pre-import commonly used modules
-        self._preload_modules()
-
-    def _preload_modules(self):
-        """Pre-import commonly used script modules."""
-        common_scripts = [
-            self.TIME_SAVER_SCRIPT_4445,
-            self.INTRO_SCRIPT,
-            self.TS1_SCRIPT,
-            self.TS2_SCRIPT,
-            self.TS3_SCRIPT,
-            self.TS3334_SCRIPT,
-            self.TS4_SCRIPT
-        ]
-        for script in common_scripts:
-            self._import_module(script)
-
     def _import_module(self, script_path):
-        """Import a module and cache it."""
-        if script_path not in self._module_cache:
+        """
+        Import a module and cache it. When the file has changed since it was imported, the
+        new version replaces the cached module only if it imports cleanly; jobs that already
+        hold the old module finish with it.
+        """
+        with self._import_lock:
             try:
-                script_name = os.path.basename(script_path)
-                module_name = os.path.splitext(script_name)[0]
-                spec = importlib.util.spec_from_file_location(module_name, script_path)
-                module = importlib.util.module_from_spec(spec)
-                spec.loader.exec_module(module)
-                self._module_cache[script_path] = module
-            except Exception as e:
+                stat = os.stat(script_path)
+                version = (stat.st_mtime_ns, stat.st_size)
+            except OSError as e:
                 logging.error(f"Failed to import module {script_path}: {e}")
-                return None
-        return self._module_cache[script_path]
+                return self._module_cache.get(script_path)
 
-    def run_timeSaverScript(self):
-        editor = self.parent_window.currentEditor()
-        if not editor:
-            self.parent_window.statusBar().showMessage("No open editor to run timeSaver4445.", 5000)
-            logging.warning("Attempted to run timeSaver4445 with no open editor.")
-            return
-        selected_text = editor.textCursor().selectedText()
-        if not selected_text.strip():
-            self.parent_window.statusBar().showMessage("No text selected for timeSaver4445.", 5000)
-            logging.warning("No text selected for timeSaver4445.")
-            return
-        self.run_generic_script(
-            script=self.TIME_SAVER_SCRIPT_4445,
-            markers=("444\n\n444\n", "\n555"),
-            pattern=r'^444\s*\n\n444\s*\n([\s\S]*?)\n555$',
-            selected_text=selected_text
-        )
+            cached = self._module_cache.get(script_path)
+            if cached is not None and self._module_versions.get(script_path) == version:
+                return cached
+            try:
+                module = self._load_module(script_path, fresh=cached is not None)
+            except Exception as e:
+                if cached is None:
+                    logging.error(f"Failed to import module {script_path}: {e}")
+                    return None
+                message = f"Reloading {os.path.basename(script_path)} failed, keeping the loaded version: {e}"
+                logging.error(message)
+                self.parent_window.statusBar().showMessage(message, 8000)
+                # Not retried until the file changes again
+                self._module_versions[script_path] = version
+                return cached
+
+            self._module_cache[script_path] = module
+            self._module_versions[script_path] = version
+            self._accepts_window.pop(script_path, None)
+            if cached is not None:
+                logging.info(f"Reloaded changed script {script_path}")
+                self.parent_window.statusBar().showMessage(f"Reloaded {os.path.basename(script_path)}", 3000)
+            return module
+
+    def _load_module(self, script_path, fresh=False):
+        """
+        Execute the script as a new module object. fresh compiles the source itself, because
+        __pycache__ is validated by a timestamp with one-second resolution.
+        """
+        module_name = os.path.splitext(os.path.basename(script_path))[0]
+        spec = importlib.util.spec_from_file_location(module_name, script_path)
+        module = importlib.util.module_from_spec(spec)
+        if fresh:
+            with open(script_path, 'rb') as f:
+                code = compile(f.read(), script_path, 'exec')
+            exec(code, module.__dict__)
+        else:
+            spec.loader.exec_module(module)
+        return module
 
     def runIntroScript(self):
         """Run the intro script on the selected text, preserving the first line as the header and rewriting the rest to flow naturally from it."""
@@ -263,78 +269,6 @@ class ScriptRunner:
             self.parent_window.statusBar().showMessage(error_msg, 5000)
             logging.error(error_msg)
 
-    def runTs1Script(self):
-        editor = self.parent_window.currentEditor()
-        if not editor:
-            self.parent_window.statusBar().showMessage("No open editor for ts1.", 5000)
-            logging.warning("Attempted to run ts1 with no open editor.")
-            return
-        selected_text = editor.textCursor().selectedText()
-        if not selected_text.strip():
-            self.parent_window.statusBar().showMessage("No text selected for ts1.", 5000)
-            logging.warning("No text selected for ts1.")
-            return
-        self.run_generic_script(
-            script=self.TS1_SCRIPT,
-            markers=("111\n", "\n111"),
-            pattern=r'^111\s*\n([\s\S]*?)\n111$',
-            selected_text=selected_text
-        )
-
-    def runTs2Script(self):
-        editor = self.parent_window.currentEditor()
-        if not editor:
-            self.parent_window.statusBar().showMessage("No open editor for ts2.", 5000)
-            logging.warning("Attempted to run ts2 with no open editor.")
-            return
-        selected_text = editor.textCursor().selectedText()
-        if not selected_text.strip():
-            self.parent_window.statusBar().showMessage("No text selected for ts2.", 5000)
-            logging.warning("No text selected for ts2.")
-            return
-        self.run_generic_script(
-            script=self.TS2_SCRIPT,
-            markers=("222\n", "\n222"),
-            pattern=r'^222\s*\n([\s\S]*?)\n222$',
-            selected_text=selected_text
-        )
-
-    def runTs3Script(self):
-        editor = self.parent_window.currentEditor()
-        if not editor:
-            self.parent_window.statusBar().showMessage("No open editor for ts3.", 5000)
-            logging.warning("Attempted to run ts3 with no open editor.")
-            return
-        selected_text = editor.textCursor().selectedText()
-        if not selected_text.strip():
-            self.parent_window.statusBar().showMessage("No text selected for ts3.", 5000)
-            logging.warning("No text selected for ts3.")
-            return
-        self.run_generic_script(
-            script=self.TS3_SCRIPT,
-            markers=("111\n", "\n111"),
-            pattern=r'^111\s*\n([\s\S]*?)\n111$',
-            selected_text=selected_text
-        )
-
-    def runTs3334Script(self):
-        editor = self.parent_window.currentEditor()
-        if not editor:
-            self.parent_window.statusBar().showMessage("No open editor for ts3334.", 5000)
-            logging.warning("Attempted to run ts3334 with no open editor.")
-            return
-        selected_text = editor.textCursor().selectedText()
-        if not selected_text.strip():
-            self.parent_window.statusBar().showMessage("No text selected for ts3334.", 5000)
-            logging.warning("No text selected for ts3334.")
-            return
-        self.run_generic_script(
-            script=self.TS3334_SCRIPT,
-            markers=("444\n\n444\n", "\n555"),
-            pattern=r'^444\s*\n\n444\s*\n([\s\S]*?)\n555$',
-            selected_text=selected_text
-        )
-
     def runQqScript(self):
         """
         Runs the qq script on either:
@@ -439,24 +373,6 @@ class ScriptRunner:
             logging.error(f"QQ Script error: {error_details}")
             print(f"Exception details: {error_details}")
 
-    def runShrtnScript(self):
-        editor = self.parent_window.currentEditor()
-        if not editor:
-            self.parent_window.statusBar().showMessage("No open editor for shrtn.", 5000)
-            logging.warning("Attempted to run shrtn.py with no open editor.")
-            return
-        selected_text = editor.textCursor().selectedText()
-        if not selected_text.strip():
-            self.parent_window.statusBar().showMessage("No text selected for shrtn script.", 5000)
-            logging.warning("No text selected for shrtn.py.")
-            return
-        self.run_generic_script(
-            script=self.SHRTN_SCRIPT,
-            markers=("111\n", "\n111"),
-            pattern=r'^111\s*\n([\s\S]*?)\n111$',
-            selected_text=selected_text
-        )
-
     # NEW: runSynScript
     def runSynScript(self):
         """
@@ -693,74 +609,44 @@ class ScriptRunner:
             logging.error("No editor is currently open.")
             return
 
-        # Get the content of the current tab
-        input_content = editor.toPlainText()
+        try:
+            # Imported on first use so a broken sorter cannot stop the app from starting
+            from modules.c6sort import SortOrder, sort_segments
+        except Exception as e:
+            logging.error(f"Failed to load the c6sort engine: {str(e)}")
+            self.parent_window.statusBar().showMessage("Sort engine unavailable", 5000)
+            return
 
-        # Define the sort order file path
-        sort_order_file = "/home/j/Desktop/ttag_sort_order.vhd"
+        if self._sort_order is None:
+            self._sort_order = SortOrder()
+        sort_order_file = self._sort_order.path
         if not os.path.exists(sort_order_file):
             logging.error(f"Sort order file not found: {sort_order_file}")
-            return
-
-        # Read the sort order
-        try:
-            sort_order_content = read_file(sort_order_file)
-        except Exception as e:
-            logging.error(f"Error reading sort order file: {str(e)}")
+            self.parent_window.statusBar().showMessage(f"Sort order file not found: {sort_order_file}", 5000)
             return
 
         try:
-            # Parse and sort the blocks
-            blocks = parse_input(input_content)
-            if not blocks:
-                logging.warning("No valid blocks found in the input content.")
-                return
-
-            sort_order = get_sort_order(sort_order_content)
-            if not sort_order:
+            if not self._sort_order.ranks():
                 logging.warning("Sort order file is empty or invalid.")
                 return
+            if not editor.segments.count():
+                logging.warning("No valid blocks found in the input content.")
+                return
 
-            sorted_blocks = sort_blocks(blocks, sort_order)
-            sorted_content = ''.join(sorted_blocks)
-
-            # Save cursor and scroll positions
-            cursor = editor.textCursor()
-            scrollbar = editor.verticalScrollBar()
-            scroll_pos = scrollbar.value()
-            cursor_pos = cursor.position()
-
-            # Update the editor content
-            editor.setPlainText(sorted_content)
-            
-            # Use QTimer to restore positions after content is rendered
-            def restore_positions():
-                # Restore scroll position
-                scrollbar.setValue(scroll_pos)
-                
-                # Restore cursor position if it's within the new content length
-                if cursor_pos <= len(sorted_content):
-                    cursor.setPosition(cursor_pos)
-                    editor.setTextCursor(cursor)
-                
-                # Update file modification time if needed
-                filepath = editor.property("filepath")
-                if filepath and os.path.exists(filepath):
-                    new_mtime = os.path.getmtime(filepath)
-                    editor.setProperty("last_modified_time", new_mtime)
-
-                # Clear any external change warning
-                self.parent_window.statusBar().setStyleSheet("")
-                self.parent_window.statusBar().showMessage("Sorting completed successfully", 5000)
-
-            # Schedule the position restoration after a short delay
-            QTimer.singleShot(100, restore_positions)
+            # Only segments out of place are moved; cursor, scroll and undo history survive
+            scroll = editor.verticalScrollBar().value()
+            moved, unranked = sort_segments(editor.segments, self._sort_order)
+            editor.verticalScrollBar().setValue(scroll)
+            message = f"Sorting completed successfully ({moved} segment(s) moved"
+            if unranked:
+                message += f", {unranked} not in the sort order"
+            self.parent_window.statusBar().showMessage(message + ")", 5000)
 
         except Exception as e:
             logging.error(f"Error during sorting: {str(e)}")
             self.parent_window.statusBar().showMessage("Sort operation failed", 5000)
 
-    def run_generic_script(self, script, markers, pattern, selected_text):
+    def run_generic_script(self, script, markers, pattern, selected_text, concurrency=1):
         """Generic script runner that handles the common pattern of processing selected text."""
         try:
             # Get or import the module
@@ -768,12 +654,14 @@ class ScriptRunner:
             if not module:
                 self.parent_window.statusBar().showMessage("Failed to load script module.", 5000)
                 return
+            tracing.mark("import")
 
             # Process the text in memory instead of using a temporary file
             marked_text = f"{markers[0]}{selected_text}{markers[1]}"
             
             # Parse segments and process them
             segments = module.parse_segments_with_positions(marked_text)
+            tracing.mark("parse")
             if not segments:
                 self.parent_window.statusBar().showMessage("No valid segments found to process.", 5000)
                 return
@@ -784,32 +672,30 @@ class ScriptRunner:
             cursor.beginEditBlock()
 
             # Cache the module's clean_segment signature to avoid repeated checks
-            module_name = module.__name__
-            if module_name not in self._module_cache:
-                self._module_cache[module_name] = {}
-            
-            if 'accepts_window' not in self._module_cache[module_name]:
+            if script not in self._accepts_window:
                 import inspect
                 sig = inspect.signature(module.clean_segment)
-                self._module_cache[module_name]['accepts_window'] = 'window' in sig.parameters
-
-            accepts_window = self._module_cache[module_name]['accepts_window']
-
-            # Process all segments first
-            processed_texts = []
-            for segment in segments:
-                # Handle timeSaver4445.py's different segment structure
-                if module_name == 'timeSaver4445':
-                    processed_text = module.clean_segment(segment['context_444'], segment['content_555'], window=self.parent_window)
-                else:
-                    # Use cached information about window parameter support
-                    if accepts_window:
-                        processed_text = module.clean_segment(segment['content'], window=self.parent_window)
-                    else:
-                        processed_text = module.clean_segment(segment['content'])
-                
-                if processed_text:
-                    processed_texts.append(processed_text)
+                self._accepts_window[script] = 'window' in sig.parameters
+            accepts_window = self._accepts_window[script]
+
+            # Process all segments first. A script opting in with a concurrency hint above one
+            # gets its API calls overlapped; one that reports through window= always runs
+            # sequentially, since the window must only be touched from the GUI thread
+            contents = [segment['content'] for segment in segments]
+            workers = 1 if accepts_window else min(concurrency, len(contents))
+            if accepts_window and concurrency > 1:
+                logging.debug(f"{os.path.basename(script)} takes window=; ignoring its concurrency hint")
+            if workers > 1:
+                self.parent_window.statusBar().showMessage(
+                    f"Processing {len(contents)} segments, {workers} at a time...")
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    results = list(executor.map(module.clean_segment, contents))
+            elif accepts_window:
+                results = [module.clean_segment(content, window=self.parent_window) for content in contents]
+            else:
+                results = [module.clean_segment(content) for content in contents]
+            processed_texts = [text for text in results if text]
+            tracing.mark("api")
 
             # Replace the entire selection with the processed text
             if processed_texts:
@@ -820,6 +706,7 @@ class ScriptRunner:
                 cursor.insertText(final_text)
 
             cursor.endEditBlock()
+            tracing.mark("insert")
             self.parent_window.statusBar().showMessage("Text processing completed successfully.", 5000)
 
         except Exception as e:
@@ -905,24 +792,6 @@ class ScriptRunner:
             logging.error(f"CpyImages Script error: {error_details}")
             print(f"Exception details: {error_details}")
 
-    def runTs4Script(self):
-        editor = self.parent_window.currentEditor()
-        if not editor:
-            self.parent_window.statusBar().showMessage("No open editor for ts4.", 5000)
-            logging.warning("Attempted to run ts4 with no open editor.")
-            return
-        selected_text = editor.textCursor().selectedText()
-        if not selected_text.strip():
-            self.parent_window.statusBar().showMessage("No text selected for ts4.", 5000)
-            logging.warning("No text selected for ts4.")
-            return
-        self.run_generic_script(
-            script=self.TS4_SCRIPT,
-            markers=("111\n", "\n111"),
-            pattern=r'^111\s*\n([\s\S]*?)\n111$',
-            selected_text=selected_text
-        )
-
     def runTestModelScript(self):
         """Run the test_model script on the selected text."""
         editor = self.parent_window.currentEditor()
@@ -1342,109 +1211,6 @@ class ScriptRunner:
             logging.error(f"Context Script error: {error_details}")
             print(f"Exception details: {error_details}")
 
-    def runCmntSntmntScript(self):
-        """Run the CmntSntmnt script on the selected text to analyze sentiment of comments."""
-        editor = self.parent_window.currentEditor()
-        if not editor:
-            self.parent_window.statusBar().showMessage("No open editor for comment sentiment analysis.", 5000)
-            logging.warning("Attempted to run CmntSntmnt with no open editor.")
-            return
-            
-        selected_text = editor.textCursor().selectedText()
-        if not selected_text.strip():
-            self.parent_window.statusBar().showMessage("No text selected for comment sentiment analysis.", 5000)
-            logging.warning("No text selected for CmntSntmnt.")
-            return
-
-        try:
-            # Get the path to CmntSntmnt.py
-            script_path = os.path.join(self.scripts_dir, 'CmntSntmnt.py')
-            
-            # Run the script with the selected text
-            result = subprocess.run(
-                ['python3', script_path, selected_text],
-                capture_output=True,
-                text=True,
-                check=False
-            )
-
-            if result.returncode == 0:
-                # Replace selected text with the script output
-                cursor = editor.textCursor()
-                cursor.beginEditBlock()
-                cursor.removeSelectedText()
-                cursor.insertText(result.stdout)
-                cursor.endEditBlock()
-                self.parent_window.statusBar().showMessage("Comment sentiment analysis completed successfully.", 5000)
-            else:
-                error_msg = f"Comment sentiment analysis failed: {result.stderr}"
-                self.parent_window.statusBar().showMessage(error_msg, 5000)
-                logging.error(error_msg)
-                
-        except Exception as e:
-            error_msg = f"Error running comment sentiment analysis: {str(e)}"
-            self.parent_window.statusBar().showMessage(error_msg, 5000)
-            logging.error(error_msg)
-
-    def runSTBScript(self):
-        """Run the STB script on the current editor's text."""
-        logging.debug("Starting runSTBScript method")
-        
-        try:
-            editor = self.parent_window.currentEditor()
-            if not editor:
-                logging.warning("No open editor for STB.")
-                self.parent_window.statusBar().showMessage("No open editor for STB.", 5000)
-                return
-            
-            selected_text = editor.textCursor().selectedText()
-            if not selected_text.strip():
-                # If no text is selected, use the entire document
-                selected_text = editor.toPlainText()
-            
-            if not selected_text.strip():
-                logging.warning("No text available for STB.")
-                self.parent_window.statusBar().showMessage("No text available for STB.", 5000)
-                return
-
-            logging.debug(f"Running STB script with text length: {len(selected_text)}")
-
-            # Run the STB script using subprocess with detailed error capturing
-            result = subprocess.run(
-                ['python3', self.STB_SCRIPT, selected_text],
-                capture_output=True,
-                text=True,
-                check=False
-            )
-
-            # Log both stdout and stderr
-            logging.debug(f"STB script stdout: {result.stdout}")
-            logging.debug(f"STB script stderr: {result.stderr}")
-
-            if result.returncode == 0:
-                cursor = editor.textCursor()
-                cursor.beginEditBlock()
-                
-                # Replace the selected text or entire document with the script output
-                if editor.textCursor().hasSelection():
-                    cursor.removeSelectedText()
-                    cursor.insertText(result.stdout)
-                else:
-                    cursor.select(QTextCursor.Document)
-                    cursor.removeSelectedText()
-                    cursor.insertText(result.stdout)
-                
-                cursor.endEditBlock()
-                self.parent_window.statusBar().showMessage("STB script completed successfully.", 5000)
-            else:
-                error_msg = f"STB script failed (return code {result.returncode}): {result.stderr}"
-                self.parent_window.statusBar().showMessage(error_msg, 5000)
-                logging.error(error_msg)
-        except Exception as e:
-            error_msg = f"Unexpected error in runSTBScript: {str(e)}"
-            self.parent_window.statusBar().showMessage(error_msg, 5000)
-            logging.error(error_msg, exc_info=True)  # Log full traceback
-
     def runSTBCScript(self):
         """Run the STBC script on the current editor's text, using surrounding context for better understanding."""
         logging.debug("Starting runSTBCScript method")
@@ -0,0 +1,296 @@
+# /modules/segment_model.py
+
+import re
+import bisect
+from collections import namedtuple
+
+from PyQt5.QtCore import QObject
+from PyQt5.QtGui import QTextCursor
+
+from modules.text_patch import longest_increasing
+
+TITLE_RE = re.compile(r'^\s*[\'"]?Title:')
+
+# index: position in the segment list; first_block/last_block: block numbers;
+# start/end: character range [start, end) in the document
+Segment = namedtuple("Segment", "index first_block last_block start end")
+
+
+def is_title(text):
+    return TITLE_RE.match(text) is not None
+
+
+class SegmentModel(QObject):
+    """
+    The "Title:" segments of a QTextDocument.
+
+    A segment runs from a Title: line up to the next one (or the end of the document);
+    text above the first title belongs to no segment. The model keeps a sorted list of
+    title block numbers and updates it from contentsChange, rescanning only the blocks an
+    edit touched. Segment edits (move, swap, extract, insert) are done with a text cursor
+    on the affected ranges only, each as one undoable step.
+    """
+
+    def __init__(self, document, parent=None):
+        super().__init__(parent)
+        self.document = document
+        self._titles = []
+        self._block_count = 0
+        self.rescan()
+        # QTextDocument only reports contentsChange once it has a layout
+        document.documentLayout()
+        document.contentsChange.connect(self._onContentsChange)
+
+    def rescan(self):
+        """Rebuild the title list from scratch."""
+        titles = []
+        block = self.document.begin()
+        while block.isValid():
+            if is_title(block.text()):
+                titles.append(block.blockNumber())
+            block = block.next()
+        self._titles = titles
+        self._block_count = self.document.blockCount()
+
+    def _onContentsChange(self, position, removed, added):
+        doc = self.document
+        first = doc.findBlock(position).blockNumber()
+        last_block = doc.findBlock(position + added)
+        last = last_block.blockNumber() if last_block.isValid() else doc.blockCount() - 1
+        if first < 0:
+            self.rescan()
+            return
+        delta = doc.blockCount() - self._block_count
+        self._block_count = doc.blockCount()
+        old_last = last - delta  # the same block before the edit
+
+        titles = self._titles
+        lo = bisect.bisect_left(titles, first)
+        hi = bisect.bisect_right(titles, old_last)
+        rescanned = []
+        block = doc.findBlockByNumber(first)
+        while block.isValid() and block.blockNumber() <= last:
+            if is_title(block.text()):
+                rescanned.append(block.blockNumber())
+            block = block.next()
+        tail = titles[hi:]
+        if delta:
+            tail = [number + delta for number in tail]
+        self._titles = titles[:lo] + rescanned + tail
+
+    # Lookup
+
+    def count(self):
+        return len(self._titles)
+
+    def titles(self):
+        """Block numbers of all title lines, in document order."""
+        return list(self._titles)
+
+    def _end_position(self):
+        return self.document.characterCount() - 1
+
+    def segment(self, index):
+        """The segment at index (negative indexes count from the end)."""
+        titles = self._titles
+        if index < 0:
+            index += len(titles)
+        if not 0 <= index < len(titles):
+            raise IndexError(f"segment index out of range: {index}")
+        start = self.document.findBlockByNumber(titles[index]).position()
+        if index + 1 < len(titles):
+            next_block = titles[index + 1]
+            end = self.document.findBlockByNumber(next_block).position()
+            last_block = next_block - 1
+        else:
+            end = self._end_position()
+            last_block = self.document.blockCount() - 1
+        return Segment(index, titles[index], last_block, start, end)
+
+    def segments(self):
+        return [self.segment(i) for i in range(len(self._titles))]
+
+    def index_for_block(self, block_number):
+        """Index of the segment containing block_number, or -1 above the first title."""
+        return bisect.bisect_right(self._titles, block_number) - 1
+
+    def index_at(self, position):
+        return self.index_for_block(self.document.findBlock(position).blockNumber())
+
+    def segment_at(self, position):
+        """The segment containing the character position, or None above the first title."""
+        index = self.index_at(position)
+        return self.segment(index) if index >= 0 else None
+
+    def next_title(self, block_number):
+        """Block number of the first title line after block_number, or None."""
+        i = bisect.bisect_right(self._titles, block_number)
+        return self._titles[i] if i < len(self._titles) else None
+
+    def previous_title(self, block_number):
+        """Block number of the last title line before block_number, or None."""
+        i = bisect.bisect_left(self._titles, block_number)
+        return self._titles[i - 1] if i else None
+
+    def nearest_title(self, block_number, radius):
+        """The title line closest to block_number within radius blocks, or None."""
+        i = bisect.bisect_left(self._titles, block_number)
+        candidates = [n for n in self._titles[max(0, i - 1):i + 1] if abs(n - block_number) <= radius]
+        return min(candidates, key=lambda n: abs(n - block_number)) if candidates else None
+
+    # Editing
+
+    def text(self, index):
+        """A segment's text, always ending with a newline."""
+        seg = self.segment(index)
+        cursor = QTextCursor(self.document)
+        cursor.setPosition(seg.start)
+        cursor.setPosition(seg.end, QTextCursor.KeepAnchor)
+        text = cursor.selectedText().replace('\u2029', '\n')
+        return text if text.endswith('\n') else text + '\n'
+
+    def _removal_range(self, seg):
+        """Range to delete to take seg out of the document without leaving a stray line."""
+        if seg.index == len(self._titles) - 1 and seg.start > 0 and self.document.lastBlock().text():
+            # The last segment has no final newline: take the one before it instead
+            return seg.start - 1, seg.end
+        return seg.start, seg.end
+
+    def _insertion(self, index, text):
+        """(position, text) that puts a newline-terminated segment text before segment index."""
+        if index < len(self._titles):
+            return self.segment(index).start, text
+        end = self._end_position()
+        if end > 0 and self.document.lastBlock().text():
+            # Appending after a last line without a newline
+            return end, '\n' + text[:-1]
+        return end, text
+
+    def extract(self, index, cursor=None):
+        """Remove a segment from the document and return its text."""
+        seg = self.segment(index)
+        text = self.text(index)
+        start, end = self._removal_range(seg)
+        cursor = cursor or QTextCursor(self.document)
+        cursor.beginEditBlock()
+        cursor.setPosition(start)
+        cursor.setPosition(end, QTextCursor.KeepAnchor)
+        cursor.removeSelectedText()
+        cursor.endEditBlock()
+        return text
+
+    def insert(self, index, text, cursor=None):
+        """Insert text as a new segment before segment index (at the end if index == count())."""
+        if not text.endswith('\n'):
+            text += '\n'
+        position, text = self._insertion(index, text)
+        cursor = cursor or QTextCursor(self.document)
+        cursor.beginEditBlock()
+        cursor.setPosition(position)
+        cursor.insertText(text)
+        cursor.endEditBlock()
+
+    def move(self, index, before):
+        """
+        Move segment index so it sits right before segment before (the end if before ==
+        count()). Only the moved segment's text is cut and reinserted.
+        """
+        count = len(self._titles)
+        if not 0 <= index < count or not 0 <= before <= count:
+            raise IndexError(f"segment move out of range: {index} -> {before}")
+        if before in (index, index + 1):
+            return
+        seg = self.segment(index)
+        text = self.text(index)
+        start, end = self._removal_range(seg)
+        position, text = self._insertion(before, text)
+        cursor = QTextCursor(self.document)
+        cursor.beginEditBlock()
+        # Positions are from before the edit, so change the later range first
+        if position > start:
+            cursor.setPosition(position)
+            cursor.insertText(text)
+            cursor.setPosition(start)
+            cursor.setPosition(end, QTextCursor.KeepAnchor)
+            cursor.removeSelectedText()
+        else:
+            cursor.setPosition(start)
+            cursor.setPosition(end, QTextCursor.KeepAnchor)
+            cursor.removeSelectedText()
+            cursor.setPosition(position)
+            cursor.insertText(text)
+        cursor.endEditBlock()
+
+    def swap(self, i, j):
+        """Exchange two segments."""
+        if i == j:
+            return
+        i, j = min(i, j), max(i, j)
+        first, second = self.segment(i), self.segment(j)
+        first_text, second_text = self.text(i), self.text(j)
+        second_end = second.end
+        if j == len(self._titles) - 1 and self.document.lastBlock().text():
+            # The later segment ends the document without a newline; keep it that way
+            first_text = first_text[:-1]
+        cursor = QTextCursor(self.document)
+        cursor.beginEditBlock()
+        cursor.setPosition(second.start)
+        cursor.setPosition(second_end, QTextCursor.KeepAnchor)
+        cursor.insertText(first_text)
+        cursor.setPosition(first.start)
+        cursor.setPosition(first.end, QTextCursor.KeepAnchor)
+        cursor.insertText(second_text)
+        cursor.endEditBlock()
+
+    def reorder(self, order):
+        """
+        Rearrange the segments so that new segment k is old segment order[k], as one
+        undoable step. Segments in the longest run already in the right relative order stay
+        put; only the others are cut and reinserted. Returns the number of segments moved.
+        """
+        count = len(self._titles)
+        if sorted(order) != list(range(count)):
+            raise ValueError("order must be a permutation of the segment indexes")
+        new_index = [0] * count
+        for k, old in enumerate(order):
+            new_index[old] = k
+        keep = {old for old, _ in longest_increasing([(old, new_index[old]) for old in range(count)])}
+        if len(keep) == count:
+            return 0
+
+        segments = self.segments()
+        base = segments[0].start
+        current = list(range(count))  # old indexes in document order as the moves happen
+        lengths = [seg.end - seg.start for seg in segments]
+        cursor = QTextCursor(self.document)
+        cursor.beginEditBlock()
+        # Edits inside the block are applied at once but contentsChange only arrives at
+        # the end, so positions are tracked here rather than asked of the model
+        trailing = bool(self.document.lastBlock().text())
+        if trailing:
+            # Give the last segment a final newline while segments are shuffled
+            cursor.setPosition(self._end_position())
+            cursor.insertText('\n')
+            lengths[-1] += 1
+        current_lengths = lengths[:]
+        for k, old in enumerate(order):
+            if old in keep:
+                continue
+            i = current.index(old)
+            start = base + sum(current_lengths[:i])
+            cursor.setPosition(start)
+            cursor.setPosition(start + lengths[old], QTextCursor.KeepAnchor)
+            text = cursor.selectedText().replace('\u2029', '\n')
+            cursor.removeSelectedText()
+            del current[i], current_lengths[i]
+            # Right after the segment that precedes it in the new order
+            i = current.index(order[k - 1]) + 1 if k else 0
+            cursor.setPosition(base + sum(current_lengths[:i]))
+            cursor.insertText(text)
+            current.insert(i, old)
+            current_lengths.insert(i, lengths[old])
+        if trailing:
+            cursor.setPosition(self._end_position())
+            cursor.deletePreviousChar()
+        cursor.endEditBlock()
+        return count - len(keep)
@@ -0,0 +1,200 @@
+# /modules/send_queue.py
+
+import os
+import time
+import queue
+import logging
+
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, QTimer, pyqtSignal
+from PyQt5.QtGui import QTextCursor
+
+from modules.file_saver import atomic_write
+
+SEPARATOR = "\n\n"
+
+
+def prepend_block(segments):
+    """Text that prepending each segment in turn would put in front of the old content."""
+    # Every send goes on top, so the newest segment ends up first
+    return "".join(segment + SEPARATOR for segment in reversed(segments))
+
+
+class _SendSignals(QObject):
+    wake = pyqtSignal()
+
+
+class _SendBatch(QRunnable):
+    """Backs up the target once, then rewrites it with every queued segment on top."""
+
+    def __init__(self, sender, target, segments):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.sender = sender
+        self.target = target
+        self.segments = segments
+
+    def execute(self):
+        try:
+            existing = ""
+            if os.path.exists(self.target):
+                with open(self.target, 'r', encoding='utf-8', errors='replace') as f:
+                    existing = f.read()
+            if self.sender.store is not None:
+                self.sender.store.snapshot_text(self.target, existing, "send")
+            atomic_write(self.target, prepend_block(self.segments) + existing)
+        except Exception as e:
+            return e
+        return None
+
+    def run(self):
+        error = self.execute()
+        self.sender._done.put((self, error))
+        self.sender._signals.wake.emit()
+
+
+class SendQueue(QObject):
+    """
+    Write-behind queue for the "Send To" actions.
+
+    Segments sent to the same file within BATCH_DELAY are written together: one read, one
+    incremental backup and one atomic rewrite per batch, off the GUI thread. A target that
+    is open in a tab gets the segment inserted into that tab's document instead.
+    """
+
+    BATCH_DELAY = 1500  # ms
+    MAX_RETRY_DELAY = 60 * 1000  # ms; failed sends back off from BATCH_DELAY doubling up to this
+
+    finished = pyqtSignal(str, int, str)  # target, segments written, error message ("" on success)
+
+    def __init__(self, parent_window=None, store=None):
+        super().__init__(parent_window)
+        self.parent = parent_window
+        self.store = store
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(1)
+        self._pending = {}    # target -> segments in send order
+        self._running = {}    # target -> batch being written
+        self._failures = {}   # target -> consecutive failed sends
+        self._retry_at = {}   # target -> time.monotonic() before which it is not retried
+        self._done = queue.SimpleQueue()
+        self._signals = _SendSignals()
+        self._signals.wake.connect(self._drain)
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self.flush)
+
+    def openEditor(self, target):
+        """The tab currently showing target, if any."""
+        tabs = getattr(self.parent, "tabs", None)
+        if tabs is None:
+            return None
+        target = os.path.abspath(target)
+        for i in range(tabs.count()):
+            widget = tabs.widget(i)
+            filepath = widget.property("filepath")
+            if filepath and os.path.abspath(filepath) == target:
+                hibernation = getattr(self.parent, "hibernation", None)
+                return hibernation.wake(widget) if hibernation else widget
+        return None
+
+    def send(self, target, segment):
+        """Queue segment to be prepended to target. Returns True if it went straight into an open tab."""
+        editor = self.openEditor(target)
+        if editor is not None:
+            self._insertIntoEditor(editor, [segment])
+            return True
+        self._pending.setdefault(target, []).append(segment)
+        self._timer.start(self.BATCH_DELAY)
+        return False
+
+    def hasPending(self):
+        return bool(self._pending) or bool(self._running)
+
+    def _insertIntoEditor(self, editor, segments):
+        cursor = QTextCursor(editor.document())
+        cursor.beginEditBlock()
+        cursor.setPosition(0)
+        cursor.insertText(prepend_block(segments))
+        cursor.endEditBlock()
+        if self.parent is not None and hasattr(self.parent, "markUnsavedChanges"):
+            self.parent.markUnsavedChanges(editor)
+        logging.info(f"Inserted {len(segments)} segment(s) into open tab for {editor.property('filepath')}")
+
+    def flush(self, blocking=False):
+        """Start writing every queued batch; with blocking=True write them inline and wait."""
+        self._timer.stop()
+        if blocking:
+            while self._running:
+                self.pool.waitForDone(50)
+                self._drain()
+        now = time.monotonic()
+        for target in list(self._pending):
+            if target in self._running:
+                continue  # Picked up again when the running batch finishes
+            if not blocking and self._retry_at.get(target, 0) > now:
+                continue  # Still backing off after a failure
+            segments = self._pending.pop(target)
+            editor = self.openEditor(target)
+            if editor is not None:
+                # Opened since the segments were queued; the tab is now the authority
+                self._insertIntoEditor(editor, segments)
+                self.finished.emit(target, len(segments), "")
+                continue
+            batch = _SendBatch(self, target, segments)
+            self._running[target] = batch
+            if blocking:
+                self._onBatchFinished(batch, batch.execute())
+            else:
+                self.pool.start(batch)
+        self._schedule()
+
+    def _schedule(self):
+        """Arm the timer for the next queued batch that is not being written (after its backoff)."""
+        now = time.monotonic()
+        delays = []
+        for target in self._pending:
+            if target in self._running:
+                continue
+            retry_at = self._retry_at.get(target)
+            delays.append(self.BATCH_DELAY if retry_at is None else max(0, (retry_at - now) * 1000))
+        if not delays:
+            return
+        delay = int(min(delays))
+        if self._timer.isActive() and self._timer.remainingTime() <= delay:
+            return
+        self._timer.start(delay)
+
+    def _drain(self):
+        while True:
+            try:
+                batch, error = self._done.get_nowait()
+            except queue.Empty:
+                return
+            self._onBatchFinished(batch, error)
+
+    def _onBatchFinished(self, batch, error):
+        if self._running.get(batch.target) is batch:
+            del self._running[batch.target]
+        if error is None:
+            self._failures.pop(batch.target, None)
+            self._retry_at.pop(batch.target, None)
+            logging.info(f"Sent {len(batch.segments)} segment(s) to {batch.target}")
+            self.finished.emit(batch.target, len(batch.segments), "")
+        else:
+            # Keep the segments (ahead of anything sent since) so nothing is lost, and retry later
+            self._pending[batch.target] = batch.segments + self._pending.get(batch.target, [])
+            failures = self._failures.get(batch.target, 0) + 1
+            self._failures[batch.target] = failures
+            delay = min(self.BATCH_DELAY * 2 ** (failures - 1), self.MAX_RETRY_DELAY)
+            self._retry_at[batch.target] = time.monotonic() + delay / 1000
+            logging.error(f"Failed to send to {batch.target} (attempt {failures}, retrying in {delay / 1000:.1f} s): {error}")
+            self.finished.emit(batch.target, len(batch.segments), str(error))
+        self._schedule()
+
+    def takeFailed(self):
+        """Remove and return every segment that is still unsent, as {target: segments}."""
+        pending, self._pending = self._pending, {}
+        self._failures.clear()
+        self._retry_at.clear()
+        return pending
@@ -0,0 +1,167 @@
+# /modules/session.py
+#
+# The open tabs (order, cursor, selection and scroll per tab, which one was current) and
+# the pane layout, saved on exit and restored on the next start. Only the current tab is
+# read at startup; the others are placeholders that load when first selected, and small
+# files are also loaded in idle time after the window is up.
+
+import os
+import json
+import logging
+
+from PyQt5.QtCore import QObject
+
+from modules.file_saver import atomic_write
+from modules.tab_hibernation import HibernatedTab
+
+SESSION_FILE = os.path.expanduser("~/.config/notepadmod/session.json")
+SESSION_VERSION = 1
+
+# Files up to this size are loaded in the background; larger ones wait for their tab to be selected
+BACKGROUND_LOAD_LIMIT = 256 * 1024
+
+
+def load_session(path=SESSION_FILE):
+    """The saved session dict, or None if there is none (or it cannot be read)."""
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            session = json.load(f)
+    except (OSError, ValueError) as e:
+        logging.error(f"Failed to load session from {path}: {e}")
+        return None
+    if not isinstance(session, dict) or session.get("version") != SESSION_VERSION:
+        logging.warning(f"Ignoring session file {path} with unknown format")
+        return None
+    return session
+
+
+def save_session(session, path=SESSION_FILE):
+    try:
+        atomic_write(path, json.dumps(session, indent=2), fsync=False)
+    except OSError as e:
+        logging.error(f"Failed to save session to {path}: {e}")
+
+
+class Session(QObject):
+    """Saves the window's tabs and panes and restores them with lazily loaded tabs."""
+
+    def __init__(self, parent_window, path=SESSION_FILE):
+        super().__init__(parent_window)
+        self.parent = parent_window
+        self.path = path
+
+    def capture(self):
+        """The session as a JSON-ready dict. Untitled tabs are left out (the edit journal covers them)."""
+        window = self.parent
+        tabs = window.tabs
+        entries = []
+        current = 0
+        for i in range(tabs.count()):
+            widget = tabs.widget(i)
+            filepath = widget.property("filepath")
+            if not filepath:
+                continue
+            if i == tabs.currentIndex():
+                current = len(entries)
+            if window.hibernation.isHibernated(widget):
+                # Never loaded or hibernated: the placeholder still has the positions
+                record = widget.record
+                entries.append({
+                    "filepath": filepath,
+                    "cursor": record.get("cursor", 0),
+                    "anchor": record.get("anchor", 0),
+                    "scroll": record.get("scroll", 0),
+                })
+            else:
+                cursor = widget.textCursor()
+                entries.append({
+                    "filepath": filepath,
+                    "cursor": cursor.position(),
+                    "anchor": cursor.anchor(),
+                    "scroll": widget.verticalScrollBar().value(),
+                })
+        return {
+            "version": SESSION_VERSION,
+            "tabs": entries,
+            "current": current,
+            "image_pane_visible": window.image_pane_visible,
+            "splitter": window.splitter.sizes(),
+            "editor_splitter": window.editor_splitter.sizes(),
+        }
+
+    def save(self):
+        session = self.capture()
+        save_session(session, self.path)
+        logging.debug(f"Saved session with {len(session['tabs'])} tab(s)")
+
+    def restore(self):
+        """
+        Reopen the saved tabs: the current one is loaded now, the others get placeholders.
+        Returns False if there was nothing to restore.
+        """
+        session = load_session(self.path)
+        if not session:
+            return False
+        window = self.parent
+        entries = []
+        current = 0
+        for i, entry in enumerate(session.get("tabs", [])):
+            if isinstance(entry, dict) and entry.get("filepath") and os.path.exists(entry["filepath"]):
+                if i <= session.get("current", 0):
+                    # The saved current tab, or the one before it if its file is gone
+                    current = len(entries)
+                entries.append(entry)
+        if not entries:
+            return False
+
+        self._restorePanes(session)
+        active = entries[current]
+        window.openFile(active["filepath"], active.get("cursor", 0), active.get("scroll", 0))
+
+        tabs = window.tabs
+        placeholders = []
+        # Inserted around the open tab without reporting tab changes, which would load them
+        tabs.blockSignals(True)
+        try:
+            for i, entry in enumerate(entries):
+                if i == current:
+                    continue
+                filepath = entry["filepath"]
+                record = {
+                    "filepath": filepath,
+                    "cursor": entry.get("cursor", 0),
+                    "anchor": entry.get("anchor", entry.get("cursor", 0)),
+                    "scroll": entry.get("scroll", 0),
+                    "label": os.path.basename(filepath),
+                }
+                placeholder = HibernatedTab(None, record)
+                tabs.insertTab(tabs.count() if i > current else i, placeholder, record["label"])
+                placeholders.append(placeholder)
+        finally:
+            tabs.blockSignals(False)
+
+        if not window.hibernation.enabled:
+            for placeholder in placeholders:
+                if os.path.getsize(placeholder.record["filepath"]) <= BACKGROUND_LOAD_LIMIT:
+                    window.startup.idle("session tab", lambda p=placeholder: self._loadInBackground(p))
+        logging.info(f"Restored session: {len(entries)} tab(s), {len(placeholders)} not loaded yet")
+        return True
+
+    def _restorePanes(self, session):
+        window = self.parent
+        if session.get("image_pane_visible", True) != window.image_pane_visible:
+            window.toggleImagePane()
+        for splitter, key in ((window.splitter, "splitter"), (window.editor_splitter, "editor_splitter")):
+            sizes = session.get(key)
+            if isinstance(sizes, list) and len(sizes) == splitter.count() and all(isinstance(n, int) for n in sizes):
+                splitter.setSizes(sizes)
+
+    def _loadInBackground(self, placeholder):
+        try:
+            if self.parent.tabs.indexOf(placeholder) < 0:
+                return
+        except RuntimeError:
+            return  # the tab was loaded or closed in the meantime
+        self.parent.hibernation.wake(placeholder, quiet=True)
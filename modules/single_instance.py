@@ -0,0 +1,102 @@
+# /modules/single_instance.py
+#
+# One editor window per user. The running window listens on a local socket; a later
+# launch hands its file arguments over and exits instead of starting a second window.
+# Only QtCore/QtNetwork are needed on the client side, so forwarding happens before the
+# editor modules are imported.
+
+import os
+import json
+import getpass
+import logging
+
+from PyQt5.QtCore import QObject, pyqtSignal
+from PyQt5.QtNetwork import QLocalServer, QLocalSocket
+
+SERVER_NAME = f"notepadmod-{getpass.getuser()}"
+
+
+def forward_to_running(paths, server_name=SERVER_NAME, timeout=1000):
+    """
+    Send file paths to a running instance. Returns True when it accepted them, False when
+    there is no running instance (or it did not answer within timeout ms).
+    """
+    socket = QLocalSocket()
+    socket.connectToServer(server_name)
+    if not socket.waitForConnected(timeout):
+        return False
+    # Relative paths are resolved here: the running window has its own working directory
+    message = {"files": [os.path.abspath(p) for p in paths]}
+    socket.write(json.dumps(message).encode('utf-8') + b"\n")
+    if not socket.waitForBytesWritten(timeout):
+        socket.abort()
+        return False
+    accepted = False
+    while socket.waitForReadyRead(timeout):
+        if socket.canReadLine():
+            accepted = bytes(socket.readLine()).strip() == b"ok"
+            break
+    socket.disconnectFromServer()
+    return accepted
+
+
+class InstanceServer(QObject):
+    """Accepts file lists from later launches and emits filesRequested for each one."""
+
+    filesRequested = pyqtSignal(list)
+
+    def __init__(self, parent=None, server_name=SERVER_NAME):
+        super().__init__(parent)
+        self.server_name = server_name
+        self.server = QLocalServer(self)
+        self.server.setSocketOptions(QLocalServer.UserAccessOption)
+        self.server.newConnection.connect(self._onNewConnection)
+        self._buffers = {}
+
+    def listen(self):
+        """Start listening. Returns False if another instance already owns the name."""
+        # On Unix listen() replaces a socket file that is in use, so check for a live one first
+        probe = QLocalSocket()
+        probe.connectToServer(self.server_name)
+        if probe.waitForConnected(200):
+            probe.disconnectFromServer()
+            logging.warning("Another instance is already listening; not starting the server")
+            return False
+        # Whatever is left is a socket file from an instance that crashed
+        QLocalServer.removeServer(self.server_name)
+        if self.server.listen(self.server_name):
+            logging.info(f"Single-instance server listening on {self.server.fullServerName()}")
+            return True
+        logging.error(f"Single-instance server failed to listen: {self.server.errorString()}")
+        return False
+
+    def close(self):
+        self.server.close()
+
+    def _onNewConnection(self):
+        while self.server.hasPendingConnections():
+            socket = self.server.nextPendingConnection()
+            self._buffers[socket] = b""
+            socket.readyRead.connect(lambda s=socket: self._onReadyRead(s))
+            socket.disconnected.connect(lambda s=socket: self._onDisconnected(s))
+
+    def _onReadyRead(self, socket):
+        self._buffers[socket] = self._buffers.get(socket, b"") + bytes(socket.readAll())
+        if b"\n" not in self._buffers[socket]:
+            return
+        line, _, self._buffers[socket] = self._buffers[socket].partition(b"\n")
+        try:
+            message = json.loads(line.decode('utf-8'))
+            files = [str(path) for path in message.get("files", [])]
+        except (ValueError, AttributeError, TypeError) as e:
+            logging.error(f"Bad message on the single-instance socket: {e}")
+            socket.write(b"error\n")
+            return
+        socket.write(b"ok\n")
+        socket.flush()
+        logging.info(f"Received {len(files)} file(s) from another launch")
+        self.filesRequested.emit(files)
+
+    def _onDisconnected(self, socket):
+        self._buffers.pop(socket, None)
+        socket.deleteLater()
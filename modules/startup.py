@@ -0,0 +1,226 @@
+# /modules/startup.py
+#
+# Startup timing and deferred initialization. The window is shown as soon as it can be
+# edited; slow setup that nothing on screen needs yet (the workspace scan, the image file
+# index) runs afterwards on a pool thread or in idle passes of the event loop.
+#
+#   python3 -m modules.startup [module] [--top N]    import-time report for a module
+
+import os
+import re
+import sys
+import time
+import queue
+import logging
+import argparse
+import subprocess
+
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, QTimer, pyqtSignal
+
+
+def _process_age():
+    """Seconds since this process was started (0 where /proc is not available)."""
+    try:
+        with open("/proc/self/stat") as f:
+            # Fields after the command name; starttime is field 22 of the full line
+            start_ticks = int(f.read().rsplit(")", 1)[1].split()[19])
+        with open("/proc/uptime") as f:
+            uptime = float(f.read().split()[0])
+        return max(0.0, uptime - start_ticks / os.sysconf("SC_CLK_TCK"))
+    except (OSError, ValueError, IndexError):
+        return 0.0
+
+
+_START = time.perf_counter() - _process_age()
+
+
+def elapsed_ms():
+    """Milliseconds since the process started."""
+    return (time.perf_counter() - _START) * 1000
+
+
+class _TaskSignals(QObject):
+    wake = pyqtSignal()
+
+
+class _BackgroundTask(QRunnable):
+    def __init__(self, startup, name, func):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.startup = startup
+        self.name = name
+        self.func = func
+
+    def run(self):
+        start = time.perf_counter()
+        try:
+            result, error = self.func(), None
+        except Exception as e:
+            result, error = None, e
+        self.startup._done.put((self, result, error, (time.perf_counter() - start) * 1000))
+        self.startup._signals.wake.emit()
+
+
+class DeferredStartup(QObject):
+    """
+    Work to do once the window is up. background() tasks run on a pool thread and hand
+    their result to a callback on the GUI thread; idle() tasks run on the GUI thread, one
+    per event loop pass, so input is handled in between. With eager=True everything runs
+    immediately instead (the old startup order, for comparison and debugging).
+    """
+
+    finished = pyqtSignal()
+
+    def __init__(self, parent=None, eager=False):
+        super().__init__(parent)
+        self.eager = eager
+        self.phases = [("process start", 0.0)]  # (name, ms since process start)
+        self.timings = {}                       # task name -> ms it took
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(2)
+        self._done = queue.SimpleQueue()
+        self._signals = _TaskSignals()
+        self._signals.wake.connect(self._drain)
+        self._callbacks = {}
+        self._running = set()
+        self._idle = []
+        self._idle_timer = QTimer(self)
+        self._idle_timer.setSingleShot(True)
+        self._idle_timer.timeout.connect(self._runIdle)
+        self._started = False
+
+    def mark(self, phase):
+        """Record that startup reached a phase."""
+        self.phases.append((phase, elapsed_ms()))
+        logging.debug(f"Startup: {phase} at {self.phases[-1][1]:.0f} ms")
+
+    def background(self, name, func, done=None):
+        """Run func() on a pool thread; done(result) is called on the GUI thread."""
+        if self.eager:
+            self._run(name, func, done)
+            return
+        task = _BackgroundTask(self, name, func)
+        self._callbacks[task] = done
+        self._running.add(task)
+        if self._started:
+            self.pool.start(task)
+
+    def idle(self, name, func):
+        """Run func() on the GUI thread once the event loop is idle."""
+        if self.eager:
+            self._run(name, func)
+            return
+        self._idle.append((name, func))
+        if self._started:
+            self._idle_timer.start(0)
+
+    def start(self):
+        """Call once the window is shown: lets the queued work begin."""
+        if self._started:
+            return
+        self.mark("window shown")
+        self._started = True
+        for task in self._running:
+            self.pool.start(task)
+        if self._idle:
+            self._idle_timer.start(0)
+        self._checkFinished()
+
+    def waitForDone(self, msecs=-1):
+        """Block until background tasks have finished (their callbacks are not run)."""
+        return self.pool.waitForDone(msecs)
+
+    def isFinished(self):
+        return self._started and not self._running and not self._idle
+
+    def report(self):
+        lines = [f"{name:<24} {ms:8.0f} ms" for name, ms in self.phases]
+        lines += [f"  {name:<22} {ms:8.0f} ms (deferred)" for name, ms in self.timings.items()]
+        return "\n".join(lines)
+
+    def _run(self, name, func, done=None):
+        start = time.perf_counter()
+        try:
+            result = func()
+        except Exception as e:
+            logging.error(f"Startup task '{name}' failed: {e}")
+            return
+        finally:
+            self.timings[name] = (time.perf_counter() - start) * 1000
+        if done:
+            done(result)
+
+    def _drain(self):
+        while True:
+            try:
+                task, result, error, ms = self._done.get_nowait()
+            except queue.Empty:
+                break
+            self._running.discard(task)
+            self.timings[task.name] = ms
+            done = self._callbacks.pop(task, None)
+            if error is not None:
+                logging.error(f"Startup task '{task.name}' failed: {error}")
+            elif done:
+                try:
+                    done(result)
+                except Exception as e:
+                    logging.error(f"Startup task '{task.name}' callback failed: {e}")
+        self._checkFinished()
+
+    def _runIdle(self):
+        if self._idle:
+            name, func = self._idle.pop(0)
+            self._run(name, func)
+        if self._idle:
+            self._idle_timer.start(0)
+        self._checkFinished()
+
+    def _checkFinished(self):
+        if self.isFinished() and not any(name == "deferred work done" for name, _ in self.phases):
+            self.mark("deferred work done")
+            logging.info(f"Startup timings:\n{self.report()}")
+            self.finished.emit()
+
+
+_IMPORTTIME_RE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def import_report(module="modules.notepad_window", top=25, python=None, cwd=None):
+    """
+    Import the module in a fresh interpreter under -X importtime. Returns (total_ms,
+    [(cumulative_ms, self_ms, depth, name)]) for the top imports by cumulative time.
+    """
+    cwd = cwd or os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ)
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    proc = subprocess.run(
+        [python or sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=cwd, env=env, capture_output=True, text=True,
+    )
+    rows = []
+    for line in proc.stderr.splitlines():
+        match = _IMPORTTIME_RE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            rows.append((int(cumulative_us) / 1000, int(self_us) / 1000, len(indent) // 2, name))
+    total = next((row[0] for row in rows if row[3] == module), 0.0)
+    rows.sort(key=lambda row: -row[0])
+    return total, rows[:top]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Import-time report (like python -X importtime)")
+    parser.add_argument("module", nargs="?", default="modules.notepad_window")
+    parser.add_argument("--top", type=int, default=25)
+    args = parser.parse_args(argv)
+    total, rows = import_report(args.module, args.top)
+    print(f"import {args.module}: {total:.1f} ms")
+    print(f"{'cumulative':>11} {'self':>8}  module")
+    for cumulative, own, depth, name in rows:
+        print(f"{cumulative:9.1f} ms {own:6.1f} ms  {'  ' * depth}{name}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
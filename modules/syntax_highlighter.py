@@ -1,12 +1,19 @@
 import re
+import time
+from PyQt5.QtCore import QTimer
 from PyQt5.QtGui import QSyntaxHighlighter, QTextCharFormat, QColor
 import os
 
+from modules import tracing
+from modules.block_info import BlockInfo, classify_line, URL, TIMESTAMP
+
 class VHDLSyntaxHighlighter(QSyntaxHighlighter):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.highlightingRules = []
         self.hide_special_lines = False  # Toggle state for hiding lines
+        self._untraced_ms = 0.0
+        self._untraced_blocks = 0
 
         # Add rule for URLs
         urlFormat = QTextCharFormat()
@@ -65,10 +72,29 @@ class VHDLSyntaxHighlighter(QSyntaxHighlighter):
             self.highlightingRules.append((re.compile(location_pattern), locationFormat))
 
     def highlightBlock(self, text):
+        start = time.perf_counter()
+        self._highlightBlock(text)
+        elapsed = (time.perf_counter() - start) * 1000
+        if not tracing.add("highlight", elapsed):
+            # Typing or text set outside a traced action: one record per event loop pass
+            self._untraced_ms += elapsed
+            self._untraced_blocks += 1
+            if self._untraced_blocks == 1:
+                QTimer.singleShot(0, self._recordUntraced)
+
+    def _recordUntraced(self):
+        tracing.tracer.record("highlight", self._untraced_ms, note=f"{self._untraced_blocks} blocks", background=True)
+        self._untraced_ms = 0.0
+        self._untraced_blocks = 0
+
+    def _highlightBlock(self, text):
+        # Classify the line once here; everything else reads the kind off the block
+        info = BlockInfo(*classify_line(text))
+        self.setCurrentBlockUserData(info)
+
         # Check if line should be hidden
         if self.hide_special_lines:
-            if (self.urlPattern.match(text) or 
-                self.timestampPattern.match(text)):
+            if info.kind in (URL, TIMESTAMP):
                 block = self.currentBlock()
                 block.setVisible(False)
                 return
@@ -122,6 +148,7 @@ class VHDLSyntaxHighlighter(QSyntaxHighlighter):
         
         self.setCurrentBlockState(0)
 
+    @tracing.traced("toggle special lines")
     def toggleSpecialLines(self):
         """Toggle visibility of lines starting with https or Timestamp"""
         self.hide_special_lines = not self.hide_special_lines
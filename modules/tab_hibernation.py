@@ -0,0 +1,347 @@
+# /modules/tab_hibernation.py
+#
+# Opt-in hibernation of background tabs. A hibernated tab's editor (document, layout,
+# highlighter, undo stack, side pane state) is replaced by a small placeholder and its
+# text, cursor and scroll position are kept in a compressed file until the tab is
+# activated again.
+
+import os
+import sys
+import json
+import time
+import uuid
+import zlib
+import logging
+
+from PyQt5.QtCore import QObject, QTimer, Qt
+from PyQt5.QtGui import QTextCursor
+from PyQt5.QtWidgets import QLabel, QVBoxLayout, QWidget
+
+from modules.editor import Editor
+from modules.file_saver import atomic_write
+
+HIBERNATION_DIR = os.path.expanduser("~/.config/notepadmod/hibernate")
+SETTINGS_FILE = os.path.expanduser("~/.config/notepadmod/hibernation.json")
+
+# idle_minutes: hibernate a tab this long after it was last shown (0 = never)
+# memory_mb: above this resident size, also hibernate the least recently shown tab (0 = never)
+DEFAULT_SETTINGS = {"enabled": False, "idle_minutes": 30, "memory_mb": 1500}
+
+
+def process_rss():
+    """Resident set size of this process in bytes (0 if it cannot be read)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+        # Only the peak is available here: KiB on Linux, bytes on macOS
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+    except (ImportError, OSError):
+        return 0
+
+
+def load_settings(path=SETTINGS_FILE):
+    settings = dict(DEFAULT_SETTINGS)
+    if os.path.exists(path):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                settings.update(json.load(f))
+        except (OSError, ValueError, TypeError) as e:
+            logging.error(f"Failed to load hibernation settings from {path}: {e}")
+    return settings
+
+
+def save_settings(settings, path=SETTINGS_FILE):
+    try:
+        atomic_write(path, json.dumps(settings, indent=2), fsync=False)
+    except OSError as e:
+        logging.error(f"Failed to save hibernation settings to {path}: {e}")
+
+
+def write_hibernation_file(path, record):
+    """Store a tab record ({"text": ..., plus metadata}) as zlib-compressed JSON."""
+    data = zlib.compress(json.dumps(record).encode('utf-8'), 1)
+    temp_path = path + ".tmp"
+    with open(temp_path, 'wb') as f:
+        f.write(data)
+    os.replace(temp_path, path)
+    return len(data)
+
+
+def read_hibernation_file(path):
+    with open(path, 'rb') as f:
+        return json.loads(zlib.decompress(f.read()).decode('utf-8'))
+
+
+def _disk_stamp(filepath):
+    try:
+        st = os.stat(filepath)
+        return [st.st_mtime_ns, st.st_size]
+    except (OSError, TypeError):
+        return None
+
+
+class HibernatedTab(QWidget):
+    """
+    Placeholder shown in the tab of a hibernated editor; holds everything but the text.
+    With path None the text is read from the record's file instead (tabs restored from
+    the session that have not been loaded yet).
+    """
+
+    def __init__(self, path, record, parent=None):
+        super().__init__(parent)
+        self.path = path
+        self.record = {key: value for key, value in record.items() if key != "text"}
+        # Code that looks tabs up by file keeps finding this one
+        self.setProperty("filepath", record.get("filepath"))
+        layout = QVBoxLayout(self)
+        label = QLabel("Hibernated - select the tab to restore it" if path else "Select the tab to load it")
+        label.setAlignment(Qt.AlignCenter)
+        label.setStyleSheet("color: gray; font-size: 16px;")
+        layout.addWidget(label)
+
+
+class TabHibernation(QObject):
+    """
+    Decides when background tabs are hibernated and restores them on activation.
+
+    Only tabs without unsaved changes are hibernated, so the edit journal never has to
+    cover a hibernated tab. The undo history is not kept; waking a tab reports how many
+    undo steps were dropped.
+    """
+
+    CHECK_INTERVAL = 30 * 1000  # ms between policy checks
+
+    def __init__(self, parent_window, directory=HIBERNATION_DIR, settings_path=SETTINGS_FILE):
+        super().__init__(parent_window)
+        self.parent = parent_window
+        self.directory = directory
+        self.settings_path = settings_path
+        self.settings = load_settings(settings_path)
+        os.makedirs(self.directory, exist_ok=True)
+        # Hibernated text is a copy of what was saved; files from a previous session are stale
+        for name in os.listdir(self.directory):
+            if name.endswith(".hib"):
+                self._remove(os.path.join(self.directory, name))
+
+        self._last_shown = {}  # editor -> time.monotonic() when it stopped being current
+        self._current = None
+        self.hibernated = 0
+        self.woken = 0
+
+        self._timer = QTimer(self)
+        self._timer.timeout.connect(self.check)
+        if self.enabled:
+            self._timer.start(self.CHECK_INTERVAL)
+
+    @property
+    def enabled(self):
+        return bool(self.settings.get("enabled"))
+
+    def setEnabled(self, enabled):
+        self.settings["enabled"] = bool(enabled)
+        save_settings(self.settings, self.settings_path)
+        if enabled:
+            self._timer.start(self.CHECK_INTERVAL)
+        else:
+            self._timer.stop()
+        logging.info(f"Tab hibernation {'enabled' if enabled else 'disabled'}")
+
+    @staticmethod
+    def isHibernated(widget):
+        return isinstance(widget, HibernatedTab)
+
+    # Policy
+
+    def tabActivated(self, widget):
+        """Record that the previously current tab went into the background."""
+        now = time.monotonic()
+        if self._current is not None and self._current is not widget:
+            self._last_shown[self._current] = now
+        self._current = widget
+        self._last_shown.pop(widget, None)
+
+    def _editors(self):
+        tabs = self.parent.tabs
+        return [tabs.widget(i) for i in range(tabs.count()) if isinstance(tabs.widget(i), Editor)]
+
+    def eligible(self, editor):
+        """A background tab with nothing unsaved and no save in flight."""
+        if editor is self.parent.tabs.currentWidget() or not isinstance(editor, Editor):
+            return False
+        if editor.document().isModified() or editor.property("save_in_progress"):
+            return False
+        filepath = editor.property("filepath")
+        return not (filepath and self.parent.file_saver.isSaving(filepath))
+
+    def check(self):
+        """Hibernate tabs idle for longer than idle_minutes, then the least recently shown while over memory_mb."""
+        if not self.enabled:
+            return
+        now = time.monotonic()
+        candidates = []
+        for editor in self._editors():
+            if self.eligible(editor):
+                candidates.append((self._last_shown.setdefault(editor, now), editor))
+        candidates.sort(key=lambda item: item[0])
+
+        idle = self.settings.get("idle_minutes", 0) * 60
+        if idle:
+            while candidates and now - candidates[0][0] >= idle:
+                self.hibernate(candidates.pop(0)[1])
+
+        limit = self.settings.get("memory_mb", 0) * 1024 * 1024
+        if limit and candidates and process_rss() > limit:
+            # One per check: the freed memory only shows up once the editor is deleted
+            self.hibernate(candidates[0][1])
+
+    def hibernateInactive(self):
+        """Hibernate every eligible background tab now. Returns how many were hibernated."""
+        return sum(1 for editor in self._editors() if self.eligible(editor) and self.hibernate(editor))
+
+    # Hibernating and waking
+
+    def hibernate(self, editor):
+        """Replace an editor with a placeholder. Returns the placeholder, or None if it was not hibernated."""
+        window = self.parent
+        tabs = window.tabs
+        index = tabs.indexOf(editor)
+        if index < 0 or not self.eligible(editor):
+            return None
+        filepath = editor.property("filepath") or None
+        cursor = editor.textCursor()
+        record = {
+            "text": editor.toPlainText(),
+            "filepath": filepath,
+            "disk": _disk_stamp(filepath),
+            "last_modified_time": editor.property("last_modified_time"),
+            "cursor": cursor.position(),
+            "anchor": cursor.anchor(),
+            "scroll": editor.verticalScrollBar().value(),
+            "undo_steps": editor.document().availableUndoSteps(),
+            "label": tabs.tabText(index),
+            "tooltip": tabs.tabToolTip(index),
+            "hibernated": time.time(),
+        }
+        path = os.path.join(self.directory, f"{uuid.uuid4().hex}.hib")
+        try:
+            size = write_hibernation_file(path, record)
+        except OSError as e:
+            logging.error(f"Failed to hibernate {filepath or 'Untitled'}: {e}")
+            return None
+
+        # Nothing unsaved, so there is nothing for the journal to recover
+        window.journals.detach(editor)
+        window.file_monitor.unwatch(editor)
+        window.dropPaneState(editor)
+        placeholder = HibernatedTab(path, record)
+        self._replace(index, editor, placeholder, record)
+        self._last_shown.pop(editor, None)
+        editor.deleteLater()
+        self.hibernated += 1
+        logging.info(f"Hibernated {filepath or 'Untitled'} ({len(record['text'])} chars -> {size} bytes)")
+        return placeholder
+
+    def wake(self, widget, quiet=False):
+        """
+        The editor for a tab widget, restoring it first if it is hibernated (None if that
+        fails). quiet skips the status bar message.
+        """
+        if not self.isHibernated(widget):
+            return widget
+        window = self.parent
+        index = window.tabs.indexOf(widget)
+        record = widget.record
+        filepath = record.get("filepath")
+        text = None
+        if widget.path:
+            try:
+                text = read_hibernation_file(widget.path)["text"]
+            except (OSError, ValueError, KeyError, zlib.error) as e:
+                logging.error(f"Failed to read hibernated tab {widget.path}: {e}")
+
+        # A tab that was never loaded has no stamp; its file is read either way
+        disk_changed = bool(widget.path) and filepath and _disk_stamp(filepath) != record.get("disk")
+        from_disk = filepath and (text is None or disk_changed)
+        if from_disk:
+            # The tab had nothing unsaved, so the file on disk is what it should show
+            try:
+                with open(filepath, 'r', encoding='utf-8', errors='replace') as f:
+                    text = f.read()
+            except OSError as e:
+                if text is None:
+                    logging.error(f"Failed to restore hibernated tab for {filepath}: {e}")
+                    window.statusBar().showMessage(f"Could not restore {record.get('label')}: {e}", 5000)
+                    return None
+            else:
+                window.file_saver.remember(filepath, text)
+        if text is None:
+            window.statusBar().showMessage(f"Could not restore {record.get('label')}", 5000)
+            return None
+
+        editor = Editor(parent=window)
+        editor.setPlainText(text)
+        if filepath:
+            editor.setProperty("filepath", filepath)
+            mtime = os.path.getmtime(filepath) if from_disk and os.path.exists(filepath) else record.get("last_modified_time")
+            editor.setProperty("last_modified_time", mtime)
+        window.journals.attach(editor, window.file_saver.saved_digest(filepath) if filepath else None)
+        window._connectEditor(editor)
+        cursor = editor.textCursor()
+        length = editor.document().characterCount() - 1
+        cursor.setPosition(min(record.get("anchor", 0), length))
+        cursor.setPosition(min(record.get("cursor", 0), length), QTextCursor.KeepAnchor)
+        editor.setTextCursor(cursor)
+        editor.verticalScrollBar().setValue(record.get("scroll", 0))
+
+        self._replace(index, widget, editor, record)
+        window.file_monitor.watch(editor, text)
+        if widget.path:
+            self._remove(widget.path)
+        widget.deleteLater()
+        self.woken += 1
+
+        undo_steps = record.get("undo_steps", 0)
+        message = f"Restored {record.get('label')}" if widget.path else f"Loaded {record.get('label')}"
+        if disk_changed:
+            message += " (reloaded: the file changed on disk)"
+        if undo_steps:
+            message += f"; {undo_steps} undo step(s) from before hibernation were not kept"
+        if not quiet:
+            window.statusBar().showMessage(message, 5000)
+        logging.info(message)
+        return editor
+
+    def discard(self, widget):
+        """A hibernated tab is being closed."""
+        if self.isHibernated(widget) and widget.path:
+            self._remove(widget.path)
+
+    def discardAll(self):
+        for i in range(self.parent.tabs.count()):
+            self.discard(self.parent.tabs.widget(i))
+
+    def _replace(self, index, old, new, record):
+        """Put new in old's tab without the tab widget reporting a change of tab."""
+        tabs = self.parent.tabs
+        current = tabs.currentIndex()
+        tabs.blockSignals(True)
+        try:
+            tabs.removeTab(index)
+            tabs.insertTab(index, new, record.get("label", ""))
+            tabs.setTabToolTip(index, record.get("tooltip", ""))
+            tabs.setCurrentIndex(current)
+        finally:
+            tabs.blockSignals(False)
+        if self._current is old:
+            self._current = new
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
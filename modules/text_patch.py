@@ -0,0 +1,205 @@
+# /modules/text_patch.py
+#
+# Apply whole-document transforms as minimal edits instead of setPlainText, so the
+# undo stack, layout, highlighting, cursor and scroll position of untouched text survive.
+
+import bisect
+import difflib
+
+from PyQt5.QtGui import QTextCursor
+
+from modules.utf16 import OffsetMap
+
+REFINE_LIMIT = 4000   # refine line hunks by character only below this many characters
+REFINE_RATIO = 0.6    # ...and only when their two sides are at least this similar
+REFINE_BUDGET = 1000000  # total (old x new) characters refined by character per compute_patch call
+MAX_EDITS = 20000     # beyond this, one big replacement is cheaper than many small ones
+SEQUENCE_MATCH_LIMIT = 40000  # largest (lines x lines) gap handed to difflib without anchors
+
+
+def _common_affix(a, b):
+    """Lengths of the common prefix and (non-overlapping) common suffix of two sequences."""
+    start = 0
+    limit = min(len(a), len(b))
+    while start < limit and a[start] == b[start]:
+        start += 1
+    end = 0
+    limit -= start
+    while end < limit and a[len(a) - 1 - end] == b[len(b) - 1 - end]:
+        end += 1
+    return start, end
+
+
+def _unique_matches(a, alo, ahi, b, blo, bhi):
+    """(i, j) pairs of lines occurring exactly once in both ranges, ordered by i."""
+    in_a = {}
+    for i in range(alo, ahi):
+        in_a[a[i]] = i if a[i] not in in_a else None
+    in_b = {}
+    for j in range(blo, bhi):
+        if in_a.get(b[j]) is not None:
+            in_b[b[j]] = j if b[j] not in in_b else None
+    return sorted((in_a[line], j) for line, j in in_b.items() if j is not None)
+
+
+def longest_increasing(pairs):
+    """Longest subsequence of pairs (sorted by i) whose j values also increase."""
+    tails, tail_idx, prev = [], [], [None] * len(pairs)
+    for k, (i, j) in enumerate(pairs):
+        pos = bisect.bisect_left(tails, j)
+        if pos == len(tails):
+            tails.append(j)
+            tail_idx.append(k)
+        else:
+            tails[pos] = j
+            tail_idx[pos] = k
+        prev[k] = tail_idx[pos - 1] if pos else None
+    result = []
+    k = tail_idx[-1] if tail_idx else None
+    while k is not None:
+        result.append(pairs[k])
+        k = prev[k]
+    result.reverse()
+    return result
+
+
+def line_hunks(a, b):
+    """
+    Changed regions between two line lists as (i1, i2, j1, j2) tuples (a[i1:i2] -> b[j1:j2]).
+
+    Patience-style: lines unique to both sides anchor the alignment and the gaps between
+    anchors are diffed recursively, which stays fast on long documents full of repeated
+    (e.g. blank) lines. Small gaps without anchors fall back to difflib.
+    """
+    hunks = []
+    stack = [(0, len(a), 0, len(b))]
+    while stack:
+        alo, ahi, blo, bhi = stack.pop()
+        # Trim the common head and tail first; most edits are small and local
+        while alo < ahi and blo < bhi and a[alo] == b[blo]:
+            alo += 1
+            blo += 1
+        while alo < ahi and blo < bhi and a[ahi - 1] == b[bhi - 1]:
+            ahi -= 1
+            bhi -= 1
+        if alo == ahi and blo == bhi:
+            continue
+        if alo == ahi or blo == bhi:
+            hunks.append((alo, ahi, blo, bhi))
+            continue
+        anchors = longest_increasing(_unique_matches(a, alo, ahi, b, blo, bhi))
+        if anchors:
+            # Diff the gaps between anchors; the anchor lines themselves match
+            prev_i, prev_j = alo, blo
+            for i, j in anchors + [(ahi, bhi)]:
+                if prev_i < i or prev_j < j:
+                    stack.append((prev_i, i, prev_j, j))
+                prev_i, prev_j = i + 1, j + 1
+            continue
+        if (ahi - alo) * (bhi - blo) <= SEQUENCE_MATCH_LIMIT:
+            matcher = difflib.SequenceMatcher(None, a[alo:ahi], b[blo:bhi], autojunk=False)
+            hunks.extend((i1 + alo, i2 + alo, j1 + blo, j2 + blo)
+                         for tag, i1, i2, j1, j2 in matcher.get_opcodes() if tag != 'equal')
+        else:
+            hunks.append((alo, ahi, blo, bhi))
+    hunks.sort()
+    return hunks
+
+
+def compute_patch(old, new):
+    """
+    Return the edits turning old into new as (start, end, replacement) tuples in old's
+    character offsets, sorted by start and non-overlapping.
+
+    The texts are diffed line by line first; small replaced line ranges whose two sides
+    are similar are then diffed character by character so a changed word does not replace
+    the whole line. Everything else, and anything past REFINE_BUDGET, is replaced by line.
+    """
+    if old == new:
+        return []
+    start, end = _common_affix(old, new)
+    old_mid = old[start:len(old) - end]
+    new_mid = new[start:len(new) - end]
+    if not old_mid or not new_mid:
+        return [(start, start + len(old_mid), new_mid)]
+
+    a = old_mid.splitlines(keepends=True)
+    b = new_mid.splitlines(keepends=True)
+    a_offsets = [0]
+    for line in a:
+        a_offsets.append(a_offsets[-1] + len(line))
+    b_offsets = [0]
+    for line in b:
+        b_offsets.append(b_offsets[-1] + len(line))
+
+    edits = []
+    budget = REFINE_BUDGET
+    for i1, i2, j1, j2 in line_hunks(a, b):
+        refine = (i1 != i2 and j1 != j2
+                  and a_offsets[i2] - a_offsets[i1] + b_offsets[j2] - b_offsets[j1] <= REFINE_LIMIT)
+        if refine and i2 - i1 == j2 - j1:
+            # Edited lines in place: pair them up so each one is judged on its own
+            blocks = [(i, i + 1, j, j + 1) for i, j in zip(range(i1, i2), range(j1, j2))]
+        else:
+            blocks = [(i1, i2, j1, j2)]
+        for bi1, bi2, bj1, bj2 in blocks:
+            a_start, a_end = a_offsets[bi1], a_offsets[bi2]
+            b_start, b_end = b_offsets[bj1], b_offsets[bj2]
+            cost = (a_end - a_start) * (b_end - b_start)
+            opcodes = None
+            if refine and cost <= budget:
+                matcher = difflib.SequenceMatcher(None, old_mid[a_start:a_end], new_mid[b_start:b_end],
+                                                  autojunk=False)
+                # The cheap upper bounds keep unrelated text away from the quadratic matcher
+                if matcher.real_quick_ratio() >= REFINE_RATIO and matcher.quick_ratio() >= REFINE_RATIO:
+                    budget -= cost
+                    if matcher.ratio() >= REFINE_RATIO:
+                        opcodes = matcher.get_opcodes()
+            if opcodes is None:
+                # Unrelated text (reordered segments, rewritten lines): replace whole lines
+                edits.append((start + a_start, start + a_end, new_mid[b_start:b_end]))
+                continue
+            for tag, ci1, ci2, cj1, cj2 in opcodes:
+                if tag != 'equal':
+                    edits.append((start + a_start + ci1, start + a_start + ci2,
+                                  new_mid[b_start + cj1:b_start + cj2]))
+
+    if len(edits) > MAX_EDITS:
+        return [(start, start + len(old_mid), new_mid)]
+    return edits
+
+
+def apply_patch(document, edits, old):
+    """
+    Apply compute_patch() edits to a QTextDocument as one undoable edit block. old is the
+    text the edits were computed on: their offsets count code points, QTextCursor counts
+    UTF-16 units, and the two differ after any emoji or other non-BMP character.
+    """
+    if not edits:
+        return
+    offsets = OffsetMap(old)
+    cursor = QTextCursor(document)
+    cursor.beginEditBlock()
+    # Back to front, so earlier offsets stay valid
+    for start, end, replacement in reversed(edits):
+        cursor.setPosition(offsets.to_qt(start))
+        if end > start:
+            cursor.setPosition(offsets.to_qt(end), QTextCursor.KeepAnchor)
+        cursor.insertText(replacement)
+    cursor.endEditBlock()
+
+
+def apply_text(editor, new_text):
+    """
+    Make the editor's text equal new_text by patching only what differs.
+    Returns the number of edits applied (0 if the text was already identical).
+    """
+    old_text = editor.toPlainText()
+    edits = compute_patch(old_text, new_text)
+    if edits:
+        scroll_bar = editor.verticalScrollBar()
+        scroll = scroll_bar.value()
+        apply_patch(editor.document(), edits, old_text)
+        # Edits above the viewport can still nudge it; keep the view where it was
+        scroll_bar.setValue(scroll)
+    return len(edits)
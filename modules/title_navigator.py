@@ -0,0 +1,275 @@
+# /modules/title_navigator.py
+
+import bisect
+import logging
+
+from PyQt5.QtCore import Qt, QAbstractListModel, QModelIndex, QSize, pyqtSignal
+from PyQt5.QtGui import QColor, QFont, QFontMetrics
+from PyQt5.QtWidgets import QListView, QStyledItemDelegate, QStyle, QAbstractItemView
+
+from modules.block_info import block_info
+
+LINE_ROLE = Qt.UserRole + 1      # block number of the Title: line
+VISIBLE_ROLE = Qt.UserRole + 2   # segment overlaps the editor viewport
+NEWS_ROLE = Qt.UserRole + 3      # title contains "news"
+CURRENT_ROLE = Qt.UserRole + 4   # segment holds the editor cursor
+
+VISIBLE_COLOR = QColor("#ff9933")
+NEWS_COLOR = QColor("#27a344")
+TEXT_COLOR = QColor("#d4d4d4")
+BACKGROUND = QColor("#1e1e1e")
+HOVER_BACKGROUND = QColor("#2d2d2d")
+CURRENT_BACKGROUND = QColor("#262626")
+
+
+class TitleListModel(QAbstractListModel):
+    """
+    The Title: segments of one editor as list rows. refresh() re-reads only the titles in
+    blocks edited since the last refresh and resets the model only when segments were added
+    or removed; viewport and cursor changes just flip roles on the affected rows.
+    """
+
+    def __init__(self, editor=None, parent=None):
+        super().__init__(parent)
+        self.editor = editor
+        self._titles = []   # title text per row
+        self._lines = []    # first block per row
+        self._news = []
+        self._visible = (0, -1)  # first/last visible row
+        self._current = -1
+        self._snapshot = None  # document snapshot the rows were read from
+        self._dirty = None     # (first, last) block range edited since then; None = all
+        self._block_count = 0
+        self._document = None
+        self._watch(editor)
+
+    def setEditor(self, editor):
+        if editor is self.editor:
+            return
+        self.editor = editor
+        self._snapshot = None
+        self._watch(editor)
+        self.refresh()
+
+    def _watch(self, editor):
+        if self._document is not None:
+            try:
+                self._document.contentsChange.disconnect(self._onContentsChange)
+            except (TypeError, RuntimeError):
+                pass  # the closed tab's document is already gone
+        self._document = editor.document() if editor is not None else None
+        self._dirty = None
+        if self._document is not None:
+            self._block_count = self._document.blockCount()
+            self._document.contentsChange.connect(self._onContentsChange)
+
+    def _onContentsChange(self, position, removed, added):
+        doc = self._document
+        first = doc.findBlock(position).blockNumber()
+        last_block = doc.findBlock(position + added)
+        last = last_block.blockNumber() if last_block.isValid() else doc.blockCount() - 1
+        delta = doc.blockCount() - self._block_count
+        self._block_count = doc.blockCount()
+        if first < 0:
+            self._dirty = None
+            self._snapshot = None
+        elif self._snapshot is not None:
+            if self._dirty is None or self._dirty[0] is None:
+                self._dirty = (first, last)
+            else:
+                old_first, old_last = self._dirty
+                # Blocks after this edit moved by delta
+                if old_first > first:
+                    old_first = max(first, old_first + delta)
+                if old_last >= first:
+                    old_last = max(last, old_last + delta)
+                self._dirty = (min(old_first, first), max(old_last, last))
+
+    # Qt model interface
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._titles)
+
+    def data(self, index, role=Qt.DisplayRole):
+        row = index.row()
+        if not index.isValid() or not 0 <= row < len(self._titles):
+            return None
+        if role == Qt.DisplayRole:
+            return f"Title:{self._titles[row]}"
+        if role == Qt.ToolTipRole:
+            return self._titles[row]
+        if role == LINE_ROLE:
+            return self._lines[row]
+        if role == VISIBLE_ROLE:
+            return self._visible[0] <= row <= self._visible[1]
+        if role == NEWS_ROLE:
+            return self._news[row]
+        if role == CURRENT_ROLE:
+            return row == self._current
+        return None
+
+    # Updates
+
+    def refresh(self):
+        """Re-read the titles if the document changed since the last refresh."""
+        editor = self.editor
+        if editor is None:
+            if self._titles:
+                self.beginResetModel()
+                self._titles, self._lines, self._news = [], [], []
+                self.endResetModel()
+            return
+        # The snapshot object is replaced on every change to the document
+        snapshot = editor.snapshots.current()
+        if snapshot is self._snapshot:
+            return
+        self._snapshot = snapshot
+
+        document = editor.document()
+        lines = editor.segments.titles()
+        dirty, self._dirty = self._dirty, (None, None)
+
+        def read(numbers):
+            return [block_info(document.findBlockByNumber(n)).payload or "" for n in numbers]
+
+        if dirty is None:
+            lo, hi, titles = 0, len(lines), read(lines)
+        elif dirty[0] is None:
+            lo = hi = 0
+            titles = self._titles
+        else:
+            # Rows outside the edited blocks keep their titles; rows below shift by the row delta
+            lo = bisect.bisect_left(lines, dirty[0])
+            hi = bisect.bisect_right(lines, dirty[1])
+            shift = len(lines) - len(self._titles)
+            titles = self._titles[:lo] + read(lines[lo:hi]) + self._titles[hi - shift:]
+
+        if len(titles) != len(self._titles) or dirty is None:
+            self.beginResetModel()
+            self._titles, self._lines = titles, lines
+            self._news = ["news" in t.lower() for t in titles]
+            self._visible, self._current = (0, -1), -1
+            self.endResetModel()
+            return
+        old = self._titles
+        self._titles, self._lines = titles, lines
+        changed = [i for i in range(lo, hi) if titles[i] != old[i]]
+        for i in changed:
+            self._news[i] = "news" in titles[i].lower()
+        if changed:
+            self.dataChanged.emit(self.index(changed[0]), self.index(changed[-1]))
+
+    def _rowForLine(self, line):
+        return bisect.bisect_right(self._lines, line) - 1
+
+    def setViewport(self, first_line, last_line):
+        """Mark the rows whose segments overlap the visible lines. Returns the first visible row."""
+        first = max(0, self._rowForLine(first_line))
+        last = self._rowForLine(last_line)
+        visible = (first, last) if last >= 0 else (0, -1)
+        if visible != self._visible:
+            old = self._visible
+            self._visible = visible
+            rows = [r for r in (old[0], old[1], visible[0], visible[1]) if 0 <= r < len(self._titles)]
+            if rows:
+                self.dataChanged.emit(self.index(min(rows)), self.index(max(rows)), [VISIBLE_ROLE])
+        return visible[0] if visible[1] >= 0 else -1
+
+    def setCurrentLine(self, line):
+        row = self._rowForLine(line)
+        if row != self._current:
+            for r in (self._current, row):
+                if 0 <= r < len(self._titles):
+                    self.dataChanged.emit(self.index(r), self.index(r), [CURRENT_ROLE])
+            self._current = row
+
+
+class TitleDelegate(QStyledItemDelegate):
+    """Paints a title row; colors come from the row's roles instead of per-item stylesheets."""
+
+    PADDING = 8
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.font = QFont()
+        self.font.setPixelSize(14)
+        self.font.setBold(True)
+        self._height = QFontMetrics(self.font).height() + 2 * self.PADDING
+
+    def sizeHint(self, option, index):
+        return QSize(option.rect.width(), self._height)
+
+    def paint(self, painter, option, index):
+        painter.save()
+        rect = option.rect
+        if option.state & QStyle.State_MouseOver:
+            background = HOVER_BACKGROUND
+        elif index.data(CURRENT_ROLE):
+            background = CURRENT_BACKGROUND
+        else:
+            background = BACKGROUND
+        painter.fillRect(rect, background)
+
+        if index.data(VISIBLE_ROLE):
+            color = VISIBLE_COLOR
+        elif index.data(NEWS_ROLE):
+            color = NEWS_COLOR
+        else:
+            color = TEXT_COLOR
+        painter.setPen(color)
+        painter.setFont(self.font)
+        text_rect = rect.adjusted(self.PADDING, 0, -self.PADDING, 0)
+        text = QFontMetrics(self.font).elidedText(index.data(Qt.DisplayRole), Qt.ElideRight, text_rect.width())
+        painter.drawText(text_rect, Qt.AlignLeft | Qt.AlignVCenter, text)
+        painter.restore()
+
+
+class TitleNavigator(QListView):
+    """List of the current editor's title segments; only the rows on screen are painted."""
+
+    titleActivated = pyqtSignal(int)  # block number of the clicked Title: line
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setItemDelegate(TitleDelegate(self))
+        self.setUniformItemSizes(True)
+        self.setMouseTracking(True)
+        self.setSelectionMode(QAbstractItemView.NoSelection)
+        self.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.setStyleSheet("""
+            QListView {
+                border: none;
+                background-color: #1e1e1e;
+            }
+        """)
+        self.clicked.connect(self._onClicked)
+        self._first_visible = -1
+
+    def setModel(self, model):
+        super().setModel(model)
+        self._first_visible = -1
+
+    def viewState(self):
+        """(scroll position, followed row) so a model swapped out can be shown again as it was."""
+        return self.verticalScrollBar().value(), self._first_visible
+
+    def restoreViewState(self, scroll, first_visible_row):
+        # Lay the rows out now so the scroll range is known
+        self.doItemsLayout()
+        self.verticalScrollBar().setValue(scroll)
+        self._first_visible = first_visible_row
+
+    def _onClicked(self, index):
+        line = index.data(LINE_ROLE)
+        if line is not None:
+            self.titleActivated.emit(line)
+
+    def followViewport(self, first_visible_row):
+        """Center the first visible title when it changes (leaves manual scrolling alone otherwise)."""
+        if first_visible_row == self._first_visible or first_visible_row < 0 or self.model() is None:
+            return
+        self._first_visible = first_visible_row
+        self.scrollTo(self.model().index(first_visible_row), QAbstractItemView.PositionAtCenter)
+        logging.debug(f"Title navigator centered on row {first_visible_row}")
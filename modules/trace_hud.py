@@ -0,0 +1,109 @@
+# /modules/trace_hud.py
+
+from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtWidgets import (QLabel, QDialog, QVBoxLayout, QHBoxLayout, QTableWidget,
+                             QTableWidgetItem, QPushButton, QCheckBox, QHeaderView)
+
+from modules import tracing
+
+
+class TraceHud(QLabel):
+    """
+    Status bar readout of the last user action's latency and its phases (View > Latency HUD).
+    Spans finish on any thread, so the label polls the tracer instead of being notified.
+    """
+
+    POLL = 250  # ms
+
+    def __init__(self, parent=None, tracer=tracing.tracer):
+        super().__init__(parent)
+        self.tracer = tracer
+        self._revision = None
+        self.setStyleSheet("QLabel { color: #8fbcbb; padding: 0 8px; }")
+        self._timer = QTimer(self)
+        self._timer.setInterval(self.POLL)
+        self._timer.timeout.connect(self.refresh)
+        self.hide()
+
+    def setActive(self, on):
+        self.setVisible(on)
+        if on:
+            self._revision = None
+            self.refresh()
+            self._timer.start()
+        else:
+            self._timer.stop()
+
+    def refresh(self):
+        if self.tracer.revision == self._revision:
+            return
+        self._revision = self.tracer.revision
+        span = self.tracer.last()
+        self.setText(span.summary() if span else "No actions timed yet")
+        self.setToolTip("Last action, ms per phase; View > Latency Stats for p50/p95 per action")
+
+
+class TraceStatsDialog(QDialog):
+    """p50/p95/max per traced action over the spans in the tracer's ring buffer."""
+
+    COLUMNS = ["Action", "Count", "p50 ms", "p95 ms", "Max ms", "Phases (p50 ms)"]
+
+    def __init__(self, parent=None, tracer=tracing.tracer):
+        super().__init__(parent)
+        self.tracer = tracer
+        self.setWindowTitle("Latency Stats")
+        self.resize(1100, 600)
+
+        layout = QVBoxLayout(self)
+        self.table = QTableWidget(0, len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.verticalHeader().hide()
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.table.horizontalHeader().setStretchLastSection(True)
+        self.table.horizontalHeader().setSortIndicator(3, Qt.DescendingOrder)  # slowest p95 first
+        layout.addWidget(self.table)
+
+        buttons = QHBoxLayout()
+        self.background = QCheckBox("Include pane updates and highlighting")
+        self.background.toggled.connect(self.refresh)
+        buttons.addWidget(self.background)
+        buttons.addStretch()
+        refresh = QPushButton("Refresh")
+        refresh.clicked.connect(self.refresh)
+        buttons.addWidget(refresh)
+        clear = QPushButton("Clear")
+        clear.clicked.connect(self.clear)
+        buttons.addWidget(clear)
+        layout.addLayout(buttons)
+
+    def showEvent(self, event):
+        self.refresh()
+        super().showEvent(event)
+
+    def clear(self):
+        self.tracer.clear()
+        self.refresh()
+
+    def refresh(self):
+        background = {span.action for span in list(self.tracer.records) if span.background}
+        stats = self.tracer.stats()
+        if not self.background.isChecked():
+            stats = {action: row for action, row in stats.items() if action not in background}
+        rows = list(stats.items())
+
+        self.table.setSortingEnabled(False)
+        self.table.setRowCount(len(rows))
+        for i, (action, row) in enumerate(rows):
+            phases = " · ".join(f"{phase} {ms:.0f}" for phase, ms in row["phases"].items())
+            values = [action, row["count"], row["p50"], row["p95"], row["max"], phases]
+            for column, value in enumerate(values):
+                item = QTableWidgetItem()
+                if isinstance(value, str):
+                    item.setText(value)
+                else:
+                    # Numeric data sorts numerically
+                    item.setData(Qt.DisplayRole, round(value, 1) if isinstance(value, float) else value)
+                    item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                self.table.setItem(i, column, item)
+        self.table.setSortingEnabled(True)
@@ -0,0 +1,200 @@
+# /modules/tracing.py
+#
+# Lightweight latency spans for user actions (scripts, file open/save, pane updates,
+# highlighting). A span times one action; mark() inside it closes a phase, so a slow ts1
+# press shows whether the time went into the import, the API call or inserting the text.
+# Finished spans go into a ring buffer that the status bar HUD and the stats panel read.
+#
+#   with tracing.span("open file"):
+#       text = read()
+#       tracing.mark("read")
+#       editor.setPlainText(text)
+#       tracing.mark("setText")
+#
+# A span opened while another one is running on the same thread joins the outer one, so
+# helpers can open spans of their own and still show up as phases of the action that
+# called them.
+
+import math
+import time
+import inspect
+import functools
+import threading
+from collections import deque
+from contextlib import contextmanager
+
+CAPACITY = 2000    # finished spans kept for the stats panel
+
+
+class Span:
+    """One timed action: ordered phases plus accumulated inner costs (e.g. highlighting)."""
+
+    __slots__ = ("action", "start", "last", "phases", "inner", "note", "background", "total")
+
+    def __init__(self, action, note=None, background=False):
+        self.action = action
+        self.start = self.last = time.perf_counter()
+        self.phases = []       # [(phase, ms)] in order
+        self.inner = {}        # name -> ms spent inside the phases, reported separately
+        self.note = note
+        self.background = background   # housekeeping (pane updates, highlighting), not a user action
+        self.total = None
+
+    def mark(self, phase):
+        """End the current phase (it started at the previous mark or the span start)."""
+        now = time.perf_counter()
+        self.phases.append((phase, (now - self.last) * 1000))
+        self.last = now
+
+    def add(self, name, ms):
+        self.inner[name] = self.inner.get(name, 0.0) + ms
+
+    def close(self):
+        end = time.perf_counter()
+        if self.phases and end - self.last >= 0.0005:
+            self.phases.append(("rest", (end - self.last) * 1000))
+        self.total = (end - self.start) * 1000
+
+    def summary(self):
+        """'ts1 2410 ms: import 31 · api 2350 · insert 29 (highlight 12)'"""
+        text = f"{self.action} {self.total:.0f} ms"
+        if self.note:
+            text += f" [{self.note}]"
+        if self.phases:
+            text += ": " + " · ".join(f"{phase} {ms:.0f}" for phase, ms in self.phases)
+        if self.inner:
+            text += " (" + ", ".join(f"{name} {ms:.0f}" for name, ms in self.inner.items()) + ")"
+        return text
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values), max(1, math.ceil(fraction * len(sorted_values)))) - 1
+    return sorted_values[index]
+
+
+class Tracer:
+    """Ring buffer of finished spans and the span running on each thread."""
+
+    def __init__(self, capacity=CAPACITY):
+        self.records = deque(maxlen=capacity)
+        self.revision = 0          # bumped on every finished span; readers poll it
+        self._local = threading.local()
+
+    def current(self):
+        return getattr(self._local, "span", None)
+
+    @contextmanager
+    def span(self, action, note=None, background=False):
+        outer = self.current()
+        if outer is not None:
+            yield outer
+            return
+        span = Span(action, note, background)
+        self._local.span = span
+        try:
+            yield span
+        finally:
+            self._local.span = None
+            span.close()
+            self._append(span)
+
+    def record(self, action, total_ms, phases=(), note=None, background=False):
+        """Add work that was timed elsewhere (e.g. highlighting batched over an event loop pass)."""
+        span = Span(action, note, background)
+        span.phases = list(phases)
+        span.total = total_ms
+        self._append(span)
+
+    def _append(self, span):
+        self.records.append(span)
+        self.revision += 1
+
+    def last(self, background=False):
+        """The most recent span; only user actions unless background is set."""
+        for span in reversed(self.records):
+            if background or not span.background:
+                return span
+        return None
+
+    def clear(self):
+        self.records.clear()
+        self.revision += 1
+
+    def stats(self):
+        """{action: {count, p50, p95, max, phases: {phase: p50}}} over the buffered spans."""
+        totals, phases = {}, {}
+        for span in list(self.records):
+            totals.setdefault(span.action, []).append(span.total)
+            action_phases = phases.setdefault(span.action, {})
+            for phase, ms in span.phases:
+                action_phases.setdefault(phase, []).append(ms)
+            for name, ms in span.inner.items():
+                action_phases.setdefault(f"({name})", []).append(ms)
+        stats = {}
+        for action, values in totals.items():
+            values.sort()
+            stats[action] = {
+                "count": len(values),
+                "p50": percentile(values, 0.50),
+                "p95": percentile(values, 0.95),
+                "max": values[-1],
+                "phases": {phase: percentile(sorted(ms), 0.50) for phase, ms in phases[action].items()},
+            }
+        return stats
+
+
+tracer = Tracer()
+
+
+def span(action, note=None, background=False):
+    return tracer.span(action, note, background)
+
+
+def mark(phase):
+    """End a phase of the span running on this thread (no-op outside a span)."""
+    current = tracer.current()
+    if current is not None:
+        current.mark(phase)
+
+
+def add(name, ms):
+    """Charge ms of inner work (counted inside the phases) to the running span; False if there is none."""
+    current = tracer.current()
+    if current is None:
+        return False
+    current.add(name, ms)
+    return True
+
+
+def traced(action=None):
+    """Decorator: run the function inside a span named action (the function name by default)."""
+    def decorate(func):
+        name = action or func.__name__
+        # Qt passes signal arguments (e.g. checked) the slot may not take; drop the extras
+        parameters = inspect.signature(func).parameters.values()
+        if any(p.kind == p.VAR_POSITIONAL for p in parameters):
+            accepted = None
+        else:
+            accepted = sum(p.kind in (p.POSITIONAL_ONLY, p.POSITIONAL_OR_KEYWORD) for p in parameters)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if accepted is not None:
+                args = args[:accepted]
+            with tracer.span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def trace_methods(prefix):
+    """Class decorator: trace every method whose name starts with prefix."""
+    def decorate(cls):
+        for name, member in list(vars(cls).items()):
+            if name.startswith(prefix) and inspect.isfunction(member):
+                setattr(cls, name, traced()(member))
+        return cls
+    return decorate
@@ -0,0 +1,60 @@
+# /modules/utf16.py
+#
+# Qt counts document positions (QTextCursor, contentsChange) in UTF-16 code units; Python
+# strings count code points. The two differ after every character outside the BMP (emoji,
+# some CJK): each of those is one code point but two UTF-16 units. Offsets that cross
+# between the two worlds go through these helpers.
+
+import re
+from bisect import bisect_right
+
+_NON_BMP = re.compile("[\U00010000-\U0010FFFF]")
+
+
+def has_non_bmp(text):
+    return _NON_BMP.search(text) is not None
+
+
+def utf16_len(text):
+    """Length of text in UTF-16 code units (what Qt counts)."""
+    return len(text) + len(_NON_BMP.findall(text))
+
+
+def _surrogates(match):
+    code = ord(match.group()) - 0x10000
+    return chr(0xD800 + (code >> 10)) + chr(0xDC00 + (code & 0x3FF))
+
+
+def to_units(text):
+    """text with each non-BMP character split into its surrogate pair, one str item per UTF-16 unit."""
+    return _NON_BMP.sub(_surrogates, text)
+
+
+def from_units(units):
+    """Inverse of to_units: join surrogate pairs back into characters."""
+    return units.encode('utf-16-le', 'surrogatepass').decode('utf-16-le', 'replace')
+
+
+class OffsetMap:
+    """
+    Converts between code point and UTF-16 offsets of one text. Only the non-BMP
+    characters are stored, so text without any costs nothing and converts as identity.
+    """
+
+    def __init__(self, text):
+        # Code point index of each non-BMP character, in order
+        self._wide = [m.start() for m in _NON_BMP.finditer(text)]
+        # UTF-16 offset of each of them
+        self._wide_units = [index + i for i, index in enumerate(self._wide)]
+
+    def to_qt(self, index):
+        """UTF-16 offset of code point index."""
+        if not self._wide:
+            return index
+        return index + bisect_right(self._wide, index - 1)
+
+    def from_qt(self, position):
+        """Code point index of UTF-16 offset position (never inside a surrogate pair in Qt)."""
+        if not self._wide:
+            return position
+        return position - bisect_right(self._wide_units, position - 2)
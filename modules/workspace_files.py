@@ -0,0 +1,229 @@
+# /modules/workspace_files.py
+
+import os
+import logging
+
+from PyQt5.QtCore import QObject, QTimer, QFileSystemWatcher, pyqtSignal
+
+from modules.fuzzy import FuzzyIndex
+
+# Text files under these directories can be opened with Quick Open
+WORKSPACE_DIRS = ["/home/j/Desktop"]
+WORKSPACE_EXTENSIONS = {".vhd", ".txt", ".md"}
+MAX_DEPTH = 3            # directory levels below a workspace dir that are indexed
+MAX_WATCHED_DIRS = 256   # QFileSystemWatcher uses an inotify watch per directory
+
+# Desktop files whose names start with four digits are listed in the Recent menu
+DESKTOP_DIR = os.path.expanduser("~/Desktop")
+
+
+def scan_workspace(dirs, extensions=WORKSPACE_EXTENSIONS, max_depth=MAX_DEPTH):
+    """{directory: {file path, ...}} for the text files under dirs (hidden entries skipped)."""
+    found = {}
+    for top in dirs:
+        if not os.path.isdir(top):
+            continue
+        top_depth = top.rstrip(os.sep).count(os.sep)
+        for root, subdirs, files in os.walk(top):
+            if root.count(os.sep) - top_depth >= max_depth:
+                subdirs[:] = []
+            subdirs[:] = [d for d in subdirs if not d.startswith(".")]
+            found[root] = {os.path.join(root, name) for name in files
+                           if not name.startswith(".") and os.path.splitext(name)[1].lower() in extensions}
+    return found
+
+
+def is_desktop_number_file(name):
+    return len(name) >= 4 and name[:4].isdigit()
+
+
+class WorkspaceFiles(QObject):
+    """
+    In-memory list of recent files, numbered Desktop files and workspace text files, with
+    a fuzzy index over all of them. A directory watcher keeps it current, so showing the
+    Recent menu or Quick Open does no file system work.
+    """
+
+    changed = pyqtSignal()
+
+    DEBOUNCE = 300  # ms
+
+    def __init__(self, parent_window, recent_files_path, max_recent=20,
+                 workspace_dirs=WORKSPACE_DIRS, desktop_dir=DESKTOP_DIR):
+        super().__init__(parent_window)
+        self.parent = parent_window
+        self.recent_files_path = recent_files_path
+        self.max_recent = max_recent
+        self.workspace_dirs = [d for d in workspace_dirs if os.path.isdir(d)]
+        self.desktop_dir = desktop_dir
+        self.index = FuzzyIndex()
+        self.revision = 0          # bumped on every change; views rebuild when it moves
+
+        self.recent = self._readRecent()
+        self.desktop_numbered = set()
+        self._dir_files = {}       # workspace directory -> {file path, ...}
+        self._missing = set()      # recent files that no longer exist
+        self._pending_dirs = set()
+
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.fileChanged.connect(self._onFileChanged)
+        self.watcher.directoryChanged.connect(self._onDirectoryChanged)
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(self.DEBOUNCE)
+        self._timer.timeout.connect(self._processChanges)
+
+        self._scanDesktop()
+        self._checkRecent()
+        self._watch([self.recent_files_path, self.desktop_dir])
+        self._rebuildIndex()
+
+        if self.workspace_dirs:
+            dirs = list(self.workspace_dirs)
+            startup = getattr(parent_window, "startup", None)
+            if startup is not None:
+                startup.background("workspace scan", lambda: scan_workspace(dirs), self._setWorkspace)
+            else:
+                self._setWorkspace(scan_workspace(dirs))
+
+    # Recent list
+
+    def _readRecent(self):
+        if os.path.exists(self.recent_files_path):
+            try:
+                with open(self.recent_files_path, 'r', encoding='utf-8', errors='replace') as file:
+                    return [line for line in file.read().splitlines() if line][:self.max_recent]
+            except OSError as e:
+                logging.error(f"Failed to read recent files from {self.recent_files_path}: {e}")
+        return []
+
+    def saveRecent(self):
+        try:
+            os.makedirs(os.path.dirname(self.recent_files_path), exist_ok=True)
+            with open(self.recent_files_path, 'w', encoding='utf-8') as file:
+                for file_path in self.recent:
+                    file.write(f"{file_path}\n")
+        except OSError as e:
+            logging.error(f"Error saving recent files: {e}")
+        self._watch([self.recent_files_path])
+
+    def addRecent(self, file_path):
+        """Move file_path to the top of the recent list."""
+        if self.recent and self.recent[0] == file_path:
+            return
+        if file_path in self.recent:
+            self.recent.remove(file_path)
+        self.recent.insert(0, file_path)
+        del self.recent[self.max_recent:]
+        self._missing.discard(file_path)
+        self.saveRecent()
+        self._watch([os.path.dirname(file_path)])
+        self.index.add(file_path)
+        self._changed()
+
+    def removeRecent(self, file_path):
+        if file_path in self.recent:
+            self.recent.remove(file_path)
+            self.saveRecent()
+            self._rebuildIndex()
+            self._changed()
+
+    def existingRecent(self):
+        return [path for path in self.recent if path not in self._missing]
+
+    def _checkRecent(self):
+        self._missing = {path for path in self.recent if not os.path.exists(path)}
+        self._watch({os.path.dirname(path) for path in self.recent})
+
+    # Desktop and workspace
+
+    def _scanDesktop(self):
+        numbered = set()
+        try:
+            for name in os.listdir(self.desktop_dir):
+                path = os.path.join(self.desktop_dir, name)
+                if is_desktop_number_file(name) and os.path.isfile(path):
+                    numbered.add(path)
+        except OSError:
+            pass
+        self.desktop_numbered = numbered
+
+    def _setWorkspace(self, found):
+        self._dir_files = found
+        self._watch(list(found)[:MAX_WATCHED_DIRS])
+        self._rebuildIndex()
+        self._changed()
+        logging.info(f"Workspace index: {len(self.index)} files in {len(found)} directories")
+
+    def _rescanDirectory(self, directory):
+        """Re-list one changed workspace directory; only subdirectories that are new get walked."""
+        top = next((d for d in self.workspace_dirs if directory == d or directory.startswith(d + os.sep)), None)
+        if top is None:
+            return
+        for known in [d for d in self._dir_files if d == directory or d.startswith(directory + os.sep)]:
+            if not os.path.isdir(known):
+                del self._dir_files[known]
+        try:
+            names = os.listdir(directory)
+        except OSError:
+            return
+        depth = directory.count(os.sep) - top.rstrip(os.sep).count(os.sep)
+        files, new_dirs = set(), []
+        for name in names:
+            if name.startswith("."):
+                continue
+            path = os.path.join(directory, name)
+            if os.path.isdir(path):
+                if path not in self._dir_files and depth < MAX_DEPTH:
+                    new_dirs.append(path)
+            elif os.path.splitext(name)[1].lower() in WORKSPACE_EXTENSIONS:
+                files.add(path)
+        self._dir_files[directory] = files
+        for subdir in new_dirs:
+            found = scan_workspace([subdir], max_depth=MAX_DEPTH - depth - 1)
+            self._dir_files.update(found)
+            room = MAX_WATCHED_DIRS - len(self.watcher.directories())
+            self._watch(list(found)[:max(0, room)])
+
+    # Watching
+
+    def _watch(self, paths):
+        paths = [p for p in paths if p and os.path.exists(p)]
+        watched = set(self.watcher.files()) | set(self.watcher.directories())
+        missing = [p for p in paths if p not in watched]
+        if missing:
+            self.watcher.addPaths(missing)
+
+    def _onFileChanged(self, path):
+        self._pending_dirs.add(None)  # None: the recent list file
+        self._timer.start()
+
+    def _onDirectoryChanged(self, path):
+        self._pending_dirs.add(path)
+        self._timer.start()
+
+    def _processChanges(self):
+        pending, self._pending_dirs = self._pending_dirs, set()
+        if None in pending:
+            recent = self._readRecent()
+            if recent != self.recent:
+                self.recent = recent
+            self._watch([self.recent_files_path])
+        if self.desktop_dir in pending:
+            self._scanDesktop()
+        for directory in pending - {None}:
+            self._rescanDirectory(directory)
+        self._checkRecent()
+        self._rebuildIndex()
+        self._changed()
+
+    def _rebuildIndex(self):
+        paths = self.existingRecent()
+        paths += sorted(self.desktop_numbered)
+        for files in self._dir_files.values():
+            paths += files
+        self.index.set(dict.fromkeys(paths))
+
+    def _changed(self):
+        self.revision += 1
+        self.changed.emit()
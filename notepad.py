@@ -17,14 +17,34 @@ logging.basicConfig(
     force=True
 )
 
-from modules.notepad_window import NotepadWindow
-from PyQt5.QtWidgets import QApplication
 from modules.link_converter import convert_coords_to_links
 
 def main():
-    app = QApplication(sys.argv)
-    window = NotepadWindow()
+    # --eager-startup: finish all initialization before the window is shown (the old behavior)
+    # --new-instance: start a separate window even if one is already running
+    options = {arg for arg in sys.argv[1:] if arg.startswith("--")}
+    files = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+
+    if "--new-instance" not in options:
+        from modules.single_instance import forward_to_running
+        if forward_to_running(files):
+            # The running window opened the files; skip loading the editor entirely
+            return
+
+    # Imported after the hand-off check: this is most of the startup time
+    from PyQt5.QtWidgets import QApplication
+    from modules.notepad_window import NotepadWindow
+    from modules.single_instance import InstanceServer
+
+    app = QApplication(sys.argv[:1])
+    window = NotepadWindow(eager_startup="--eager-startup" in options)
+    if "--new-instance" not in options:
+        window.instance_server = InstanceServer(window)
+        window.instance_server.filesRequested.connect(window.openFiles)
+        window.instance_server.listen()
     window.show()
+    if files:
+        window.openFiles([os.path.abspath(fname) for fname in files])
     sys.exit(app.exec_())
 
 def log_uncaught_exceptions(exctype, value, tb):
@@ -5,6 +5,16 @@
 # This script analyzes comments for sentiment using AI.
 # It follows the same pattern as qq.py but focuses on sentiment analysis.
 
+# Script plugin manifest, read without importing this file (modules/plugin_registry.py)
+PLUGIN = {
+    "name": "CmntSntmnt",
+    "tooltip": "CmntSntmnt - Analyze sentiment of highlighted comments",
+    "mode": "subprocess",
+    "model": "gpt-4o-mini",
+    "toolbar": 2,
+    "order": 70,
+}
+
 import sys
 import argparse
 import re
@@ -1,4 +1,17 @@
 #!/usr/bin/env python3
+# Script plugin manifest, read without importing this file (modules/plugin_registry.py)
+PLUGIN = {
+    "name": "STB",
+    "label": "STB-",
+    "tooltip": "STB- - Rewrite and improve text",
+    "mode": "subprocess",
+    "input": "selection_or_document",
+    "model": "ft:gpt-4o-mini-2024-07-18:personal::Alh2FOfj",
+    "toolbar": 2,
+    "menus": ["edit"],
+    "order": 60,
+}
+
 import argparse
 import sys
 import traceback
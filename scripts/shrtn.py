@@ -7,6 +7,19 @@
 
 # This is basically the AI CORE Script, but inside of '111's instead
 
+# Script plugin manifest, read without importing this file (modules/plugin_registry.py)
+PLUGIN = {
+    "name": "shrtn",
+    "tooltip": "shrtn - Text shortening tool",
+    "markers": ["111\n", "\n111"],
+    "pattern": r"^111\s*\n([\s\S]*?)\n111$",
+    "model": "gpt-4o-mini",
+    "concurrency": 4,
+    "toolbar": 2,
+    "menus": ["edit"],
+    "order": 50,
+}
+
 import sys
 import argparse
 import re
@@ -7,6 +7,18 @@
 
 # This is basically the AI CORE Script, but inside of '111's instead
 
+# Script plugin manifest, read without importing this file (modules/plugin_registry.py)
+PLUGIN = {
+    "name": "ts1",
+    "tooltip": "ts1 - Text processing script 1",
+    "markers": ["111\n", "\n111"],
+    "pattern": r"^111\s*\n([\s\S]*?)\n111$",
+    "model": "gpt-4o-mini",
+    # No "concurrency": clean_segment reports progress through window=, which needs the sequential path
+    "menus": ["edit", "context"],
+    "order": 10,
+}
+
 import sys
 import argparse
 import re
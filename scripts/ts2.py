@@ -9,12 +9,22 @@
 
 # FILENAME CHANGED TO ts2.py
 
+# Script plugin manifest, read without importing this file (modules/plugin_registry.py)
+PLUGIN = {
+    "name": "ts2",
+    "tooltip": "ts2 - Text processing script 2",
+    "markers": ["222\n", "\n222"],
+    "pattern": r"^222\s*\n([\s\S]*?)\n222$",
+    "model": "gpt-4o-mini",
+    # No "concurrency": clean_segment reports progress through window=, which needs the sequential path
+    "menus": ["context"],
+    "order": 20,
+}
+
 import sys
 import argparse
 import re
 import os
-import shutil
-import time  # For timestamp
 import threading
 import itertools
 from openai import OpenAI  # Updated import syntax
@@ -604,34 +614,16 @@ def main():
         print(f"{RED}[ERROR] Error reading input file: {e}{RESET}")
         sys.exit(1)
 
-    # Create a backup of the input file in the specified directory with timestamp
+    # Back up the input file into the editor's shared backup store
     try:
-        # Get the base filename without the path
-        base_filename = os.path.basename(input_file)
-        # Remove the extension from the filename
-        filename_without_ext = os.path.splitext(base_filename)[0]
-        # Get the current time in 12-hour format with am/pm
-        time_str = time.strftime("%I%M%p").lower()
-        # Remove leading zero from hour if present
-        if time_str.startswith('0'):
-            time_str = time_str[1:]
-
-        # Construct the backup filename
-        backup_filename = f"{filename_without_ext}_222_{time_str}.vhd"
-        # Specify the backup directory
-        backup_directory = "/home/j/Desktop/Finals/"
-        # Ensure the backup directory exists
-        if not os.path.exists(backup_directory):
-            os.makedirs(backup_directory)
-        # Full backup path
-        backup_file = os.path.join(backup_directory, backup_filename)
-        # Copy the input file to the backup location
-        shutil.copyfile(input_file, backup_file)
-        logging.info(f"Created backup file '{backup_file}'.")
-        print(f"[INFO] Created backup file '{backup_file}'.")
+        sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        from modules.backup_store import BackupStore
+        snap = BackupStore().snapshot_text(input_file, content, "ts2")
+        logging.info(f"Created backup '{snap.manifest_path}'.")
+        print(f"[INFO] Created backup '{snap.manifest_path}' ({snap.new_bytes} new bytes).")
     except Exception as e:
-        logging.error(f"Error creating backup file: {e}")
-        print(f"{RED}[ERROR] Error creating backup file: {e}{RESET}")
+        logging.error(f"Error creating backup: {e}")
+        print(f"{RED}[ERROR] Error creating backup: {e}{RESET}")
         sys.exit(1)
 
     # Parse the segments with positions
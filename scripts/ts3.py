@@ -7,6 +7,18 @@
 
 # This is basically the AI CORE Script, but inside of '111's instead
 
+# Script plugin manifest, read without importing this file (modules/plugin_registry.py)
+PLUGIN = {
+    "name": "ts3",
+    "tooltip": "ts3 - Text processing script 3",
+    "markers": ["111\n", "\n111"],
+    "pattern": r"^111\s*\n([\s\S]*?)\n111$",
+    "model": "gpt-4o-mini",
+    "concurrency": 4,
+    "menus": ["context"],
+    "order": 30,
+}
+
 import sys
 import argparse
 import re
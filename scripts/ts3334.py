@@ -2,6 +2,18 @@
 
 # /modules/ts3334.py
 
+# Script plugin manifest, read without importing this file (modules/plugin_registry.py)
+PLUGIN = {
+    "name": "ts3334",
+    "tooltip": "ts3334 - Rewrite the 555 content using the 444 context",
+    "markers": ["444\n\n444\n", "\n555"],
+    "pattern": r"^444\s*\n\n444\s*\n([\s\S]*?)\n555$",
+    "model": "gpt-4o-mini",
+    # No "concurrency": clean_segment reports progress through window=, which needs the sequential path
+    "menus": ["context"],
+    "order": 35,
+}
+
 import sys
 import argparse
 import re
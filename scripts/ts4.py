@@ -5,6 +5,18 @@
 # How to use: python3 ts4.py inputfile.txt
 # This script updates the input file in place after creating a backup.
 
+# Script plugin manifest, read without importing this file (modules/plugin_registry.py)
+PLUGIN = {
+    "name": "ts4",
+    "tooltip": "ts4 - Text processing script 4",
+    "markers": ["111\n", "\n111"],
+    "pattern": r"^111\s*\n([\s\S]*?)\n111$",
+    "model": "gpt-4o-mini",
+    "concurrency": 4,
+    "menus": ["context"],
+    "order": 40,
+}
+
 import sys
 import argparse
 import re
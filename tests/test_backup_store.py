@@ -0,0 +1,106 @@
+# /tests/test_backup_store.py
+
+import datetime
+import zlib
+
+import pytest
+
+from modules import backup_store
+from modules.backup_store import BackupStore, RetentionPolicy
+
+
+class FakeSnapshot:
+    def __init__(self, name, created):
+        self.manifest_path = name
+        self.created = created
+
+
+def test_retention_counts_keep_last_days_as_seen():
+    now = datetime.datetime(2026, 3, 10, 18, 0)
+    snapshots = [FakeSnapshot(f"s{i}", now - datetime.timedelta(hours=i)) for i in range(30)]
+    expired = RetentionPolicy(keep_last=3, keep_days=30).select_expired(snapshots, now)
+    kept = [s.manifest_path for s in snapshots if s not in expired]
+    # s0-s2 are the newest; s3-s18 share their day, so only the newest of the day before stays
+    assert kept == ["s0", "s1", "s2", "s19"]
+
+
+def test_retention_drops_days_past_keep_days():
+    now = datetime.datetime(2026, 3, 10, 12, 0)
+    snapshots = [FakeSnapshot(f"d{i}", now - datetime.timedelta(days=i)) for i in range(10)]
+    expired = RetentionPolicy(keep_last=2, keep_days=5).select_expired(snapshots, now)
+    assert [s.manifest_path for s in expired] == ["d5", "d6", "d7", "d8", "d9"]
+
+
+def test_retention_runs_at_most_once_per_interval(tmp_path, monkeypatch):
+    store = BackupStore(str(tmp_path), RetentionPolicy(keep_last=2, keep_days=0))
+    source = str(tmp_path / "rundown.vhd")
+    for n in range(5):
+        store.snapshot_text(source, f"version {n}\n")
+    # The first snapshot ran retention; the following ones are inside the interval
+    assert len(store.snapshots(source)) == 5
+
+    monkeypatch.setattr(backup_store, "RETENTION_INTERVAL", 0)
+    store.snapshot_text(source, "version 5\n")
+    assert [store.read_text(s) for s in store.snapshots(source)] == ["version 5\n", "version 4\n"]
+
+
+def lines(count, seed=0):
+    return b"".join(f"line {seed}-{n} {'x' * (n % 70)}\n".encode() for n in range(count))
+
+
+def test_chunks_reassemble_and_respect_sizes():
+    data = lines(5000)
+    chunks = backup_store.chunk_data(data)
+    assert b"".join(chunks) == data
+    assert all(len(c) <= backup_store.MAX_CHUNK for c in chunks)
+    assert all(len(c) >= backup_store.MIN_CHUNK for c in chunks[:-1])
+    assert all(c.endswith(b"\n") for c in chunks)
+
+
+def test_chunks_hard_split_long_lines():
+    data = b"a" * 150000 + b"\nshort\n"
+    chunks = backup_store.chunk_data(data)
+    assert b"".join(chunks) == data
+    assert max(len(c) for c in chunks) == backup_store.MAX_CHUNK
+
+
+def test_insert_only_changes_nearby_chunks():
+    data = lines(5000)
+    middle = data.index(b"line 0-2500 ")
+    edited = data[:middle] + b"inserted line\n" + data[middle:]
+    before = set(backup_store.chunk_data(data))
+    after = backup_store.chunk_data(edited)
+    assert sum(c not in before for c in after) <= 2
+
+
+def test_snapshot_dedups_and_restores(tmp_path):
+    store = BackupStore(str(tmp_path / "store"))
+    source = tmp_path / "rundown.vhd"
+    data = lines(5000)
+    source.write_bytes(data)
+    first = store.snapshot_file(str(source))
+    source.write_bytes(data.replace(b"line 0-2500 ", b"line 0-2500 edited "))
+    second = store.snapshot_file(str(source), "cleaner")
+
+    assert first.new_bytes == len(data)
+    assert 0 < second.new_bytes <= 2 * backup_store.MAX_CHUNK
+    assert [s.label for s in store.snapshots(str(source))] == ["cleaner", "backup"]
+
+    dest = tmp_path / "restored.vhd"
+    store.restore(first, str(dest))
+    assert dest.read_bytes() == data
+    edited = source.read_bytes()
+    source.write_bytes(b"clobbered\n")
+    store.restore(second)
+    assert source.read_bytes() == edited
+
+
+def test_restore_refuses_corrupt_snapshot(tmp_path):
+    store = BackupStore(str(tmp_path / "store"))
+    snap = store.snapshot_bytes(str(tmp_path / "a.txt"), lines(100))
+    path = store._object_path(snap.chunks[0])
+    with open(path, "wb") as f:
+        f.write(zlib.compress(b"tampered\n"))
+    with pytest.raises(IOError):
+        store.restore(snap, str(tmp_path / "out.txt"))
+    assert not (tmp_path / "out.txt").exists()
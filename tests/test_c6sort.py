@@ -0,0 +1,87 @@
+# /tests/test_c6sort.py
+
+import os
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import pytest
+from PyQt5.QtGui import QTextDocument
+from PyQt5.QtWidgets import QApplication
+
+from modules import c6sort
+from modules.c6sort import SortOrder, compile_sort_order, normalize_title, sort_segments
+from modules.segment_model import SegmentModel
+
+app = QApplication.instance() or QApplication([])
+
+ORDER = "Title: Ukraine front\nTitle: Markets\n\nnot an entry\nTitle: Ukraine front\nTitle: Weather today:\n"
+
+
+@pytest.fixture
+def sort_order(tmp_path):
+    path = tmp_path / "order.vhd"
+    path.write_text(ORDER, encoding="utf-8")
+    return SortOrder(str(path))
+
+
+def test_normalize_title():
+    assert normalize_title('  "Title:   Ukraine   Front "') == "ukraine front"
+    assert normalize_title("'title: Markets'") == "markets"
+    assert normalize_title("Markets") == "markets"
+
+
+def test_title_lines_win_and_first_occurrence_ranks():
+    assert compile_sort_order(ORDER) == {"ukraine front": 0, "markets": 1, "weather today:": 2}
+    # Without any Title: line every non-empty line is an entry
+    assert compile_sort_order("Markets\n\nUkraine front\nmarkets\n") == {"markets": 0, "ukraine front": 1}
+
+
+def test_rank_exact_then_longest_word_prefix(sort_order):
+    assert sort_order.rank("Title: MARKETS") == 1
+    assert sort_order.rank('"Title: Ukraine front: day 3') == 0
+    assert sort_order.rank("Title: Weather today: rain") == 2
+    assert sort_order.rank("Title: Weather") is None
+    assert sort_order.rank("Title: Ukraine") is None
+
+
+def test_rank_map_recompiled_only_when_the_file_changes(sort_order, monkeypatch):
+    calls = []
+    real = c6sort.compile_sort_order
+    monkeypatch.setattr(c6sort, "compile_sort_order", lambda text: calls.append(text) or real(text))
+    first = sort_order.ranks()
+    assert sort_order.ranks() is first
+    assert len(calls) == 1
+
+    with open(sort_order.path, "a", encoding="utf-8") as f:
+        f.write("Title: Sports\n")
+    assert sort_order.ranks()["sports"] == 3
+    assert len(calls) == 2
+
+    os.remove(sort_order.path)
+    with pytest.raises(OSError):
+        sort_order.ranks()
+
+
+def make_model(titles):
+    document = QTextDocument()
+    document.setPlainText("".join(f"Title: {title}\nbody of {title}\n\n" for title in titles))
+    return document, SegmentModel(document)
+
+
+def document_titles(document):
+    return [line[len("Title: "):] for line in document.toPlainText().splitlines() if line.startswith("Title:")]
+
+
+def test_sort_segments_ranked_first_and_stable(sort_order):
+    document, model = make_model(["Local news", "Markets", "Weather today: rain", "Sports",
+                                  "Ukraine front: east", "Markets close", "Ukraine front"])
+    moved, unranked = sort_segments(model, sort_order)
+    assert document_titles(document) == ["Ukraine front: east", "Ukraine front", "Markets",
+                                         "Markets close", "Weather today: rain", "Local news", "Sports"]
+    assert unranked == 2
+    assert moved == 4  # all but the 1, 2, 3 run of old indexes
+    # Bodies travel with their titles
+    assert "Title: Sports\nbody of Sports\n" in document.toPlainText()
+
+    # Sorting a sorted document moves nothing
+    assert sort_segments(model, sort_order) == (0, 2)
@@ -0,0 +1,34 @@
+# /tests/test_doc_snapshot.py
+
+import os
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtGui import QTextCursor, QTextDocument
+from PyQt5.QtWidgets import QApplication
+
+from modules.doc_snapshot import DocSnapshot
+
+app = QApplication.instance() or QApplication([])
+
+
+def test_positions_match_qt_after_non_bmp_characters():
+    document = QTextDocument()
+    document.setPlainText("Title: 😀 story\nhttps://example.com/😀😀/a\nplain\n")
+    snapshot = DocSnapshot(document)
+
+    block, starts = document.begin(), []
+    while block.isValid():
+        starts.append(block.position())
+        block = block.next()
+    assert snapshot.offsets == starts
+
+    for line, text in enumerate(snapshot.lines):
+        for column in range(len(text) + 1):
+            position = snapshot.position_of(line, column)
+            assert snapshot.line_at(position) == line
+            assert snapshot.column_at(position) == column
+            cursor = QTextCursor(document)
+            cursor.setPosition(position)
+            cursor.movePosition(QTextCursor.EndOfBlock, QTextCursor.KeepAnchor)
+            assert cursor.selectedText() == text[column:]
@@ -0,0 +1,115 @@
+# /tests/test_edit_journal.py
+
+import os
+import random
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import pytest
+from PyQt5.QtGui import QTextCursor
+from PyQt5.QtWidgets import QApplication, QPlainTextEdit
+
+from modules.edit_journal import DocumentJournal, JournalManager, read_journal, replay
+from modules.utf16 import utf16_len
+
+app = QApplication.instance() or QApplication([])
+
+
+@pytest.fixture
+def manager(tmp_path):
+    manager = JournalManager(None, str(tmp_path))
+    yield manager
+    manager.discard_all()
+
+
+def journal_files(manager):
+    return sorted(name for name in os.listdir(manager.journal_dir) if name.endswith(".jnl"))
+
+
+def edit(editor, pos, remove, text):
+    cursor = QTextCursor(editor.document())
+    cursor.setPosition(pos)
+    cursor.setPosition(pos + remove, QTextCursor.KeepAnchor)
+    cursor.insertText(text)
+
+
+def recovered(manager, journal):
+    header, ops = read_journal(journal.path)
+    return replay(header["text"], ops)
+
+
+def test_replay_counts_utf16_units():
+    base = "Title: 😀 story\ncc- 🇺🇦 update\n"
+    # Positions as Qt reports them: the emoji and both flag halves are two units each
+    ops = [(9, 0, "X"), (25, 0, "!"), (0, 5, "Name")]
+    assert replay(base, ops) == "Name: 😀X story\ncc- 🇺🇦! update\n"
+
+
+def test_replay_across_chunks_matches_whole_text_edits():
+    rnd = random.Random(3)
+    text = "".join(rnd.choice("ab😀\n") for _ in range(500))
+    ops = []
+    current = text
+    for _ in range(200):
+        # Qt positions never fall inside a surrogate pair
+        bounds = [utf16_len(current[:k]) for k in range(len(current) + 1)]
+        start = rnd.randrange(len(bounds))
+        end = min(len(bounds) - 1, start + rnd.randint(0, 6))
+        op = (bounds[start], bounds[end] - bounds[start], rnd.choice(["", "x", "😃y", "line\n"]))
+        ops.append(op)
+        current = current[:start] + op[2] + current[end:]
+    assert replay(text, ops, chunk_size=16) == current
+
+
+def test_journal_replays_edits_after_non_bmp_characters(manager):
+    editor = QPlainTextEdit()
+    editor.setPlainText("Title: 😀 story\nbody\n")
+    manager.attach(editor)
+    manager.waitForDone()
+    journal = manager.journals[editor]
+
+    edit(editor, 9, 0, "X")                 # after the emoji
+    editor.moveCursor(QTextCursor.End)
+    for ch in "more 👍 typing":
+        editor.insertPlainText(ch)           # coalesced into one insert
+    edit(editor, 0, 5, "Name")
+    journal.flush()
+
+    header, ops = read_journal(journal.path)
+    assert len(ops) == 3
+    assert replay(header["text"], ops) == editor.toPlainText()
+
+
+def test_read_journal_stops_at_torn_line(tmp_path):
+    path = tmp_path / "torn.jnl"
+    path.write_text('{"t": "base", "text": "abc"}\n[1, 0, "x"]\n[2, 1, "y', encoding="utf-8")
+    header, ops = read_journal(str(path))
+    assert header["text"] == "abc"
+    assert ops == [(1, 0, "x")]
+
+
+def test_compaction_keeps_old_file_until_new_base_lands(manager, monkeypatch):
+    monkeypatch.setattr(DocumentJournal, "COMPACT_OPS", 5)
+    editor = QPlainTextEdit()
+    editor.setPlainText("😀 base\n")
+    manager.attach(editor)
+    manager.waitForDone()
+    journal = manager.journals[editor]
+    first = journal.path
+
+    for n in range(5):
+        edit(editor, 0, 0, f"{n}\n")
+    journal.flush()
+    # The new base is being written on the pool; the old journal still holds every edit
+    assert journal.path == first
+    assert journal._base_job is not None
+    assert recovered(manager, journal) == editor.toPlainText()
+
+    edit(editor, 0, 0, "late\n")            # waits in memory for the new base
+    journal.flush()
+    manager.waitForDone()
+    assert journal.path != first
+    assert journal_files(manager) == [os.path.basename(journal.path)]
+    header, ops = read_journal(journal.path)
+    assert header["text"] == editor.toPlainText().replace("late\n", "", 1)
+    assert replay(header["text"], ops) == editor.toPlainText()
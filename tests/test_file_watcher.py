@@ -0,0 +1,53 @@
+# /tests/test_file_watcher.py
+
+from modules.file_watcher import merge3
+
+BASE = "Title: one\nalpha\nbeta\ngamma\n\nTitle: two\ndelta\nepsilon\n"
+
+
+def test_unchanged_sides():
+    assert merge3(BASE, BASE, BASE) == (BASE, 0)
+    mine = BASE.replace("beta", "BETA")
+    assert merge3(BASE, mine, BASE) == (mine, 0)
+    assert merge3(BASE, BASE, mine) == (mine, 0)
+
+
+def test_disjoint_edits_are_combined():
+    mine = BASE.replace("alpha\n", "alpha\nmy line\n")
+    theirs = BASE.replace("epsilon", "EPSILON").replace("Title: one\n", "")
+    merged, conflicts = merge3(BASE, mine, theirs)
+    assert conflicts == 0
+    assert merged == "alpha\nmy line\nbeta\ngamma\n\nTitle: two\ndelta\nEPSILON\n"
+
+
+def test_same_change_on_both_sides_is_not_a_conflict():
+    both = BASE.replace("gamma\n", "")
+    assert merge3(BASE, both, both) == (both, 0)
+
+
+def test_overlapping_edits_keep_mine():
+    mine = BASE.replace("beta", "mine")
+    theirs = BASE.replace("beta", "theirs").replace("delta", "DELTA")
+    merged, conflicts = merge3(BASE, mine, theirs)
+    assert conflicts == 1
+    assert merged == mine.replace("delta", "DELTA")
+
+
+def test_adjacent_edits_are_one_conflicting_region():
+    mine = BASE.replace("alpha", "ALPHA")
+    theirs = BASE.replace("beta", "BETA")
+    merged, conflicts = merge3(BASE, mine, theirs)
+    assert (merged, conflicts) == (mine, 1)
+
+
+def test_insertions_at_the_same_place_keep_mine():
+    mine = BASE.replace("\nTitle: two", "\nmine\nTitle: two")
+    theirs = BASE.replace("\nTitle: two", "\ntheirs\nTitle: two")
+    assert merge3(BASE, mine, theirs) == (mine, 1)
+
+
+def test_missing_trailing_newline():
+    base = "a\nb\nc"
+    mine = "A\nb\nc"
+    theirs = "a\nb\nc\nd"
+    assert merge3(base, mine, theirs) == ("A\nb\nc\nd", 0)
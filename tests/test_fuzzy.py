@@ -0,0 +1,104 @@
+# /tests/test_fuzzy.py
+
+import itertools
+import random
+
+from modules.fuzzy import FuzzyIndex, NAME_BONUS, _positions, fuzzy_score
+
+PATHS = [
+    "/home/j/Desktop/Finals/TODAY_ONLY.vhd",
+    "/home/j/Desktop/Finals/today_backup.vhd",
+    "/home/j/Documents/totally/done/notes.txt",
+    "/home/j/Desktop/code/gui71/segmentMoversAllv6.py",
+    "/home/j/Desktop/Finals/rundown.vhd",
+    "/home/j/rundown.vhd",
+    "/tmp/todo.md",
+]
+
+
+def embeddings(query, key):
+    """Every way query occurs as a subsequence of key (brute force, short strings only)."""
+    for combo in itertools.combinations(range(len(key)), len(query)):
+        if all(key[p] == ch for p, ch in zip(combo, query)):
+            yield combo
+
+
+def test_positions_is_the_most_compact_leftmost_match():
+    rnd = random.Random(11)
+    for _ in range(400):
+        key = "".join(rnd.choice("ab_c") for _ in range(rnd.randint(0, 9)))
+        query = "".join(rnd.choice("abc") for _ in range(rnd.randint(1, 3)))
+        found = list(embeddings(query, key))
+        positions = _positions(query, key)
+        if not found:
+            assert positions is None
+            continue
+        assert [key[p] for p in positions] == list(query)
+        assert positions == sorted(set(positions))
+        end = min(match[-1] for match in found)
+        start = max(match[0] for match in found if match[-1] == end)
+        assert (positions[0], positions[-1]) == (start, end)
+
+
+def test_positions_prefers_the_compact_window():
+    assert _positions("ab", "a_xa_b") == [3, 5]
+    assert _positions("abc", "xxabxc") == [2, 3, 5]
+
+
+def test_score_rewards_boundaries_runs_and_camel_case():
+    assert fuzzy_score("tdyonl", "today_only.vhd") is not None
+    assert fuzzy_score("xyz", "today_only.vhd") is None
+    assert fuzzy_score("", "anything") == 0
+    # A word start beats the same letter mid-word, a run beats a gap
+    assert fuzzy_score("o", "only") > fuzzy_score("o", "todo")
+    assert fuzzy_score("to", "today") > fuzzy_score("to", "t_xo")
+    assert fuzzy_score("mo", "segmentmovers.py", "segmentMovers.py") > fuzzy_score("mo", "segmentmovers.py")
+
+
+def test_search_finds_every_subsequence_match():
+    rnd = random.Random(2)
+    index = FuzzyIndex(PATHS)
+    for _ in range(200):
+        query = "".join(rnd.choice("tdoanlrvhu/.") for _ in range(rnd.randint(1, 4)))
+        expected = {path for path in PATHS if _positions(query, path.lower()) is not None}
+        assert {path for _, path in index.search(query)} == expected
+
+
+def test_file_name_matches_rank_first():
+    index = FuzzyIndex(PATHS)
+    results = index.search("today")
+    assert [path for _, path in results[:2]] == [PATHS[0], PATHS[1]]
+    assert all(score >= NAME_BONUS for score, _ in results[:2])
+    # segmentMoversAllv6.py only matches with the help of its directories
+    assert [path for _, path in results[2:]] == [PATHS[3]]
+    # Equal scores: the shorter path first
+    assert [path for _, path in index.search("rundown")] == [PATHS[5], PATHS[4]]
+
+
+def test_typing_reuses_matches_but_sees_index_changes():
+    index = FuzzyIndex(PATHS)
+    fresh = FuzzyIndex(PATHS)
+    for query in ("t", "to", "tod", "toda", "today"):
+        assert index.search(query) == fresh.search(query)
+
+    index.add("/srv/today_extra.vhd")
+    assert "/srv/today_extra.vhd" in [path for _, path in index.search("today_")]
+    index.remove(PATHS[0])
+    assert PATHS[0] not in [path for _, path in index.search("today_o")]
+
+
+def test_empty_query_and_limit():
+    index = FuzzyIndex(PATHS)
+    assert [path for _, path in index.search("  ")] == PATHS
+    assert len(index.search("h", limit=3)) == 3
+    # Spaces in the query are ignored
+    assert index.search("to day") == index.search("today")
+
+
+def test_set_keeps_existing_entries():
+    index = FuzzyIndex(PATHS)
+    entry = index._entries[PATHS[0]]
+    index.set(PATHS[:2] + ["/new/file.txt"])
+    assert len(index) == 3
+    assert index._entries[PATHS[0]] is entry
+    assert "/new/file.txt" in index and PATHS[4] not in index
@@ -0,0 +1,156 @@
+# /tests/test_line_pipeline.py
+#
+# The presets replaced ad-hoc loops in the window; the old loops are kept here as the
+# reference they must agree with (apart from keeping a trailing newline).
+
+import random
+import re
+
+import pytest
+
+from modules.line_pipeline import (CC_REACTIONS, TEMPMAX_PREFIXES, Pipeline, builtin_presets,
+                                   get_pipeline, stage_from_spec)
+
+
+def old_cleaner(text):
+    cleaned_lines = [line for line in text.splitlines() if line.strip() not in CC_REACTIONS]
+    result_lines = []
+    empty_count = 0
+    for line in cleaned_lines:
+        if line.strip() == "":
+            empty_count += 1
+        else:
+            if empty_count:
+                result_lines.extend([""] * (empty_count % 4))
+                empty_count = 0
+            result_lines.append(line)
+    if empty_count:
+        result_lines.extend([""] * (empty_count % 4))
+    return "\n".join(result_lines)
+
+
+def old_spacermvr(text):
+    result_lines = []
+    empty_count = 0
+    for line in text.splitlines():
+        if line.strip() == "":
+            empty_count += 1
+            if empty_count <= 3:
+                result_lines.append("")
+        else:
+            empty_count = 0
+            result_lines.append(line)
+    return "\n".join(result_lines)
+
+
+def old_tempmax(text):
+    return "\n".join(line for line in text.split("\n")
+                     if not any(line.strip().startswith(prefix) for prefix in TEMPMAX_PREFIXES))
+
+
+def old_deepstate(text):
+    gps_pattern = re.compile(r'^(-?\d+\.\d+)\s*,\s*(-?\d+\.\d+)\s*$')
+    new_lines = []
+    for line in text.splitlines():
+        match = gps_pattern.match(line.strip())
+        if match:
+            lat, lon = match.groups()
+            new_lines.append(f"https://deepstatemap.live/en#13/{lat}/{lon}")
+        else:
+            new_lines.append(line)
+    return "\n".join(new_lines)
+
+
+def old_cc_spacing(content):
+    lines = content.splitlines()
+    new_lines = []
+    in_segment = False
+    found_first_cc = False
+    for i in range(len(lines)):
+        line = lines[i].strip()
+        if line.startswith('"Title:') or line.startswith("'Title:"):
+            new_lines.append(lines[i])
+            in_segment = True
+            found_first_cc = False
+        elif in_segment and line.startswith('cc-') and not found_first_cc:
+            new_lines.extend([''] * 4)
+            new_lines.append(lines[i])
+            found_first_cc = True
+        elif line.startswith('cc-'):
+            if new_lines and new_lines[-1].strip():
+                new_lines.append('')
+            new_lines.append(lines[i])
+            if i + 1 < len(lines) and lines[i + 1].strip():
+                new_lines.append('')
+        else:
+            new_lines.append(lines[i])
+    return '\n'.join(new_lines)
+
+
+OLD_LOOPS = {
+    "cleaner": old_cleaner,
+    "spacermvr": old_spacermvr,
+    "tempmax": old_tempmax,
+    "deepstate": old_deepstate,
+    "cc-spacing": old_cc_spacing,
+}
+
+LINE_POOL = CC_REACTIONS[:6] + [
+    "", "", "", "   ", "\t",
+    '"Title: quoted segment', "'Title: single quoted", "Title: plain",
+    "cc-Some longer comment", "  cc-indented", "mm- media", "jj- note",
+    "48.51234, 35.87654", " -12.5,  130.25 ", "48.5, east",
+    "Timestamp: 12:30", "https://example.com/a", "--/home/j/clip.mp4", "----word",
+    "Ordinary paragraph text with cc- inside.", "Ещё строка 😀",
+]
+
+
+def documents(count=200, seed=7):
+    """Random documents without a trailing newline (the one behaviour the pipeline changed)."""
+    rnd = random.Random(seed)
+    for _ in range(count):
+        lines = [rnd.choice(LINE_POOL) for _ in range(rnd.randint(0, 60))]
+        yield "\n".join(lines + ["end"])
+
+
+@pytest.mark.parametrize("preset", sorted(OLD_LOOPS))
+def test_presets_match_the_loops_they_replace(preset):
+    for text in documents():
+        assert get_pipeline(preset, builtin_presets()).run_text(text) == OLD_LOOPS[preset](text)
+
+
+def test_fused_presets_match_the_loops_run_in_turn():
+    pipeline = get_pipeline("cleaner,spacermvr,deepstate", builtin_presets())
+    for text in documents():
+        assert pipeline.run_text(text) == old_deepstate(old_spacermvr(old_cleaner(text)))
+
+
+@pytest.mark.parametrize("preset", sorted(OLD_LOOPS))
+def test_trailing_newline_is_kept(preset):
+    for text in documents():
+        result = get_pipeline(preset, builtin_presets()).run_text(text + "\n")
+        # The old loops dropped the file's final newline (only tempmax's split kept it)
+        old = OLD_LOOPS[preset](text)
+        assert result == old + "\n"
+
+
+def test_changed_counts():
+    pipeline = get_pipeline("cleaner", builtin_presets())
+    pipeline.run_text("a\ncc-Wow\n\n\n\n\nb\ncc-Nice")
+    assert [stage.changed for stage in pipeline.stages] == [2, 4]
+    assert pipeline.changed == 6
+
+
+def test_specs_round_trip():
+    for stages in builtin_presets().values():
+        rebuilt = Pipeline([stage_from_spec(stage.spec()) for stage in stages])
+        original = Pipeline(stages)
+        for text in documents(20):
+            assert rebuilt.run_text(text) == original.run_text(text)
+
+
+def test_unknown_stage_and_preset():
+    with pytest.raises(ValueError):
+        stage_from_spec({"stage": "nope"})
+    with pytest.raises(KeyError):
+        get_pipeline("cleaner,nope", builtin_presets())
@@ -0,0 +1,117 @@
+# /tests/test_segment_model.py
+
+import os
+import random
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import pytest
+from PyQt5.QtGui import QTextDocument
+from PyQt5.QtWidgets import QApplication
+
+from modules.segment_model import SegmentModel
+
+app = QApplication.instance() or QApplication([])
+
+PREAMBLE = "Rundown 😀\n\n"
+
+
+def segment(n):
+    return f"Title: story {n}\nhttps://example.com/{n}\nbody {n} {'👍' * (n % 3)}\n\n"
+
+
+def segment_texts(count, trailing_newline=True):
+    texts = [segment(n) for n in range(count)]
+    if not trailing_newline:
+        # The last segment ends the document without a newline (or its blank line)
+        texts[-1] = texts[-1].rstrip("\n") + "\n"
+    return texts
+
+
+def make(count, trailing_newline=True):
+    document = QTextDocument()
+    text = PREAMBLE + "".join(segment_texts(count, trailing_newline))
+    document.setPlainText(text if trailing_newline else text[:-1])
+    return document, SegmentModel(document)
+
+
+def expected_text(order, trailing_newline=True):
+    order = list(order)
+    texts = segment_texts(len(order), trailing_newline)
+    text = PREAMBLE + "".join(texts[n] for n in order)
+    return text if trailing_newline else text[:-1]
+
+
+def fewest_moves(order):
+    """len(order) minus its longest increasing subsequence, by brute force."""
+    best = [1] * len(order)
+    for i in range(len(order)):
+        for j in range(i):
+            if order[j] < order[i]:
+                best[i] = max(best[i], best[j] + 1)
+    return len(order) - max(best, default=0)
+
+
+@pytest.mark.parametrize("trailing_newline", [True, False])
+def test_reorder_matches_order_with_fewest_moves(trailing_newline):
+    rnd = random.Random(5)
+    for count in (1, 2, 3, 8, 25):
+        for _ in range(10):
+            order = list(range(count))
+            rnd.shuffle(order)
+            document, model = make(count, trailing_newline)
+            moved = model.reorder(order)
+            assert document.toPlainText() == expected_text(order, trailing_newline)
+            assert moved == fewest_moves(order)
+            # The model followed the edits through contentsChange
+            model_titles = model.titles()
+            model.rescan()
+            assert model_titles == model.titles()
+
+
+def test_reorder_is_one_undo_step():
+    document, model = make(10)
+    original = document.toPlainText()
+    model.reorder([9, 0, 1, 2, 8, 3, 4, 5, 6, 7])
+    assert document.toPlainText() == expected_text([9, 0, 1, 2, 8, 3, 4, 5, 6, 7])
+    document.undo()
+    assert document.toPlainText() == original
+
+
+def test_single_move_and_identity():
+    document, model = make(6)
+    assert model.reorder(list(range(6))) == 0
+    assert document.toPlainText() == expected_text(range(6))
+    assert document.isUndoAvailable() is False
+    # Moving one segment to the front touches only that segment
+    assert model.reorder([5, 0, 1, 2, 3, 4]) == 1
+
+
+def test_reorder_rejects_non_permutations():
+    document, model = make(3)
+    for order in ([0, 1], [0, 1, 1], [0, 1, 3]):
+        with pytest.raises(ValueError):
+            model.reorder(order)
+
+
+def test_move_and_swap():
+    document, model = make(5)
+    model.move(0, 5)
+    assert document.toPlainText() == expected_text([1, 2, 3, 4, 0])
+    model.move(3, 1)
+    assert document.toPlainText() == expected_text([1, 4, 2, 3, 0])
+    model.swap(0, 4)
+    assert document.toPlainText() == expected_text([0, 4, 2, 3, 1])
+    assert model.count() == 5
+
+
+def test_titles_follow_edits():
+    document, model = make(4)
+    assert document.findBlockByNumber(model.titles()[2]).text() == "Title: story 2"
+    cursor = document.find("body 1")
+    cursor.insertText("Title: inserted\nbody 1")
+    model_titles = model.titles()
+    model.rescan()
+    assert model_titles == model.titles() and model.count() == 5
+    assert model.text(2) == "Title: inserted\nbody 1 👍\n\n"
+    assert model.index_at(document.find("Title: story 2").position()) == 3
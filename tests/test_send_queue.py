@@ -0,0 +1,110 @@
+# /tests/test_send_queue.py
+
+import os
+import types
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import pytest
+from PyQt5.QtCore import QEventLoop, QTimer
+from PyQt5.QtWidgets import QApplication
+
+from modules import send_queue
+from modules.send_queue import SendQueue, prepend_block
+
+app = QApplication.instance() or QApplication([])
+
+
+class FakeStore:
+    def __init__(self):
+        self.snapshots = []
+
+    def snapshot_text(self, source, text, label):
+        self.snapshots.append((source, text, label))
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(send_queue, "time", types.SimpleNamespace(monotonic=lambda: now[0]))
+    return now
+
+
+@pytest.fixture
+def sender():
+    sender = SendQueue(store=FakeStore())
+    sender.results = []
+    sender.finished.connect(lambda target, count, error: sender.results.append((count, error)))
+    return sender
+
+
+def test_prepend_block_puts_newest_first():
+    assert prepend_block(["one", "two", "three"]) == "three\n\ntwo\n\none\n\n"
+
+
+def test_batch_is_backed_up_and_written_once(tmp_path, sender):
+    target = tmp_path / "sent.vhd"
+    target.write_text("existing\n", encoding="utf-8")
+    for segment in ("one", "two", "three"):
+        assert sender.send(str(target), segment) is False
+    sender.flush(blocking=True)
+
+    assert target.read_text(encoding="utf-8") == "three\n\ntwo\n\none\n\nexisting\n"
+    assert sender.store.snapshots == [(str(target), "existing\n", "send")]
+    assert sender.results == [(3, "")]
+    assert not sender.hasPending()
+
+
+def test_failed_sends_back_off_exponentially(tmp_path, sender, clock):
+    target = str(tmp_path / "missing" / "sent.vhd")
+    sender.send(target, "one")
+    sender.flush(blocking=True)
+    assert sender._failures[target] == 1
+    assert sender._retry_at[target] == clock[0] + SendQueue.BATCH_DELAY / 1000
+    assert sender._timer.isActive()
+
+    # Still backing off: a timer flush leaves the batch alone
+    sender.send(target, "two")
+    sender.flush()
+    assert sender._pending[target] == ["one", "two"]
+    assert not sender._running
+
+    for failures in range(2, 9):
+        sender.flush(blocking=True)
+        expected = min(SendQueue.BATCH_DELAY * 2 ** (failures - 1), SendQueue.MAX_RETRY_DELAY)
+        assert sender._retry_at[target] == clock[0] + expected / 1000
+    assert expected == SendQueue.MAX_RETRY_DELAY
+
+    # Once the target is writable the segments land in send order and the backoff resets
+    os.makedirs(os.path.dirname(target))
+    clock[0] += SendQueue.MAX_RETRY_DELAY / 1000
+    sender.flush(blocking=True)
+    with open(target, encoding="utf-8") as f:
+        assert f.read() == "two\n\none\n\n"
+    assert not sender._failures and not sender._retry_at
+    assert [error == "" for count, error in sender.results] == [False] * 8 + [True]
+
+
+def test_retry_runs_from_the_timer(tmp_path, sender, monkeypatch):
+    monkeypatch.setattr(SendQueue, "BATCH_DELAY", 20)
+    target = str(tmp_path / "later" / "sent.vhd")
+    sender.send(target, "one")
+
+    loop = QEventLoop()
+    sender.finished.connect(lambda *args: loop.quit() if not args[2] else None)
+    sender.finished.connect(lambda *args: os.makedirs(os.path.dirname(target), exist_ok=True))
+    QTimer.singleShot(5000, loop.quit)
+    loop.exec_()
+
+    with open(target, encoding="utf-8") as f:
+        assert f.read() == "one\n\n"
+    assert sender.results[0][1] and sender.results[-1] == (1, "")
+
+
+def test_take_failed_clears_retry_state(tmp_path, sender):
+    target = str(tmp_path / "missing" / "sent.vhd")
+    sender.send(target, "one")
+    sender.flush(blocking=True)
+    assert sender.takeFailed() == {target: ["one"]}
+    assert not sender.hasPending()
+    assert not sender._failures and not sender._retry_at
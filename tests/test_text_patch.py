@@ -0,0 +1,86 @@
+# /tests/test_text_patch.py
+
+import os
+import random
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtGui import QTextDocument
+from PyQt5.QtWidgets import QApplication
+
+from modules import text_patch
+from modules.text_patch import compute_patch, apply_patch
+
+app = QApplication.instance() or QApplication([])
+
+
+def patched(old, new):
+    document = QTextDocument()
+    document.setPlainText(old)
+    apply_patch(document, compute_patch(old, new), old)
+    return document.toPlainText()
+
+
+def test_patch_after_non_bmp_characters():
+    old = "Title: 😀 story\nhttps://example.com/a\ncc- 🇺🇦 update\nmm- clip\n"
+    new = "Title: 😀 story\nhttps://example.com/b\ncc- 🇺🇦 update 👍\nmm- clip two\n"
+    assert patched(old, new) == new
+
+
+def test_patch_replaces_non_bmp_characters():
+    old = "a😀b😀c\n" * 50
+    new = old.replace("😀b", "x😃😃", 3)
+    assert patched(old, new) == new
+
+
+def test_patch_without_non_bmp_characters():
+    old = "Title: one\ntext\n\nTitle: two\nmore text\n"
+    new = "Title: one\ntext changed\n\nTitle: two\n"
+    assert patched(old, new) == new
+
+
+def rundown(count, seed=0):
+    rnd = random.Random(seed)
+    words = "minister talks ceasefire border officials sanctions markets report council energy".split()
+    segments = []
+    for index in range(count):
+        body = "\n".join(" ".join(rnd.choice(words) for _ in range(rnd.randint(8, 30)))
+                         for _ in range(rnd.randint(3, 8)))
+        segments.append(f"Title: story {index}\nhttps://example.com/{index}\n\n{body}\n\n")
+    return segments
+
+
+def test_reordered_segments_patch_by_line():
+    segments = rundown(200)
+    old = "".join(segments)
+    random.Random(1).shuffle(segments)
+    new = "".join(segments)
+    edits = compute_patch(old, new)
+    assert patched(old, new) == new
+    # Unrelated lines are replaced whole, not diffed character by character into
+    # thousands of edits (or collapsed into one replacement past MAX_EDITS)
+    assert 1 < len(edits) <= 3 * len(segments)
+
+
+def test_rewritten_lines_patch_by_line():
+    old = "".join(rundown(100))
+    new = "\n".join(line.upper() if i % 5 == 0 else line for i, line in enumerate(old.split("\n")))
+    edits = compute_patch(old, new)
+    assert patched(old, new) == new
+    assert len(edits) <= new.count("\n") // 5 + 1
+
+
+def test_similar_lines_still_patch_by_character():
+    old = "Title: one\nthe minister said the talks would continue\nend\n"
+    new = "Title: one\nthe minister said that talks would continue\nend\n"
+    edits = compute_patch(old, new)
+    assert patched(old, new) == new
+    assert all(len(replacement) <= 3 for start, end, replacement in edits)
+
+
+def test_refinement_stops_at_budget(monkeypatch):
+    old = "x the minister said\nsame\nthe talks would continue y\n"
+    new = "z the minister said\nsame\nthe talks would continue w\n"
+    assert compute_patch(old, new) == [(0, 1, "z"), (50, 51, "w")]
+    monkeypatch.setattr(text_patch, "REFINE_BUDGET", 0)
+    assert compute_patch(old, new) == [(0, 20, "z the minister said\n"), (25, 51, "the talks would continue w")]